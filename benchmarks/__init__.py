@@ -0,0 +1,5 @@
+"""Offline micro-benchmarks for performance-sensitive components.
+
+Run from the repository root with the ``src`` directory on the import path, e.g.
+``PYTHONPATH=src python -m benchmarks.classification_batching``.
+"""
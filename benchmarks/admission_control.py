@@ -0,0 +1,138 @@
+"""Goodput of the classification route under overload, with and without admission control.
+
+The fake classifier behind ``POST /v1/classification`` serves at most
+``--capacity`` calls at a time, each taking ``--service-ms``; further calls
+queue inside it, so its latency grows with the backlog as a saturated model
+server's would. Requests arrive open-loop at multiples of that capacity and
+goodput counts the 200 responses delivered within the client's ``--slo-ms``.
+Without admission control every request joins the backlog and, once it is
+longer than the SLO, nothing useful is returned; with it the excess is
+rejected quickly with 503/429 and the admitted calls still meet the SLO.
+
+    PYTHONPATH=src python -m benchmarks.admission_control --loads 0.5 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService
+
+from benchmarks.asgi import asgi_request
+from benchmarks.fakes import FakeClassificationService, Latency
+from src.app.core.dependencies import get_classification_service
+from src.app.core.logging import configure_logging, shutdown_logging
+from src.app.main import create_app
+from src.app.services.admission import AdmissionControlledClassificationService, AdmissionController, AIMDLimit
+
+TICKET = {"ticket_id": "T-1", "ticket_text": "I cannot reset my password, the link has expired.", "priority": "high"}
+
+
+class SaturatingClassifier(FakeClassificationService):
+    """Fake classifier with a fixed number of workers and an unbounded internal queue."""
+
+    def __init__(self, latency: Latency, capacity: int) -> None:
+        super().__init__(latency)
+        self._workers = asyncio.Semaphore(capacity)
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        async with self._workers:
+            return await super().classify(ticket)
+
+
+async def offer(
+    service: ClassificationService, rate: float, args: argparse.Namespace, seed: int
+) -> Dict[str, Any]:
+    app = create_app()
+    app.dependency_overrides[get_classification_service] = lambda: service
+    rng = random.Random(seed)
+    statuses: Dict[int, int] = {}
+    good: List[float] = []
+    rejected: List[float] = []
+
+    async def one(index: int, scheduled: float) -> None:
+        payload = {**TICKET, "ticket_id": f"T-{index}"}
+        status = (await asgi_request(app, "POST", "/v1/classification", payload)).status
+        latency = time.perf_counter() - scheduled
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200 and latency * 1000 <= args.slo_ms:
+            good.append(latency)
+        elif status in (429, 503):
+            rejected.append(latency)
+
+    tasks = []
+    start = time.perf_counter()
+    scheduled = start
+    index = 0
+    while scheduled - start < args.duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(index, scheduled)))
+        index += 1
+        scheduled += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    return {
+        "offered": index,
+        "goodput": len(good) / args.duration,
+        "good_p99_ms": statistics.quantiles(good, n=100)[98] * 1000 if len(good) > 1 else float("nan"),
+        "reject_p50_ms": statistics.median(rejected) * 1000 if rejected else float("nan"),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    devnull = open(os.devnull, "w")
+    with contextlib.redirect_stdout(devnull):
+        configure_logging()
+    capacity_rps = args.capacity / (args.service_ms / 1000)
+    print(f"upstream capacity ~{capacity_rps:.0f} req/s, client SLO {args.slo_ms:g}ms")
+    for load in args.loads:
+        rate = load * capacity_rps
+        for label in ("unlimited", "admission"):
+            upstream = SaturatingClassifier(Latency(args.service_ms, args.tail_ratio), args.capacity)
+            service: ClassificationService = upstream
+            if label == "admission":
+                controller = AdmissionController(
+                    "classification",
+                    AIMDLimit(initial=args.capacity * 4, min_limit=1, max_limit=args.capacity * 16),
+                    max_queue=args.max_queue,
+                    max_wait_seconds=args.max_wait_ms / 1000,
+                )
+                service = AdmissionControlledClassificationService(service, controller)
+            result = await offer(service, rate, args, seed=int(load * 100))
+            print(
+                f"load {load:4.1f}x {label:<10} offered={result['offered']:6d} "
+                f"goodput={result['goodput']:7.1f}/s ({result['goodput'] / rate:6.1%}) "
+                f"ok p99={result['good_p99_ms']:7.1f}ms reject p50={result['reject_p50_ms']:6.2f}ms "
+                f"statuses={result['statuses']}"
+            )
+            if label == "admission":
+                print(f"{'':26}final limit={controller.limit.limit} stats={controller.stats}")
+    shutdown_logging()
+    devnull.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=float, nargs="+", default=[0.5, 1.0, 2.0, 4.0], help="Multiples of capacity.")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--capacity", type=int, default=8, help="Concurrent calls the upstream can serve.")
+    parser.add_argument("--service-ms", type=float, default=20.0)
+    parser.add_argument("--tail-ratio", type=float, default=2.0)
+    parser.add_argument("--slo-ms", type=float, default=500.0, help="Client deadline for a useful response.")
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=200.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Minimal in-process ASGI client that timestamps response chunks.
+
+httpx's ASGI transport buffers the full body before returning, which hides
+time-to-first-byte; driving the ASGI callable directly does not.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class AsgiResult:
+    status: int = 0
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+    chunk_times_s: list[float] = field(default_factory=list)
+    total_s: float = 0.0
+
+    @property
+    def first_byte_s(self) -> Optional[float]:
+        return self.chunk_times_s[0] if self.chunk_times_s else None
+
+
+async def asgi_request(app: Any, method: str, path: str, payload: Any = None) -> AsgiResult:
+    """Issue one HTTP request against ``app`` and return status, body and timings."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode("ascii"),
+        "query_string": query.encode("ascii"),
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    result = AsgiResult()
+    chunks: list[bytes] = []
+    sent = False
+    finished = asyncio.Event()
+    start = time.perf_counter()
+
+    async def receive() -> dict:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Streaming responses watch for disconnects; only report one once the body is complete.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            result.status = message["status"]
+            result.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if chunk:
+                result.chunk_times_s.append(time.perf_counter() - start)
+                chunks.append(chunk)
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    result.total_s = time.perf_counter() - start
+    result.body = b"".join(chunks)
+    return result
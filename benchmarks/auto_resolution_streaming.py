@@ -0,0 +1,55 @@
+"""Time-to-first-byte and total latency of buffered vs streamed auto-resolution.
+
+Both endpoints are served by the real FastAPI app with the fake LLM, driven
+in-process over ASGI so no network or model credentials are required.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+
+from rag.llm import FakeLLM
+
+from benchmarks.asgi import asgi_request
+from src.app.core.dependencies import get_auto_resolution_service
+from src.app.main import create_app
+from src.app.services.auto_resolution import RAGAutoResolutionService
+from src.app.services.stubs import NotConfiguredSimilarityService
+
+PAYLOAD = {"ticket_text": "I cannot reset my password, the link has expired.", "priority": "high"}
+
+
+def _ms(samples: list[float]) -> str:
+    return f"p50={statistics.median(samples) * 1000:8.1f}ms max={max(samples) * 1000:8.1f}ms"
+
+
+async def run(args: argparse.Namespace) -> None:
+    app = create_app()
+    service = RAGAutoResolutionService(
+        similarity=NotConfiguredSimilarityService(),
+        llm=FakeLLM(first_token_latency_ms=args.first_token_ms, token_latency_ms=args.token_ms),
+    )
+    app.dependency_overrides[get_auto_resolution_service] = lambda: service
+
+    buffered = [await asgi_request(app, "POST", "/v1/auto-resolution", PAYLOAD) for _ in range(args.requests)]
+    streamed = [await asgi_request(app, "POST", "/v1/auto-resolution/stream", PAYLOAD) for _ in range(args.requests)]
+    assert all(item.status == 200 for item in buffered + streamed)
+
+    print(f"buffered  ttfb        {_ms([r.first_byte_s for r in buffered])}")
+    print(f"buffered  total       {_ms([r.total_s for r in buffered])}")
+    print(f"streamed  grounding   {_ms([r.chunk_times_s[0] for r in streamed])}")
+    print(f"streamed  first token {_ms([r.chunk_times_s[1] for r in streamed])}")
+    print(f"streamed  total       {_ms([r.total_s for r in streamed])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--first-token-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
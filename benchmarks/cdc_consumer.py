@@ -0,0 +1,143 @@
+"""Throughput and freshness lag of the CDC consumer, per-event versus batched.
+
+A synthetic generator publishes ticket creates, updates and deletes at a fixed
+rate into the in-memory source. The consumer applies them to a local
+similarity index and a latency-injected feature store. ``--batch-size 1`` with
+an invocation overhead approximates one Lambda call per event.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Sequence
+
+from cdc.consumer import CDCConsumer
+from cdc.events import TicketChangeEvent
+from cdc.sinks import ChangeSink, SimilarityIndexSink, TicketFeatureSink
+from cdc.sources import InMemoryCheckpointStore, InMemoryEventSource
+from feature_store.online_store import SQLiteOnlineFeatureStore
+from rag.embeddings import HashingEmbedder
+from rag.vector_index import IVFIndex
+
+from benchmarks.fakes import Latency
+from benchmarks.feature_store import RemoteLatencyStore
+from src.app.services.similarity import LocalSimilarityService
+
+WORDS = (
+    "password reset login invoice charged twice refund dashboard slow export csv error timeout "
+    "subscription cancel upgrade plan api key rotate webhook failing mobile app crash sync"
+).split()
+
+
+class InvocationOverheadSink(ChangeSink):
+    """Charges a fixed cost per apply, standing in for a function cold path and client setup."""
+
+    name = "overhead"
+
+    def __init__(self, overhead_ms: float) -> None:
+        self._overhead = overhead_ms / 1000
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        if self._overhead:
+            await asyncio.sleep(self._overhead)
+
+
+async def generate(source: InMemoryEventSource, rate: float, events: int, seed: int) -> float:
+    """Publish ``events`` changes at ``rate`` per second; return the seconds spent blocked on backpressure."""
+    rng = random.Random(seed)
+    versions: Dict[str, int] = {}
+    live: list[str] = []
+    blocked = 0.0
+    start = time.perf_counter()
+    for index in range(events):
+        due = start + index / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = rng.random()
+        if live and roll < 0.05:
+            ticket_id = live.pop(rng.randrange(len(live)))
+            operation = "delete"
+        elif live and roll < 0.35:
+            ticket_id, operation = rng.choice(live), "upsert"
+        else:
+            ticket_id, operation = f"T-{index}", "upsert"
+            live.append(ticket_id)
+        versions[ticket_id] = versions.get(ticket_id, 0) + 1
+        event = TicketChangeEvent(
+            ticket_id=ticket_id,
+            operation=operation,  # type: ignore[arg-type]
+            version=versions[ticket_id],
+            emitted_at=time.time(),
+            text=" ".join(rng.choices(WORDS, k=12)),
+            customer_id=f"C-{rng.randrange(1000)}",
+        )
+        before = time.perf_counter()
+        await source.publish(event)
+        blocked += time.perf_counter() - before
+    return blocked
+
+
+async def run_mode(args: argparse.Namespace, batch_size: int, overhead_ms: float, directory: Path) -> None:
+    source = InMemoryEventSource(capacity=args.capacity)
+    similarity = LocalSimilarityService(
+        embedder=HashingEmbedder(dim=args.dim), index=IVFIndex(dim=args.dim, nlist=args.nlist, nprobe=8)
+    )
+    store = RemoteLatencyStore(
+        SQLiteOnlineFeatureStore(directory / f"features-{batch_size}.sqlite"), Latency(args.store_ms)
+    )
+    consumer = CDCConsumer(
+        source,
+        [InvocationOverheadSink(overhead_ms), SimilarityIndexSink(similarity), TicketFeatureSink(store, "ticket")],
+        InMemoryCheckpointStore(),
+        batch_size=batch_size,
+        max_wait_seconds=0.05,
+    )
+    start = time.perf_counter()
+    consumer_task = asyncio.create_task(consumer.run())
+    blocked = await generate(source, args.rate, args.events, args.seed)
+    while consumer.stats.events < args.events:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    consumer.stop()
+    await consumer_task
+
+    stats = consumer.stats
+    cuts = statistics.quantiles(stats.lag_seconds, n=100)
+    print(
+        f"batch_size={batch_size:<5} events/s={stats.events / elapsed:9.0f} "
+        f"lag p50={cuts[49] * 1000:8.1f}ms p99={cuts[98] * 1000:8.1f}ms "
+        f"batches={stats.batches} superseded={stats.superseded} store_calls={store.calls} "
+        f"producer_blocked={blocked:.2f}s"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"events={args.events} target_rate={args.rate:.0f}/s store_ms={args.store_ms} overhead_ms={args.overhead_ms}")
+    with tempfile.TemporaryDirectory() as directory:
+        await run_mode(args, 1, args.overhead_ms, Path(directory))
+        for batch_size in args.batch_sizes:
+            await run_mode(args, batch_size, args.overhead_ms, Path(directory))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=2_000.0, help="Events published per second.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--capacity", type=int, default=10_000, help="Source events retained before producers block.")
+    parser.add_argument("--store-ms", type=float, default=5.0, help="Median feature store write round trip.")
+    parser.add_argument("--overhead-ms", type=float, default=2.0, help="Fixed cost per consumer invocation.")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
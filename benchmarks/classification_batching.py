@@ -0,0 +1,85 @@
+"""Compare classification throughput with and without the micro-batcher.
+
+The fake model charges a fixed overhead per invocation (network hop, tensor
+setup) plus a small marginal cost per ticket, and serves a bounded number of
+invocations at once, which is the cost profile that batching is designed to
+amortise.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+
+from src.app.services.batching import MicroBatchingClassificationService
+
+
+class FakeBatchModel:
+    """Classifier with a fixed per-call overhead and a per-ticket marginal cost."""
+
+    def __init__(self, call_overhead_ms: float, per_ticket_ms: float, workers: int) -> None:
+        self._call_overhead = call_overhead_ms / 1000
+        self._per_ticket = per_ticket_ms / 1000
+        self._workers = asyncio.Semaphore(workers)
+        self.invocations = 0
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return (await self.classify_batch([ticket]))[0]
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        async with self._workers:
+            self.invocations += 1
+            await asyncio.sleep(self._call_overhead + self._per_ticket * len(tickets))
+        return [ClassificationOutcome(category=TicketCategory.OTHER, confidence=0.5) for _ in tickets]
+
+
+async def _drive(service, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await service.classify(Ticket(ticket_id=str(index), text=f"ticket {index}"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def run(args: argparse.Namespace) -> None:
+    direct = FakeBatchModel(args.call_overhead_ms, args.per_ticket_ms, args.model_workers)
+    elapsed = await _drive(direct, args.requests, args.concurrency)
+    print(
+        f"per-request : {args.requests / elapsed:10.1f} tickets/s  "
+        f"model calls={direct.invocations}"
+    )
+
+    model = FakeBatchModel(args.call_overhead_ms, args.per_ticket_ms, args.model_workers)
+    batcher = MicroBatchingClassificationService(
+        model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms
+    )
+    elapsed = await _drive(batcher, args.requests, args.concurrency)
+    print(
+        f"micro-batch : {args.requests / elapsed:10.1f} tickets/s  "
+        f"model calls={model.invocations}  "
+        f"avg batch={args.requests / max(model.invocations, 1):.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--call-overhead-ms", type=float, default=4.0)
+    parser.add_argument("--per-ticket-ms", type=float, default=0.05)
+    parser.add_argument("--model-workers", type=int, default=4)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Append latency, history read latency and restart recovery time of the conversation store."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from domain.models.conversation import ConversationTurn
+from domain.repositories.conversation_store import LocalConversationStore
+
+
+def _us(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1e6:8.1f}us p99={cuts[98] * 1e6:8.1f}us"
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalConversationStore(directory, max_turns_per_ticket=args.max_turns, max_age=None)
+        append_latency = []
+        start = time.perf_counter()
+        for index in range(args.turns):
+            turn = ConversationTurn(
+                ticket_id=f"T-{index % args.tickets}",
+                user_message=f"message {index} about my password reset",
+                assistant_message="Have you tried the reset link?",
+                created_at=datetime.now(timezone.utc),
+            )
+            begin = time.perf_counter()
+            await store.append_turn(turn)
+            append_latency.append(time.perf_counter() - begin)
+        elapsed = time.perf_counter() - start
+        store.flush()
+        print(f"append            {args.turns / elapsed:10.0f} turns/s  {_us(append_latency)}")
+
+        for limit in (5, 20, 100):
+            read_latency = []
+            for index in range(2000):
+                begin = time.perf_counter()
+                await store.get_history(f"T-{index % args.tickets}", limit=limit)
+                read_latency.append(time.perf_counter() - begin)
+            print(f"history limit={limit:<4} {_us(read_latency)}")
+        store.close()
+
+        recovered = LocalConversationStore(directory, max_turns_per_ticket=args.max_turns, max_age=None)
+        print(f"recovery (log replay of {args.turns} turns)   {recovered.recovery_seconds * 1000:8.1f}ms")
+        recovered.compact()
+        recovered.close()
+        compacted = LocalConversationStore(directory, max_turns_per_ticket=args.max_turns, max_age=None)
+        print(f"recovery (snapshot, {args.tickets} tickets x <= {args.max_turns} turns) "
+              f"{compacted.recovery_seconds * 1000:8.1f}ms")
+        compacted.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200_000)
+    parser.add_argument("--tickets", type=int, default=2_000)
+    parser.add_argument("--max-turns", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Overhead of drift monitoring on /v1/classification, and what the monitor reports.
+
+A local classifier is trained on synthetic tickets and a drift baseline is
+built from the same tickets. The benchmark then measures:
+
+* ``observe`` per call and ``flush`` throughput, for one-ticket calls as
+  the online path produces them;
+* per-request latency of ``POST /v1/classification`` served by the local
+  classifier with and without a drift monitor (flushing on its background
+  thread every ``--flush-ms``), interleaving the two so machine noise
+  affects both alike;
+* PSI and KS over a window of in-distribution traffic, then over a window of
+  shifted traffic: longer tickets, mostly critical, mostly billing, all
+  created at night.
+
+    PYTHONPATH=src python -m benchmarks.drift_monitoring --requests 2000 --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService
+from domain.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import transform_tickets
+from ml.models.linear import LinearModel
+from ml.monitoring.drift import BaselineBuilder, DriftBaseline, DriftMonitor, DriftReport, monitored_features
+from ml.training.linear import LinearModelTrainer, fit_linear_model
+
+from benchmarks.asgi import asgi_request
+from benchmarks.local_inference import FILLER, VOCABULARY
+from src.app.core.dependencies import get_classification_service
+from src.app.main import create_app
+from src.app.services.local_models import LocalClassificationService, LocalModelRuntime
+
+
+def tickets(count: int, seed: int, shifted: bool = False) -> tuple[list[Ticket], np.ndarray]:
+    rng = random.Random(seed)
+    categories = list(VOCABULARY)
+    result, classes = [], []
+    for index in range(count):
+        if shifted and rng.random() < 0.7:
+            category, priority, hour = TicketCategory.BILLING, TicketPriority.CRITICAL, rng.randint(0, 5)
+            filler = 30
+        else:
+            category, priority, hour = rng.choice(categories), rng.choice(list(TicketPriority)), rng.randint(8, 19)
+            filler = 12
+        words = rng.choices(VOCABULARY[category].split(), k=rng.randint(2, 6)) + rng.choices(FILLER, k=filler)
+        rng.shuffle(words)
+        created_at = datetime(2024, 5, 1, hour, rng.randint(0, 59))
+        result.append(Ticket(ticket_id=f"T-{index}", text=" ".join(words), priority=priority, created_at=created_at))
+        classes.append(categories.index(category))
+    return result, np.array(classes)
+
+
+def _quantiles(samples: List[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1e6:7.1f}us p99={cuts[98] * 1e6:7.1f}us"
+
+
+def _print_report(title: str, report: DriftReport) -> None:
+    print(f"{title}: rows={report.rows} drifted={report.drifted or '-'}")
+    for drift in report.features:
+        ks = "" if drift.ks is None else f" ks={drift.ks:.3f}"
+        print(f"  {drift.feature:<20} psi={drift.psi:7.3f}{ks}")
+
+
+def primitives(runtime: LocalModelRuntime, baseline: DriftBaseline, sample: List[Ticket]) -> None:
+    monitor = DriftMonitor(baseline, flush_interval=None, max_pending=len(sample) * 10)
+    observations = [(transform_tickets([ticket]), runtime.predict([ticket])) for ticket in sample]
+    start = time.perf_counter()
+    for features, outputs in observations:
+        monitor.observe(features, outputs)
+    observe_ns = (time.perf_counter() - start) / len(observations) * 1e9
+    start = time.perf_counter()
+    rows = monitor.flush()
+    flush_s = time.perf_counter() - start
+    print(f"observe {observe_ns:6.0f}ns/call   flush {rows / flush_s:9.0f} calls/s ({flush_s * 1e6 / rows:.1f}us/call)")
+
+
+def _provider(service: ClassificationService) -> Callable[[], ClassificationService]:
+    return lambda: service
+
+
+async def endpoint(
+    model: LinearModel, baseline: DriftBaseline, sample: List[Ticket], args: argparse.Namespace
+) -> None:
+    executor = ThreadPoolExecutor(max_workers=args.threads)
+    monitor = DriftMonitor(baseline, flush_interval=args.flush_ms / 1000, min_rows=1)
+    apps = {}
+    for name, drift_monitor in (("bare", None), ("monitored", monitor)):
+        service = LocalClassificationService(LocalModelRuntime(model, executor, drift_monitor=drift_monitor))
+        app = create_app()
+        app.dependency_overrides[get_classification_service] = _provider(service)
+        apps[name] = app
+    payloads = [
+        {
+            "ticket_id": ticket.ticket_id,
+            "ticket_text": ticket.text,
+            "priority": ticket.priority.value,
+            "created_at": ticket.created_at.isoformat(),
+        }
+        for ticket in sample
+    ]
+    samples: Dict[str, List[float]] = {name: [] for name in apps}
+    for app in apps.values():
+        for payload in payloads[:50]:
+            await asgi_request(app, "POST", "/v1/classification", payload)
+    for _ in range(args.rounds):
+        for name, app in apps.items():
+            for payload in payloads:
+                result = await asgi_request(app, "POST", "/v1/classification", payload)
+                assert result.status == 200, result.body
+                samples[name].append(result.total_s)
+    for name, values in samples.items():
+        print(f"{name:<10} POST /v1/classification {_quantiles(values)}")
+    for quantile, index in (("p50", 49), ("p99", 98)):
+        bare = statistics.quantiles(samples["bare"], n=100)[index]
+        monitored = statistics.quantiles(samples["monitored"], n=100)[index]
+        print(f"overhead at {quantile}: {(monitored - bare) * 1e6:+.1f}us ({(monitored / bare - 1) * 100:+.1f}%)")
+    monitor.close()
+    executor.shutdown()
+    report = monitor.report()
+    print(f"monitor recorded {report.rows} requests, dropped {report.dropped}")
+
+
+def detection(runtime: LocalModelRuntime, baseline: DriftBaseline, args: argparse.Namespace) -> None:
+    now = [0.0]
+    monitor = DriftMonitor(baseline, window_seconds=3600, buckets=12, flush_interval=None, clock=lambda: now[0])
+    for phase, shifted in (("in-distribution window", False), ("shifted window", True)):
+        sample, _ = tickets(args.window, seed=3 if shifted else 2, shifted=shifted)
+        for ticket in sample:
+            monitor.observe(transform_tickets([ticket]), runtime.predict([ticket]))
+        monitor.flush()
+        _print_report(phase, monitor.report())
+        # Let the whole window expire before the next phase.
+        now[0] += 3600
+    monitor.close()
+
+
+async def run(args: argparse.Namespace) -> None:
+    vectorizer = HashedFeatureVectorizer(n_features=args.n_features)
+    train, classes = tickets(args.train, seed=0)
+    features = transform_tickets(train)
+    rows = vectorizer.transform(features)
+    metadata = {"vectorizer": {"n_features": vectorizer.n_features, "use_bigrams": vectorizer.use_bigrams}}
+    labels = [category.value for category in VOCABULARY]
+    model = fit_linear_model(rows, classes, LinearModelTrainer("classifier", vectorizer.n_features, labels)).model(
+        metadata
+    )
+    builder = BaselineBuilder(monitored_features(model.labels))
+    builder.add(features, model.predict_proba(rows))
+    baseline = builder.build()
+    print(f"baseline over {baseline.rows} training tickets, bins={[f.bins for f in baseline.features.values()]}")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    runtime = LocalModelRuntime(model, executor)
+    sample, _ = tickets(args.requests, seed=1)
+    primitives(runtime, baseline, sample)
+    await endpoint(model, baseline, sample, args)
+    detection(runtime, baseline, args)
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--window", type=int, default=5_000, help="Requests per detection window.")
+    parser.add_argument("--flush-ms", type=float, default=1000.0)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--n-features", type=int, default=2**18)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
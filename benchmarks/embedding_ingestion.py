@@ -0,0 +1,85 @@
+"""Throughput of the embedding backfill as the process pool grows.
+
+Synthetic tickets are written as Parquet partitions, a share of them exact
+or whitespace/case variants of earlier ones, and the whole corpus is
+ingested from scratch once per ``--workers`` value. Reported are input rows
+per second, the speedup over one worker and the parallel efficiency
+(speedup / workers), next to the number of CPUs this machine has: worker
+counts above it can only show overhead. A second run over the same output
+is timed too; it should find nothing left to do.
+
+    PYTHONPATH=src python -m benchmarks.embedding_ingestion --rows 200000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from rag.ingestion import EmbedderSpec, EmbeddingIngestion
+
+from benchmarks.incremental_training import raw_tickets
+
+
+def write_corpus(directory: Path, rows: int, partition_rows: int, duplicate_rate: float) -> None:
+    rng = random.Random(0)
+    for index, offset in enumerate(range(0, rows, partition_rows)):
+        table = raw_tickets(min(partition_rows, rows - offset), seed=index)
+        subjects, bodies = table.column("subject").to_pylist(), table.column("body").to_pylist()
+        for row in range(1, len(bodies)):
+            if rng.random() < duplicate_rate:
+                source = rng.randrange(row)
+                subjects[row], bodies[row] = subjects[source].upper(), "  " + bodies[source]
+        table = table.set_column(0, "subject", pa.array(subjects)).set_column(1, "body", pa.array(bodies))
+        pq.write_table(table, directory / f"part-{index:05d}.parquet")
+
+
+def run(args: argparse.Namespace) -> None:
+    print(f"cpus={os.cpu_count()} rows={args.rows} dim={args.dim}")
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        dataset = root / "tickets"
+        dataset.mkdir()
+        write_corpus(dataset, args.rows, args.partition_rows, args.duplicate_rate)
+        baseline = None
+        for workers in args.workers:
+            ingestion = EmbeddingIngestion(
+                root / f"out-{workers}",
+                embedder=EmbedderSpec(options={"dim": args.dim}),
+                chunk_rows=args.chunk_rows,
+                segment_rows=args.segment_rows,
+                nlist=args.nlist,
+                workers=workers,
+            )
+            report = ingestion.run(dataset)
+            baseline = baseline or report.rows_per_second
+            speedup = report.rows_per_second / baseline
+            rerun = ingestion.run(dataset)
+            print(
+                f"workers={workers:2d} {report.seconds:7.2f}s {report.rows_per_second:9.0f} rows/s "
+                f"speedup={speedup:4.2f}x efficiency={speedup / workers:4.0%} "
+                f"embedded={report.embedded} duplicates={report.duplicates} segments={report.segments} "
+                f"rerun={rerun.seconds:5.2f}s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--partition-rows", type=int, default=50_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--chunk-rows", type=int, default=8_192)
+    parser.add_argument("--segment-rows", type=int, default=50_000)
+    parser.add_argument("--nlist", type=int, default=256)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Latency-configurable fake implementations of every domain service protocol."""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime
+
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import (
+    AutoResolutionOutcome,
+    AutoResolutionStream,
+    ClassificationOutcome,
+    ResolutionTimeOutcome,
+    SimilarTicket,
+)
+from domain.models.ticket import Ticket
+from domain.services.interfaces import (
+    AutoResolutionService,
+    ClassificationService,
+    ConversationService,
+    ResolutionTimeService,
+    SimilarityService,
+)
+from domain.value_objects.ticket_category import TicketCategory
+from rag.llm import FakeLLM
+
+
+@dataclass(slots=True)
+class Latency:
+    """Log-normal latency with the given median and a p99/p50 tail ratio, plus an error rate."""
+
+    median_ms: float = 5.0
+    tail_ratio: float = 3.0
+    error_rate: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        # ln(p99 / p50) = 2.326 * sigma for a log-normal distribution.
+        sigma = math.log(max(self.tail_ratio, 1.0)) / 2.326
+        return rng.lognormvariate(math.log(self.median_ms / 1000), sigma)
+
+    async def wait(self, rng: random.Random) -> None:
+        await asyncio.sleep(self.sample(rng))
+        if self.error_rate and rng.random() < self.error_rate:
+            raise RuntimeError("Injected upstream failure.")
+
+
+class FakeClassificationService(ClassificationService):
+    def __init__(self, latency: Latency, seed: int = 0) -> None:
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        await self.latency.wait(self._rng)
+        return ClassificationOutcome(category=TicketCategory.AUTHENTICATION, confidence=0.87)
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        await self.latency.wait(self._rng)
+        return [ClassificationOutcome(category=TicketCategory.AUTHENTICATION, confidence=0.87) for _ in tickets]
+
+
+class FakeResolutionTimeService(ResolutionTimeService):
+    def __init__(self, latency: Latency, seed: int = 1) -> None:
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        await self.latency.wait(self._rng)
+        return ResolutionTimeOutcome(estimated_hours=6.5)
+
+
+class FakeSimilarityService(SimilarityService):
+    def __init__(self, latency: Latency, seed: int = 2) -> None:
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        await self.latency.wait(self._rng)
+        return [
+            SimilarTicket(
+                ticket_id=f"T-{index}", similarity_score=0.9 - index * 0.05, summary="Password reset link expired"
+            )
+            for index in range(top_k)
+        ]
+
+
+class FakeConversationService(ConversationService):
+    def __init__(self, latency: Latency, seed: int = 3) -> None:
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+    async def append_turn(self, turn: ConversationTurn) -> None:
+        await self.latency.wait(self._rng)
+
+    async def get_history(self, ticket_id: str, limit: int = 10) -> list[ConversationTurn]:
+        await self.latency.wait(self._rng)
+        return [
+            ConversationTurn(
+                ticket_id=ticket_id,
+                user_message="Still broken",
+                assistant_message=None,
+                created_at=datetime(2026, 1, 1),
+            )
+            for _ in range(min(limit, 3))
+        ]
+
+
+class FakeAutoResolutionService(AutoResolutionService):
+    def __init__(self, latency: Latency, token_latency_ms: float = 0.0, seed: int = 4) -> None:
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._llm = FakeLLM(first_token_latency_ms=0.0, token_latency_ms=token_latency_ms, max_tokens=20)
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        await self.latency.wait(self._rng)
+        grounding = [item.ticket_id for item in context.similar_tickets] if context else []
+        return AutoResolutionOutcome(response=await self._llm.complete(ticket.text), grounding_ticket_ids=grounding)
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        await self.latency.wait(self._rng)
+        grounding = [item.ticket_id for item in context.similar_tickets] if context else []
+        return AutoResolutionStream(grounding_ticket_ids=grounding, tokens=self._llm.stream(ticket.text))
@@ -0,0 +1,98 @@
+"""Fault-injecting stand-ins for upstream backends: stalls, errors and periodic outages."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from domain.models.results import ClassificationOutcome, SimilarTicket
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService, SimilarityService
+from rag.llm import LLMClient
+
+
+@dataclass(slots=True)
+class FaultProfile:
+    """Faults added independently to every call on top of the wrapped fake's own latency.
+
+    A stall models a slow replica, GC pause or lost packet: the call still
+    succeeds, ``stall_ms`` late. During an outage (``outage_s`` out of every
+    ``outage_every_s``) every call fails after ``outage_error_ms``.
+    """
+
+    stall_rate: float = 0.0
+    stall_ms: float = 500.0
+    error_rate: float = 0.0
+    outage_every_s: float = 0.0
+    outage_s: float = 0.0
+    outage_error_ms: float = 50.0
+
+
+class FaultInjector:
+    def __init__(self, profile: FaultProfile, seed: int = 0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._clock = clock
+        self._start = clock()
+        self.calls = 0
+
+    def in_outage(self) -> bool:
+        profile = self.profile
+        if not profile.outage_every_s or not profile.outage_s:
+            return False
+        return (self._clock() - self._start) % profile.outage_every_s >= profile.outage_every_s - profile.outage_s
+
+    async def inject(self) -> None:
+        """Delay or fail the current call according to the profile."""
+        self.calls += 1
+        profile = self.profile
+        if self.in_outage():
+            await asyncio.sleep(profile.outage_error_ms / 1000)
+            raise ConnectionError("Injected outage.")
+        if profile.error_rate and self._rng.random() < profile.error_rate:
+            raise ConnectionError("Injected upstream failure.")
+        if profile.stall_rate and self._rng.random() < profile.stall_rate:
+            await asyncio.sleep(profile.stall_ms / 1000)
+
+
+class FaultInjectingClassificationService(ClassificationService):
+    def __init__(self, delegate: ClassificationService, faults: FaultInjector) -> None:
+        self._delegate = delegate
+        self.faults = faults
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        await self.faults.inject()
+        return await self._delegate.classify(ticket)
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        await self.faults.inject()
+        return await self._delegate.classify_batch(tickets)
+
+
+class FaultInjectingSimilarityService(SimilarityService):
+    def __init__(self, delegate: SimilarityService, faults: FaultInjector) -> None:
+        self._delegate = delegate
+        self.faults = faults
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        await self.faults.inject()
+        return await self._delegate.find_similar(ticket, top_k=top_k)
+
+
+class FaultInjectingLLM(LLMClient):
+    """Faults hit before the first token, where a hosted model's queueing and prefill happen."""
+
+    def __init__(self, delegate: LLMClient, faults: FaultInjector) -> None:
+        self._delegate = delegate
+        self.faults = faults
+
+    async def complete(self, prompt: str) -> str:
+        await self.faults.inject()
+        return await self._delegate.complete(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        await self.faults.inject()
+        async for token in self._delegate.stream(prompt):
+            yield token
@@ -0,0 +1,154 @@
+"""Hit ratio and lookup latency of the feature store client under Zipfian customer traffic.
+
+Each simulated request looks up one customer, or a small batch of customers,
+drawn from a Zipf distribution. The SQLite store is wrapped with an injected
+round-trip latency standing in for the remote online store, and the client is
+compared against reading through to the store on every lookup.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Mapping, Sequence
+
+from feature_store.client import customer_feature_client
+from feature_store.definitions.customer import CustomerFeatures
+from feature_store.online_store import FeatureRecord, SQLiteOnlineFeatureStore
+
+from benchmarks.fakes import Latency
+
+
+class RemoteLatencyStore:
+    """Adds a sampled network round trip to every call of the wrapped store."""
+
+    max_batch_size = SQLiteOnlineFeatureStore.max_batch_size
+
+    def __init__(self, store: SQLiteOnlineFeatureStore, latency: Latency, seed: int = 0) -> None:
+        self._store = store
+        self._latency = latency
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    async def batch_get(self, feature_group: str, record_ids: Sequence[str]) -> Dict[str, FeatureRecord]:
+        self.calls += 1
+        await self._latency.wait(self._rng)
+        return await self._store.batch_get(feature_group, record_ids)
+
+    async def batch_put(self, feature_group: str, records: Mapping[str, FeatureRecord]) -> None:
+        self.calls += 1
+        await self._latency.wait(self._rng)
+        await self._store.batch_put(feature_group, records)
+
+    async def batch_delete(self, feature_group: str, record_ids: Sequence[str]) -> None:
+        self.calls += 1
+        await self._latency.wait(self._rng)
+        await self._store.batch_delete(feature_group, record_ids)
+
+
+def zipf_sampler(customers: int, exponent: float, seed: int):
+    weights = [1.0 / rank**exponent for rank in range(1, customers + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1]
+    rng = random.Random(seed)
+
+    def sample() -> str:
+        return f"C-{bisect.bisect_left(cumulative, rng.random() * total)}"
+
+    return sample
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1000:7.2f}ms p99={cuts[98] * 1000:7.2f}ms"
+
+
+async def _drive(lookup, sample, requests: int, concurrency: int, batch: int) -> list[float]:
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            ids = [sample() for _ in range(batch)]
+            start = time.perf_counter()
+            await lookup(ids)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite = SQLiteOnlineFeatureStore(Path(directory) / "features.sqlite")
+        now = datetime.now(timezone.utc)
+        rng = random.Random(args.seed)
+        await sqlite.batch_put(
+            "customer",
+            {
+                f"C-{index}": CustomerFeatures(
+                    customer_id=f"C-{index}",
+                    avg_resolution_time=rng.uniform(1, 72),
+                    ticket_count_30d=rng.randint(0, 40),
+                    sla_breach_ratio=rng.random(),
+                    event_time=now,
+                ).to_record()
+                for index in range(args.customers)
+            },
+        )
+        latency = Latency(args.store_ms)
+
+        direct = RemoteLatencyStore(sqlite, latency, seed=args.seed)
+        direct_latencies = await _drive(
+            lambda ids: direct.batch_get("customer", list(dict.fromkeys(ids))),
+            zipf_sampler(args.customers, args.zipf, args.seed),
+            args.requests,
+            args.concurrency,
+            args.batch,
+        )
+
+        remote = RemoteLatencyStore(sqlite, latency, seed=args.seed)
+        client = customer_feature_client(
+            remote, "customer", ttl_seconds=args.ttl_s, max_staleness_seconds=args.max_staleness_s
+        )
+        cached_latencies = await _drive(
+            client.get_many,
+            zipf_sampler(args.customers, args.zipf, args.seed),
+            args.requests,
+            args.concurrency,
+            args.batch,
+        )
+
+    stats = client.stats
+    print(f"customers={args.customers} zipf={args.zipf} requests={args.requests} batch={args.batch}")
+    print(f"direct store   {_quantiles(direct_latencies)} store_calls={direct.calls}")
+    print(f"feature client {_quantiles(cached_latencies)} store_calls={remote.calls}")
+    print(
+        f"hit_ratio={stats.hit_ratio:.3f} hits={stats.hits} stale_hits={stats.stale_hits} "
+        f"misses={stats.misses} coalesced={stats.coalesced}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=1, help="Customers looked up per request.")
+    parser.add_argument("--store-ms", type=float, default=8.0, help="Median remote store round trip.")
+    parser.add_argument("--ttl-s", type=float, default=60.0)
+    parser.add_argument("--max-staleness-s", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Query latency and recall of BM25, vector and hybrid (reciprocal-rank fused) retrieval.
+
+Synthetic tickets belong to issues. An issue has a few characteristic words,
+synonyms a customer may use instead, and for some issues an error code such
+as ``ERR-40213`` that most of its tickets quote. A stand-in semantic embedder
+maps an issue's words and synonyms near a shared topic vector, the way a
+sentence-embedding model would, and knows nothing about error codes.
+
+Queries are fresh tickets of a known issue: half are paraphrases written in
+synonyms (where vectors shine), half quote the error code and little else
+(where BM25 shines). A hit is relevant when it belongs to the same issue.
+Block-max BM25 is checked against exhaustive scoring, and incremental
+ingestion is timed in small batches like the CDC consumer applies them.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import zlib
+from typing import Sequence
+
+import numpy as np
+
+from domain.models.ticket import Ticket
+from rag.embeddings import normalize_rows
+from rag.lexical_index import BM25Index, tokenize
+from rag.vector_index import IVFIndex
+
+from src.app.services.similarity import LocalSimilarityService
+
+SYLLABLES = "ka lo mi nu pe ra si to vu ze ba de fi go hu ja".split()
+FILLER = "please help since yesterday our the it is not working again urgent customer account team".split()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(3, 5)))
+
+
+class TicketGenerator:
+    def __init__(self, issues: int, seed: int = 0) -> None:
+        self._rng = random.Random(seed)
+        unique: set[str] = set()
+        while len(unique) < issues * 13:
+            unique.add(_word(self._rng))
+        pool = sorted(unique)
+        self._rng.shuffle(pool)
+        # Issue words are shared by a few issues each; synonyms are specific but never appear in tickets.
+        shared, specific = pool[: issues * 5], pool[issues * 5 :]
+        self.words = [self._rng.sample(shared, 8) for _ in range(issues)]
+        self.synonyms = [specific[i * 8 : i * 8 + 8] for i in range(issues)]
+        self.codes = [
+            f"ERR-{self._rng.randint(10_000, 99_999)}" if self._rng.random() < 0.5 else "" for _ in range(issues)
+        ]
+
+    def text(self, issue: int, rng: random.Random) -> str:
+        words = rng.sample(self.words[issue], rng.randint(3, 5)) + rng.choices(FILLER, k=rng.randint(2, 5))
+        if self.codes[issue] and rng.random() < 0.7:
+            words.append(self.codes[issue])
+        rng.shuffle(words)
+        return " ".join(words)
+
+    def paraphrase(self, issue: int, rng: random.Random) -> str:
+        words = rng.sample(self.synonyms[issue], 4) + rng.sample(self.words[issue], 1) + rng.choices(FILLER, k=3)
+        rng.shuffle(words)
+        return " ".join(words)
+
+    def code_query(self, issue: int, rng: random.Random) -> str:
+        words = [self.codes[issue]] + rng.sample(self.words[issue], 1) + rng.choices(FILLER, k=6)
+        rng.shuffle(words)
+        return " ".join(words)
+
+
+class TopicEmbedder:
+    """Embed text as the normalised sum of word vectors that point at the topics of their issues."""
+
+    def __init__(self, generator: TicketGenerator, dim: int, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        self.dim = dim
+        self._centers = normalize_rows(rng.standard_normal((len(generator.words), dim)))
+        self._noise = rng.standard_normal((4096, dim)).astype(np.float32) * (0.7 / np.sqrt(dim))
+        topics: dict[str, list[int]] = {}
+        for issue, (words, synonyms) in enumerate(zip(generator.words, generator.synonyms)):
+            for word in (*words, *synonyms):
+                topics.setdefault(word, []).append(issue)
+        self._vectors = {
+            word: normalize_rows(self._centers[issues].sum(axis=0)) + self._noise[zlib.crc32(word.encode()) % 4096]
+            for word, issues in topics.items()
+        }
+        self._vectors.update((word, self._noise[index]) for index, word in enumerate(FILLER))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                vector = self._vectors.get(token)
+                if vector is not None:
+                    matrix[row] += vector
+        return normalize_rows(matrix)
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1000:7.3f}ms p99={cuts[98] * 1000:7.3f}ms"
+
+
+def _recall(found: list[str], issue: int, issue_of: dict[str, int], relevant: int, k: int) -> float:
+    return sum(issue_of.get(label) == issue for label in found[:k]) / max(min(relevant, k), 1)
+
+
+async def run(args: argparse.Namespace) -> None:
+    generator = TicketGenerator(args.issues)
+    rng = random.Random(1)
+    issue_of: dict[str, int] = {}
+    tickets = []
+    for index in range(args.size):
+        issue = rng.randrange(args.issues)
+        tickets.append(Ticket(ticket_id=f"T-{index}", text=generator.text(issue, rng)))
+        issue_of[tickets[-1].ticket_id] = issue
+    sizes = [0] * args.issues
+    for issue in issue_of.values():
+        sizes[issue] += 1
+
+    embedder = TopicEmbedder(generator, args.dim)
+    index = IVFIndex(dim=args.dim, nlist=args.nlist, nprobe=args.nprobe, auto_train=False)
+    lexical = BM25Index()
+    vector_service = LocalSimilarityService(embedder, index)
+    hybrid_service = LocalSimilarityService(embedder, index, lexical=lexical, hybrid_candidates=args.candidates)
+
+    start = time.perf_counter()
+    index.add([ticket.ticket_id for ticket in tickets], embedder.embed([ticket.text for ticket in tickets]))
+    index.train()
+    print(f"vector build     {time.perf_counter() - start:7.2f}s for {args.size} tickets")
+    start = time.perf_counter()
+    lexical.add([ticket.ticket_id for ticket in tickets], [ticket.text for ticket in tickets])
+    print(f"bm25 build       {time.perf_counter() - start:7.2f}s vocabulary={lexical.vocabulary_size}")
+
+    coded_issues = [issue for issue, code in enumerate(generator.codes) if code]
+    queries = []
+    for position in range(args.queries):
+        if position % 2:
+            issue = rng.choice(coded_issues)
+            text = generator.code_query(issue, rng)
+        else:
+            issue = rng.randrange(args.issues)
+            text = generator.paraphrase(issue, rng)
+        queries.append((issue, Ticket(ticket_id=f"Q-{position}", text=text)))
+
+    agreement = 0
+    modes = {"bm25 exhaustive": [], "bm25 block-max": [], "vector": [], "hybrid": []}
+    recalls = {mode: {True: [], False: []} for mode in modes}
+    for position, (issue, query) in enumerate(queries):
+        for mode in modes:
+            start = time.perf_counter()
+            if mode == "bm25 exhaustive":
+                exhaustive = lexical.search_exhaustive(query.text, args.k)
+                found = [label for label, _ in exhaustive]
+            elif mode == "bm25 block-max":
+                pruned = lexical.search(query.text, args.k)
+                found = [label for label, _ in pruned]
+            elif mode == "vector":
+                found = [hit.ticket_id for hit in await vector_service.find_similar(query, args.k)]
+            else:
+                found = [hit.ticket_id for hit in await hybrid_service.find_similar(query, args.k)]
+            modes[mode].append(time.perf_counter() - start)
+            recalls[mode][position % 2 == 1].append(_recall(found, issue, issue_of, sizes[issue], args.k))
+        # Compare scores rather than labels: equally scored documents may come back in either order.
+        agreement += [round(score, 4) for _, score in exhaustive] == [round(score, 4) for _, score in pruned]
+
+    print(f"block-max scores == exhaustive top-{args.k} on {agreement}/{len(queries)} queries")
+    for mode, latencies in modes.items():
+        paraphrased, coded = (statistics.fmean(recalls[mode][flag]) for flag in (False, True))
+        print(
+            f"{mode:<16} {_quantiles(latencies)} recall@{args.k} paraphrase={paraphrased:.3f} "
+            f"error-code={coded:.3f} overall={(paraphrased + coded) / 2:.3f}"
+        )
+
+    batches = [tickets[start : start + args.ingest_batch] for start in range(0, args.size // 10, args.ingest_batch)]
+    start = time.perf_counter()
+    for batch in batches:
+        hybrid_service.index_tickets(batch)
+    elapsed = time.perf_counter() - start
+    print(
+        f"incremental reindex of {args.size // 10} tickets in batches of {args.ingest_batch}: "
+        f"{args.size // 10 / elapsed:8.0f} tickets/s (vector + bm25)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--issues", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--ingest-batch", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Wall-clock time and peak memory of incremental training against full retrains as the dataset grows.
+
+Synthetic raw tickets are written as Parquet partitions of ``--partition-rows``
+rows. At each dataset size one more partition lands, as after a CDC flush,
+and the classifier is brought up to date three ways:
+
+* ``incremental``: warm start from the previous checkpoint, one pass over
+  the new partition only;
+* ``full-streamed``: retrain from scratch, ``--epochs`` passes over every
+  partition streamed in batches;
+* ``full-in-memory``: load every partition, featurize it at once and fit,
+  the way the notebook does.
+
+Each run happens in a fresh process so its peak RSS can be read from
+``ru_maxrss``; ``idle`` is the same process doing nothing but the imports.
+RSS also keeps memory the allocator has not returned, so every mode runs a
+second time under ``tracemalloc`` (untimed) to report the peak of live
+Python and NumPy allocations plus Arrow's memory pool. Accuracy is measured
+on held-out tickets, some of which mix in words of another category.
+
+    PYTHONPATH=src python -m benchmarks.incremental_training --sizes 20000 40000 80000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import RawColumns, transform_batch
+from ml.models.linear import LinearModel
+from ml.training.incremental import CATEGORY_TARGET, CheckpointStore, IncrementalTrainer, target_values
+from ml.training.linear import LinearModelTrainer, fit_linear_model
+
+from benchmarks.local_inference import FILLER, VOCABULARY
+
+N_FEATURES = 2**18
+
+
+def raw_tickets(count: int, seed: int, confusion: float = 0.3) -> pa.Table:
+    rng = random.Random(seed)
+    categories = list(VOCABULARY)
+    subjects, bodies, priorities, labels = [], [], [], []
+    for _ in range(count):
+        category = rng.choice(categories)
+        words = rng.choices(VOCABULARY[category].split(), k=rng.randint(1, 4)) + rng.choices(FILLER, k=12)
+        if rng.random() < confusion:
+            words += rng.choices(VOCABULARY[rng.choice(categories)].split(), k=rng.randint(1, 3))
+        rng.shuffle(words)
+        subjects.append(" ".join(words[:4]))
+        bodies.append(" ".join(words[4:]))
+        priorities.append(rng.choice(list(TicketPriority)).value)
+        labels.append(category.value)
+    return pa.table({"subject": subjects, "body": bodies, "priority": priorities, "category": labels})
+
+
+def _accuracy(model_path: Path, test_path: Path) -> float:
+    model = LinearModel.load(model_path)
+    features = transform_batch(pq.read_table(test_path).combine_chunks().to_batches()[0], _columns())
+    keep, classes = target_values(features, CATEGORY_TARGET)
+    rows = HashedFeatureVectorizer(N_FEATURES).transform(features.take(pa.array(keep)))
+    return float((model.predict(rows) == classes).mean())
+
+
+def _columns() -> RawColumns:
+    return RawColumns(passthrough=(CATEGORY_TARGET.column,))
+
+
+def _peak_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(mode: str, dataset: str, checkpoints: str, test: str, epochs: int, traced: bool) -> Tuple[float, ...]:
+    """Runs in a fresh process; returns (seconds, peak RSS in MB, accuracy), or the peak heap in MB if traced."""
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    model_path: Optional[Path]
+    if mode == "idle":
+        return 0.0, _peak_mb(), float("nan")
+    if mode == "full-in-memory":
+        table = pq.read_table(dataset).combine_chunks()
+        features = transform_batch(table.to_batches(max_chunksize=table.num_rows)[0], _columns())
+        keep, classes = target_values(features, CATEGORY_TARGET)
+        rows = HashedFeatureVectorizer(N_FEATURES).transform(features.take(pa.array(keep)))
+        trainer = fit_linear_model(
+            rows, classes, LinearModelTrainer("classifier", N_FEATURES, CATEGORY_TARGET.labels), epochs=epochs
+        )
+        model_path = Path(checkpoints) / "in-memory.npz"
+        trainer.model().save(model_path)
+    else:
+        store = CheckpointStore(checkpoints)
+        trainer_epochs = 1 if mode == "incremental" else epochs
+        IncrementalTrainer(store, CATEGORY_TARGET, n_features=N_FEATURES, epochs=trainer_epochs).train(
+            dataset, full=mode != "incremental"
+        )
+        model_path = store.model_path()
+    seconds = time.perf_counter() - start
+    if traced:
+        return ((tracemalloc.get_traced_memory()[1] + pa.default_memory_pool().max_memory()) / 2**20,)
+    assert model_path is not None
+    return seconds, _peak_mb(), _accuracy(model_path, Path(test))
+
+
+def _measure(*args: object) -> Tuple[float, ...]:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_run, *args).result()
+
+
+def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        dataset, incremental, full = root / "tickets", root / "incremental", root / "full"
+        dataset.mkdir()
+        test = root / "test.parquet"
+        pq.write_table(raw_tickets(5_000, seed=-1), test)
+        partitions = 0
+
+        def add_partition() -> None:
+            nonlocal partitions
+            path = dataset / f"part-{partitions:05d}.parquet"
+            pq.write_table(raw_tickets(args.partition_rows, seed=partitions), path)
+            partitions += 1
+
+        _, idle_mb, _ = _measure("idle", str(dataset), str(full), str(test), args.epochs, False)
+        print(f"idle process peak RSS {idle_mb:.0f}MB")
+        for size in args.sizes:
+            while (partitions + 1) * args.partition_rows < size:
+                add_partition()
+            # Bring the incremental checkpoint up to date with what is already there, untimed.
+            IncrementalTrainer(CheckpointStore(incremental), CATEGORY_TARGET, n_features=N_FEATURES).train(dataset)
+            add_partition()
+            rows = partitions * args.partition_rows
+            for mode in ("incremental", "full-streamed", "full-in-memory"):
+                target = incremental if mode == "incremental" else full
+                if mode == "incremental":
+                    # Trace a throwaway copy so the timed run still starts from the previous version.
+                    traced_target = root / "incremental-traced"
+                    shutil.rmtree(traced_target, ignore_errors=True)
+                    shutil.copytree(incremental, traced_target)
+                else:
+                    traced_target = full
+                (heap_mb,) = _measure(mode, str(dataset), str(traced_target), str(test), args.epochs, True)
+                seconds, peak_mb, accuracy = _measure(mode, str(dataset), str(target), str(test), args.epochs, False)
+                print(
+                    f"rows={rows:8d} {mode:<15} {seconds:7.2f}s peak heap={heap_mb:6.1f}MB "
+                    f"peak RSS={peak_mb:5.0f}MB (+{peak_mb - idle_mb:4.0f}MB) accuracy={accuracy:.3f}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 40_000, 80_000])
+    parser.add_argument("--partition-rows", type=int, default=5_000)
+    parser.add_argument("--epochs", type=int, default=3, help="Passes of the full retrains.")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
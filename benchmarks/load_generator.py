@@ -0,0 +1,248 @@
+"""Open-loop load test of the full FastAPI app with fake, latency-configurable services.
+
+``create_app()`` is served in-process with every service dependency replaced
+by the fakes in :mod:`benchmarks.fakes`, so serialization, middleware,
+routing and dependency wiring are exercised exactly as deployed while model,
+vector store and LLM latency stay under control. Requests arrive on a
+Poisson schedule at each target rate, independently of how fast earlier ones
+complete, and latency is measured from the scheduled arrival so queueing
+inside the app is not hidden (no coordinated omission). Per route the run
+reports throughput, p50/p95/p99 and error rate, and writes everything to
+JSON; ``--baseline`` compares against an earlier result file.
+
+    PYTHONPATH=src python -m benchmarks.load_generator --rates 100 400 --output run.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from benchmarks.asgi import asgi_request
+from benchmarks.fakes import (
+    FakeAutoResolutionService,
+    FakeClassificationService,
+    FakeConversationService,
+    FakeResolutionTimeService,
+    FakeSimilarityService,
+    Latency,
+)
+from src.app.core.dependencies import (
+    get_auto_resolution_service,
+    get_classification_service,
+    get_conversation_service,
+    get_resolution_time_service,
+    get_similarity_service,
+    get_ticket_analysis_pipeline,
+)
+from src.app.core.logging import configure_logging, shutdown_logging
+from src.app.main import create_app
+from src.app.services.analysis import StageTimeouts, TicketAnalysisPipeline
+
+TICKET = {"ticket_id": "T-1", "ticket_text": "I cannot reset my password, the link has expired.", "priority": "high"}
+
+
+@dataclass(slots=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    weight: float
+    payload: Callable[[int], Any] = lambda index: None
+
+
+ENDPOINTS = [
+    Endpoint("classify", "POST", "/v1/classification", 30, lambda index: {**TICKET, "ticket_id": f"T-{index}"}),
+    Endpoint(
+        "classify_batch",
+        "POST",
+        "/v1/classification/batch",
+        3,
+        lambda index: {"tickets": [{**TICKET, "ticket_id": f"T-{index}-{item}"} for item in range(16)]},
+    ),
+    Endpoint("resolution_time", "POST", "/v1/resolution-time", 15, lambda index: TICKET),
+    Endpoint("similarity", "POST", "/v1/similarity?top_k=5", 15, lambda index: TICKET),
+    Endpoint("auto_resolution", "POST", "/v1/auto-resolution", 5, lambda index: TICKET),
+    Endpoint("auto_resolution_stream", "POST", "/v1/auto-resolution/stream", 5, lambda index: TICKET),
+    Endpoint(
+        "conversation_append",
+        "POST",
+        "/v1/conversation",
+        10,
+        lambda index: {"ticket_id": f"T-{index % 100}", "user_message": "Still broken after the reset."},
+    ),
+    Endpoint("conversation_history", "GET", "/v1/conversation/T-1?limit=10", 10),
+    Endpoint("analyze", "POST", "/v1/tickets/analyze", 7, lambda index: TICKET),
+]
+
+
+@dataclass(slots=True)
+class RouteResult:
+    requests: int = 0
+    errors: int = 0
+    throughput_rps: float = 0.0
+    error_rate: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+
+def build_app(args: argparse.Namespace) -> FastAPI:
+    """Return ``create_app()`` with every service dependency replaced by a fake."""
+    latency = lambda median: Latency(median, args.tail_ratio, args.error_rate)  # noqa: E731
+    classification = FakeClassificationService(latency(args.classifier_ms))
+    resolution_time = FakeResolutionTimeService(latency(args.regressor_ms))
+    similarity = FakeSimilarityService(latency(args.similarity_ms))
+    conversation = FakeConversationService(latency(args.conversation_ms))
+    auto_resolution = FakeAutoResolutionService(latency(args.llm_ms), token_latency_ms=args.token_ms)
+    pipeline = TicketAnalysisPipeline(
+        classification,
+        resolution_time,
+        similarity,
+        conversation,
+        auto_resolution,
+        StageTimeouts(classification=1, resolution_time=1, similarity=1, history=1, auto_resolution=5),
+    )
+    app = create_app()
+    app.dependency_overrides.update(
+        {
+            get_classification_service: lambda: classification,
+            get_resolution_time_service: lambda: resolution_time,
+            get_similarity_service: lambda: similarity,
+            get_conversation_service: lambda: conversation,
+            get_auto_resolution_service: lambda: auto_resolution,
+            get_ticket_analysis_pipeline: lambda: pipeline,
+        }
+    )
+    return app
+
+
+async def _send(app: FastAPI, endpoint: Endpoint, index: int) -> int:
+    try:
+        return (await asgi_request(app, endpoint.method, endpoint.path, endpoint.payload(index))).status
+    except Exception:  # noqa: BLE001 - Starlette re-raises after sending the 500
+        return 500
+
+
+async def run_rate(app: FastAPI, rate: float, duration: float, seed: int) -> Dict[str, RouteResult]:
+    """Offer ``rate`` requests per second for ``duration`` seconds and summarise each route."""
+    rng = random.Random(seed)
+    weights = [endpoint.weight for endpoint in ENDPOINTS]
+    samples: Dict[str, List[float]] = {endpoint.name: [] for endpoint in ENDPOINTS}
+    statuses: Dict[str, Dict[str, int]] = {endpoint.name: {} for endpoint in ENDPOINTS}
+    tasks = []
+
+    async def one(endpoint: Endpoint, index: int, scheduled: float) -> None:
+        status = await _send(app, endpoint, index)
+        samples[endpoint.name].append(time.perf_counter() - scheduled)
+        counts = statuses[endpoint.name]
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    start = time.perf_counter()
+    scheduled = start
+    index = 0
+    while scheduled - start < duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = rng.choices(ENDPOINTS, weights=weights)[0]
+        tasks.append(asyncio.create_task(one(endpoint, index, scheduled)))
+        index += 1
+        scheduled += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for name, latencies in samples.items():
+        if not latencies:
+            continue
+        errors = sum(count for status, count in statuses[name].items() if int(status) >= 500)
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0]] * 99
+        results[name] = RouteResult(
+            requests=len(latencies),
+            errors=errors,
+            throughput_rps=round((len(latencies) - errors) / elapsed, 2),
+            error_rate=round(errors / len(latencies), 4),
+            p50_ms=round(cuts[49] * 1000, 3),
+            p95_ms=round(cuts[94] * 1000, 3),
+            p99_ms=round(cuts[98] * 1000, 3),
+            statuses=dict(sorted(statuses[name].items())),
+        )
+    return results
+
+
+def _print(rate: float, results: Dict[str, RouteResult], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"offered {rate:g} req/s")
+    for name, result in results.items():
+        line = (
+            f"  {name:<24} n={result.requests:6d} {result.throughput_rps:8.1f} ok/s "
+            f"p50={result.p50_ms:8.2f}ms p95={result.p95_ms:8.2f}ms p99={result.p99_ms:8.2f}ms "
+            f"errors={result.error_rate:6.2%}"
+        )
+        previous = (baseline or {}).get(f"{rate:g}", {}).get(name)
+        if previous and previous["p99_ms"]:
+            line += f"  p99 vs baseline {result.p99_ms / previous['p99_ms'] - 1:+.1%}"
+        print(line)
+
+
+async def run(args: argparse.Namespace) -> None:
+    baseline = json.loads(Path(args.baseline).read_text())["rates"] if args.baseline else None
+    # Keep the production log pipeline in place, but write it to /dev/null.
+    devnull = open(os.devnull, "w")
+    with contextlib.redirect_stdout(devnull):
+        configure_logging()
+    app = build_app(args)
+    await run_rate(app, min(args.rates), 1.0, seed=-1)
+
+    report: Dict[str, Any] = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key not in {"output", "baseline"}},
+        "rates": {},
+    }
+    for rate in args.rates:
+        results = await run_rate(app, rate, args.duration, seed=int(rate))
+        report["rates"][f"{rate:g}"] = {name: asdict(result) for name, result in results.items()}
+        _print(rate, results, baseline)
+    shutdown_logging()
+    devnull.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"wrote {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 400, 800], help="Offered requests/second.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per rate.")
+    parser.add_argument("--classifier-ms", type=float, default=5.0)
+    parser.add_argument("--regressor-ms", type=float, default=5.0)
+    parser.add_argument("--similarity-ms", type=float, default=15.0)
+    parser.add_argument("--conversation-ms", type=float, default=3.0)
+    parser.add_argument("--llm-ms", type=float, default=150.0, help="Time to first token of the fake LLM.")
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--tail-ratio", type=float, default=3.0, help="p99/p50 of every fake service.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected failure rate of every fake service.")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--baseline", help="Earlier --output file to compare p99 against.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
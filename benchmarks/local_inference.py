@@ -0,0 +1,177 @@
+"""Latency of in-process model inference against a mocked remote model endpoint.
+
+A hashed-feature linear classifier and regressor are trained on synthetic
+tickets, saved as artifacts and loaded back the way ``dependencies.py`` does.
+The remote baseline serializes each request to JSON and waits a log-normal
+network round trip, like a SageMaker endpoint call, before decoding the reply.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService
+from domain.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import transform_tickets
+from ml.models.linear import LinearModel
+from ml.training.linear import LinearModelTrainer, fit_linear_model
+
+from benchmarks.fakes import Latency
+from src.app.services.batching import MicroBatchingClassificationService
+from src.app.services.local_models import LocalClassificationService, LocalModelRuntime, LocalResolutionTimeService
+
+VOCABULARY = {
+    TicketCategory.AUTHENTICATION: "login password reset locked account sso two-factor token sign",
+    TicketCategory.BILLING: "invoice charged refund payment card subscription plan billing receipt",
+    TicketCategory.PERFORMANCE: "slow timeout latency loading dashboard hang lag spinner minutes",
+    TicketCategory.USABILITY: "button confusing menu find settings layout export option where",
+    TicketCategory.OTHER: "hello question feedback general request information thanks team",
+}
+FILLER = "please help since yesterday our the it is not working again urgent customer".split()
+BASE_HOURS = {TicketCategory.AUTHENTICATION: 2, TicketCategory.BILLING: 12, TicketCategory.PERFORMANCE: 30}
+
+
+def synthetic_tickets(count: int, seed: int) -> tuple[list[Ticket], np.ndarray, np.ndarray]:
+    rng = random.Random(seed)
+    categories = list(VOCABULARY)
+    tickets, classes, hours = [], [], []
+    for index in range(count):
+        category = rng.choice(categories)
+        priority = rng.choice(list(TicketPriority))
+        words = rng.choices(VOCABULARY[category].split(), k=rng.randint(2, 6)) + rng.choices(FILLER, k=12)
+        rng.shuffle(words)
+        tickets.append(Ticket(ticket_id=f"T-{index}", text=" ".join(words), priority=priority))
+        classes.append(categories.index(category))
+        urgency = {TicketPriority.CRITICAL: 0.3, TicketPriority.HIGH: 0.6}.get(priority, 1.0)
+        hours.append(BASE_HOURS.get(category, 6) * urgency * rng.lognormvariate(0, 0.3))
+    return tickets, np.array(classes), np.array(hours, dtype=np.float32)
+
+
+class RemoteEndpointClassifier(ClassificationService):
+    """Stand-in for a hosted endpoint: JSON encode, network round trip, JSON decode."""
+
+    def __init__(self, latency: Latency, seed: int = 0) -> None:
+        self._latency = latency
+        self._rng = random.Random(seed)
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return (await self.classify_batch([ticket]))[0]
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        instances = [{"text": ticket.text, "priority": ticket.priority.value} for ticket in tickets]
+        body = json.dumps({"instances": instances})
+        await self._latency.wait(self._rng)
+        reply = json.loads(json.dumps({"predictions": [["other", 0.5]] * len(json.loads(body)["instances"])}))
+        return [
+            ClassificationOutcome(category=TicketCategory(label), confidence=score)
+            for label, score in reply["predictions"]
+        ]
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1000:7.2f}ms p99={cuts[98] * 1000:7.2f}ms"
+
+
+async def _sequential(call, tickets: list[Ticket]) -> list[float]:
+    latencies = []
+    for ticket in tickets:
+        start = time.perf_counter()
+        await call(ticket)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _concurrent(call, tickets: list[Ticket], concurrency: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    remaining = iter(tickets)
+
+    async def worker() -> None:
+        for ticket in remaining:
+            start = time.perf_counter()
+            await call(ticket)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(tickets) / (time.perf_counter() - start), latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    vectorizer = HashedFeatureVectorizer(n_features=args.n_features)
+    train, classes, hours = synthetic_tickets(args.train, seed=0)
+    rows = vectorizer.transform(transform_tickets(train))
+    metadata = {"vectorizer": {"n_features": vectorizer.n_features, "use_bigrams": vectorizer.use_bigrams}}
+    start = time.perf_counter()
+    classifier = fit_linear_model(
+        rows, classes, LinearModelTrainer("classifier", vectorizer.n_features, [c.value for c in VOCABULARY])
+    ).model(metadata)
+    regressor = fit_linear_model(
+        rows, hours, LinearModelTrainer("regressor", vectorizer.n_features, target_transform="log1p")
+    ).model(metadata)
+    print(f"trained on {args.train} tickets in {time.perf_counter() - start:.1f}s")
+
+    executor = ThreadPoolExecutor(max_workers=args.threads)
+    with tempfile.TemporaryDirectory() as directory:
+        classifier.save(Path(directory) / "classifier.npz")
+        regressor.save(Path(directory) / "regressor.npz")
+        size_kb = (Path(directory) / "classifier.npz").stat().st_size / 1024
+        local_classifier = LocalClassificationService(
+            LocalModelRuntime(LinearModel.load(Path(directory) / "classifier.npz", "classifier"), executor)
+        )
+        local_regressor = LocalResolutionTimeService(
+            LocalModelRuntime(LinearModel.load(Path(directory) / "regressor.npz", "regressor"), executor)
+        )
+
+    test, test_classes, test_hours = synthetic_tickets(args.requests, seed=1)
+    predicted = await local_classifier.classify_batch(test)
+    labels = list(VOCABULARY)
+    accuracy = np.mean(
+        [labels.index(outcome.category) == expected for outcome, expected in zip(predicted, test_classes)]
+    )
+    estimates = np.array([(await local_regressor.estimate(ticket)).estimated_hours for ticket in test[:500]])
+    mape = float(np.median(np.abs(estimates - test_hours[:500]) / test_hours[:500]))
+    print(f"artifact={size_kb:.0f}KB holdout accuracy={accuracy:.3f} regressor median APE={mape:.2f}")
+
+    remote = RemoteEndpointClassifier(Latency(args.remote_ms))
+    print(f"sequential local classify   {_quantiles(await _sequential(local_classifier.classify, test))}")
+    print(f"sequential local estimate   {_quantiles(await _sequential(local_regressor.estimate, test))}")
+    print(f"sequential remote classify  {_quantiles(await _sequential(remote.classify, test[: args.remote_requests]))}")
+
+    batched = MicroBatchingClassificationService(local_classifier, max_batch_size=32, max_wait_ms=1.0)
+    for name, service, sample in (
+        ("local+batching", batched, test),
+        ("remote", remote, test[: args.remote_requests * 4]),
+    ):
+        throughput, latencies = await _concurrent(service.classify, sample, args.concurrency)
+        print(f"concurrency={args.concurrency} {name:<15} {throughput:8.0f} req/s {_quantiles(latencies)}")
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--remote-requests", type=int, default=300)
+    parser.add_argument("--remote-ms", type=float, default=25.0, help="Median endpoint round trip.")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--n-features", type=int, default=2**18)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
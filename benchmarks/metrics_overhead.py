@@ -0,0 +1,105 @@
+"""Cost of recording metrics: per-sample primitives and per-request middleware overhead.
+
+The primitives are timed in a tight loop. The middleware is measured by
+sending the same requests to a minimal FastAPI app with and without
+``MetricsMiddleware`` and comparing per-request latency quantiles; the
+scrape cost is the time to render the registry after the run.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from observability.metrics import REGISTRY, render
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from benchmarks.asgi import asgi_request
+from src.app.core.middleware import MetricsMiddleware
+
+
+def _per_call_ns(function, repeats: int) -> float:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e9
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1e6:7.1f}us p99={cuts[98] * 1e6:7.1f}us"
+
+
+def primitives(repeats: int) -> None:
+    registry = CollectorRegistry()
+    counter = Counter("bench_total", "Benchmark counter.", registry=registry)
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ("route", "status"), registry=registry)
+    bound = histogram.labels("/v1/tickets/{ticket_id}", "200")
+    print(f"counter.inc                {_per_call_ns(counter.inc, repeats):7.0f}ns")
+    print(f"bound histogram.observe    {_per_call_ns(lambda: bound.observe(0.003), repeats):7.0f}ns")
+    print(
+        "labels().observe           "
+        f"{_per_call_ns(lambda: histogram.labels('/v1/tickets/{ticket_id}', '200').observe(0.003), repeats):7.0f}ns"
+    )
+
+
+def _app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/tickets/{ticket_id}")
+    async def ticket(ticket_id: str) -> dict:
+        return {"ticket_id": ticket_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def middleware(requests: int, rounds: int) -> None:
+    apps = {"bare": _app(False), "metrics": _app(True)}
+    samples: dict[str, list[float]] = {name: [] for name in apps}
+    for name, app in apps.items():
+        for index in range(50):
+            await asgi_request(app, "GET", f"/v1/tickets/T-{index}")
+    # Interleave the variants so drift in machine load affects both alike.
+    for _ in range(rounds):
+        for name, app in apps.items():
+            for index in range(requests):
+                result = await asgi_request(app, "GET", f"/v1/tickets/T-{index}")
+                samples[name].append(result.total_s)
+    for name, values in samples.items():
+        print(f"{name:<8} request {_quantiles(values)}")
+    overhead = statistics.median(samples["metrics"]) - statistics.median(samples["bare"])
+    print(f"middleware overhead at p50: {overhead * 1e6:.1f}us")
+    recorded = REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count", {"method": "GET", "route": "/v1/tickets/{ticket_id}", "status": "200"}
+    )
+    print(f"recorded {recorded:.0f} requests under one route template")
+
+
+def scrape(series: int) -> None:
+    registry = CollectorRegistry()
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ("route", "status"), registry=registry)
+    for index in range(series):
+        histogram.labels(f"/route/{index}", "200").observe(0.01)
+    start = time.perf_counter()
+    text = render(registry)
+    print(f"render {series} histogram series: {(time.perf_counter() - start) * 1000:.2f}ms, {len(text)} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--series", type=int, default=200)
+    args = parser.parse_args()
+    primitives(args.repeats)
+    asyncio.run(middleware(args.requests, args.rounds))
+    scrape(args.series)
+
+
+if __name__ == "__main__":
+    main()
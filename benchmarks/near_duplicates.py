@@ -0,0 +1,153 @@
+"""Precision, recall and cost of MinHash/LSH duplicate detection against the vector path.
+
+A stream of synthetic tickets is generated in which ``--resubmit-rate`` of
+the tickets resubmit a recent one: a verbatim copy, a copy with case,
+punctuation and whitespace changed, or a copy with a word or two edited or
+a short follow-up appended. Every other ticket is new, drawn from the same
+per-category vocabulary, so unrelated tickets about the same topic are
+close in embedding space.
+
+Each ticket is first checked against the tickets before it, then indexed:
+
+* ``minhash``: :class:`NearDuplicateIndex` query and insert;
+* ``vector``: hashing embedding and IVF search, flagging a duplicate when
+  the nearest ticket's cosine similarity reaches each ``--cosine``
+  threshold, the way ``find_similar`` would be used for it.
+
+The batch mode used by backfills (:meth:`NearDuplicateIndex.deduplicate`)
+is timed over the whole stream as well.
+
+    PYTHONPATH=src python -m benchmarks.near_duplicates --tickets 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from rag.embeddings import HashingEmbedder
+from rag.near_duplicates import NearDuplicateIndex
+from rag.vector_index import IVFIndex
+
+from benchmarks.local_inference import FILLER, VOCABULARY
+
+FOLLOW_UPS = ["any update?", "still broken.", "please advise", "thanks in advance", "same issue today"]
+
+
+def _perturb(text: str, rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.3:
+        return text
+    if kind < 0.6:
+        words = text.split()
+        shouted = [word.upper() if rng.random() < 0.3 else word for word in words]
+        return "  ".join(shouted) + rng.choice(["!", "?", " ..."])
+    words = text.split()
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(words))
+        if rng.random() < 0.5:
+            words[position] = rng.choice(FILLER)
+        else:
+            words.insert(position, rng.choice(FILLER))
+    if rng.random() < 0.5:
+        words.append(rng.choice(FOLLOW_UPS))
+    return " ".join(words)
+
+
+def ticket_stream(count: int, resubmit_rate: float, window: int, seed: int = 0) -> Tuple[List[str], List[bool]]:
+    """Return ticket texts and whether each one resubmits an earlier ticket."""
+    rng = random.Random(seed)
+    categories = list(VOCABULARY)
+    texts: List[str] = []
+    originals: List[str] = []
+    truth: List[bool] = []
+    for _ in range(count):
+        if originals and rng.random() < resubmit_rate:
+            texts.append(_perturb(rng.choice(originals[-window:]), rng))
+            truth.append(True)
+            continue
+        category = rng.choice(categories)
+        words = rng.choices(VOCABULARY[category].split(), k=rng.randint(3, 6))
+        words += rng.choices(FILLER, k=rng.randint(8, 20))
+        rng.shuffle(words)
+        originals.append(" ".join(words))
+        texts.append(originals[-1])
+        truth.append(False)
+    return texts, truth
+
+
+def _scores(predicted: List[bool], truth: List[bool]) -> str:
+    tp = sum(p and t for p, t in zip(predicted, truth))
+    fp = sum(p and not t for p, t in zip(predicted, truth))
+    fn = sum(t and not p for p, t in zip(predicted, truth))
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return f"precision={precision:.3f} recall={recall:.3f}"
+
+
+def _latency(samples: List[float]) -> str:
+    values = np.asarray(samples) * 1e6
+    return f"mean={values.mean():7.1f}us p50={np.percentile(values, 50):7.1f}us p99={np.percentile(values, 99):7.1f}us"
+
+
+def run(args: argparse.Namespace) -> None:
+    texts, truth = ticket_stream(args.tickets, args.resubmit_rate, args.window)
+    labels = [f"T-{index}" for index in range(len(texts))]
+    print(f"tickets={len(texts)} resubmissions={sum(truth)}")
+
+    index = NearDuplicateIndex(threshold=args.threshold)
+    predicted, query_seconds, insert_seconds = [], [], []
+    for label, text in zip(labels, texts):
+        start = time.perf_counter()
+        predicted.append(bool(index.query(text, limit=1)))
+        middle = time.perf_counter()
+        index.add([label], [text])
+        query_seconds.append(middle - start)
+        insert_seconds.append(time.perf_counter() - middle)
+    print(f"minhash  threshold={args.threshold:.2f} {_scores(predicted, truth)}")
+    print(f"         query  {_latency(query_seconds)}")
+    print(f"         insert {_latency(insert_seconds)}")
+
+    start = time.perf_counter()
+    originals = NearDuplicateIndex(threshold=args.threshold, max_entries=None).deduplicate(labels, texts)
+    seconds = time.perf_counter() - start
+    print(
+        f"minhash  batch  {len(texts) / seconds:9.0f} tickets/s "
+        f"{_scores([original is not None for original in originals], truth)}"
+    )
+
+    embedder = HashingEmbedder(dim=args.dim)
+    vectors = IVFIndex(dim=args.dim, nlist=args.nlist, nprobe=args.nprobe)
+    nearest, vector_seconds = [], []
+    for label, text in zip(labels, texts):
+        start = time.perf_counter()
+        vector = embedder.embed([text])
+        hits = vectors.search(vector[0], 1)
+        vector_seconds.append(time.perf_counter() - start)
+        nearest.append(hits[0][1] if hits else -1.0)
+        vectors.add([label], vector)
+    print(f"vector   embed+search {_latency(vector_seconds)}")
+    for cosine in args.cosine:
+        print(f"vector   cosine>={cosine:.2f} {_scores([score >= cosine for score in nearest], truth)}")
+    speedup = float(np.mean(vector_seconds) / np.mean(query_seconds))
+    print(f"minhash query is {speedup:.1f}x cheaper than embed+search on average")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--resubmit-rate", type=float, default=0.2)
+    parser.add_argument("--window", type=int, default=5_000, help="How far back resubmitted tickets come from.")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--cosine", type=float, nargs="+", default=[0.8, 0.9, 0.95])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, default=16)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
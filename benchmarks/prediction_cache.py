@@ -0,0 +1,100 @@
+"""Hit ratio and latency of the two-tier prediction cache on a repeat-heavy workload."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+
+from src.app.services.cache import CachedClassificationService, SQLiteCacheBackend, classification_cache
+
+TEMPLATES = [
+    "Reset my password",
+    "I was charged twice for invoice {n}",
+    "The dashboard is slow since the last update",
+    "Cannot log in after enabling two-factor authentication",
+    "Please cancel subscription {n}",
+]
+
+
+class FakeClassifier:
+    def __init__(self, latency_ms: float) -> None:
+        self._latency = latency_ms / 1000
+        self.calls = 0
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        self.calls += 1
+        await asyncio.sleep(self._latency)
+        return ClassificationOutcome(category=TicketCategory.OTHER, confidence=0.9)
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return [await self.classify(ticket) for ticket in tickets]
+
+
+def workload(size: int, unique: int, seed: int = 0) -> list[Ticket]:
+    """Zipf-like ticket stream with cosmetic variations (case, spacing, punctuation)."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(unique)]
+    bases = [TEMPLATES[i % len(TEMPLATES)].format(n=i) for i in range(unique)]
+    tickets = []
+    for i in range(size):
+        text = rng.choices(bases, weights)[0]
+        if rng.random() < 0.5:
+            text = text.upper() if rng.random() < 0.3 else f"  {text}!! "
+        tickets.append(Ticket(ticket_id=str(i), text=text))
+    return tickets
+
+
+async def run(args: argparse.Namespace) -> None:
+    tickets = workload(args.requests, args.unique)
+    model = FakeClassifier(args.model_latency_ms)
+    start = time.perf_counter()
+    for ticket in tickets:
+        await model.classify(ticket)
+    print(f"uncached      {time.perf_counter() - start:7.2f}s  model calls={model.calls}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, shared in (
+            ("local only", None),
+            ("local+sqlite", SQLiteCacheBackend(Path(workdir) / "cache.db", namespace="classification")),
+        ):
+            model = FakeClassifier(args.model_latency_ms)
+            service = CachedClassificationService(
+                model, classification_cache(args.max_entries, 300.0, shared), model_version="v1"
+            )
+            start = time.perf_counter()
+            for ticket in tickets:
+                await service.classify(ticket)
+            stats = service.cache.stats
+            print(
+                f"{label:<13} {time.perf_counter() - start:7.2f}s  model calls={model.calls}  "
+                f"hit ratio={stats.hit_ratio:.3f} (local={stats.local_hits} shared={stats.shared_hits} "
+                f"miss={stats.misses} evicted={stats.evictions})"
+            )
+
+        # A second worker sharing the SQLite tier starts with a cold local tier.
+        model = FakeClassifier(args.model_latency_ms)
+        shared = SQLiteCacheBackend(Path(workdir) / "cache.db", namespace="classification")
+        service = CachedClassificationService(model, classification_cache(args.max_entries, 300.0, shared), "v1")
+        for ticket in tickets[: args.requests // 10]:
+            await service.classify(ticket)
+        print(f"second worker model calls={model.calls}  shared hits={service.cache.stats.shared_hits}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--unique", type=int, default=2000)
+    parser.add_argument("--max-entries", type=int, default=500)
+    parser.add_argument("--model-latency-ms", type=float, default=1.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Rows/sec per core and peak memory of the chunked preprocessing pipeline.
+
+A synthetic raw ticket dataset is written to Parquet in chunks, so it can be
+made far larger than RAM, and then run through ``preprocess_parquet`` at
+several worker counts. Peak RSS is sampled for the parent and for the whole
+process tree; both depend on ``--batch-size`` and the worker count and should
+stay flat as ``--rows`` grows. A pure-Python per-row implementation over a
+sample gives the vectorization baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ml.feature_engineering.ticket_features import RawColumns
+from ml.preprocessing.pipeline import preprocess_parquet
+from ml.preprocessing.text import PII_PATTERNS
+
+SUBJECTS = ["Login issue", "Invoice question", "Slow dashboard", "Export failing", "Account locked"]
+SENTENCES = [
+    "I cannot sign in since this morning.",
+    "Please contact me at jane.doe{n}@example.com or +1 (555) 010-{n:04d}.",
+    "The card 4111 1111 1111 {n:04d} was charged twice.",
+    "Reports take minutes to load from 10.0.{m}.{m}.",
+    "See https://status.example.com/incidents/{n} for details.",
+    "Nothing changed on our side   and the   error persists.",
+]
+
+
+def write_dataset(path: Path, rows: int, chunk_rows: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    schema = pa.schema(
+        [
+            ("subject", pa.string()),
+            ("body", pa.string()),
+            ("priority", pa.string()),
+            ("category", pa.string()),
+            ("created_at", pa.timestamp("us")),
+        ]
+    )
+    origin = datetime(2025, 1, 1)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, rows, chunk_rows):
+            size = min(chunk_rows, rows - start)
+            bodies = [
+                " ".join(
+                    rng.choice(SENTENCES).format(n=start + index, m=index % 250) for _ in range(rng.randint(2, 6))
+                )
+                for index in range(size)
+            ]
+            writer.write_batch(
+                pa.RecordBatch.from_pydict(
+                    {
+                        "subject": [rng.choice(SUBJECTS) for _ in range(size)],
+                        "body": bodies,
+                        "priority": [rng.choice(["Low", "medium", "HIGH", "critical", None]) for _ in range(size)],
+                        "category": [rng.choice(["billing", "authentication", "usability", "?"]) for _ in range(size)],
+                        "created_at": [origin + timedelta(minutes=start + index) for index in range(size)],
+                    },
+                    schema=schema,
+                )
+            )
+
+
+def python_baseline(path: Path, sample_rows: int) -> float:
+    """Rows/sec of a per-row ``re`` implementation, the shape of a pandas ``.apply`` pipeline."""
+    compiled = [
+        (re.compile(pattern.replace("(?i)", ""), re.IGNORECASE), placeholder) for pattern, placeholder in PII_PATTERNS
+    ]
+    whitespace = re.compile(r"\s+")
+    table = pq.ParquetFile(path).read_row_group(0).slice(0, sample_rows).to_pylist()
+    start = time.perf_counter()
+    for row in table:
+        text = f"{row['subject'] or ''} {row['body'] or ''}"
+        for pattern, placeholder in compiled:
+            text = pattern.sub(placeholder, text)
+        text = whitespace.sub(" ", text.lower()).strip()
+        _ = (len(text), row["created_at"].hour if row["created_at"] else -1, (row["priority"] or "").lower())
+    return len(table) / (time.perf_counter() - start)
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid: int) -> list[int]:
+    found: list[int] = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children", encoding="ascii") as handle:
+                found.extend(int(child) for child in handle.read().split())
+        except OSError:
+            continue
+    return found
+
+
+class PeakRss:
+    """Sample the resident memory of this process and its pool workers in the background (Linux only)."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.parent_mb = self.tree_mb = 0.0
+
+    def __enter__(self) -> "PeakRss":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        pid = os.getpid()
+        while not self._stop.wait(self._interval):
+            parent = _rss_kb(pid)
+            tree = parent + sum(_rss_kb(child) for child in _children(pid))
+            self.parent_mb = max(self.parent_mb, parent / 1024)
+            self.tree_mb = max(self.tree_mb, tree / 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=65_536)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--baseline-rows", type=int, default=50_000)
+    parser.add_argument("--directory", type=Path, default=None, help="Parent of the dataset directory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        source = Path(directory) / "raw.parquet"
+        start = time.perf_counter()
+        # Generate in a separate process so its allocations do not count towards the pipeline's peak.
+        writer = multiprocessing.get_context("spawn").Process(
+            target=write_dataset, args=(source, args.rows, args.batch_size)
+        )
+        writer.start()
+        writer.join()
+        size_mb = source.stat().st_size / 2**20
+        print(f"dataset rows={args.rows} parquet={size_mb:.0f}MB written in {time.perf_counter() - start:.1f}s")
+
+        baseline = python_baseline(source, args.baseline_rows)
+        print(f"per-row python      rows/s={baseline:10.0f}")
+        for workers in args.workers:
+            with PeakRss() as memory:
+                report = preprocess_parquet(
+                    source,
+                    Path(directory) / f"features-{workers}.parquet",
+                    RawColumns(),
+                    batch_size=args.batch_size,
+                    workers=workers,
+                )
+            print(
+                f"workers={workers:<3}         rows/s={report.rows_per_second:10.0f} "
+                f"per-core={report.rows_per_second / min(workers, os.cpu_count() or 1):10.0f} "
+                f"peak_rss parent={memory.parent_mb:6.0f}MB all_processes={memory.tree_mb:6.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
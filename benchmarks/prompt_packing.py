@@ -0,0 +1,111 @@
+"""Prompt size, packing time and time to first token as conversation history grows.
+
+For each history length the auto-resolution prompt is rendered unbounded (the
+previous behaviour) and packed into fixed token budgets. Time to first token
+comes from the fake LLM with a per-prompt-token prefill delay, and input cost
+is estimated from the prompt token count.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from domain.models.conversation import ConversationTurn
+from domain.models.results import SimilarTicket
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_priority import TicketPriority
+from rag.llm import FakeLLM
+from rag.prompt_templates.builder import PromptBuilder, render_resolution_prompt
+from rag.prompt_templates.tokens import token_counter
+
+WORDS = (
+    "login password reset link expired account locked browser cache session token invoice refund "
+    "charged twice dashboard slow export csv settings error page mobile app update sync email"
+).split()
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + "."
+
+
+def conversation(length: int, seed: int = 0) -> list[ConversationTurn]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        ConversationTurn(
+            ticket_id="T-1",
+            user_message=_sentence(rng, 8, 40),
+            assistant_message=_sentence(rng, 20, 80),
+            created_at=start + timedelta(minutes=index),
+        )
+        for index in range(length)
+    ]
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1e6:7.1f}us p99={cuts[98] * 1e6:7.1f}us"
+
+
+async def _first_token(llm: FakeLLM, prompt: str) -> float:
+    start = time.perf_counter()
+    async for _ in llm.stream(prompt):
+        return time.perf_counter() - start
+    return time.perf_counter() - start
+
+
+async def run(args: argparse.Namespace) -> None:
+    counter = token_counter(args.counter)
+    print(f"token counter: {type(counter).__name__}")
+    rng = random.Random(1)
+    ticket = Ticket(ticket_id="T-1", text=_sentence(rng, 30, 60), priority=TicketPriority.HIGH)
+    grounding = [
+        SimilarTicket(ticket_id=f"T-{100 + index}", similarity_score=0.9 - 0.05 * index, summary=_sentence(rng, 15, 30))
+        for index in range(args.grounding)
+    ]
+    builders = {budget: PromptBuilder(budget, counter) for budget in args.budgets}
+    llm = FakeLLM(first_token_latency_ms=args.first_token_ms, prefill_ms_per_1k_tokens=args.prefill_ms_per_1k)
+
+    for length in args.history:
+        history = conversation(length)
+        prompt = render_resolution_prompt(ticket, grounding, history)
+        tokens = counter.count(prompt)
+        ttft = await _first_token(llm, prompt)
+        print(
+            f"history={length:<4} unbounded  tokens={tokens:6d} ttft={ttft * 1000:7.1f}ms "
+            f"cost=${tokens / 1000 * args.usd_per_1k:.4f}"
+        )
+        for budget, builder in builders.items():
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                built = builder.build(ticket, grounding, history)
+                timings.append(time.perf_counter() - start)
+            tokens = counter.count(built.text)
+            ttft = await _first_token(llm, built.text)
+            print(
+                f"history={length:<4} budget={budget:<5} tokens={tokens:6d} ttft={ttft * 1000:7.1f}ms "
+                f"cost=${tokens / 1000 * args.usd_per_1k:.4f} pack {_quantiles(timings)} "
+                f"turns={len(built.history)} grounding={len(built.grounding)}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 5, 20, 50, 200, 1000])
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1500, 3000])
+    parser.add_argument("--grounding", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--counter", choices=["auto", "tiktoken", "heuristic"], default="auto")
+    parser.add_argument("--first-token-ms", type=float, default=50.0)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=80.0, help="Prompt processing time per 1k tokens.")
+    parser.add_argument("--usd-per-1k", type=float, default=0.003, help="Input token price.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Throughput and tail latency of request logging, before and after the ASGI/queue rewrite.
+
+A minimal FastAPI route is driven by concurrent in-process clients while
+every request is logged to a file:
+
+- before: ``BaseHTTPMiddleware`` plus ``json.dumps`` into a synchronous
+  ``StreamHandler``, as the service used to log;
+- after: the pure-ASGI ``RequestLoggingMiddleware`` with records serialized
+  and written by the queue listener thread;
+- sampled: the same with only a fraction of successful requests logged.
+
+The time to drain the queue after the load stops is reported separately.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from benchmarks.asgi import asgi_request
+from src.app.core.logging import DeferredQueueHandler, JsonLogFormatter
+from src.app.core.middleware import RequestLoggingMiddleware
+
+legacy_logger = logging.getLogger("benchmarks.request_logging.legacy")
+
+
+class LegacyJsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record, datefmt="%Y-%m-%dT%H:%M:%S.%fZ"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if isinstance(getattr(record, "extra", None), dict):
+            payload.update(record.extra)  # type: ignore[attr-defined]
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):  # type: ignore[override]
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        legacy_logger.info(
+            "request_completed",
+            extra={
+                "extra": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status_code": response.status_code,
+                    "duration_ms": round(duration_ms, 2),
+                }
+            },
+        )
+        return response
+
+
+def _app(variant: str, sample_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/tickets/{ticket_id}")
+    async def ticket(ticket_id: str) -> dict:
+        return {"ticket_id": ticket_id}
+
+    if variant == "before":
+        app.add_middleware(LegacyRequestLoggingMiddleware)
+    else:
+        app.add_middleware(RequestLoggingMiddleware, success_sample_rate=sample_rate)
+    return app
+
+
+def _configure(variant: str, path: Path) -> tuple[logging.Handler, Optional[QueueListener]]:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.INFO)
+    stream = logging.StreamHandler(path.open("w", encoding="utf-8"))
+    if variant == "before":
+        stream.setFormatter(LegacyJsonFormatter())
+        root.addHandler(stream)
+        return stream, None
+    stream.setFormatter(JsonLogFormatter())
+    handler = DeferredQueueHandler(queue.Queue(maxsize=100_000))
+    listener = QueueListener(handler.queue, stream)
+    listener.start()
+    root.addHandler(handler)
+    return stream, listener
+
+
+async def _load(app: FastAPI, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    counter = iter(range(requests))
+
+    async def client() -> None:
+        for index in counter:
+            result = await asgi_request(app, "GET", f"/v1/tickets/T-{index}")
+            latencies.append(result.total_s)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    variants = [("before", 1.0), ("after", 1.0), ("sampled", args.sample_rate)]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, rate in variants:
+            path = Path(directory) / f"{name}.log"
+            stream, listener = _configure(name, path)
+            app = _app(name, rate)
+            await _load(app, 200, args.concurrency)
+            elapsed, latencies = await _load(app, args.requests, args.concurrency)
+            drain_start = time.perf_counter()
+            if listener is not None:
+                listener.stop()
+            drain = time.perf_counter() - drain_start
+            stream.close()
+            lines = sum(1 for _ in path.open(encoding="utf-8"))
+            cuts = statistics.quantiles(latencies, n=100)
+            print(
+                f"{name:<8} {args.requests / elapsed:8.0f} req/s  p50={cuts[49] * 1000:6.2f}ms "
+                f"p99={cuts[98] * 1000:6.2f}ms  log lines={lines:6d}  drain={drain * 1000:6.1f}ms"
+            )
+    logging.getLogger().handlers.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Tail latency and error rate of upstream calls with and without the resilience layer.
+
+A fake vector service and a fake LLM sit behind :mod:`benchmarks.faults`,
+which stalls, fails or takes down each attempt independently. Calls arrive
+open-loop and go either straight to the faulty upstream or through
+:class:`ResilientUpstream` (deadline, hedging at the recent p95, one
+budgeted retry, circuit breaker). Scenarios:
+
+* ``stalls``: a few percent of attempts stall; hedging should cut p99.
+* ``errors``: a share of attempts fail; budgeted retries should hide most.
+* ``outage``: the upstream is down part of the time; the breaker should
+  fail fast instead of sending every call into the outage.
+
+    PYTHONPATH=src python -m benchmarks.resilience --scenario stalls errors outage
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from domain.models.ticket import Ticket
+from rag.llm import FakeLLM
+
+from benchmarks.faults import FaultInjector, FaultInjectingLLM, FaultInjectingSimilarityService, FaultProfile
+from benchmarks.fakes import FakeSimilarityService, Latency
+from src.app.services.resilience import (
+    CircuitBreaker,
+    ResilientLLMClient,
+    ResilientSimilarityService,
+    ResilientUpstream,
+    RetryBudget,
+)
+
+SCENARIOS = {
+    "stalls": FaultProfile(stall_rate=0.03, stall_ms=400.0),
+    "errors": FaultProfile(error_rate=0.05),
+    "outage": FaultProfile(outage_every_s=4.0, outage_s=1.5, outage_error_ms=100.0),
+}
+
+
+async def offer(
+    call: Callable[[int], Awaitable[object]], rate: float, duration: float, seed: int
+) -> Dict[str, float]:
+    rng = random.Random(seed)
+    ok: List[float] = []
+    failed: List[float] = []
+
+    async def one(index: int) -> None:
+        start = time.perf_counter()
+        try:
+            await call(index)
+        except Exception:  # noqa: BLE001 - every failure counts the same here
+            failed.append(time.perf_counter() - start)
+            return
+        ok.append(time.perf_counter() - start)
+
+    tasks = []
+    start = time.perf_counter()
+    scheduled = start
+    index = 0
+    while scheduled - start < duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(index)))
+        index += 1
+        scheduled += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    cuts = statistics.quantiles(ok, n=1000, method="inclusive") if len(ok) > 1 else [float("nan")] * 999
+    return {
+        "calls": index,
+        "p50_ms": cuts[499] * 1000,
+        "p99_ms": cuts[989] * 1000,
+        "p999_ms": cuts[998] * 1000,
+        "error_rate": len(failed) / index,
+        "failure_p50_ms": statistics.median(failed) * 1000 if failed else float("nan"),
+    }
+
+
+def _upstream(name: str, timeout_ms: float) -> ResilientUpstream:
+    return ResilientUpstream(
+        name,
+        breaker=CircuitBreaker(min_calls=20, open_seconds=0.5),
+        budget=RetryBudget(ratio=0.1, min_per_second=5.0),
+        timeout_seconds=timeout_ms / 1000,
+        max_retries=1,
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    for scenario in args.scenario:
+        profile = SCENARIOS[scenario]
+        print(f"scenario {scenario}: {profile}")
+        for label in ("direct", "resilient"):
+            faults = FaultInjector(profile, seed=7)
+            vector = FaultInjectingSimilarityService(FakeSimilarityService(Latency(args.vector_ms, 1.5)), faults)
+            llm_faults = FaultInjector(profile, seed=8)
+            llm = FaultInjectingLLM(FakeLLM(first_token_latency_ms=args.llm_ms, token_latency_ms=0.0), llm_faults)
+            upstreams = []
+            if label == "resilient":
+                vector_upstream, llm_upstream = _upstream("vector", 1000.0), _upstream("llm", 3000.0)
+                vector = ResilientSimilarityService(vector, vector_upstream)
+                llm = ResilientLLMClient(llm, llm_upstream)
+                upstreams = [vector_upstream, llm_upstream]
+            vector_call, llm_call = vector.find_similar, llm.complete
+            results = {
+                "vector": await offer(
+                    lambda index: vector_call(Ticket(ticket_id=f"T-{index}", text="VPN drops every hour")),
+                    args.rate,
+                    args.duration,
+                    seed=1,
+                ),
+                "llm": await offer(lambda index: llm_call(f"prompt {index}"), args.rate / 4, args.duration, seed=2),
+            }
+            attempts = {"vector": faults.calls, "llm": llm_faults.calls}
+            for name, result in results.items():
+                print(
+                    f"  {name:<6} {label:<9} p50={result['p50_ms']:7.1f}ms p99={result['p99_ms']:7.1f}ms "
+                    f"p99.9={result['p999_ms']:7.1f}ms errors={result['error_rate']:6.2%} "
+                    f"fail p50={result['failure_p50_ms']:6.1f}ms "
+                    f"upstream attempts/call={attempts[name] / result['calls']:.3f}"
+                )
+            for upstream in upstreams:
+                print(f"  {'':6} {upstream.name} {upstream.stats} circuit opened {upstream.breaker.opened}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--rate", type=float, default=200.0, help="Vector calls per second; the LLM gets a quarter.")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--vector-ms", type=float, default=10.0)
+    parser.add_argument("--llm-ms", type=float, default=150.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
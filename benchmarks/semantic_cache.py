@@ -0,0 +1,138 @@
+"""Hit rate, wrong answers and latency saved by the semantic auto-resolution cache.
+
+A stream of tickets is drawn from a fixed set of issues, each phrased with
+random filler, word order, casing and punctuation, and sent to the RAG
+auto-resolution service over the fake LLM, first without a cache and then
+behind the semantic cache at several thresholds. A hit is wrong when the
+cached response was generated for a different issue. Finally the grounding
+tickets of a few issues are invalidated as a CDC update would.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from domain.models.results import AutoResolutionOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_priority import TicketPriority
+from rag.embeddings import HashingEmbedder
+from rag.llm import FakeLLM
+from rag.vector_index import IVFIndex
+
+from src.app.services.auto_resolution import RAGAutoResolutionService
+from src.app.services.semantic_cache import SemanticCachedAutoResolutionService, SemanticResponseCache
+from src.app.services.similarity import LocalSimilarityService
+
+OBJECTS = "password invoice dashboard export login refund subscription email invoice mobile sync report".split()
+PROBLEMS = "expired failing slow missing duplicated locked blank broken delayed wrong".split()
+CONTEXTS = "after update on android on web since monday in firefox for admin for team every time".split(" ")
+FILLERS = ["hi", "hello", "please help", "urgent", "thanks", "again", "still", "asap", "team"]
+
+
+def issues(count: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    seen: set[tuple[str, ...]] = set()
+    result = []
+    while len(result) < count:
+        words = (rng.choice(OBJECTS), rng.choice(PROBLEMS), *rng.sample(CONTEXTS, 2), f"err-{rng.randint(100, 999)}")
+        if words not in seen:
+            seen.add(words)
+            result.append(list(words))
+    return result
+
+
+def paraphrase(words: list[str], rng: random.Random) -> str:
+    words = list(words)
+    if rng.random() < 0.5:
+        index = rng.randrange(len(words) - 1)
+        words[index], words[index + 1] = words[index + 1], words[index]
+    words = rng.sample(FILLERS, rng.randint(0, 2)) + words
+    text = " ".join(words) + rng.choice(["", ".", "!", "?", " !!"])
+    return text.upper() if rng.random() < 0.1 else text.capitalize()
+
+
+def _ms(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"mean={statistics.fmean(samples) * 1000:7.1f}ms p50={cuts[49] * 1000:7.1f}ms p99={cuts[98] * 1000:7.1f}ms"
+
+
+async def _replay(service: RAGAutoResolutionService, stream: list[tuple[int, Ticket]]) -> list[float]:
+    timings = []
+    for _, ticket in stream:
+        start = time.perf_counter()
+        await service.generate(ticket)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(1)
+    catalogue = issues(args.issues)
+    embedder = HashingEmbedder(dim=args.dim)
+    similarity = LocalSimilarityService(embedder, IVFIndex(dim=args.dim, nlist=16, nprobe=4))
+    similarity.index_tickets(
+        [
+            Ticket(ticket_id=f"KB-{index}-{copy}", text=paraphrase(words, rng), priority=TicketPriority.MEDIUM)
+            for index, words in enumerate(catalogue)
+            for copy in range(2)
+        ]
+    )
+    rag = RAGAutoResolutionService(
+        similarity=similarity,
+        llm=FakeLLM(first_token_latency_ms=args.first_token_ms, token_latency_ms=args.token_ms),
+    )
+    # Popular issues dominate, as in real ticket streams.
+    weights = [1 / (rank + 1) for rank in range(args.issues)]
+    stream = []
+    for number in range(args.requests):
+        issue = rng.choices(range(args.issues), weights=weights)[0]
+        ticket = Ticket(ticket_id=f"T-{number}", text=paraphrase(catalogue[issue], rng), priority=TicketPriority.MEDIUM)
+        stream.append((issue, ticket))
+
+    timings = await _replay(rag, stream)
+    print(f"no cache          {_ms(timings)}")
+
+    for threshold in args.thresholds:
+        cache = SemanticResponseCache(embedder, threshold=threshold, max_entries=args.max_entries)
+        service = SemanticCachedAutoResolutionService(rag, cache)
+        wrong = 0
+        timings = []
+        # The fake LLM repeats texts across prompts, so outcomes are told apart by identity.
+        generated: dict[int, tuple[AutoResolutionOutcome, int]] = {}
+        for issue, ticket in stream:
+            before = cache.stats.hits
+            start = time.perf_counter()
+            outcome = await service.generate(ticket)
+            timings.append(time.perf_counter() - start)
+            if cache.stats.hits > before:
+                wrong += generated[id(outcome)][1] != issue
+            else:
+                generated[id(outcome)] = (outcome, issue)
+        stats = cache.stats
+        print(
+            f"threshold={threshold:.2f}    {_ms(timings)} hit_ratio={stats.hit_ratio:.3f} "
+            f"wrong_hits={wrong} saved={stats.latency_saved_seconds:6.2f}s entries={len(cache)}"
+        )
+
+    start = time.perf_counter()
+    dropped = cache.invalidate_grounding(f"KB-{index}-{copy}" for index in range(5) for copy in range(2))
+    print(f"invalidating 5 issues' grounding dropped {dropped} entries in {(time.perf_counter() - start) * 1e6:.0f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--max-entries", type=int, default=10_000)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.95, 0.9, 0.85, 0.8, 0.7])
+    parser.add_argument("--first-token-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=1.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Recall@k and query latency of the IVF index against brute-force cosine search."""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from rag.embeddings import normalize_rows
+from rag.vector_index import IVFIndex
+
+
+def synthetic_corpus(size: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Return clustered unit vectors, which resemble topic-grouped ticket embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=size)
+    noise = rng.standard_normal((size, dim)).astype(np.float32) * 0.6
+    return normalize_rows(centers[assignment] + noise)
+
+
+def percentile_ms(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.size, args.dim, args.clusters)
+    labels = [str(i) for i in range(args.size)]
+    rng = np.random.default_rng(1)
+    queries = normalize_rows(
+        corpus[rng.integers(0, args.size, size=args.queries)]
+        + rng.standard_normal((args.queries, args.dim)).astype(np.float32) * 0.05
+    )
+
+    truth, brute_latency = [], []
+    for query in queries:
+        start = time.perf_counter()
+        scores = corpus @ query
+        top = np.argpartition(-scores, args.k - 1)[: args.k]
+        brute_latency.append(time.perf_counter() - start)
+        truth.append({str(i) for i in top})
+    print(
+        f"brute-force      p50={percentile_ms(brute_latency, 50):7.3f}ms "
+        f"p99={percentile_ms(brute_latency, 99):7.3f}ms recall@{args.k}=1.000"
+    )
+
+    index = IVFIndex(dim=args.dim, nlist=args.nlist, auto_train=False)
+    start = time.perf_counter()
+    index.add(labels, corpus)
+    index.train()
+    print(f"build            {time.perf_counter() - start:7.2f}s for {args.size} vectors")
+
+    for nprobe in args.nprobe:
+        index.nprobe = nprobe
+        latency, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            result = index.search(query, args.k)
+            latency.append(time.perf_counter() - start)
+            hits += len(expected.intersection(label for label, _ in result))
+        print(
+            f"ivf nprobe={nprobe:<5} p50={percentile_ms(latency, 50):7.3f}ms "
+            f"p99={percentile_ms(latency, 99):7.3f}ms recall@{args.k}={hits / (args.k * args.queries):.3f}"
+        )
+
+    start = time.perf_counter()
+    removed = index.remove(labels[: args.size // 10])
+    index.add(labels[: args.size // 10], corpus[: args.size // 10])
+    print(f"delete+reinsert  {time.perf_counter() - start:7.2f}s for {removed} vectors")
+
+
+if __name__ == "__main__":
+    main()
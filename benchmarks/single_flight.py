@@ -0,0 +1,108 @@
+"""Upstream calls and latency during a retry storm, with and without single-flight.
+
+Each ticket is submitted ``--duplicates`` times within ``--spread-ms`` (client
+retries plus gateway fan-out) against fake similarity and auto-resolution
+services. A fraction of the first submissions is cancelled shortly after it
+starts, as when the client that triggered the call disconnects; the
+remaining duplicates must still be answered.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from domain.models.ticket import Ticket
+
+from benchmarks.fakes import FakeAutoResolutionService, FakeSimilarityService, Latency
+from src.app.services.single_flight import SingleFlightAutoResolutionService, SingleFlightSimilarityService
+
+
+class CountingSimilarity(FakeSimilarityService):
+    calls = 0
+
+    async def find_similar(self, ticket, top_k=5):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        return await super().find_similar(ticket, top_k)
+
+
+class CountingAutoResolution(FakeAutoResolutionService):
+    calls = 0
+
+    async def generate(self, ticket, context=None):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        return await super().generate(ticket, context)
+
+
+async def storm(call, args: argparse.Namespace, seed: int) -> tuple[list[float], int]:  # type: ignore[no-untyped-def]
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    cancelled = 0
+
+    async def submit(ticket: Ticket, delay: float, cancel_after: float | None) -> None:
+        nonlocal cancelled
+        await asyncio.sleep(delay)
+        start = time.perf_counter()
+        task = asyncio.ensure_future(call(ticket))
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            task.cancel()
+            cancelled += 1
+            return
+        await task
+        latencies.append(time.perf_counter() - start)
+
+    jobs = []
+    for index in range(args.tickets):
+        ticket = Ticket(ticket_id=f"T-{index}", text=f"Password reset link expired for account {index}")
+        offset = index * args.interval_ms / 1000
+        for copy in range(args.duplicates):
+            delay = offset + (rng.uniform(0, args.spread_ms) / 1000 if copy else 0.0)
+            disconnect = copy == 0 and rng.random() < args.disconnect_rate
+            jobs.append(submit(ticket, delay, 0.005 if disconnect else None))
+    await asyncio.gather(*jobs)
+    return latencies, cancelled
+
+
+def _report(name: str, latencies: list[float], calls: int, requests: int) -> None:
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<30} upstream calls={calls:5d} ({calls / requests:5.2f}/request) "
+        f"p50={cuts[49] * 1000:7.1f}ms p99={cuts[98] * 1000:7.1f}ms answered={len(latencies)}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    requests = args.tickets * args.duplicates
+    for label, single_flight in (("direct", False), ("single-flight", True)):
+        similarity = CountingSimilarity(Latency(args.similarity_ms))
+        auto_resolution = CountingAutoResolution(Latency(args.llm_ms), token_latency_ms=0.0)
+        similarity_call = (
+            SingleFlightSimilarityService(similarity).find_similar if single_flight else similarity.find_similar
+        )
+        generate_call = (
+            SingleFlightAutoResolutionService(auto_resolution).generate if single_flight else auto_resolution.generate
+        )
+        latencies, cancelled = await storm(similarity_call, args, seed=1)
+        _report(f"similarity {label}", latencies, similarity.calls, requests)
+        latencies, cancelled = await storm(generate_call, args, seed=2)
+        _report(f"auto-resolution {label}", latencies, auto_resolution.calls, requests)
+    print(f"{cancelled} leaders disconnected per run")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=4)
+    parser.add_argument("--spread-ms", type=float, default=20.0)
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Gap between distinct tickets.")
+    parser.add_argument("--disconnect-rate", type=float, default=0.2)
+    parser.add_argument("--similarity-ms", type=float, default=30.0)
+    parser.add_argument("--llm-ms", type=float, default=300.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
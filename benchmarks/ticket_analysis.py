@@ -0,0 +1,82 @@
+"""End-to-end latency of /v1/tickets/analyze versus calling each stage in sequence.
+
+Stages use log-normal fake latencies; the concurrent pipeline should land near
+the slowest independent stage plus auto-resolution, not the sum of all stages.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from domain.models.context import ResolutionContext
+from domain.models.ticket import Ticket
+
+from benchmarks.fakes import (
+    FakeAutoResolutionService,
+    FakeClassificationService,
+    FakeConversationService,
+    FakeResolutionTimeService,
+    FakeSimilarityService,
+    Latency,
+)
+from src.app.services.analysis import StageTimeouts, TicketAnalysisPipeline
+
+
+def _quantiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49] * 1000:7.1f}ms p99={cuts[98] * 1000:7.1f}ms"
+
+
+async def run(args: argparse.Namespace) -> None:
+    classification = FakeClassificationService(Latency(args.classifier_ms))
+    resolution_time = FakeResolutionTimeService(Latency(args.regressor_ms))
+    similarity = FakeSimilarityService(Latency(args.similarity_ms))
+    conversation = FakeConversationService(Latency(args.history_ms))
+    auto_resolution = FakeAutoResolutionService(Latency(args.llm_ms))
+    ticket = Ticket(ticket_id="T-1", text="I cannot reset my password")
+
+    sequential = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        await classification.classify(ticket)
+        await resolution_time.estimate(ticket)
+        similar = await similarity.find_similar(ticket)
+        history = await conversation.get_history(ticket.ticket_id)
+        # Clients calling /v1/auto-resolution separately pay for retrieval again.
+        await similarity.find_similar(ticket)
+        await auto_resolution.generate(ticket, ResolutionContext(similar_tickets=similar, history=history))
+        sequential.append(time.perf_counter() - start)
+
+    pipeline = TicketAnalysisPipeline(
+        classification,
+        resolution_time,
+        similarity,
+        conversation,
+        auto_resolution,
+        StageTimeouts(classification=1, resolution_time=1, similarity=1, history=1, auto_resolution=5),
+    )
+    concurrent = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        await pipeline.analyze(ticket)
+        concurrent.append(time.perf_counter() - start)
+
+    print(f"sequential endpoints  {_quantiles(sequential)}")
+    print(f"analyze pipeline      {_quantiles(concurrent)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--classifier-ms", type=float, default=15.0)
+    parser.add_argument("--regressor-ms", type=float, default=15.0)
+    parser.add_argument("--similarity-ms", type=float, default=20.0)
+    parser.add_argument("--history-ms", type=float, default=5.0)
+    parser.add_argument("--llm-ms", type=float, default=60.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
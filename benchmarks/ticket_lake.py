@@ -0,0 +1,199 @@
+"""Write throughput, compaction and query latency of the partitioned ticket lake on synthetic data.
+
+``--rows`` resolved tickets spread evenly over ``--months`` months are
+generated in time order and appended to ``silver/resolved_tickets`` in
+chunks, committing every ``--commit-rows`` rows the way a CDC-driven writer
+would, which leaves small files behind. The gold SLA and resolution-time
+queries are then timed over one month, one quarter and the whole range,
+before and after compaction. The ad-hoc baseline loads the whole table into
+memory and aggregates it there, which is what analytics did without a query
+layer; it is skipped when the table would not fit in ``--baseline-max-rows``.
+
+    PYTHONPATH=src python -m benchmarks.ticket_lake --rows 100000000 --root /tmp/ticket-lake
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data_lake.athena_queries.gold_metrics import (
+    DEFAULT_SLA_TARGET_HOURS,
+    SLA_TARGET_HOURS,
+    resolution_hours,
+    resolution_time_summary,
+    sla_summary,
+)
+from data_lake.query import LakeQuery
+from data_lake.tables import RESOLVED_TICKETS, TIMESTAMP
+from data_lake.writer import PartitionedWriter, compact
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PRIORITIES = np.array(["critical", "high", "medium", "low"])
+PRIORITY_WEIGHTS = np.array([0.05, 0.2, 0.5, 0.25])
+MEDIAN_HOURS = np.array([2.0, 5.0, 12.0, 30.0])
+CATEGORIES = np.array(["authentication", "billing", "performance", "usability", "other"])
+
+
+def _month(offset: int) -> datetime:
+    year, month = divmod(START.month - 1 + offset, 12)
+    return START.replace(year=START.year + year, month=month + 1)
+
+
+def synthetic_chunk(rng: np.random.Generator, first_id: int, rows: int, begin_us: int, end_us: int) -> pa.Table:
+    created = np.sort(rng.integers(begin_us, end_us, rows))
+    priority = rng.choice(len(PRIORITIES), size=rows, p=PRIORITY_WEIGHTS)
+    hours = MEDIAN_HOURS[priority] * rng.lognormal(0.0, 0.9, rows)
+    ids = pc.cast(pa.array(np.arange(first_id, first_id + rows)), pa.string())
+    customers = pc.cast(pa.array(rng.integers(0, 1_000_000, rows)), pa.string())
+    return pa.table(
+        {
+            "ticket_id": pc.binary_join_element_wise("T-", ids, ""),
+            "customer_id": pc.binary_join_element_wise("C-", customers, ""),
+            "created_at": pa.array(created, TIMESTAMP),
+            "resolved_at": pa.array(created + (hours * 3.6e9).astype(np.int64), TIMESTAMP),
+            "priority": pa.array(PRIORITIES).take(pa.array(priority)),
+            "category": pa.array(CATEGORIES).take(pa.array(rng.integers(0, len(CATEGORIES), rows))),
+            "status": pa.array(["resolved"] * rows),
+        }
+    )
+
+
+def write(root: Path, args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(0)
+    begin_us = int(START.timestamp() * 1e6)
+    span_us = int(_month(args.months).timestamp() * 1e6) - begin_us
+    chunks = -(-args.rows // args.chunk_rows)
+    written = since_commit = 0
+    generate_s = 0.0
+    start = time.perf_counter()
+    with PartitionedWriter(root, RESOLVED_TICKETS) as writer:
+        for index in range(chunks):
+            rows = min(args.chunk_rows, args.rows - written)
+            generated = time.perf_counter()
+            chunk = synthetic_chunk(
+                rng, written, rows, begin_us + span_us * index // chunks, begin_us + span_us * (index + 1) // chunks
+            )
+            generate_s += time.perf_counter() - generated
+            writer.append(chunk)
+            written += rows
+            since_commit += rows
+            if since_commit >= args.commit_rows:
+                writer.commit()
+                since_commit = 0
+    seconds = time.perf_counter() - start - generate_s
+    files = list(RESOLVED_TICKETS.path(root).rglob("part-*.parquet"))
+    size = sum(path.stat().st_size for path in files)
+    print(
+        f"wrote {written:,} rows in {seconds:.1f}s ({written / seconds:,.0f} rows/s, generation excluded) "
+        f"-> {len(files)} files, {size / 2**20:,.0f}MB ({size / written:.1f} bytes/row)"
+    )
+
+
+def _timed(function: Callable[[], pa.Table], repeats: int) -> Tuple[float, pa.Table]:
+    samples: List[float] = []
+    result = pa.table({})
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def queries(root: Path, args: argparse.Namespace, label: str) -> None:
+    query = LakeQuery(root)
+    last = _month(args.months)
+    ranges = {
+        "1 month": (_month(args.months - 1), last),
+        "1 quarter": (_month(args.months - 3), last),
+        f"all {args.months} months": (None, None),
+    }
+    total_files = len(query.files(RESOLVED_TICKETS))
+    for name, (start, end) in ranges.items():
+        files = len(query.files(RESOLVED_TICKETS, start, end))
+        seconds, result = _timed(lambda: sla_summary(query, start, end), args.repeats)
+        tickets = pc.sum(result.column("tickets")).as_py()
+        print(
+            f"[{label}] sla_summary {name:<10} {seconds * 1000:9.1f}ms files={files}/{total_files} "
+            f"tickets={tickets:,} ({tickets / seconds:,.0f} rows/s)"
+        )
+    start, end = ranges["1 quarter"]
+    seconds, result = _timed(lambda: resolution_time_summary(query, start, end), args.repeats)
+    print(f"[{label}] resolution_time_summary 1 quarter {seconds * 1000:9.1f}ms groups={result.num_rows}")
+
+
+def baseline(root: Path, args: argparse.Namespace) -> Optional[pa.Table]:
+    """Load the whole table, then aggregate the SLA of the last month in memory."""
+    if args.rows > args.baseline_max_rows:
+        print(f"[baseline] skipped: {args.rows:,} rows exceed --baseline-max-rows={args.baseline_max_rows:,}")
+        return None
+    start = time.perf_counter()
+    table = pq.read_table(RESOLVED_TICKETS.path(root))
+    loaded = time.perf_counter() - start
+    month_start = pa.scalar(_month(args.months - 1), TIMESTAMP)
+    recent = table.filter(pc.greater_equal(table.column("created_at"), month_start))
+    hours = resolution_hours(recent)
+    target = pc.fill_null(
+        pc.take(
+            pa.array(list(SLA_TARGET_HOURS.values())),
+            pc.index_in(recent.column("priority"), value_set=pa.array(list(SLA_TARGET_HOURS))),
+        ),
+        DEFAULT_SLA_TARGET_HOURS,
+    )
+    summary = pa.table(
+        {"priority": recent.column("priority"), "breached": pc.cast(pc.greater(hours, target), pa.int64())}
+    ).group_by("priority").aggregate([("breached", "sum"), ("breached", "count")])
+    seconds = time.perf_counter() - start
+    print(
+        f"[baseline] load everything {loaded * 1000:9.1f}ms ({table.nbytes / 2**30:.1f}GB in memory), "
+        f"SLA of 1 month {seconds * 1000:9.1f}ms total"
+    )
+    return summary
+
+
+def run(args: argparse.Namespace) -> None:
+    created = args.root is None
+    root = Path(args.root or tempfile.mkdtemp(prefix="ticket-lake-"))
+    try:
+        if not args.reuse:
+            shutil.rmtree(RESOLVED_TICKETS.path(root), ignore_errors=True)
+            write(root, args)
+        queries(root, args, "small files")
+        baseline(root, args)
+        report = compact(root, RESOLVED_TICKETS, target_file_bytes=int(args.target_mb * 2**20))
+        print(
+            f"compacted {report.partitions} partitions: {report.files_in} -> {report.files_out} files, "
+            f"{report.rows:,} rows in {report.seconds:.1f}s"
+        )
+        queries(root, args, "compacted")
+    finally:
+        if created:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="Rows per append.")
+    parser.add_argument("--commit-rows", type=int, default=100_000, help="Rows between writer commits.")
+    parser.add_argument("--target-mb", type=float, default=128.0, help="Compaction target file size.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline-max-rows", type=int, default=20_000_000)
+    parser.add_argument("--root", help="Lake directory to write to and keep; a temporary one by default.")
+    parser.add_argument("--reuse", action="store_true", help="Query the table already under --root.")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
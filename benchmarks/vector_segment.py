@@ -0,0 +1,142 @@
+"""Per-worker memory, cold-start time and recall of mmap int8 segments.
+
+The baseline loads an unquantised float32 matrix into each worker's heap and
+builds an in-memory IVF index over it; the segment path maps one shared file.
+Per-worker memory is read from ``/proc/self/smaps_rollup`` (Linux): private
+bytes are what each additional worker costs, shared bytes are page cache that
+all workers map once.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.similarity_index import synthetic_corpus
+from rag.embeddings import normalize_rows
+from rag.vector_index import IVFIndex
+from rag.vector_segment import VectorSegment, write_segment
+
+
+def memory_kib() -> dict[str, int]:
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as handle:
+            for line in handle:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return {"private": -1, "shared": -1}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"private": private, "shared": shared}
+
+
+def _worker(mode: str, path: str, nlist: int, queries: np.ndarray, results, barrier) -> None:
+    baseline = memory_kib()
+    start = time.perf_counter()
+    if mode == "segment":
+        segment = VectorSegment.open(path)
+        search = lambda query: segment.search(query, 10)  # noqa: E731
+    else:
+        matrix = np.load(path)
+        index = IVFIndex(dim=matrix.shape[1], nlist=nlist, auto_train=False)
+        index.add([str(i) for i in range(len(matrix))], matrix)
+        index.train()
+        search = lambda query: index.search(query, 10)  # noqa: E731
+    search(queries[0])
+    load_seconds = time.perf_counter() - start
+    for query in queries:
+        search(query)
+    # Measure only once every worker holds its index, so shared pages show as shared.
+    barrier.wait()
+    after = memory_kib()
+    barrier.wait()
+    results.put(
+        {
+            "mode": mode,
+            "load_s": load_seconds,
+            "private_mib": (after["private"] - baseline["private"]) / 1024,
+            "shared_mib": (after["shared"] - baseline["shared"]) / 1024,
+        }
+    )
+
+
+def recall(hits: list[list[str]], truth: list[set[str]], k: int) -> float:
+    return sum(len(set(found) & expected) for found, expected in zip(hits, truth)) / (k * len(truth))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=2_000)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.size, args.dim, args.clusters)
+    labels = [str(i) for i in range(args.size)]
+    rng = np.random.default_rng(1)
+    queries = normalize_rows(
+        corpus[rng.integers(0, args.size, size=args.queries)]
+        + rng.standard_normal((args.queries, args.dim)).astype(np.float32) * 0.3
+    )
+    truth = [{str(i) for i in np.argpartition(-(corpus @ q), args.k - 1)[: args.k]} for q in queries]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        segment_path = Path(workdir) / "tickets.seg"
+        matrix_path = Path(workdir) / "tickets.npy"
+        np.save(matrix_path, corpus)
+        start = time.perf_counter()
+        write_segment(segment_path, labels, corpus, nlist=args.nlist)
+        print(f"segment write      {time.perf_counter() - start:7.2f}s  {segment_path.stat().st_size / 2**20:8.1f} MiB")
+
+        segment = VectorSegment.open(segment_path)
+        for rerank in (0, 32, 64, 128):
+            found, latency = [], []
+            for query in queries:
+                begin = time.perf_counter()
+                hits = segment.search(query, args.k, rerank_candidates=rerank)
+                latency.append(time.perf_counter() - begin)
+                found.append([hit.ticket_id for hit in hits])
+            print(
+                f"int8 rerank={rerank:<4}  recall@{args.k}={recall(found, truth, args.k):.3f}  "
+                f"p50={np.percentile(latency, 50) * 1000:.3f}ms p99={np.percentile(latency, 99) * 1000:.3f}ms"
+            )
+        segment.close()
+
+        index = IVFIndex(dim=args.dim, nlist=args.nlist, auto_train=False)
+        index.add(labels, corpus)
+        index.train()
+        found = [[label for label, _ in index.search(query, args.k)] for query in queries]
+        print(f"float32 ivf        recall@{args.k}={recall(found, truth, args.k):.3f}")
+
+        context = multiprocessing.get_context("spawn")
+        for mode, path in (("float32-heap", matrix_path), ("segment", segment_path)):
+            results, barrier = context.Queue(), context.Barrier(args.workers)
+            workers = [
+                context.Process(target=_worker, args=(mode, str(path), args.nlist, queries, results, barrier))
+                for _ in range(args.workers)
+            ]
+            for worker in workers:
+                worker.start()
+            rows = [results.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            print(
+                f"{mode:<13} workers={args.workers}  cold start={np.mean([r['load_s'] for r in rows]):7.3f}s  "
+                f"private/worker={np.mean([r['private_mib'] for r in rows]):8.1f} MiB  "
+                f"shared/worker={np.mean([r['shared_mib'] for r in rows]):8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""End-to-end ticket analysis endpoint running the inference flow concurrently."""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, status
+
+from src.app.core.dependencies import get_ticket_analysis_pipeline
+from src.app.schemas.ticket import (
+    AutoResolutionResponse,
+    ClassificationResponse,
+    ConversationTurn,
+    CustomerFeaturesResponse,
+    ResolutionTimeResponse,
+    SimilarTicket,
+    StageTiming,
+    TicketAnalysisRequest,
+    TicketAnalysisResponse,
+)
+from src.app.services.analysis import TicketAnalysisPipeline
+from src.app.services.mappers import ticket_from_request
+
+router = APIRouter(prefix="/v1/tickets", tags=["analysis"])
+
+
+@router.post("/analyze", response_model=TicketAnalysisResponse, status_code=status.HTTP_200_OK)
+async def analyze_ticket(
+    payload: TicketAnalysisRequest,
+    pipeline: TicketAnalysisPipeline = Depends(get_ticket_analysis_pipeline),
+) -> TicketAnalysisResponse:
+    """Classify, estimate, retrieve and auto-resolve a ticket in one call.
+
+    Stages that time out or are not configured are reported in ``stages`` and
+    their results omitted, rather than failing the whole request.
+    """
+    ticket = ticket_from_request(payload)
+    analysis = await pipeline.analyze(
+        ticket,
+        top_k=payload.top_k,
+        history_limit=payload.history_limit,
+        include_auto_resolution=payload.include_auto_resolution,
+    )
+    return TicketAnalysisResponse(
+        classification=(
+            ClassificationResponse(
+                category=analysis.classification.category.value, confidence=analysis.classification.confidence
+            )
+            if analysis.classification is not None
+            else None
+        ),
+        resolution_time=(
+            ResolutionTimeResponse(estimated_resolution_hours=analysis.resolution_time.estimated_hours)
+            if analysis.resolution_time is not None
+            else None
+        ),
+        similar_tickets=[
+            SimilarTicket(
+                ticket_id=item.ticket_id,
+                similarity_score=item.similarity_score,
+                summary=item.summary,
+                near_duplicate=item.near_duplicate,
+            )
+            for item in analysis.similar_tickets
+        ],
+        history=[
+            ConversationTurn(
+                ticket_id=item.ticket_id,
+                user_message=item.user_message,
+                assistant_message=item.assistant_message,
+                created_at=item.created_at,
+            )
+            for item in analysis.history
+        ],
+        auto_resolution=(
+            AutoResolutionResponse(
+                auto_resolution=analysis.auto_resolution.response,
+                grounding_ticket_ids=analysis.auto_resolution.grounding_ticket_ids,
+            )
+            if analysis.auto_resolution is not None
+            else None
+        ),
+        customer_features=(
+            CustomerFeaturesResponse(
+                avg_resolution_time=analysis.customer_features.avg_resolution_time,
+                ticket_count_30d=analysis.customer_features.ticket_count_30d,
+                sla_breach_ratio=analysis.customer_features.sla_breach_ratio,
+            )
+            if analysis.customer_features is not None
+            else None
+        ),
+        stages={
+            name: StageTiming(status=report.status, duration_ms=report.duration_ms, detail=report.detail)
+            for name, report in analysis.stages.items()
+        },
+        total_duration_ms=analysis.total_duration_ms,
+    )
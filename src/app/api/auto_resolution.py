@@ -1,15 +1,22 @@
 """Auto-resolution endpoint powered by RAG and Bedrock."""
 from __future__ import annotations
 
+import json
+from typing import Any, AsyncIterator, Dict
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
+from domain.models.results import AutoResolutionStream
 from domain.services.interfaces import AutoResolutionService
 
 from src.app.core.dependencies import get_auto_resolution_service
+from src.app.core.logging import get_logger
 from src.app.schemas.ticket import AutoResolutionResponse, ClassificationRequest
 from src.app.services.mappers import ticket_from_request
 
 router = APIRouter(prefix="/v1/auto-resolution", tags=["auto-resolution"])
+logger = get_logger(__name__)
 
 
 @router.post("", response_model=AutoResolutionResponse, status_code=status.HTTP_200_OK)
@@ -27,3 +34,41 @@ async def generate_auto_resolution(
         )
     except NotImplementedError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+
+
+def _sse_event(event: str, payload: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+async def _event_stream(stream: AutoResolutionStream) -> AsyncIterator[bytes]:
+    yield _sse_event("grounding", {"grounding_ticket_ids": stream.grounding_ticket_ids})
+    try:
+        async for token in stream.tokens:
+            yield _sse_event("token", {"token": token})
+    except Exception as exc:  # noqa: BLE001 - headers are already sent, report in-band
+        logger.exception("auto_resolution_stream_failed")
+        yield _sse_event("error", {"detail": str(exc)})
+        return
+    yield _sse_event("done", {})
+
+
+@router.post("/stream", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def stream_auto_resolution(
+    payload: ClassificationRequest,
+    service: AutoResolutionService = Depends(get_auto_resolution_service),
+) -> StreamingResponse:
+    """Stream an automated resolution as server-sent events.
+
+    The first ``grounding`` event carries the grounding ticket ids, followed by one
+    ``token`` event per generated token and a final ``done`` (or ``error``) event.
+    """
+    try:
+        ticket = ticket_from_request(payload)
+        stream = await service.generate_stream(ticket)
+    except NotImplementedError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    return StreamingResponse(
+        _event_stream(stream),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,7 +6,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from domain.services.interfaces import ClassificationService
 
 from src.app.core.dependencies import get_classification_service
-from src.app.schemas.ticket import ClassificationRequest, ClassificationResponse
+from src.app.schemas.ticket import (
+    BatchClassificationRequest,
+    BatchClassificationResponse,
+    ClassificationRequest,
+    ClassificationResponse,
+)
 from src.app.services.mappers import ticket_from_request
 
 router = APIRouter(prefix="/v1/classification", tags=["classification"])
@@ -24,3 +29,22 @@ async def classify_ticket(
         return ClassificationResponse(category=result.category.value, confidence=result.confidence)
     except NotImplementedError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+
+
+@router.post("/batch", response_model=BatchClassificationResponse, status_code=status.HTTP_200_OK)
+async def classify_ticket_batch(
+    payload: BatchClassificationRequest,
+    service: ClassificationService = Depends(get_classification_service),
+) -> BatchClassificationResponse:
+    """Classify a batch of tickets with a single model invocation per batch."""
+    try:
+        tickets = [ticket_from_request(item) for item in payload.tickets]
+        results = await service.classify_batch(tickets)
+        return BatchClassificationResponse(
+            results=[
+                ClassificationResponse(category=result.category.value, confidence=result.confidence)
+                for result in results
+            ]
+        )
+    except NotImplementedError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
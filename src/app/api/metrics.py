@@ -0,0 +1,14 @@
+"""Prometheus scrape endpoint."""
+from __future__ import annotations
+
+from fastapi import APIRouter, Response
+
+from observability.metrics import CONTENT_TYPE, render
+
+router = APIRouter(tags=["observability"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Return every registered metric in the Prometheus text format."""
+    return Response(content=render(), media_type=CONTENT_TYPE)
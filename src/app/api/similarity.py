@@ -27,6 +27,7 @@ async def find_similar_tickets(
                 ticket_id=item.ticket_id,
                 similarity_score=item.similarity_score,
                 summary=item.summary,
+                near_duplicate=item.near_duplicate,
             )
             for item in results
         ]
@@ -29,6 +29,18 @@ class AppSettings(BaseSettings):
         description="HTTP headers permitted via CORS.",
     )
     log_level: str = Field(default="INFO", description="Root logging level.")
+    log_queue_size: int = Field(
+        default=10_000, ge=0, description="Records buffered for the background log writer; 0 writes synchronously."
+    )
+    log_success_sample_rate: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Fraction of fast, successful requests that are logged."
+    )
+    log_slow_request_ms: float = Field(
+        default=1000.0, ge=0.0, description="Requests at least this slow are always logged."
+    )
+    metrics_enabled: bool = Field(
+        default=True, description="Record request and service metrics and expose them on /metrics."
+    )
     aws_region: str = Field(default="us-east-1", description="AWS region for downstream service calls.")
     sagemaker_classifier_endpoint: str = Field(
         default="", description="SageMaker endpoint name for ticket classification."
@@ -36,21 +48,282 @@ class AppSettings(BaseSettings):
     sagemaker_regressor_endpoint: str = Field(
         default="", description="SageMaker endpoint name for resolution time regression."
     )
+    classification_backend: Literal["none", "local"] = Field(
+        default="none", description="Ticket classifier; 'local' serves a model artifact in-process."
+    )
+    classification_model_path: str = Field(
+        default=".data/models/classifier.npz", description="Local classifier artifact used by the 'local' backend."
+    )
+    resolution_time_backend: Literal["none", "local"] = Field(
+        default="none", description="Resolution time regressor; 'local' serves a model artifact in-process."
+    )
+    resolution_time_model_path: str = Field(
+        default=".data/models/resolution_time.npz", description="Local regressor artifact used by the 'local' backend."
+    )
+    local_inference_threads: int = Field(
+        default=4, ge=1, description="Worker threads running local model inference off the event loop."
+    )
+    classification_drift_baseline_path: str = Field(
+        default="", description="Drift baseline of the local classifier; empty disables its drift monitor."
+    )
+    resolution_time_drift_baseline_path: str = Field(
+        default="", description="Drift baseline of the local regressor; empty disables its drift monitor."
+    )
+    drift_window_seconds: float = Field(
+        default=3600.0, gt=0.0, description="Span of live traffic compared against the drift baseline."
+    )
+    drift_window_buckets: int = Field(
+        default=12, ge=1, description="Time slices of the drift window; one expires at a time."
+    )
+    drift_min_rows: int = Field(
+        default=500, ge=1, description="Predictions the drift window needs before PSI and KS are reported."
+    )
+    drift_flush_interval_ms: float = Field(
+        default=1000.0, gt=0.0, description="How often recorded predictions are folded into the drift window."
+    )
     feature_store_ticket_group: str = Field(
         default="", description="SageMaker Feature Store ticket feature group name."
     )
     feature_store_customer_group: str = Field(
         default="", description="SageMaker Feature Store customer feature group name."
     )
+    feature_store_backend: Literal["none", "sqlite"] = Field(
+        default="none", description="Online feature store; 'sqlite' reads a local stand-in database."
+    )
+    feature_store_sqlite_path: str = Field(
+        default=".data/features.sqlite", description="SQLite file backing the local online feature store."
+    )
+    feature_cache_ttl_seconds: float = Field(
+        default=60.0, gt=0.0, description="Age below which cached online features are served without a refresh."
+    )
+    feature_max_staleness_seconds: float = Field(
+        default=300.0, gt=0.0, description="Age beyond which cached online features are never served."
+    )
+    feature_cache_max_entries: int = Field(
+        default=100_000, ge=1, description="Maximum feature records held in the in-process feature cache."
+    )
     opensearch_host: str = Field(default="", description="Endpoint for the OpenSearch domain.")
     opensearch_index: str = Field(default="tickets", description="OpenSearch index storing ticket embeddings.")
+    classification_model_version: str = Field(
+        default="v1",
+        description="Version of a remote classifier for prediction cache keys; local artifacts use their fingerprint.",
+    )
+    resolution_time_model_version: str = Field(
+        default="v1",
+        description="Version of a remote regressor for prediction cache keys; local artifacts use their fingerprint.",
+    )
+    prediction_cache_enabled: bool = Field(
+        default=True, description="Cache classification and resolution-time predictions per normalized ticket."
+    )
+    prediction_cache_max_entries: int = Field(
+        default=10_000, ge=1, description="Maximum entries held in each in-process prediction cache."
+    )
+    prediction_cache_ttl_seconds: float = Field(
+        default=300.0, gt=0.0, description="Time-to-live of cached predictions in seconds."
+    )
+    prediction_cache_shared_path: str = Field(
+        default="", description="SQLite file backing the shared prediction cache tier; disabled when empty."
+    )
+    similarity_backend: Literal["none", "local"] = Field(
+        default="none", description="Similarity search backend; 'local' serves an in-process ANN index."
+    )
+    embedding_dim: int = Field(default=256, ge=8, description="Dimension of locally computed ticket embeddings.")
+    ann_nlist: int = Field(default=1024, ge=1, description="Number of inverted lists in the local ANN index.")
+    ann_nprobe: int = Field(default=16, ge=1, description="Inverted lists scanned per local ANN query.")
+    similarity_segment_path: str = Field(
+        default="", description="Vector segment file or embedding backfill directory mapped by the local backend."
+    )
+    similarity_rerank_candidates: int = Field(
+        default=64, ge=0, description="Quantised candidates re-scored in float32 per segment query."
+    )
+    similarity_retrieval: Literal["vector", "hybrid"] = Field(
+        default="vector", description="'hybrid' fuses BM25 over indexed tickets with vector search by reciprocal rank."
+    )
+    hybrid_candidates: int = Field(
+        default=50, ge=1, description="Candidates taken from each retriever before rank fusion."
+    )
+    rrf_k: float = Field(default=60.0, gt=0.0, description="Rank offset of reciprocal-rank fusion.")
+    near_duplicate_detection_enabled: bool = Field(
+        default=True, description="Answer resubmitted tickets from a MinHash/LSH index before the vector search."
+    )
+    near_duplicate_threshold: float = Field(
+        default=0.6, gt=0.0, le=1.0, description="Estimated word-shingle Jaccard similarity marking a duplicate."
+    )
+    near_duplicate_max_entries: int = Field(
+        default=200_000, ge=1, description="Most recently indexed tickets the near-duplicate index keeps."
+    )
     bedrock_model_id: str = Field(default="", description="Amazon Bedrock model identifier for RAG responses.")
+    llm_backend: Literal["none", "fake"] = Field(
+        default="none", description="LLM used for auto-resolution; 'fake' is a deterministic offline generator."
+    )
+    fake_llm_first_token_latency_ms: float = Field(
+        default=200.0, ge=0.0, description="Simulated time to first token of the fake LLM."
+    )
+    fake_llm_token_latency_ms: float = Field(
+        default=20.0, ge=0.0, description="Simulated delay between tokens of the fake LLM."
+    )
+    fake_llm_prefill_ms_per_1k_tokens: float = Field(
+        default=0.0, ge=0.0, description="Simulated extra time to first token per 1000 prompt tokens."
+    )
+    auto_resolution_grounding_top_k: int = Field(
+        default=3, ge=0, description="Similar tickets retrieved to ground each auto-resolution."
+    )
+    semantic_cache_enabled: bool = Field(
+        default=False, description="Reuse auto-resolutions of earlier tickets whose embedding is close enough."
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.92, ge=0.0, le=1.0, description="Minimum cosine similarity for a semantic cache hit."
+    )
+    semantic_cache_max_entries: int = Field(
+        default=10_000, ge=1, description="Maximum auto-resolutions kept in the semantic cache."
+    )
+    semantic_cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0.0, description="Lifetime of a semantic cache entry."
+    )
+    prompt_max_tokens: int = Field(
+        default=3000, ge=0, description="Token budget of auto-resolution prompts; 0 includes all grounding and history."
+    )
+    prompt_token_counter: Literal["auto", "tiktoken", "heuristic"] = Field(
+        default="auto", description="Token counter used to budget prompts; 'auto' uses tiktoken when installed."
+    )
     dynamodb_conversation_table: str = Field(
         default="", description="DynamoDB table storing conversation memory."
     )
+    conversation_backend: Literal["none", "local"] = Field(
+        default="none", description="Conversation memory backend; 'local' keeps history in memory with a disk log."
+    )
+    conversation_store_dir: str = Field(
+        default=".data/conversations", description="Directory holding the local conversation log and snapshots."
+    )
+    conversation_max_turns: int = Field(
+        default=200, ge=1, description="Most recent turns retained per ticket by the local conversation store."
+    )
+    conversation_max_age_hours: float = Field(
+        default=720.0, gt=0.0, description="Age after which conversation turns are dropped from the local store."
+    )
+    conversation_fsync_interval_ms: float = Field(
+        default=1000.0, gt=0.0, description="Interval at which the conversation log is fsynced in the background."
+    )
+    conversation_compaction_interval_s: float = Field(
+        default=300.0, gt=0.0, description="Minimum interval between conversation log compactions into snapshots."
+    )
     kinesis_stream_name: str = Field(
         default="", description="Kinesis/MSK stream name carrying CDC events."
     )
+    cdc_source: Literal["none", "file"] = Field(
+        default="none", description="Ticket change event source; 'file' tails a local JSON-lines event log."
+    )
+    cdc_event_log_path: str = Field(
+        default=".data/cdc/events.jsonl", description="JSON-lines event log tailed by the 'file' CDC source."
+    )
+    cdc_checkpoint_path: str = Field(
+        default=".data/cdc/checkpoint.json", description="File recording the last applied CDC offset."
+    )
+    cdc_batch_size: int = Field(
+        default=500, ge=1, description="Maximum change events applied to the index and feature store at once."
+    )
+    cdc_max_wait_ms: float = Field(
+        default=200.0, gt=0.0, description="Time the CDC consumer waits for new events before polling again."
+    )
+    cdc_max_attempts: int = Field(
+        default=10, ge=1, description="Attempts at applying a CDC batch before it is dead-lettered and skipped."
+    )
+    cdc_dead_letter_path: str = Field(
+        default=".data/cdc/dead_letter.jsonl", description="JSON-lines file receiving CDC batches that kept failing."
+    )
+    single_flight_enabled: bool = Field(
+        default=True, description="Share one service call between concurrent identical API requests."
+    )
+    admission_control_enabled: bool = Field(
+        default=True, description="Bound concurrent calls per service and shed load that cannot be served in time."
+    )
+    admission_initial_limit: int = Field(
+        default=32, ge=1, description="Concurrent calls admitted per service before the limit adapts."
+    )
+    admission_min_limit: int = Field(default=2, ge=1, description="Lowest concurrency limit the adaptation may reach.")
+    admission_max_limit: int = Field(
+        default=256, ge=1, description="Highest concurrency limit the adaptation may reach."
+    )
+    admission_latency_tolerance: float = Field(
+        default=2.0,
+        gt=1.0,
+        description="Latency over the no-load baseline, as a ratio, at which the concurrency limit backs off.",
+    )
+    admission_max_queue: int = Field(
+        default=64, ge=0, description="Calls per service allowed to wait for a slot; beyond this they get a 429."
+    )
+    admission_max_wait_ms: float = Field(
+        default=500.0,
+        gt=0.0,
+        description="Longest a call may wait for a slot; calls predicted or found to wait longer get a 503.",
+    )
+    request_timeout_ms: float = Field(
+        default=10000.0,
+        gt=0.0,
+        description="Deadline of each API request; clients may shorten it with X-Request-Timeout-Ms.",
+    )
+    upstream_resilience_enabled: bool = Field(
+        default=True,
+        description="Wrap model, vector index and LLM backends with timeouts, retries, hedging and circuit breakers.",
+    )
+    upstream_timeout_ms: float = Field(
+        default=2000.0, gt=0.0, description="Overall time budget of one classifier, regressor or vector call."
+    )
+    upstream_llm_timeout_ms: float = Field(
+        default=10000.0, gt=0.0, description="Time budget of an LLM completion, or of a stream's first token."
+    )
+    upstream_max_retries: int = Field(
+        default=1, ge=0, description="Retries of a transient remote upstream failure, subject to the retry budget."
+    )
+    upstream_hedging_enabled: bool = Field(
+        default=True,
+        description="Hedge remote upstream calls slower than the recent tail latency; in-process backends never hedge.",
+    )
+    upstream_hedge_quantile: float = Field(
+        default=0.95, gt=0.0, lt=1.0, description="Latency quantile after which a hedged attempt is sent."
+    )
+    upstream_retry_budget_ratio: float = Field(
+        default=0.1, ge=0.0, description="Retries and hedges allowed per upstream call, as a fraction of calls."
+    )
+    upstream_retry_budget_min_per_second: float = Field(
+        default=5.0, ge=0.0, description="Retries and hedges allowed per second regardless of traffic."
+    )
+    upstream_breaker_failure_ratio: float = Field(
+        default=0.5, gt=0.0, le=1.0, description="Failure ratio over recent calls that opens a circuit breaker."
+    )
+    upstream_breaker_min_calls: int = Field(
+        default=20, ge=1, description="Recent calls needed before a circuit breaker may open."
+    )
+    upstream_breaker_open_ms: float = Field(
+        default=5000.0, gt=0.0, description="Time an open circuit rejects calls before letting a probe through."
+    )
+    classification_batching_enabled: bool = Field(
+        default=True, description="Coalesce concurrent classification calls into batched model invocations."
+    )
+    classification_batch_max_size: int = Field(
+        default=32, ge=1, description="Maximum number of tickets dispatched in one classifier invocation."
+    )
+    classification_batch_max_wait_ms: float = Field(
+        default=5.0, ge=0.0, description="Maximum time a ticket waits for its batch to fill before dispatch."
+    )
+    analysis_classification_timeout_ms: float = Field(
+        default=300.0, gt=0.0, description="Deadline of the classification stage in /v1/tickets/analyze."
+    )
+    analysis_resolution_time_timeout_ms: float = Field(
+        default=300.0, gt=0.0, description="Deadline of the resolution-time stage in /v1/tickets/analyze."
+    )
+    analysis_similarity_timeout_ms: float = Field(
+        default=200.0, gt=0.0, description="Deadline of the similarity stage in /v1/tickets/analyze."
+    )
+    analysis_history_timeout_ms: float = Field(
+        default=100.0, gt=0.0, description="Deadline of the conversation history stage in /v1/tickets/analyze."
+    )
+    analysis_auto_resolution_timeout_ms: float = Field(
+        default=5000.0, gt=0.0, description="Deadline of the auto-resolution stage in /v1/tickets/analyze."
+    )
+    analysis_features_timeout_ms: float = Field(
+        default=50.0, gt=0.0, description="Deadline of the customer feature lookup in /v1/tickets/analyze."
+    )
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,37 @@
+"""Per-request deadlines carried in a context variable down to upstream calls."""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, or ``None`` outside of one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def bounded_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Shorten ``timeout`` so it never outlives the current request's deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[float]:
+    """Run the block with a deadline ``timeout`` seconds from now, never later than an enclosing one."""
+    deadline = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
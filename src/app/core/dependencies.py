@@ -1,8 +1,14 @@
 """Dependency providers for FastAPI routes."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from functools import lru_cache
 
+from cdc.consumer import CDCConsumer
+from cdc.sinks import ChangeSink, ResolutionCacheSink, SimilarityIndexSink, TicketFeatureSink
+from cdc.sources import FileCheckpointStore, FileDeadLetterLog, FileEventSource
+from domain.repositories.conversation_store import LocalConversationStore
 from domain.services.interfaces import (
     AutoResolutionService,
     ClassificationService,
@@ -10,8 +16,78 @@ from domain.services.interfaces import (
     ResolutionTimeService,
     SimilarityService,
 )
+from feature_store.client import FeatureStoreClient, customer_feature_client
+from feature_store.definitions.customer import CustomerFeatures
+from feature_store.online_store import OnlineFeatureStore, SQLiteOnlineFeatureStore
+from ml.models.linear import LinearModel
+from ml.monitoring.drift import DriftBaseline, DriftMonitor
+from rag.embeddings import HashingEmbedder
+from rag.ingestion import open_segments
+from rag.lexical_index import BM25Index
+from rag.near_duplicates import NearDuplicateIndex
+from rag.llm import FakeLLM, LLMClient
+from rag.prompt_templates.builder import PromptBuilder
+from rag.prompt_templates.tokens import token_counter
+from rag.vector_index import IVFIndex
 
-
+from src.app.core.config import settings
+from src.app.core.metrics import (
+    watch_admission,
+    watch_cache,
+    watch_drift,
+    watch_queue,
+    watch_single_flight,
+    watch_upstream,
+)
+from src.app.services.admission import (
+    AdmissionControlledAutoResolutionService,
+    AdmissionControlledClassificationService,
+    AdmissionControlledConversationService,
+    AdmissionControlledResolutionTimeService,
+    AdmissionControlledSimilarityService,
+    AdmissionController,
+    AIMDLimit,
+)
+from src.app.services.analysis import StageTimeouts, TicketAnalysisPipeline
+from src.app.services.auto_resolution import RAGAutoResolutionService
+from src.app.services.batching import MicroBatchingClassificationService
+from src.app.services.cache import (
+    CachedClassificationService,
+    CachedResolutionTimeService,
+    SQLiteCacheBackend,
+    classification_cache,
+    resolution_time_cache,
+)
+from src.app.services.instrumented import (
+    InstrumentedAutoResolutionService,
+    InstrumentedClassificationService,
+    InstrumentedConversationService,
+    InstrumentedResolutionTimeService,
+    InstrumentedSimilarityService,
+)
+from src.app.services.local_models import (
+    LocalClassificationService,
+    LocalModelRuntime,
+    LocalResolutionTimeService,
+)
+from src.app.services.resilience import (
+    CircuitBreaker,
+    ResilientClassificationService,
+    ResilientLLMClient,
+    ResilientResolutionTimeService,
+    ResilientSimilarityService,
+    ResilientUpstream,
+    RetryBudget,
+)
+from src.app.services.semantic_cache import SemanticCachedAutoResolutionService, SemanticResponseCache
+from src.app.services.similarity import LocalSimilarityService
+from src.app.services.single_flight import (
+    SingleFlight,
+    SingleFlightAutoResolutionService,
+    SingleFlightClassificationService,
+    SingleFlightResolutionTimeService,
+    SingleFlightSimilarityService,
+)
 from src.app.services.stubs import (
     NotConfiguredAutoResolutionService,
     NotConfiguredClassificationService,
@@ -21,51 +97,426 @@ from src.app.services.stubs import (
 )
 
 
+def _shared_prediction_cache(namespace: str) -> SQLiteCacheBackend | None:
+    if not settings.prediction_cache_shared_path:
+        return None
+    return SQLiteCacheBackend(settings.prediction_cache_shared_path, namespace=namespace)
+
+
+def _watch_prediction_cache(name: str, service: CachedClassificationService | CachedResolutionTimeService) -> None:
+    stats = service.cache.stats
+    watch_cache(name, hits=lambda: stats.local_hits + stats.shared_hits, misses=lambda: stats.misses)
+
+
+@lru_cache(maxsize=1)
+def _local_inference_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.local_inference_threads, thread_name_prefix="local-inference")
+
+
+@lru_cache(maxsize=None)
+def _drift_monitor(name: str, baseline_path: str) -> DriftMonitor | None:
+    if not baseline_path:
+        return None
+    monitor = DriftMonitor(
+        DriftBaseline.load(baseline_path),
+        window_seconds=settings.drift_window_seconds,
+        buckets=settings.drift_window_buckets,
+        flush_interval=settings.drift_flush_interval_ms / 1000,
+        min_rows=settings.drift_min_rows,
+    )
+    watch_drift(name, monitor)
+    return monitor
+
+
+@lru_cache(maxsize=None)
+def _upstream(name: str, timeout_ms: float, in_process: bool = False) -> ResilientUpstream:
+    """Resilience policy of one backend.
+
+    An in-process backend only gets the deadline and the circuit breaker: its
+    attempts run on a shared thread pool and cannot be cancelled, so a hedge
+    or retry would duplicate CPU-bound work exactly when that pool is
+    saturated (and re-run a whole micro-batch, feeding the drift monitor twice).
+    """
+    upstream = ResilientUpstream(
+        name,
+        breaker=CircuitBreaker(
+            failure_ratio=settings.upstream_breaker_failure_ratio,
+            min_calls=settings.upstream_breaker_min_calls,
+            open_seconds=settings.upstream_breaker_open_ms / 1000,
+        ),
+        budget=RetryBudget(
+            ratio=settings.upstream_retry_budget_ratio,
+            min_per_second=settings.upstream_retry_budget_min_per_second,
+        ),
+        timeout_seconds=timeout_ms / 1000,
+        max_retries=0 if in_process else settings.upstream_max_retries,
+        hedge=settings.upstream_hedging_enabled and not in_process,
+        hedge_quantile=settings.upstream_hedge_quantile,
+    )
+    watch_upstream(upstream)
+    return upstream
+
+
 @lru_cache(maxsize=1)
 def _classification_service() -> ClassificationService:
-    return NotConfiguredClassificationService()
+    service: ClassificationService = NotConfiguredClassificationService()
+    model_version = settings.classification_model_version
+    if settings.classification_backend == "local":
+        model = LinearModel.load(settings.classification_model_path, expected_kind="classifier")
+        model_version = model.fingerprint
+        service = LocalClassificationService(
+            LocalModelRuntime(
+                model,
+                _local_inference_executor(),
+                drift_monitor=_drift_monitor("classification", settings.classification_drift_baseline_path),
+            )
+        )
+        if settings.upstream_resilience_enabled:
+            upstream = _upstream("classifier", settings.upstream_timeout_ms, in_process=True)
+            service = ResilientClassificationService(service, upstream)
+    if settings.classification_batching_enabled:
+        batching = MicroBatchingClassificationService(
+            service,
+            max_batch_size=settings.classification_batch_max_size,
+            max_wait_ms=settings.classification_batch_max_wait_ms,
+        )
+        watch_queue("classification_batch", lambda: batching.queue_depth)
+        service = batching
+    if settings.prediction_cache_enabled:
+        service = CachedClassificationService(
+            service,
+            cache=classification_cache(
+                settings.prediction_cache_max_entries,
+                settings.prediction_cache_ttl_seconds,
+                shared=_shared_prediction_cache(CachedClassificationService.namespace),
+            ),
+            model_version=model_version,
+        )
+        _watch_prediction_cache("classification", service)
+    return service
 
 
 @lru_cache(maxsize=1)
 def _resolution_time_service() -> ResolutionTimeService:
-    return NotConfiguredResolutionTimeService()
+    service: ResolutionTimeService = NotConfiguredResolutionTimeService()
+    model_version = settings.resolution_time_model_version
+    if settings.resolution_time_backend == "local":
+        model = LinearModel.load(settings.resolution_time_model_path, expected_kind="regressor")
+        model_version = model.fingerprint
+        service = LocalResolutionTimeService(
+            LocalModelRuntime(
+                model,
+                _local_inference_executor(),
+                drift_monitor=_drift_monitor("resolution_time", settings.resolution_time_drift_baseline_path),
+            )
+        )
+        if settings.upstream_resilience_enabled:
+            upstream = _upstream("regressor", settings.upstream_timeout_ms, in_process=True)
+            service = ResilientResolutionTimeService(service, upstream)
+    if settings.prediction_cache_enabled:
+        service = CachedResolutionTimeService(
+            service,
+            cache=resolution_time_cache(
+                settings.prediction_cache_max_entries,
+                settings.prediction_cache_ttl_seconds,
+                shared=_shared_prediction_cache(CachedResolutionTimeService.namespace),
+            ),
+            model_version=model_version,
+        )
+        _watch_prediction_cache("resolution_time", service)
+    return service
 
 
 @lru_cache(maxsize=1)
 def _similarity_service() -> SimilarityService:
+    if settings.similarity_backend == "local":
+        near_duplicates = None
+        if settings.near_duplicate_detection_enabled:
+            near_duplicates = NearDuplicateIndex(
+                threshold=settings.near_duplicate_threshold, max_entries=settings.near_duplicate_max_entries
+            )
+            stats = near_duplicates.stats
+            watch_cache("near_duplicates", hits=lambda: stats.exact + stats.near, misses=lambda: stats.misses)
+        return LocalSimilarityService(
+            embedder=HashingEmbedder(dim=settings.embedding_dim),
+            index=IVFIndex(dim=settings.embedding_dim, nlist=settings.ann_nlist, nprobe=settings.ann_nprobe),
+            segments=open_segments(settings.similarity_segment_path) if settings.similarity_segment_path else (),
+            segment_nprobe=settings.ann_nprobe,
+            segment_rerank_candidates=settings.similarity_rerank_candidates,
+            lexical=BM25Index() if settings.similarity_retrieval == "hybrid" else None,
+            hybrid_candidates=settings.hybrid_candidates,
+            rrf_k=settings.rrf_k,
+            near_duplicates=near_duplicates,
+        )
     return NotConfiguredSimilarityService()
 
 
+@lru_cache(maxsize=1)
+def _similarity_client() -> SimilarityService:
+    """Similarity service as queried by routes, the pipeline and RAG grounding.
+
+    ``_similarity_service()`` stays the bare index so the CDC consumer can write to it.
+    """
+    service = _similarity_service()
+    if settings.upstream_resilience_enabled and isinstance(service, LocalSimilarityService):
+        return ResilientSimilarityService(service, _upstream("vector", settings.upstream_timeout_ms, in_process=True))
+    return service
+
+
 @lru_cache(maxsize=1)
 def _auto_resolution_service() -> AutoResolutionService:
-    return NotConfiguredAutoResolutionService()
+    service: AutoResolutionService = NotConfiguredAutoResolutionService()
+    if settings.llm_backend == "fake":
+        llm: LLMClient = FakeLLM(
+            first_token_latency_ms=settings.fake_llm_first_token_latency_ms,
+            token_latency_ms=settings.fake_llm_token_latency_ms,
+            prefill_ms_per_1k_tokens=settings.fake_llm_prefill_ms_per_1k_tokens,
+        )
+        if settings.upstream_resilience_enabled:
+            llm = ResilientLLMClient(llm, _upstream("llm", settings.upstream_llm_timeout_ms))
+        service = RAGAutoResolutionService(
+            similarity=_similarity_client(),
+            llm=llm,
+            grounding_top_k=settings.auto_resolution_grounding_top_k,
+            prompt_builder=(
+                PromptBuilder(settings.prompt_max_tokens, token_counter(settings.prompt_token_counter))
+                if settings.prompt_max_tokens
+                else None
+            ),
+        )
+    if settings.semantic_cache_enabled and settings.llm_backend != "none":
+        cache = SemanticResponseCache(
+            HashingEmbedder(dim=settings.embedding_dim),
+            threshold=settings.semantic_cache_threshold,
+            max_entries=settings.semantic_cache_max_entries,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+        )
+        watch_cache("semantic_resolution", hits=lambda: cache.stats.hits, misses=lambda: cache.stats.misses)
+        service = SemanticCachedAutoResolutionService(service, cache)
+    return service
 
 
 @lru_cache(maxsize=1)
 def _conversation_service() -> ConversationService:
+    if settings.conversation_backend == "local":
+        return LocalConversationStore(
+            settings.conversation_store_dir,
+            max_turns_per_ticket=settings.conversation_max_turns,
+            max_age=timedelta(hours=settings.conversation_max_age_hours),
+            fsync_interval_seconds=settings.conversation_fsync_interval_ms / 1000,
+            compaction_interval_seconds=settings.conversation_compaction_interval_s,
+        )
     return NotConfiguredConversationService()
 
 
+@lru_cache(maxsize=1)
+def _online_feature_store() -> OnlineFeatureStore | None:
+    if settings.feature_store_backend == "sqlite":
+        return SQLiteOnlineFeatureStore(settings.feature_store_sqlite_path)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _customer_feature_client() -> FeatureStoreClient[CustomerFeatures] | None:
+    store = _online_feature_store()
+    if store is not None:
+        return customer_feature_client(
+            store,
+            feature_group=settings.feature_store_customer_group or "customer",
+            ttl_seconds=settings.feature_cache_ttl_seconds,
+            max_staleness_seconds=max(settings.feature_max_staleness_seconds, settings.feature_cache_ttl_seconds),
+            max_entries=settings.feature_cache_max_entries,
+        )
+    return None
+
+
+@lru_cache(maxsize=1)
+def _ticket_analysis_pipeline() -> TicketAnalysisPipeline:
+    return TicketAnalysisPipeline(
+        classification=_admitted_classification_service(),
+        resolution_time=_admitted_resolution_time_service(),
+        similarity=_admitted_similarity_service(),
+        conversation=_admitted_conversation_service(),
+        auto_resolution=_admitted_auto_resolution_service(),
+        timeouts=StageTimeouts(
+            classification=settings.analysis_classification_timeout_ms / 1000,
+            resolution_time=settings.analysis_resolution_time_timeout_ms / 1000,
+            similarity=settings.analysis_similarity_timeout_ms / 1000,
+            history=settings.analysis_history_timeout_ms / 1000,
+            auto_resolution=settings.analysis_auto_resolution_timeout_ms / 1000,
+            features=settings.analysis_features_timeout_ms / 1000,
+        ),
+        customer_features=_customer_feature_client(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _cdc_consumer() -> CDCConsumer | None:
+    if settings.cdc_source == "none":
+        return None
+    sinks: list[ChangeSink] = []
+    similarity = _similarity_service()
+    if isinstance(similarity, LocalSimilarityService):
+        sinks.append(SimilarityIndexSink(similarity))
+    auto_resolution = _auto_resolution_service()
+    if isinstance(auto_resolution, SemanticCachedAutoResolutionService):
+        sinks.append(ResolutionCacheSink(auto_resolution.cache))
+    store = _online_feature_store()
+    if store is not None:
+        sinks.append(TicketFeatureSink(store, settings.feature_store_ticket_group or "ticket"))
+    return CDCConsumer(
+        source=FileEventSource(settings.cdc_event_log_path),
+        sinks=sinks,
+        checkpoint=FileCheckpointStore(settings.cdc_checkpoint_path),
+        batch_size=settings.cdc_batch_size,
+        max_wait_seconds=settings.cdc_max_wait_ms / 1000,
+        max_attempts=settings.cdc_max_attempts,
+        dead_letter=FileDeadLetterLog(settings.cdc_dead_letter_path) if settings.cdc_dead_letter_path else None,
+    )
+
+
+def _single_flight(name: str) -> SingleFlight:
+    flights = SingleFlight()
+    watch_single_flight(name, leaders=lambda: flights.stats.leaders, joined=lambda: flights.stats.joined)
+    return flights
+
+
+def _admission(name: str) -> AdmissionController:
+    limit = AIMDLimit(
+        initial=settings.admission_initial_limit,
+        min_limit=settings.admission_min_limit,
+        max_limit=settings.admission_max_limit,
+        tolerance=settings.admission_latency_tolerance,
+    )
+    controller = AdmissionController(
+        name,
+        limit,
+        max_queue=settings.admission_max_queue,
+        max_wait_seconds=settings.admission_max_wait_ms / 1000,
+    )
+    watch_admission(name, controller)
+    return controller
+
+
+# Routes and the analysis pipeline share services behind admission control and
+# request coalescing, so analysis traffic counts against the same limits as the
+# per-service routes. Only routes add per-call latency metrics; the pipeline
+# records its own stage timings. The CDC consumer writes to the bare services.
+# Coalescing sits outside admission so callers joining a running call do not
+# take a slot of their own.
+@lru_cache(maxsize=1)
+def _admitted_classification_service() -> ClassificationService:
+    service = _classification_service()
+    if settings.admission_control_enabled:
+        service = AdmissionControlledClassificationService(service, _admission("classification"))
+    if settings.single_flight_enabled:
+        service = SingleFlightClassificationService(service, _single_flight("classification"))
+    return service
+
+
+@lru_cache(maxsize=1)
+def _admitted_resolution_time_service() -> ResolutionTimeService:
+    service = _resolution_time_service()
+    if settings.admission_control_enabled:
+        service = AdmissionControlledResolutionTimeService(service, _admission("resolution_time"))
+    if settings.single_flight_enabled:
+        service = SingleFlightResolutionTimeService(service, _single_flight("resolution_time"))
+    return service
+
+
+@lru_cache(maxsize=1)
+def _admitted_similarity_service() -> SimilarityService:
+    service = _similarity_client()
+    if settings.admission_control_enabled:
+        service = AdmissionControlledSimilarityService(service, _admission("similarity"))
+    if settings.single_flight_enabled:
+        service = SingleFlightSimilarityService(service, _single_flight("similarity"))
+    return service
+
+
+@lru_cache(maxsize=1)
+def _admitted_auto_resolution_service() -> AutoResolutionService:
+    service = _auto_resolution_service()
+    if settings.admission_control_enabled:
+        service = AdmissionControlledAutoResolutionService(service, _admission("auto_resolution"))
+    if settings.single_flight_enabled:
+        service = SingleFlightAutoResolutionService(service, _single_flight("auto_resolution"))
+    return service
+
+
+@lru_cache(maxsize=1)
+def _admitted_conversation_service() -> ConversationService:
+    service = _conversation_service()
+    if settings.admission_control_enabled:
+        service = AdmissionControlledConversationService(service, _admission("conversation"))
+    return service
+
+
+@lru_cache(maxsize=1)
+def _served_classification_service() -> ClassificationService:
+    service = _admitted_classification_service()
+    return InstrumentedClassificationService(service) if settings.metrics_enabled else service
+
+
+@lru_cache(maxsize=1)
+def _served_resolution_time_service() -> ResolutionTimeService:
+    service = _admitted_resolution_time_service()
+    return InstrumentedResolutionTimeService(service) if settings.metrics_enabled else service
+
+
+@lru_cache(maxsize=1)
+def _served_similarity_service() -> SimilarityService:
+    service = _admitted_similarity_service()
+    return InstrumentedSimilarityService(service) if settings.metrics_enabled else service
+
+
+@lru_cache(maxsize=1)
+def _served_auto_resolution_service() -> AutoResolutionService:
+    service = _admitted_auto_resolution_service()
+    return InstrumentedAutoResolutionService(service) if settings.metrics_enabled else service
+
+
+@lru_cache(maxsize=1)
+def _served_conversation_service() -> ConversationService:
+    service = _admitted_conversation_service()
+    return InstrumentedConversationService(service) if settings.metrics_enabled else service
+
+
 def get_classification_service() -> ClassificationService:
     """Return the classification service implementation."""
-    return _classification_service()
+    return _served_classification_service()
 
 
 def get_resolution_time_service() -> ResolutionTimeService:
     """Return the resolution time regression service."""
-    return _resolution_time_service()
+    return _served_resolution_time_service()
 
 
 def get_similarity_service() -> SimilarityService:
     """Return the similarity search service."""
-    return _similarity_service()
+    return _served_similarity_service()
 
 
 def get_auto_resolution_service() -> AutoResolutionService:
     """Return the auto-resolution service."""
-    return _auto_resolution_service()
+    return _served_auto_resolution_service()
 
 
 def get_conversation_service() -> ConversationService:
     """Return the conversation memory service."""
-    return _conversation_service()
+    return _served_conversation_service()
+
+
+def get_ticket_analysis_pipeline() -> TicketAnalysisPipeline:
+    """Return the end-to-end ticket analysis pipeline."""
+    return _ticket_analysis_pipeline()
+
+
+def get_customer_feature_client() -> FeatureStoreClient[CustomerFeatures] | None:
+    """Return the customer online feature client, or ``None`` when no store is configured."""
+    return _customer_feature_client()
+
+
+def get_cdc_consumer() -> CDCConsumer | None:
+    """Return the change event consumer, or ``None`` when no CDC source is configured."""
+    return _cdc_consumer()
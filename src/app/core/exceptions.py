@@ -1,21 +1,55 @@
 """Custom exception hierarchy providing consistent error responses."""
 from __future__ import annotations
 
+import math
+from typing import Dict, Optional
+
 from fastapi import HTTPException, status
 
 
 class AppException(HTTPException):
     """Base application exception with structured metadata."""
 
-    def __init__(self, detail: str, status_code: int = status.HTTP_400_BAD_REQUEST) -> None:
-        super().__init__(status_code=status_code, detail=detail)
+    def __init__(
+        self,
+        detail: str,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 
 class UpstreamServiceException(AppException):
     """Raised when an upstream dependency returns an error."""
 
+    def __init__(
+        self,
+        service: str,
+        detail: str,
+        status_code: int = status.HTTP_502_BAD_GATEWAY,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        super().__init__(detail=f"{service} failure: {detail}", status_code=status_code, headers=headers)
+
+
+class UpstreamTimeoutException(UpstreamServiceException):
+    """Raised when an upstream dependency does not answer within the call's or the request's deadline."""
+
     def __init__(self, service: str, detail: str) -> None:
-        super().__init__(detail=f"{service} failure: {detail}", status_code=status.HTTP_502_BAD_GATEWAY)
+        super().__init__(service, detail, status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+
+
+class CircuitOpenException(UpstreamServiceException):
+    """Raised without calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, service: str, retry_after: float) -> None:
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            service,
+            "circuit open after repeated failures.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(self.retry_after)},
+        )
 
 
 class ResourceNotFoundException(AppException):
@@ -33,3 +67,21 @@ class ValidationException(AppException):
 
     def __init__(self, detail: str) -> None:
         super().__init__(detail=detail, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+class OverloadedException(AppException):
+    """Raised when a request is shed instead of queued; clients should retry after ``retry_after`` seconds."""
+
+    def __init__(
+        self,
+        service: str,
+        detail: str,
+        retry_after: float,
+        status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+    ) -> None:
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            detail=f"{service} overloaded: {detail}",
+            status_code=status_code,
+            headers={"Retry-After": str(self.retry_after)},
+        )
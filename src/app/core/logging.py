@@ -1,58 +1,126 @@
-"""Logging configuration utilities for structured JSON logs."""
+"""Logging configuration utilities for structured JSON logs.
+
+Records are handed to a bounded in-memory queue and serialized and written by
+a background listener thread, so a request only pays for building the log
+record. When the queue is full, records are dropped and counted rather than
+blocking the event loop on stdout.
+"""
 from __future__ import annotations
 
+import copy
 import json
 import logging
-from logging.config import dictConfig
-from typing import Any, Dict
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
 from .config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+_TRACEBACKS = logging.Formatter()
+
+
+def dumps(payload: Dict[str, Any]) -> str:
+    """Serialize a log payload, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return _ENCODER.encode(payload)
+
 
 class JsonLogFormatter(logging.Formatter):
     """Serialize log records into structured JSON."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_text}.{int((created - second) * 1000):03d}Z"
+
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
         payload = {
-            "timestamp": self.formatTime(record, datefmt="%Y-%m-%dT%H:%M:%S.%fZ"),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
         if record.stack_info:
             payload["stack"] = self.formatStack(record.stack_info)
         if hasattr(record, "extra") and isinstance(record.extra, dict):
             payload.update(record.extra)
-        return json.dumps(payload, ensure_ascii=False)
+        return dumps(payload)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records without formatting them so serialization runs on the listener thread."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-style arguments and the traceback now: callers may mutate the arguments once
+        # logging returns, and a queued traceback would keep every frame and its locals alive.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACKS.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
 
 
 def configure_logging() -> None:
     """Configure root logging handlers using JSON formatting."""
-    log_level = settings.log_level.upper()
-    dictConfig(
-        {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "formatters": {
-                "json": {
-                    "()": JsonLogFormatter,
-                }
-            },
-            "handlers": {
-                "stdout": {
-                    "class": "logging.StreamHandler",
-                    "formatter": "json",
-                    "stream": "ext://sys.stdout",
-                }
-            },
-            "root": {
-                "handlers": ["stdout"],
-                "level": log_level,
-            },
-        }
-    )
+    global _listener
+    shutdown_logging()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonLogFormatter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(settings.log_level.upper())
+    if settings.log_queue_size > 0:
+        handler = DeferredQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(handler)
+    else:
+        root.addHandler(stream)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
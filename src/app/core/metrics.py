@@ -0,0 +1,142 @@
+"""Metric families recorded by the API and its services, all registered in ``REGISTRY``."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from observability.metrics import LATENCY_BUCKETS, REGISTRY, SIZE_BUCKETS, CallbackCounter
+from prometheus_client import Gauge, Histogram
+
+if TYPE_CHECKING:
+    from ml.monitoring.drift import DriftMonitor
+
+    from src.app.services.admission import AdmissionController
+    from src.app.services.resilience import ResilientUpstream
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response body completed.",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled.", registry=REGISTRY
+)
+SERVICE_CALL_DURATION = Histogram(
+    "service_call_duration_seconds",
+    "Latency of calls into domain services by service, method and outcome.",
+    ("service", "method", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+ANALYSIS_STAGE_DURATION = Histogram(
+    "analysis_stage_duration_seconds",
+    "Latency of each ticket analysis pipeline stage by final status.",
+    ("stage", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+BATCH_SIZE = Histogram(
+    "batch_size", "Items per dispatched micro-batch.", ("component",), buckets=SIZE_BUCKETS, registry=REGISTRY
+)
+QUEUE_DEPTH = Gauge("queue_depth", "Items waiting in an in-process queue.", ("component",), registry=REGISTRY)
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Hits over lookups since start.", ("cache",), registry=REGISTRY)
+CACHE_LOOKUPS = CallbackCounter("cache_lookups_total", "Cache lookups by result.", ("cache", "result"))
+SINGLE_FLIGHT_CALLS = CallbackCounter(
+    "single_flight_calls_total",
+    "Calls that started a shared service call (leader) or waited on one already running (joined).",
+    ("service", "role"),
+)
+ADMISSION_CONCURRENCY = Gauge(
+    "admission_concurrency",
+    "Adaptive concurrency limit of a service and the calls it is currently running.",
+    ("service", "kind"),
+    registry=REGISTRY,
+)
+ADMISSION_REJECTIONS = CallbackCounter(
+    "admission_rejections_total",
+    "Calls shed by admission control, by reason (queue_full, predicted_wait, timed_out).",
+    ("service", "reason"),
+)
+UPSTREAM_CIRCUIT_OPEN = Gauge(
+    "upstream_circuit_open",
+    "1 while an upstream's circuit breaker rejects calls, else 0.",
+    ("upstream",),
+    registry=REGISTRY,
+)
+UPSTREAM_EVENTS = CallbackCounter(
+    "upstream_events_total",
+    "Resilience events per upstream (hedge, hedge_win, retry, budget_exhausted, short_circuited, timeout).",
+    ("upstream", "event"),
+)
+
+MODEL_DRIFT = Gauge(
+    "model_drift",
+    "PSI and binned KS of live model inputs and outputs against the training baseline over the drift window.",
+    ("model", "feature", "statistic"),
+    registry=REGISTRY,
+)
+MODEL_DRIFT_WINDOW_ROWS = Gauge(
+    "model_drift_window_rows", "Predictions in the drift window, and those not yet folded in.",
+    ("model", "kind"),
+    registry=REGISTRY,
+)
+MODEL_DRIFT_DROPPED = CallbackCounter(
+    "model_drift_dropped_total", "Predictions not recorded because the drift monitor fell behind.", ("model",)
+)
+
+
+def watch_cache(name: str, hits: Callable[[], float], misses: Callable[[], float]) -> None:
+    """Expose a cache's own hit and miss counters, read at scrape time."""
+    CACHE_LOOKUPS.labels(name, "hit").set_function(hits)
+    CACHE_LOOKUPS.labels(name, "miss").set_function(misses)
+
+    def ratio() -> float:
+        total = hits() + misses()
+        return hits() / total if total else 0.0
+
+    CACHE_HIT_RATIO.labels(name).set_function(ratio)
+
+
+def watch_queue(name: str, depth: Callable[[], float]) -> None:
+    QUEUE_DEPTH.labels(name).set_function(depth)
+
+
+def watch_single_flight(name: str, leaders: Callable[[], float], joined: Callable[[], float]) -> None:
+    SINGLE_FLIGHT_CALLS.labels(name, "leader").set_function(leaders)
+    SINGLE_FLIGHT_CALLS.labels(name, "joined").set_function(joined)
+
+
+def watch_admission(name: str, controller: "AdmissionController") -> None:
+    stats = controller.stats
+    ADMISSION_CONCURRENCY.labels(name, "limit").set_function(lambda: controller.limit.limit)
+    ADMISSION_CONCURRENCY.labels(name, "in_flight").set_function(lambda: controller.in_flight)
+    ADMISSION_REJECTIONS.labels(name, "queue_full").set_function(lambda: stats.rejected_queue_full)
+    ADMISSION_REJECTIONS.labels(name, "predicted_wait").set_function(lambda: stats.shed_predicted_wait)
+    ADMISSION_REJECTIONS.labels(name, "timed_out").set_function(lambda: stats.timed_out)
+    watch_queue(f"admission_{name}", lambda: controller.queue_depth)
+
+
+def watch_upstream(upstream: "ResilientUpstream") -> None:
+    name, stats = upstream.name, upstream.stats
+    UPSTREAM_CIRCUIT_OPEN.labels(name).set_function(lambda: float(upstream.breaker.state.value == "open"))
+    UPSTREAM_EVENTS.labels(name, "hedge").set_function(lambda: stats.hedges)
+    UPSTREAM_EVENTS.labels(name, "hedge_win").set_function(lambda: stats.hedge_wins)
+    UPSTREAM_EVENTS.labels(name, "retry").set_function(lambda: stats.retries)
+    UPSTREAM_EVENTS.labels(name, "budget_exhausted").set_function(lambda: stats.budget_exhausted)
+    UPSTREAM_EVENTS.labels(name, "short_circuited").set_function(lambda: stats.short_circuited)
+    UPSTREAM_EVENTS.labels(name, "timeout").set_function(lambda: stats.timeouts)
+
+
+def watch_drift(name: str, monitor: "DriftMonitor") -> None:
+    """Expose the monitor's latest report; scrapes never fold or recompute anything."""
+    for index, baseline in enumerate(monitor.baseline.features.values()):
+        feature = baseline.feature.name
+        MODEL_DRIFT.labels(name, feature, "psi").set_function(lambda i=index: monitor.report().features[i].psi)
+        if not baseline.feature.categories:
+            MODEL_DRIFT.labels(name, feature, "ks").set_function(
+                lambda i=index: monitor.report().features[i].ks or 0.0
+            )
+    MODEL_DRIFT_WINDOW_ROWS.labels(name, "window").set_function(lambda: monitor.report().rows)
+    MODEL_DRIFT_WINDOW_ROWS.labels(name, "pending").set_function(lambda: monitor.report().pending)
+    MODEL_DRIFT_DROPPED.labels(name).set_function(lambda: monitor.report().dropped)
@@ -1,33 +1,126 @@
 """Shared FastAPI middleware implementations."""
 from __future__ import annotations
 
+import random
 import time
-from typing import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .deadlines import deadline_scope
 from .logging import get_logger
+from .metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
 
 logger = get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Emit structured logs for each incoming request."""
+class RequestLoggingMiddleware:
+    """Emit structured logs for each incoming request.
 
-    async def dispatch(self, request: Request, call_next: Callable):  # type: ignore[override]
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware``, which runs
+    every request in an extra task and re-streams the response body. Failed
+    and slow requests are always logged; fast successful ones are sampled at
+    ``success_sample_rate`` and carry the rate so counts can be scaled back.
+    """
+
+    def __init__(self, app: ASGIApp, success_sample_rate: float = 1.0, slow_request_ms: float = 1000.0) -> None:
+        self.app = app
+        self._sample_rate = success_sample_rate
+        self._slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         start_time = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start_time) * 1000
-        logger.info(
-            "request_completed",
-            extra={
-                "extra": {
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            always = status_code >= 400 or duration_ms >= self._slow_request_ms or self._sample_rate >= 1.0
+            if always or random.random() < self._sample_rate:
+                fields = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
                     "duration_ms": round(duration_ms, 2),
                 }
-            },
-        )
-        return response
+                if not always:
+                    fields["sample_rate"] = self._sample_rate
+                logger.info("request_completed", extra={"extra": fields})
+
+
+class MetricsMiddleware:
+    """Record request latency per route template and the number of requests in flight.
+
+    Implemented as plain ASGI so it adds no task or stream wrapping; routes are
+    labelled by their path template, and unmatched paths share one label so
+    arbitrary URLs cannot grow the series count.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+
+class DeadlineMiddleware:
+    """Give every request a deadline that upstream calls shorten their timeouts to.
+
+    Clients may ask for a tighter budget with the ``X-Request-Timeout-Ms``
+    header; it is capped at ``default_timeout_ms`` so a client cannot make the
+    service hold resources longer than configured.
+    """
+
+    header = b"x-request-timeout-ms"
+
+    def __init__(self, app: ASGIApp, default_timeout_ms: float) -> None:
+        self.app = app
+        self._default_timeout_ms = default_timeout_ms
+
+    def _timeout_ms(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    return min(requested, self._default_timeout_ms)
+                break
+        return self._default_timeout_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self._timeout_ms(scope) / 1000):
+            await self.app(scope, receive, send)
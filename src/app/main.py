@@ -1,28 +1,64 @@
 """FastAPI entrypoint wiring API routers and middleware."""
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api import auto_resolution, classification, conversation, resolution_time, similarity
+from .api import analysis, auto_resolution, classification, conversation, metrics, resolution_time, similarity
 from .core.config import settings
-from .core.logging import configure_logging, get_logger
-from .core.middleware import RequestLoggingMiddleware
+from .core.dependencies import (
+    get_cdc_consumer,
+    get_classification_service,
+    get_conversation_service,
+    get_resolution_time_service,
+    get_similarity_service,
+)
+from .core.logging import configure_logging, get_logger, shutdown_logging
+from .core.middleware import DeadlineMiddleware, MetricsMiddleware, RequestLoggingMiddleware
 
 logger = get_logger(__name__)
 
 
+def _log_cdc_exit(task: "asyncio.Task[None]") -> None:
+    # Index and feature updates stop with the consumer; make that loud rather than silent.
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("cdc_consumer_crashed", exc_info=error)
+
+
 @asynccontextmanager
-def lifespan(app: FastAPI):  # type: ignore[override]
+async def lifespan(app: FastAPI):  # type: ignore[override]
     configure_logging()
     logger.info(
         "application_startup",
         extra={"extra": {"environment": settings.environment, "version": settings.version}},
     )
+    # Open stateful backends eagerly so model artifacts are loaded, segments are
+    # mapped and conversation logs are replayed before traffic arrives.
+    get_classification_service()
+    get_resolution_time_service()
+    get_similarity_service()
+    conversation_service = get_conversation_service()
+    # The consumer shares the process with the in-memory index it keeps current.
+    cdc_consumer = get_cdc_consumer()
+    cdc_task = None
+    if cdc_consumer is not None:
+        cdc_task = asyncio.create_task(cdc_consumer.run(), name="cdc-consumer")
+        cdc_task.add_done_callback(_log_cdc_exit)
     yield
+    if cdc_consumer is not None and cdc_task is not None and not cdc_task.done():
+        cdc_consumer.stop()
+        await cdc_task
+    close = getattr(conversation_service, "close", None)
+    if close is not None:
+        close()
     logger.info("application_shutdown")
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -35,7 +71,14 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    application.add_middleware(RequestLoggingMiddleware)
+    application.add_middleware(DeadlineMiddleware, default_timeout_ms=settings.request_timeout_ms)
+    application.add_middleware(
+        RequestLoggingMiddleware,
+        success_sample_rate=settings.log_success_sample_rate,
+        slow_request_ms=settings.log_slow_request_ms,
+    )
+    if settings.metrics_enabled:
+        application.add_middleware(MetricsMiddleware)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
@@ -49,6 +92,9 @@ def create_app() -> FastAPI:
     application.include_router(similarity.router)
     application.include_router(auto_resolution.router)
     application.include_router(conversation.router)
+    application.include_router(analysis.router)
+    if settings.metrics_enabled:
+        application.include_router(metrics.router)
 
     return application
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -32,6 +32,18 @@ class ClassificationResponse(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Classifier confidence score.")
 
 
+class BatchClassificationRequest(BaseModel):
+    tickets: List[ClassificationRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Tickets to classify in a single request."
+    )
+
+
+class BatchClassificationResponse(BaseModel):
+    results: List[ClassificationResponse] = Field(
+        default_factory=list, description="Classification results in the same order as the submitted tickets."
+    )
+
+
 class ResolutionTimeResponse(BaseModel):
     estimated_resolution_hours: float = Field(
         ..., ge=0.0, description="Estimated hours required to resolve the ticket."
@@ -42,6 +54,10 @@ class SimilarTicket(BaseModel):
     ticket_id: str = Field(..., description="Identifier of the similar ticket.")
     similarity_score: float = Field(..., ge=0.0, le=1.0, description="Similarity score between 0 and 1.")
     summary: str = Field(..., description="Short summary of the similar ticket.")
+    near_duplicate: bool = Field(
+        default=False,
+        description="Whether the ticket repeats the query nearly verbatim; its score is then a Jaccard estimate.",
+    )
 
 
 class SimilarityResponse(BaseModel):
@@ -70,3 +86,36 @@ class ConversationHistoryResponse(BaseModel):
         default_factory=list,
         description="Chronological list of conversation turns for the ticket.",
     )
+
+
+class TicketAnalysisRequest(TicketBase):
+    top_k: int = Field(default=5, ge=1, le=20, description="Number of similar tickets to retrieve.")
+    history_limit: int = Field(default=10, ge=1, le=100, description="Maximum conversation turns to retrieve.")
+    include_auto_resolution: bool = Field(
+        default=True, description="Generate an auto-resolution grounded in the retrieved context."
+    )
+
+
+class StageTiming(BaseModel):
+    status: str = Field(..., description="Stage outcome: ok, timeout, unavailable, shed, failed or skipped.")
+    duration_ms: float = Field(..., ge=0.0, description="Wall-clock time spent in the stage.")
+    detail: Optional[str] = Field(default=None, description="Reason when the stage did not complete.")
+
+
+class CustomerFeaturesResponse(BaseModel):
+    avg_resolution_time: float = Field(..., ge=0.0, description="Average resolution time of the customer's tickets.")
+    ticket_count_30d: int = Field(..., ge=0, description="Tickets raised by the customer in the last 30 days.")
+    sla_breach_ratio: float = Field(..., ge=0.0, le=1.0, description="Share of the customer's tickets breaching SLA.")
+
+
+class TicketAnalysisResponse(BaseModel):
+    classification: Optional[ClassificationResponse] = Field(default=None, description="Predicted category.")
+    resolution_time: Optional[ResolutionTimeResponse] = Field(default=None, description="Estimated resolution time.")
+    similar_tickets: List[SimilarTicket] = Field(default_factory=list, description="Similar historical tickets.")
+    history: List[ConversationTurn] = Field(default_factory=list, description="Prior conversation turns.")
+    auto_resolution: Optional[AutoResolutionResponse] = Field(default=None, description="Grounded resolution.")
+    customer_features: Optional[CustomerFeaturesResponse] = Field(
+        default=None, description="Online features of the ticket's customer."
+    )
+    stages: Dict[str, StageTiming] = Field(default_factory=dict, description="Per-stage status and timing.")
+    total_duration_ms: float = Field(..., ge=0.0, description="End-to-end pipeline duration.")
@@ -0,0 +1,328 @@
+"""Adaptive concurrency limits, bounded wait queues and load shedding per service."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, TypeVar
+
+from fastapi import status
+
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import (
+    AutoResolutionOutcome,
+    AutoResolutionStream,
+    ClassificationOutcome,
+    ResolutionTimeOutcome,
+    SimilarTicket,
+)
+from domain.models.ticket import Ticket
+from domain.services.interfaces import (
+    AutoResolutionService,
+    ClassificationService,
+    ConversationService,
+    ResolutionTimeService,
+    SimilarityService,
+)
+
+from src.app.core.deadlines import bounded_timeout
+from src.app.core.exceptions import OverloadedException
+
+T = TypeVar("T")
+
+
+class AIMDLimit:
+    """Additive-increase/multiplicative-decrease concurrency limit driven by observed latency.
+
+    Latency is smoothed over recent calls so one slow call does not count as
+    congestion. The no-load latency is the lowest smoothed value seen, slowly
+    drifting up so a permanently slower upstream eventually becomes the new
+    normal. Smoothed latency above ``tolerance`` times that baseline, or a
+    failed call, multiplies the limit by ``backoff_ratio`` at most once per
+    round trip; otherwise the limit grows by one per ``limit`` completions
+    while it is actually being used.
+    """
+
+    def __init__(
+        self,
+        initial: int = 32,
+        min_limit: int = 1,
+        max_limit: int = 512,
+        backoff_ratio: float = 0.9,
+        tolerance: float = 2.0,
+        smoothing: float = 0.1,
+        baseline_drift: float = 0.0001,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial <= max_limit.")
+        self._limit = float(initial)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff_ratio = backoff_ratio
+        self._tolerance = tolerance
+        self._smoothing = smoothing
+        self._baseline_drift = baseline_drift
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._next_decrease = 0.0
+        self._clock = clock
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Smoothed latency of recent calls, or ``None`` before the first one."""
+        return self._latency
+
+    def on_sample(self, latency: float, in_flight: int, failed: bool = False) -> None:
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += (latency - self._latency) * self._smoothing
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        else:
+            self._baseline += (self._latency - self._baseline) * self._baseline_drift
+        if failed or self._latency > self._tolerance * self._baseline:
+            now = self._clock()
+            if now >= self._next_decrease:
+                self._limit = max(float(self._min_limit), self._limit * self._backoff_ratio)
+                self._next_decrease = now + self._latency
+        elif in_flight * 2 >= self._limit:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+
+@dataclass(slots=True)
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected_queue_full: int = 0
+    shed_predicted_wait: int = 0
+    timed_out: int = 0
+
+
+class AdmissionController:
+    """Admit up to ``limit`` concurrent calls and queue a bounded number of others.
+
+    A call that cannot start at once joins a FIFO queue unless the queue is
+    full (429) or the wait predicted from queue position, current limit and
+    recent service time exceeds ``max_wait_seconds``, or what is left of the
+    request deadline (503); a queued call that still has not started by then
+    is shed as well. Shedding raises
+    :class:`OverloadedException` immediately, with a ``Retry-After`` derived
+    from the same estimate, so overload turns into fast rejections instead of
+    growing latency for everyone.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: Optional[AIMDLimit] = None,
+        max_queue: int = 128,
+        max_wait_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.limit = limit or AIMDLimit()
+        self._max_queue = max_queue
+        self._max_wait = max_wait_seconds
+        self._clock = clock
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self.stats = AdmissionStats()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _predicted_wait(self, position: int) -> float:
+        service_time = self.limit.latency
+        if service_time is None:
+            return 0.0
+        return position / max(self.limit.limit, 1) * service_time
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return its start time for :meth:`release`."""
+        if self._in_flight < self.limit.limit and not self._waiters:
+            self._in_flight += 1
+            self.stats.admitted += 1
+            return self._clock()
+        position = len(self._waiters) + 1
+        if position > self._max_queue:
+            self.stats.rejected_queue_full += 1
+            raise OverloadedException(
+                self.name, "wait queue is full.", self._predicted_wait(position), status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        max_wait = max(0.0, bounded_timeout(self._max_wait) or 0.0)
+        predicted = self._predicted_wait(position)
+        if predicted > max_wait:
+            self.stats.shed_predicted_wait += 1
+            raise OverloadedException(self.name, "predicted wait exceeds the queue deadline.", predicted)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        try:
+            async with asyncio.timeout(max_wait):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; give it back.
+                self._in_flight -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self.stats.timed_out += 1
+                raise OverloadedException(
+                    self.name, "no capacity within the queue deadline.", self._predicted_wait(len(self._waiters) + 1)
+                ) from None
+            raise
+        self.stats.admitted += 1
+        return self._clock()
+
+    def release(self, started: float, failed: bool = False) -> None:
+        latency = self._clock() - started
+        self.limit.on_sample(latency, self._in_flight, failed)
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        started = await self.acquire()
+        failed = True
+        try:
+            result = await call()
+            failed = False
+            return result
+        except NotImplementedError:
+            # A stub answers instantly; that says nothing about capacity.
+            failed = False
+            raise
+        finally:
+            self.release(started, failed)
+
+
+class _AdmittedTokens:
+    """Token iterator that holds its admission slot until the stream ends, fails or is dropped."""
+
+    def __init__(self, tokens: AsyncIterator[str], controller: AdmissionController, started: float) -> None:
+        self._tokens = tokens
+        self._controller = controller
+        self._started = started
+        # A stream abandoned without being closed (client gone) still gives its slot back.
+        self._release = weakref.finalize(self, controller.release, started)
+
+    def __aiter__(self) -> "_AdmittedTokens":
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return await self._tokens.__anext__()
+        except StopAsyncIteration:
+            self._release()
+            raise
+        except Exception:
+            if self._release.detach() is not None:
+                self._controller.release(self._started, failed=True)
+            raise
+
+    async def aclose(self) -> None:
+        self._release()
+        close = getattr(self._tokens, "aclose", None)
+        if close is not None:
+            await close()
+
+
+class AdmissionControlledClassificationService(ClassificationService):
+    def __init__(self, delegate: ClassificationService, controller: AdmissionController) -> None:
+        self._delegate = delegate
+        self.controller = controller
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return await self.controller.run(lambda: self._delegate.classify(ticket))
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return await self.controller.run(lambda: self._delegate.classify_batch(tickets))
+
+
+class AdmissionControlledResolutionTimeService(ResolutionTimeService):
+    def __init__(self, delegate: ResolutionTimeService, controller: AdmissionController) -> None:
+        self._delegate = delegate
+        self.controller = controller
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        return await self.controller.run(lambda: self._delegate.estimate(ticket))
+
+
+class AdmissionControlledSimilarityService(SimilarityService):
+    def __init__(self, delegate: SimilarityService, controller: AdmissionController) -> None:
+        self._delegate = delegate
+        self.controller = controller
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        return await self.controller.run(lambda: self._delegate.find_similar(ticket, top_k=top_k))
+
+
+class AdmissionControlledAutoResolutionService(AutoResolutionService):
+    """A token stream keeps its slot until the last token, since generation is what uses the capacity."""
+
+    def __init__(self, delegate: AutoResolutionService, controller: AdmissionController) -> None:
+        self._delegate = delegate
+        self.controller = controller
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        return await self.controller.run(lambda: self._delegate.generate(ticket, context))
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        started = await self.controller.acquire()
+        try:
+            stream = await self._delegate.generate_stream(ticket, context)
+        except NotImplementedError:
+            self.controller.release(started)
+            raise
+        except BaseException:
+            self.controller.release(started, failed=True)
+            raise
+        return AutoResolutionStream(
+            grounding_ticket_ids=stream.grounding_ticket_ids,
+            tokens=_AdmittedTokens(stream.tokens, self.controller, started),
+        )
+
+
+class AdmissionControlledConversationService(ConversationService):
+    def __init__(self, delegate: ConversationService, controller: AdmissionController) -> None:
+        self._delegate = delegate
+        self.controller = controller
+
+    async def append_turn(self, turn: ConversationTurn) -> None:
+        await self.controller.run(lambda: self._delegate.append_turn(turn))
+
+    async def get_history(self, ticket_id: str, limit: int = 10) -> list[ConversationTurn]:
+        return await self.controller.run(lambda: self._delegate.get_history(ticket_id, limit=limit))
+
+    def close(self) -> None:
+        close = getattr(self._delegate, "close", None)
+        if close is not None:
+            close()
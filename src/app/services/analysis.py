@@ -0,0 +1,190 @@
+"""Concurrent orchestration of the full ticket inference flow."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Literal, Optional, TypeVar
+
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import (
+    AutoResolutionOutcome,
+    ClassificationOutcome,
+    ResolutionTimeOutcome,
+    SimilarTicket,
+)
+from domain.models.ticket import Ticket
+from domain.services.interfaces import (
+    AutoResolutionService,
+    ClassificationService,
+    ConversationService,
+    ResolutionTimeService,
+    SimilarityService,
+)
+from feature_store.client import FeatureStoreClient
+from feature_store.definitions.customer import CustomerFeatures
+
+from src.app.core.exceptions import OverloadedException
+from src.app.core.logging import get_logger
+from src.app.core.metrics import ANALYSIS_STAGE_DURATION
+
+T = TypeVar("T")
+StageStatus = Literal["ok", "timeout", "unavailable", "shed", "failed", "skipped"]
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class StageReport:
+    status: StageStatus
+    duration_ms: float
+    detail: Optional[str] = None
+
+
+@dataclass(slots=True)
+class StageTimeouts:
+    """Per-stage deadlines in seconds."""
+
+    classification: float = 0.3
+    resolution_time: float = 0.3
+    similarity: float = 0.2
+    history: float = 0.1
+    auto_resolution: float = 5.0
+    features: float = 0.05
+
+
+@dataclass(slots=True)
+class TicketAnalysis:
+    classification: Optional[ClassificationOutcome] = None
+    resolution_time: Optional[ResolutionTimeOutcome] = None
+    similar_tickets: List[SimilarTicket] = field(default_factory=list)
+    history: List[ConversationTurn] = field(default_factory=list)
+    auto_resolution: Optional[AutoResolutionOutcome] = None
+    customer_features: Optional[CustomerFeatures] = None
+    stages: Dict[str, StageReport] = field(default_factory=dict)
+    total_duration_ms: float = 0.0
+
+
+class TicketAnalysisPipeline:
+    """Run classification, regression, similarity, history and feature lookups concurrently.
+
+    Every stage has its own timeout and degrades to a partial result instead of
+    failing the request, so end-to-end latency tracks the slowest independent
+    stage rather than the sum of all of them. Similar tickets and history are
+    then handed to auto-resolution so it does not retrieve them a second time.
+
+    Stage services sit behind the same admission control as their routes. A
+    stage shed by it is reported as ``shed``; when no concurrent stage produced
+    a result and at least one was shed, the whole request is rejected with that
+    :class:`OverloadedException` so clients see 503/429 and ``Retry-After``
+    instead of an empty analysis.
+    """
+
+    def __init__(
+        self,
+        classification: ClassificationService,
+        resolution_time: ResolutionTimeService,
+        similarity: SimilarityService,
+        conversation: ConversationService,
+        auto_resolution: AutoResolutionService,
+        timeouts: StageTimeouts | None = None,
+        customer_features: FeatureStoreClient[CustomerFeatures] | None = None,
+    ) -> None:
+        self._classification = classification
+        self._resolution_time = resolution_time
+        self._similarity = similarity
+        self._conversation = conversation
+        self._auto_resolution = auto_resolution
+        self._timeouts = timeouts or StageTimeouts()
+        self._customer_features = customer_features
+
+    async def analyze(
+        self,
+        ticket: Ticket,
+        top_k: int = 5,
+        history_limit: int = 10,
+        include_auto_resolution: bool = True,
+    ) -> TicketAnalysis:
+        start = time.perf_counter()
+        analysis = TicketAnalysis()
+        timeouts = self._timeouts
+        calls: Dict[str, tuple[float, Callable[[], Awaitable[object]]]] = {
+            "classification": (timeouts.classification, lambda: self._classification.classify(ticket)),
+            "resolution_time": (timeouts.resolution_time, lambda: self._resolution_time.estimate(ticket)),
+            "similarity": (timeouts.similarity, lambda: self._similarity.find_similar(ticket, top_k=top_k)),
+        }
+        if ticket.ticket_id:
+            calls["history"] = (
+                timeouts.history,
+                lambda: self._conversation.get_history(ticket_id=ticket.ticket_id, limit=history_limit),
+            )
+        else:
+            analysis.stages["history"] = StageReport("skipped", 0.0, "Ticket has no identifier.")
+        customer_id = ticket.customer_id
+        if self._customer_features is not None and customer_id:
+            features = self._customer_features
+            calls["features"] = (timeouts.features, lambda: features.get(customer_id))
+        elif self._customer_features is not None:
+            analysis.stages["features"] = StageReport("skipped", 0.0, "Ticket has no customer identifier.")
+
+        shed: List[OverloadedException] = []
+        async with asyncio.TaskGroup() as group:
+            tasks = {
+                name: group.create_task(self._stage(analysis, name, timeout, call, shed))
+                for name, (timeout, call) in calls.items()
+            }
+        if shed and all(analysis.stages[name].status != "ok" for name in calls):
+            raise shed[0]
+        results = {name: task.result() for name, task in tasks.items()}
+        analysis.classification = results["classification"]  # type: ignore[assignment]
+        analysis.resolution_time = results["resolution_time"]  # type: ignore[assignment]
+        analysis.similar_tickets = results["similarity"] or []  # type: ignore[assignment]
+        analysis.history = results.get("history") or []  # type: ignore[assignment]
+        analysis.customer_features = results.get("features")  # type: ignore[assignment]
+
+        if include_auto_resolution:
+            context = ResolutionContext(similar_tickets=analysis.similar_tickets, history=analysis.history)
+            analysis.auto_resolution = await self._stage(
+                analysis,
+                "auto_resolution",
+                timeouts.auto_resolution,
+                lambda: self._auto_resolution.generate(ticket, context),
+                shed,
+            )
+        else:
+            analysis.stages["auto_resolution"] = StageReport("skipped", 0.0, "Not requested.")
+
+        analysis.total_duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        return analysis
+
+    @staticmethod
+    async def _stage(
+        analysis: TicketAnalysis,
+        name: str,
+        timeout: float,
+        call: Callable[[], Awaitable[T]],
+        shed: List[OverloadedException],
+    ) -> Optional[T]:
+        start = time.perf_counter()
+        result: Optional[T] = None
+        detail: Optional[str] = None
+        status: StageStatus
+        try:
+            async with asyncio.timeout(timeout):
+                result = await call()
+            status = "ok"
+        except TimeoutError:
+            status, detail = "timeout", f"Exceeded {timeout * 1000:.0f} ms."
+        except NotImplementedError as exc:
+            status, detail = "unavailable", str(exc)
+        except OverloadedException as exc:
+            shed.append(exc)
+            status, detail = "shed", exc.detail
+        except Exception as exc:  # noqa: BLE001 - a failed stage must not fail the pipeline
+            logger.exception("analysis_stage_failed", extra={"extra": {"stage": name}})
+            status, detail = "failed", str(exc) or type(exc).__name__
+        elapsed = time.perf_counter() - start
+        ANALYSIS_STAGE_DURATION.labels(name, status).observe(elapsed)
+        analysis.stages[name] = StageReport(status, round(elapsed * 1000, 2), detail)
+        return result
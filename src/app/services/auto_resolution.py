@@ -0,0 +1,71 @@
+"""Retrieval-augmented auto-resolution service."""
+from __future__ import annotations
+
+from typing import Sequence
+
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import AutoResolutionOutcome, AutoResolutionStream, SimilarTicket
+from domain.models.ticket import Ticket
+from domain.services.interfaces import AutoResolutionService, SimilarityService
+from rag.llm import LLMClient
+from rag.prompt_templates.builder import PromptBuilder, render_resolution_prompt
+
+
+def build_resolution_prompt(
+    ticket: Ticket, grounding: Sequence[SimilarTicket], history: Sequence[ConversationTurn] = ()
+) -> str:
+    """Render the LLM prompt for a ticket, its grounding tickets and prior conversation."""
+    return render_resolution_prompt(ticket, grounding, history)
+
+
+class RAGAutoResolutionService(AutoResolutionService):
+    """Ground an LLM completion in the most similar historical tickets.
+
+    Callers that already hold similar tickets and history (such as the analysis
+    pipeline) pass them in a :class:`ResolutionContext` to skip retrieval. With
+    a ``prompt_builder`` the grounding and history are packed into its token
+    budget, and only the grounding tickets that made it in are reported.
+    """
+
+    def __init__(
+        self,
+        similarity: SimilarityService,
+        llm: LLMClient,
+        grounding_top_k: int = 3,
+        prompt_builder: PromptBuilder | None = None,
+    ) -> None:
+        self._similarity = similarity
+        self._llm = llm
+        self._grounding_top_k = grounding_top_k
+        self._prompt_builder = prompt_builder
+
+    async def _context(self, ticket: Ticket, context: ResolutionContext | None) -> ResolutionContext:
+        if context is not None:
+            return ResolutionContext(
+                similar_tickets=context.similar_tickets[: self._grounding_top_k], history=context.history
+            )
+        try:
+            grounding = await self._similarity.find_similar(ticket, top_k=self._grounding_top_k)
+        except NotImplementedError:
+            # Without a similarity backend the LLM can still answer ungrounded.
+            grounding = []
+        return ResolutionContext(similar_tickets=grounding)
+
+    def _prompt(self, ticket: Ticket, context: ResolutionContext) -> tuple[str, list[str]]:
+        if self._prompt_builder is None:
+            prompt = build_resolution_prompt(ticket, context.similar_tickets, context.history)
+            return prompt, [item.ticket_id for item in context.similar_tickets]
+        built = self._prompt_builder.build(ticket, context.similar_tickets, context.history)
+        return built.text, [item.ticket_id for item in built.grounding]
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        prompt, grounding_ids = self._prompt(ticket, await self._context(ticket, context))
+        response = await self._llm.complete(prompt)
+        return AutoResolutionOutcome(response=response, grounding_ticket_ids=grounding_ids)
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        prompt, grounding_ids = self._prompt(ticket, await self._context(ticket, context))
+        return AutoResolutionStream(grounding_ticket_ids=grounding_ids, tokens=self._llm.stream(prompt))
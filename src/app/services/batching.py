@@ -0,0 +1,97 @@
+"""Micro-batching adapters that coalesce concurrent model invocations."""
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService
+
+from src.app.core.metrics import BATCH_SIZE
+
+_PendingItem = Tuple[Ticket, "asyncio.Future[ClassificationOutcome]"]
+
+
+class MicroBatchingClassificationService(ClassificationService):
+    """Group concurrent single-ticket classifications into batched model calls.
+
+    Calls to :meth:`classify` are queued until either ``max_batch_size`` tickets
+    are pending or ``max_wait_ms`` has elapsed since the first queued ticket, at
+    which point the whole group is dispatched through ``classify_batch`` on the
+    wrapped service.
+    """
+
+    def __init__(
+        self,
+        delegate: ClassificationService,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self._delegate = delegate
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max(max_wait_ms, 0.0) / 1000
+        self._pending: List[_PendingItem] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set[asyncio.Task[None]] = set()
+        self._batch_sizes = BATCH_SIZE.labels("classification")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of tickets waiting for the next batch dispatch."""
+        return len(self._pending)
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ClassificationOutcome] = loop.create_future()
+        self._pending.append((ticket, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait_seconds, self._flush)
+        return await future
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        outcomes: list[ClassificationOutcome] = []
+        for start in range(0, len(tickets), self._max_batch_size):
+            chunk = tickets[start : start + self._max_batch_size]
+            outcomes.extend(await self._delegate.classify_batch(chunk))
+        return outcomes
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self._batch_sizes.observe(len(batch))
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[_PendingItem]) -> None:
+        # Callers that were cancelled while queued no longer need a prediction.
+        live = [(ticket, future) for ticket, future in batch if not future.done()]
+        if not live:
+            return
+        try:
+            outcomes = await self._delegate.classify_batch([ticket for ticket, _ in live])
+            if len(outcomes) != len(live):
+                raise RuntimeError(
+                    f"Batch classifier returned {len(outcomes)} outcomes for {len(live)} tickets."
+                )
+        except asyncio.CancelledError:
+            for _, future in live:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001 - propagate to every waiter
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), outcome in zip(live, outcomes):
+            if not future.done():
+                future.set_result(outcome)
@@ -0,0 +1,303 @@
+"""Two-tier response caching for deterministic model predictions.
+
+A prediction is only reusable for a ticket the model would see identically,
+so :func:`prediction_cache_key` covers every model input: the text as the
+feature pipeline normalizes it (case and whitespace), the priority and the
+creation hour. The model version in the key must identify the artifact
+being served; for local models it is the artifact's fingerprint. That is
+the only invalidation: a reloaded model gets a new fingerprint, so entries
+made by the old one are never looked up again and age out by TTL and LRU.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Protocol, Tuple, TypeVar
+
+from domain.models.results import ClassificationOutcome, ResolutionTimeOutcome
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService, ResolutionTimeService
+from domain.value_objects.ticket_category import TicketCategory
+from ml.feature_engineering.ticket_features import ticket_created_hour
+
+V = TypeVar("V")
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " .!?,;:'\"-"
+
+
+def normalize_ticket_text(text: str) -> str:
+    """Fold case, whitespace and trailing punctuation so near-verbatim repeats collide."""
+    return _WHITESPACE.sub(" ", text.casefold()).strip(_EDGE_PUNCTUATION)
+
+
+def prediction_cache_key(namespace: str, ticket: Ticket, model_version: str) -> str:
+    """Return a stable cache key for a ticket prediction."""
+    # Lowercasing and collapsing whitespace is all the feature pipeline folds;
+    # anything else (punctuation feeds the length feature) must stay distinct.
+    text = _WHITESPACE.sub(" ", ticket.text.lower()).strip()
+    material = "\x1f".join(
+        (namespace, model_version, ticket.priority.value, str(ticket_created_hour(ticket)), text)
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    local_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return (self.local_hits + self.shared_hits) / lookups if lookups else 0.0
+
+
+class LRUTTLCache(Generic[V]):
+    """Bounded in-process cache evicting least-recently-used and expired entries."""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 300.0) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SharedCacheBackend(Protocol):
+    """Cache tier shared between worker processes; values are serialized strings."""
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the stored value, or ``None`` when missing or expired."""
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl_seconds``."""
+
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+
+class SQLiteCacheBackend(SharedCacheBackend):
+    """Shared tier backed by a local SQLite file, standing in for Redis or DynamoDB.
+
+    Several caches may share one file; each only sees and clears its own ``namespace``.
+    """
+
+    def __init__(self, path: str | Path, namespace: str) -> None:
+        self._namespace = namespace
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS prediction_cache (namespace TEXT NOT NULL, key TEXT NOT NULL, "
+            "value TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM prediction_cache WHERE namespace = ? AND key = ?",
+                (self._namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._connection.execute(
+                    "DELETE FROM prediction_cache WHERE namespace = ? AND key = ?", (self._namespace, key)
+                )
+                return None
+            return row[0]
+
+    def _set(self, key: str, value: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO prediction_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self._namespace, key, value, time.time() + ttl_seconds),
+            )
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM prediction_cache WHERE namespace = ?", (self._namespace,))
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+
+class TwoTierCache(Generic[V]):
+    """In-process LRU/TTL tier in front of an optional shared backend."""
+
+    def __init__(
+        self,
+        local: LRUTTLCache[V],
+        encode: Callable[[V], str],
+        decode: Callable[[str], V],
+        shared: Optional[SharedCacheBackend] = None,
+        shared_ttl_seconds: float = 3600.0,
+    ) -> None:
+        self._local = local
+        self._shared = shared
+        self._encode = encode
+        self._decode = decode
+        self._shared_ttl_seconds = shared_ttl_seconds
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.evictions = self._local.evictions
+        return self._stats
+
+    async def get(self, key: str) -> Optional[V]:
+        value = self._local.get(key)
+        if value is not None:
+            self._stats.local_hits += 1
+            return value
+        if self._shared is not None:
+            raw = await self._shared.get(key)
+            if raw is not None:
+                value = self._decode(raw)
+                self._local.set(key, value)
+                self._stats.shared_hits += 1
+                return value
+        self._stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: V) -> None:
+        self._local.set(key, value)
+        if self._shared is not None:
+            await self._shared.set(key, self._encode(value), self._shared_ttl_seconds)
+
+
+def _encode_classification(outcome: ClassificationOutcome) -> str:
+    return json.dumps({"category": outcome.category.value, "confidence": outcome.confidence})
+
+
+def _decode_classification(raw: str) -> ClassificationOutcome:
+    payload: Dict[str, Any] = json.loads(raw)
+    return ClassificationOutcome(category=TicketCategory(payload["category"]), confidence=payload["confidence"])
+
+
+def _encode_resolution_time(outcome: ResolutionTimeOutcome) -> str:
+    return json.dumps({"estimated_hours": outcome.estimated_hours})
+
+
+def _decode_resolution_time(raw: str) -> ResolutionTimeOutcome:
+    return ResolutionTimeOutcome(estimated_hours=json.loads(raw)["estimated_hours"])
+
+
+def classification_cache(
+    max_entries: int, ttl_seconds: float, shared: Optional[SharedCacheBackend] = None
+) -> TwoTierCache[ClassificationOutcome]:
+    return TwoTierCache(
+        LRUTTLCache(max_entries, ttl_seconds), _encode_classification, _decode_classification, shared, ttl_seconds
+    )
+
+
+def resolution_time_cache(
+    max_entries: int, ttl_seconds: float, shared: Optional[SharedCacheBackend] = None
+) -> TwoTierCache[ResolutionTimeOutcome]:
+    return TwoTierCache(
+        LRUTTLCache(max_entries, ttl_seconds), _encode_resolution_time, _decode_resolution_time, shared, ttl_seconds
+    )
+
+
+class CachedClassificationService(ClassificationService):
+    """Serve repeated classification requests from a :class:`TwoTierCache`."""
+
+    namespace = "classification"
+
+    def __init__(
+        self, delegate: ClassificationService, cache: TwoTierCache[ClassificationOutcome], model_version: str
+    ) -> None:
+        self._delegate = delegate
+        self._cache = cache
+        self.model_version = model_version
+
+    @property
+    def cache(self) -> TwoTierCache[ClassificationOutcome]:
+        return self._cache
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        key = prediction_cache_key(self.namespace, ticket, self.model_version)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+        outcome = await self._delegate.classify(ticket)
+        await self._cache.set(key, outcome)
+        return outcome
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        keys = [prediction_cache_key(self.namespace, ticket, self.model_version) for ticket in tickets]
+        outcomes: List[Optional[ClassificationOutcome]] = [await self._cache.get(key) for key in keys]
+        missing = [index for index, outcome in enumerate(outcomes) if outcome is None]
+        if missing:
+            fresh = await self._delegate.classify_batch([tickets[index] for index in missing])
+            for index, outcome in zip(missing, fresh):
+                outcomes[index] = outcome
+                await self._cache.set(keys[index], outcome)
+        return outcomes  # type: ignore[return-value]
+
+
+class CachedResolutionTimeService(ResolutionTimeService):
+    """Serve repeated resolution-time estimates from a :class:`TwoTierCache`."""
+
+    namespace = "resolution_time"
+
+    def __init__(
+        self, delegate: ResolutionTimeService, cache: TwoTierCache[ResolutionTimeOutcome], model_version: str
+    ) -> None:
+        self._delegate = delegate
+        self._cache = cache
+        self.model_version = model_version
+
+    @property
+    def cache(self) -> TwoTierCache[ResolutionTimeOutcome]:
+        return self._cache
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        key = prediction_cache_key(self.namespace, ticket, self.model_version)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+        outcome = await self._delegate.estimate(ticket)
+        await self._cache.set(key, outcome)
+        return outcome
@@ -0,0 +1,107 @@
+"""Service decorators recording per-call latency in the metrics registry."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import (
+    AutoResolutionOutcome,
+    AutoResolutionStream,
+    ClassificationOutcome,
+    ResolutionTimeOutcome,
+    SimilarTicket,
+)
+from domain.models.ticket import Ticket
+from domain.services.interfaces import (
+    AutoResolutionService,
+    ClassificationService,
+    ConversationService,
+    ResolutionTimeService,
+    SimilarityService,
+)
+
+from src.app.core.exceptions import OverloadedException
+from src.app.core.metrics import SERVICE_CALL_DURATION
+
+T = TypeVar("T")
+
+
+async def _timed(service: str, method: str, call: Awaitable[T]) -> T:
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await call
+        outcome = "ok"
+        return result
+    except NotImplementedError:
+        outcome = "unavailable"
+        raise
+    except OverloadedException:
+        outcome = "shed"
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        SERVICE_CALL_DURATION.labels(service, method, outcome).observe(time.perf_counter() - start)
+
+
+class InstrumentedClassificationService(ClassificationService):
+    def __init__(self, delegate: ClassificationService) -> None:
+        self._delegate = delegate
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return await _timed("classification", "classify", self._delegate.classify(ticket))
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return await _timed("classification", "classify_batch", self._delegate.classify_batch(tickets))
+
+
+class InstrumentedResolutionTimeService(ResolutionTimeService):
+    def __init__(self, delegate: ResolutionTimeService) -> None:
+        self._delegate = delegate
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        return await _timed("resolution_time", "estimate", self._delegate.estimate(ticket))
+
+
+class InstrumentedSimilarityService(SimilarityService):
+    def __init__(self, delegate: SimilarityService) -> None:
+        self._delegate = delegate
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        return await _timed("similarity", "find_similar", self._delegate.find_similar(ticket, top_k=top_k))
+
+
+class InstrumentedAutoResolutionService(AutoResolutionService):
+    """Streams are timed until the stream is opened, i.e. until grounding is known."""
+
+    def __init__(self, delegate: AutoResolutionService) -> None:
+        self._delegate = delegate
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        return await _timed("auto_resolution", "generate", self._delegate.generate(ticket, context))
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        return await _timed("auto_resolution", "generate_stream", self._delegate.generate_stream(ticket, context))
+
+
+class InstrumentedConversationService(ConversationService):
+    def __init__(self, delegate: ConversationService) -> None:
+        self._delegate = delegate
+
+    async def append_turn(self, turn: ConversationTurn) -> None:
+        await _timed("conversation", "append_turn", self._delegate.append_turn(turn))
+
+    async def get_history(self, ticket_id: str, limit: int = 10) -> list[ConversationTurn]:
+        return await _timed("conversation", "get_history", self._delegate.get_history(ticket_id, limit=limit))
+
+    def close(self) -> None:
+        close = getattr(self._delegate, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,101 @@
+"""In-process classification and resolution-time inference from local model artifacts."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional, Sequence
+
+import numpy as np
+
+from domain.models.results import ClassificationOutcome, ResolutionTimeOutcome
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService, ResolutionTimeService
+from domain.value_objects.ticket_category import TicketCategory
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import transform_tickets
+from ml.models.linear import LinearModel
+from ml.monitoring.drift import DriftMonitor, monitored_features
+
+
+class LocalModelRuntime:
+    """Featurize tickets and evaluate a linear model on an executor.
+
+    The whole path (Arrow feature transform, hashing, sparse dot product) runs
+    off the event loop in one executor call per batch. Featurization goes
+    through the same ``transform_batch`` the model was trained on. With a
+    ``drift_monitor``, every batch's features and outputs are handed to it
+    after the prediction; that is a deque append, the statistics are
+    computed on the monitor's own thread.
+    """
+
+    def __init__(
+        self, model: LinearModel, executor: Executor, drift_monitor: Optional[DriftMonitor] = None
+    ) -> None:
+        vectorizer = model.metadata.get("vectorizer", {})
+        self.model = model
+        self._vectorizer = HashedFeatureVectorizer(
+            n_features=int(vectorizer.get("n_features", model.n_features)),
+            use_bigrams=bool(vectorizer.get("use_bigrams", True)),
+        )
+        if self._vectorizer.n_features != model.n_features:
+            raise ValueError("Model artifact and vectorizer disagree on the hashed feature count.")
+        if drift_monitor is not None:
+            watched = tuple(baseline.feature for baseline in drift_monitor.baseline.features.values())
+            if watched != monitored_features(model.labels if model.kind == "classifier" else ()):
+                raise ValueError("Drift baseline was built for a different model kind or label set.")
+        self._executor = executor
+        self._drift_monitor = drift_monitor
+
+    def predict(self, tickets: Sequence[Ticket]) -> np.ndarray:
+        """Return class probabilities for classifiers, predictions for regressors."""
+        features = transform_tickets(tickets)
+        rows = self._vectorizer.transform(features)
+        if self.model.kind == "classifier":
+            outputs = self.model.predict_proba(rows)
+        else:
+            outputs = self.model.predict(rows)
+        if self._drift_monitor is not None:
+            self._drift_monitor.observe(features, outputs)
+        return outputs
+
+    async def run(self, tickets: Sequence[Ticket]) -> np.ndarray:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.predict, tickets)
+
+
+def _category(label: str) -> TicketCategory:
+    try:
+        return TicketCategory(label)
+    except ValueError:
+        return TicketCategory.OTHER
+
+
+class LocalClassificationService(ClassificationService):
+    def __init__(self, runtime: LocalModelRuntime) -> None:
+        if runtime.model.kind != "classifier":
+            raise ValueError("LocalClassificationService needs a classifier artifact.")
+        self._runtime = runtime
+        self._categories = [_category(label) for label in runtime.model.labels]
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return (await self.classify_batch([ticket]))[0]
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        if not tickets:
+            return []
+        probabilities = await self._runtime.run(tickets)
+        best = probabilities.argmax(axis=1)
+        return [
+            ClassificationOutcome(category=self._categories[index], confidence=float(row[index]))
+            for index, row in zip(best, probabilities)
+        ]
+
+
+class LocalResolutionTimeService(ResolutionTimeService):
+    def __init__(self, runtime: LocalModelRuntime) -> None:
+        if runtime.model.kind != "regressor":
+            raise ValueError("LocalResolutionTimeService needs a regressor artifact.")
+        self._runtime = runtime
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        hours = float((await self._runtime.run([ticket]))[0])
+        return ResolutionTimeOutcome(estimated_hours=max(hours, 0.0))
@@ -0,0 +1,406 @@
+"""Circuit breaking, hedging, retry budgets and deadlines around upstream backends."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, Set, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+from domain.models.results import ClassificationOutcome, ResolutionTimeOutcome, SimilarTicket
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService, ResolutionTimeService, SimilarityService
+from rag.llm import LLMClient
+
+from src.app.core.deadlines import bounded_timeout
+from src.app.core.exceptions import CircuitOpenException, UpstreamServiceException, UpstreamTimeoutException
+
+T = TypeVar("T")
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failure may succeed on another attempt and says something about the upstream's health.
+
+    Missing backends, bad input and client errors are neither retried nor
+    counted against the circuit breaker.
+    """
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+    return not isinstance(exc, (NotImplementedError, ValueError, TypeError, LookupError))
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling an upstream whose recent failure ratio is too high.
+
+    Outcomes of the last ``window`` calls are kept; once at least
+    ``min_calls`` are recorded and the failure ratio reaches
+    ``failure_ratio`` the circuit opens and calls fail fast for
+    ``open_seconds``. It then lets ``probe_calls`` through: one success
+    closes it, one failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        window: int = 50,
+        min_calls: int = 20,
+        open_seconds: float = 5.0,
+        probe_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_ratio = failure_ratio
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._probe_calls = probe_calls
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._failures = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self._open_seconds - self._clock())
+
+    def allow(self) -> bool:
+        """Whether a call may start now; a permitted half-open probe must be followed by :meth:`record`."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes < self._probe_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record(self, success: Optional[bool]) -> None:
+        """Record a call outcome; ``None`` for calls that ended without a verdict (cancelled, bad input)."""
+        if self._state is CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if success is True:
+                self._close()
+            elif success is False:
+                self._open()
+            return
+        if success is None or self._state is CircuitState.OPEN:
+            return
+        if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+            self._failures -= 1
+        self._outcomes.append(success)
+        if not success:
+            self._failures += 1
+            if len(self._outcomes) >= self._min_calls and self._failures >= self._failure_ratio * len(self._outcomes):
+                self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self.opened += 1
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+
+
+class RetryBudget:
+    """Token bucket bounding retries and hedges to a fraction of traffic.
+
+    Every call deposits ``ratio`` tokens and the bucket also refills at
+    ``min_per_second`` so a quiet service can still retry; each extra attempt
+    spends one token. When an upstream is failing, retries therefore add at
+    most ``ratio`` extra load instead of multiplying it.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 5.0,
+        max_tokens: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ratio = ratio
+        self._min_per_second = min_per_second
+        self._max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+
+    def _refill(self, amount: float) -> None:
+        now = self._clock()
+        amount += (now - self._updated) * self._min_per_second
+        self._updated = now
+        self._tokens = min(self._max_tokens, self._tokens + amount)
+
+    def deposit(self) -> None:
+        self._refill(self._ratio)
+
+    def try_spend(self) -> bool:
+        self._refill(0.0)
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+class RollingQuantile:
+    """Quantile of the most recent ``window`` samples, recomputed every ``refresh_every`` samples."""
+
+    def __init__(
+        self, quantile: float = 0.95, window: int = 512, min_samples: int = 50, refresh_every: int = 16
+    ) -> None:
+        self._quantile = quantile
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._refresh_every = refresh_every
+        self._since_refresh = 0
+        self._value: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    def observe(self, sample: float) -> None:
+        self._samples.append(sample)
+        self._since_refresh += 1
+        if len(self._samples) >= self._min_samples and (
+            self._value is None or self._since_refresh >= self._refresh_every
+        ):
+            ordered = sorted(self._samples)
+            self._value = ordered[min(len(ordered) - 1, int(self._quantile * len(ordered)))]
+            self._since_refresh = 0
+
+
+@dataclass(slots=True)
+class ResilienceStats:
+    calls: int = 0
+    attempts: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    short_circuited: int = 0
+    timeouts: int = 0
+    failures: int = 0
+
+
+class ResilientUpstream:
+    """Call an upstream with a deadline, hedging, budgeted retries and a circuit breaker.
+
+    A call gets ``timeout_seconds`` overall, shortened to whatever is left of
+    the request deadline. If the first attempt has not answered after the
+    recent ``hedge_quantile`` latency, a second one is started and the first
+    answer wins; an attempt failing with a transient error is retried up to
+    ``max_retries`` times. Hedges and retries both draw on the retry budget
+    and on the circuit breaker, which also rejects the call up front while
+    open. Transient failures surface as :class:`UpstreamServiceException`;
+    other errors, including ``NotImplementedError`` from unconfigured
+    backends, pass through unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        breaker: Optional[CircuitBreaker] = None,
+        budget: Optional[RetryBudget] = None,
+        timeout_seconds: Optional[float] = None,
+        max_retries: int = 1,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay: float = 0.001,
+        retryable: Callable[[BaseException], bool] = is_transient,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.name = name
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = budget or RetryBudget()
+        self.latency = RollingQuantile(hedge_quantile)
+        self._timeout = timeout_seconds
+        self._max_retries = max_retries
+        self._hedge = hedge
+        self._min_hedge_delay = min_hedge_delay
+        self._retryable = retryable
+        self._clock = clock
+        self.stats = ResilienceStats()
+
+    async def call(self, attempt: Callable[[], Awaitable[T]], hedge: Optional[bool] = None) -> T:
+        """Run ``attempt`` (a factory, since it may be awaited more than once) under the policy."""
+        self.stats.calls += 1
+        self.budget.deposit()
+        if not self.breaker.allow():
+            self.stats.short_circuited += 1
+            raise CircuitOpenException(self.name, self.breaker.retry_after)
+        timeout = bounded_timeout(self._timeout)
+        if timeout is not None and timeout <= 0:
+            self.breaker.record(None)
+            self.stats.timeouts += 1
+            raise UpstreamTimeoutException(self.name, "request deadline already passed.")
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._attempts(attempt, self._hedge if hedge is None else hedge)
+        except TimeoutError:
+            # Attempts cut off by the deadline record no verdict themselves; a hang is a failure.
+            self.breaker.record(False)
+            self.stats.timeouts += 1
+            raise UpstreamTimeoutException(self.name, f"no answer within {timeout * 1000:.0f}ms.") from None
+
+    async def _attempts(self, attempt: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        pending: Set["asyncio.Task[T]"] = {self._start(attempt)}
+        hedges: Set["asyncio.Task[T]"] = set()
+        retries = 0
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                delay = self._hedge_delay() if hedge else None
+                hedge = hedge and delay is not None
+                done, pending = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge = False
+                    if self._spend():
+                        self.stats.hedges += 1
+                        hedges.add(self._start(attempt))
+                        pending |= hedges
+                    continue
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner in hedges:
+                        self.stats.hedge_wins += 1
+                    return winner.result()
+                for task in done:
+                    error = task.exception()
+                    if not self._retryable(error):
+                        raise error
+                if not pending and retries < self._max_retries and self._spend():
+                    retries += 1
+                    self.stats.retries += 1
+                    pending.add(self._start(attempt))
+        finally:
+            for task in pending:
+                task.cancel()
+        self.stats.failures += 1
+        assert error is not None
+        if isinstance(error, CircuitOpenException):
+            raise error
+        raise UpstreamServiceException(self.name, str(error) or type(error).__name__) from error
+
+    def _hedge_delay(self) -> Optional[float]:
+        estimate = self.latency.value
+        return None if estimate is None else max(estimate, self._min_hedge_delay)
+
+    def _spend(self) -> bool:
+        if not self.breaker.allow():
+            return False
+        if self.budget.try_spend():
+            return True
+        # Give back the breaker slot taken for an attempt that will not run.
+        self.breaker.record(None)
+        self.stats.budget_exhausted += 1
+        return False
+
+    def _start(self, attempt: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        self.stats.attempts += 1
+        return asyncio.ensure_future(self._timed(attempt))
+
+    async def _timed(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        start = self._clock()
+        try:
+            result = await attempt()
+        except asyncio.CancelledError:
+            self.breaker.record(None)
+            raise
+        except Exception as exc:
+            self.breaker.record(False if self._retryable(exc) else None)
+            raise
+        self.breaker.record(True)
+        self.latency.observe(self._clock() - start)
+        return result
+
+
+class ResilientClassificationService(ClassificationService):
+    """Batches are not hedged: a duplicate batch doubles model work for every ticket in it."""
+
+    def __init__(self, delegate: ClassificationService, upstream: ResilientUpstream) -> None:
+        self._delegate = delegate
+        self.upstream = upstream
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return await self.upstream.call(lambda: self._delegate.classify(ticket))
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return await self.upstream.call(lambda: self._delegate.classify_batch(tickets), hedge=False)
+
+
+class ResilientResolutionTimeService(ResolutionTimeService):
+    def __init__(self, delegate: ResolutionTimeService, upstream: ResilientUpstream) -> None:
+        self._delegate = delegate
+        self.upstream = upstream
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        return await self.upstream.call(lambda: self._delegate.estimate(ticket))
+
+
+class ResilientSimilarityService(SimilarityService):
+    def __init__(self, delegate: SimilarityService, upstream: ResilientUpstream) -> None:
+        self._delegate = delegate
+        self.upstream = upstream
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        return await self.upstream.call(lambda: self._delegate.find_similar(ticket, top_k=top_k))
+
+
+class ResilientLLMClient(LLMClient):
+    """LLM client whose completions, and streams up to their first token, run under a :class:`ResilientUpstream`.
+
+    Until a stream has produced a token nothing has reached the caller, so
+    opening it can be hedged and retried like any other call; later tokens
+    come from the winning attempt and are not retried.
+    """
+
+    def __init__(self, delegate: LLMClient, upstream: ResilientUpstream) -> None:
+        self._delegate = delegate
+        self.upstream = upstream
+
+    async def complete(self, prompt: str) -> str:
+        return await self.upstream.call(lambda: self._delegate.complete(prompt))
+
+    async def _first_token(self, prompt: str) -> Tuple[Optional[str], AsyncIterator[str]]:
+        tokens = aiter(self._delegate.stream(prompt))
+        try:
+            return await anext(tokens), tokens
+        except StopAsyncIteration:
+            return None, tokens
+        except BaseException:
+            close = getattr(tokens, "aclose", None)
+            if close is not None:
+                await close()
+            raise
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        first, tokens = await self.upstream.call(lambda: self._first_token(prompt))
+        if first is None:
+            return
+        try:
+            yield first
+            async for token in tokens:
+                yield token
+        finally:
+            close = getattr(tokens, "aclose", None)
+            if close is not None:
+                await close()
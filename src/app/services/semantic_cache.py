@@ -0,0 +1,216 @@
+"""Semantic caching of auto-resolution responses keyed by ticket embeddings."""
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from domain.models.context import ResolutionContext
+from domain.models.results import AutoResolutionOutcome, AutoResolutionStream
+from domain.models.ticket import Ticket
+from domain.services.interfaces import AutoResolutionService
+from rag.embeddings import Embedder
+from rag.vector_index import IVFIndex
+
+from src.app.services.cache import normalize_ticket_text
+
+
+@dataclass(slots=True)
+class SemanticCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    expired: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    # Generation time the original responses took, summed over every hit that reused them.
+    latency_saved_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    outcome: AutoResolutionOutcome
+    priority: str
+    expires_at: float
+    generation_seconds: float
+
+
+class SemanticResponseCache:
+    """LRU/TTL cache of auto-resolution outcomes looked up by embedding similarity.
+
+    Tickets are embedded after the same normalisation as the exact-match
+    prediction cache and searched in a small IVF index; the closest entry
+    with the same priority is a hit when its cosine similarity reaches
+    ``threshold``. Entries remember the grounding tickets they were generated
+    from so that a change to any of those tickets drops them.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        threshold: float = 0.92,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        nlist: int = 64,
+        nprobe: int = 8,
+        candidates: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._embedder = embedder
+        self.threshold = threshold
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._candidates = candidates
+        self._clock = clock
+        self._index = IVFIndex(dim=embedder.dim, nlist=nlist, nprobe=nprobe)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_grounding: Dict[str, Set[str]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = SemanticCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, ticket: Ticket) -> Optional[Tuple[AutoResolutionOutcome, float]]:
+        """Return the cached outcome and its similarity, or ``None`` on a miss."""
+        query = self._embedder.embed([normalize_ticket_text(ticket.text)])[0]
+        now = self._clock()
+        with self._lock:
+            for entry_id, score in self._index.search(query, self._candidates):
+                if score < self.threshold:
+                    break
+                entry = self._entries.get(entry_id)
+                if entry is None or entry.priority != ticket.priority.value:
+                    continue
+                if entry.expires_at <= now:
+                    self._drop([entry_id])
+                    self.stats.expired += 1
+                    continue
+                self._entries.move_to_end(entry_id)
+                self.stats.hits += 1
+                self.stats.latency_saved_seconds += entry.generation_seconds
+                return entry.outcome, score
+            self.stats.misses += 1
+            return None
+
+    def store(self, ticket: Ticket, outcome: AutoResolutionOutcome, generation_seconds: float) -> None:
+        vector = self._embedder.embed([normalize_ticket_text(ticket.text)])
+        with self._lock:
+            entry_id = f"r{next(self._ids)}"
+            self._entries[entry_id] = _Entry(
+                outcome=outcome,
+                priority=ticket.priority.value,
+                expires_at=self._clock() + self._ttl_seconds,
+                generation_seconds=generation_seconds,
+            )
+            self._index.add([entry_id], vector)
+            for ticket_id in outcome.grounding_ticket_ids:
+                self._by_grounding.setdefault(ticket_id, set()).add(entry_id)
+            if len(self._entries) > self._max_entries:
+                evicted = list(itertools.islice(self._entries, len(self._entries) - self._max_entries))
+                self._drop(evicted)
+                self.stats.evictions += len(evicted)
+
+    def invalidate_grounding(self, ticket_ids: Iterable[str]) -> int:
+        """Drop every response grounded in one of ``ticket_ids``; return the number dropped."""
+        with self._lock:
+            stale: Set[str] = set()
+            for ticket_id in ticket_ids:
+                stale.update(self._by_grounding.get(ticket_id, ()))
+            self._drop(stale)
+            self.stats.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._drop(list(self._entries))
+
+    def _drop(self, entry_ids: Iterable[str]) -> None:
+        removed = []
+        for entry_id in entry_ids:
+            entry = self._entries.pop(entry_id, None)
+            if entry is None:
+                continue
+            removed.append(entry_id)
+            for ticket_id in entry.outcome.grounding_ticket_ids:
+                owners = self._by_grounding.get(ticket_id)
+                if owners is not None:
+                    owners.discard(entry_id)
+                    if not owners:
+                        del self._by_grounding[ticket_id]
+        self._index.remove(removed)
+
+
+class SemanticCachedAutoResolutionService(AutoResolutionService):
+    """Answer paraphrased repeats of earlier tickets from a :class:`SemanticResponseCache`.
+
+    Requests that carry conversation history are follow-ups whose answer
+    depends on the thread, so they bypass the cache. Streamed misses are
+    stored once the stream has been fully consumed.
+    """
+
+    def __init__(self, delegate: AutoResolutionService, cache: SemanticResponseCache) -> None:
+        self._delegate = delegate
+        self._cache = cache
+
+    @property
+    def cache(self) -> SemanticResponseCache:
+        return self._cache
+
+    def _cacheable(self, context: ResolutionContext | None) -> bool:
+        if context is not None and context.history:
+            self._cache.stats.bypassed += 1
+            return False
+        return True
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        if not self._cacheable(context):
+            return await self._delegate.generate(ticket, context)
+        cached = self._cache.lookup(ticket)
+        if cached is not None:
+            return cached[0]
+        start = time.perf_counter()
+        outcome = await self._delegate.generate(ticket, context)
+        self._cache.store(ticket, outcome, time.perf_counter() - start)
+        return outcome
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        if not self._cacheable(context):
+            return await self._delegate.generate_stream(ticket, context)
+        cached = self._cache.lookup(ticket)
+        if cached is not None:
+            outcome = cached[0]
+            return AutoResolutionStream(
+                grounding_ticket_ids=list(outcome.grounding_ticket_ids), tokens=_replay(outcome.response)
+            )
+        start = time.perf_counter()
+        stream = await self._delegate.generate_stream(ticket, context)
+        return AutoResolutionStream(
+            grounding_ticket_ids=stream.grounding_ticket_ids,
+            tokens=self._record(ticket, stream, start),
+        )
+
+    async def _record(self, ticket: Ticket, stream: AutoResolutionStream, start: float) -> AsyncIterator[str]:
+        tokens: List[str] = []
+        async for token in stream.tokens:
+            tokens.append(token)
+            yield token
+        outcome = AutoResolutionOutcome(
+            response="".join(tokens).strip(), grounding_ticket_ids=list(stream.grounding_ticket_ids)
+        )
+        self._cache.store(ticket, outcome, time.perf_counter() - start)
+
+
+async def _replay(response: str) -> AsyncIterator[str]:
+    yield response
@@ -0,0 +1,174 @@
+"""In-process similarity search backed by a local ANN index and an optional BM25 index."""
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Iterable, Optional, Sequence, Set
+
+from domain.models.results import SimilarTicket
+from domain.models.ticket import Ticket
+from domain.services.interfaces import SimilarityService
+from rag.embeddings import Embedder
+from rag.hybrid import reciprocal_rank_fusion
+from rag.lexical_index import BM25Index
+from rag.near_duplicates import NearDuplicateIndex
+from rag.vector_index import IVFIndex
+from rag.vector_segment import VectorSegment
+
+SUMMARY_MAX_CHARS = 160
+
+
+def summarize(text: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """Return a single-line preview of ticket text."""
+    collapsed = " ".join(text.split())
+    if len(collapsed) <= max_chars:
+        return collapsed
+    return collapsed[: max_chars - 1].rstrip() + "…"
+
+
+class LocalSimilarityService(SimilarityService):
+    """Serve ``find_similar`` from an embedding index held in process memory.
+
+    Optional read-only :class:`VectorSegment` files hold the bulk of the corpus
+    in shared memory-mapped pages; the in-memory index then only carries tickets
+    inserted or updated since the segments were built. Tickets updated or
+    deleted after the segments were written are shadowed so stale segment rows
+    are never returned.
+
+    With a ``lexical`` index, queries also run BM25 over the tickets passed to
+    :meth:`index_tickets` and both candidate lists are merged by reciprocal-rank
+    fusion; ``similarity_score`` is then the normalised fused score. Exact
+    tokens such as error codes or product names are what the hashed embedding
+    blurs and BM25 keeps.
+
+    With a ``near_duplicates`` index, indexed tickets whose text the query
+    repeats verbatim or nearly so (resubmissions) come first, flagged
+    ``near_duplicate`` and scored by estimated Jaccard similarity; the
+    remaining slots are filled from the vector or hybrid path, skipping
+    tickets already listed. When duplicates alone fill ``top_k`` the query
+    never reaches the embedder or the vector indexes.
+
+    Searches are CPU-bound and run on a worker thread, so they do not stall
+    the event loop and a caller's timeout or hedge can fire while one runs.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        index: IVFIndex,
+        segments: Sequence[VectorSegment] = (),
+        segment_nprobe: int = 16,
+        segment_rerank_candidates: int = 64,
+        lexical: Optional[BM25Index] = None,
+        hybrid_candidates: int = 50,
+        rrf_k: float = 60.0,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+    ) -> None:
+        if embedder.dim != index.dim or any(segment.dim != index.dim for segment in segments):
+            raise ValueError("Embedder, index and segment dimensions differ.")
+        self._embedder = embedder
+        self._index = index
+        self._segments = list(segments)
+        self._segment_nprobe = segment_nprobe
+        self._segment_rerank_candidates = segment_rerank_candidates
+        self._lexical = lexical
+        self._hybrid_candidates = hybrid_candidates
+        self._rrf_k = rrf_k
+        self._near_duplicates = near_duplicates
+        self._summaries: Dict[str, str] = {}
+        self._shadowed: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._index) + sum(len(segment) for segment in self._segments)
+
+    def index_tickets(self, tickets: Sequence[Ticket]) -> None:
+        """Insert or refresh tickets in the index."""
+        tickets = [ticket for ticket in tickets if ticket.ticket_id]
+        if not tickets:
+            return
+        vectors = self._embedder.embed([ticket.text for ticket in tickets])
+        # Summaries first: a search running on another thread may return a ticket as soon as it is indexed.
+        for ticket in tickets:
+            self._summaries[ticket.ticket_id] = summarize(ticket.text)
+        self._index.add([ticket.ticket_id for ticket in tickets], vectors)
+        if self._lexical is not None:
+            self._lexical.add([ticket.ticket_id for ticket in tickets], [ticket.text for ticket in tickets])
+        if self._near_duplicates is not None:
+            self._near_duplicates.add([ticket.ticket_id for ticket in tickets], [ticket.text for ticket in tickets])
+        if self._segments:
+            self._shadowed.update(ticket.ticket_id for ticket in tickets)
+
+    def remove_tickets(self, ticket_ids: Iterable[str]) -> int:
+        """Delete tickets from the index; return the number removed."""
+        ticket_ids = list(ticket_ids)
+        for ticket_id in ticket_ids:
+            self._summaries.pop(ticket_id, None)
+        if self._segments:
+            self._shadowed.update(ticket_ids)
+        if self._lexical is not None:
+            self._lexical.remove(ticket_ids)
+        if self._near_duplicates is not None:
+            self._near_duplicates.remove(ticket_ids)
+        return self._index.remove(ticket_ids)
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        return await asyncio.to_thread(self._find_similar, ticket, top_k)
+
+    def _find_similar(self, ticket: Ticket, top_k: int) -> list[SimilarTicket]:
+        results: list[SimilarTicket] = []
+        if self._near_duplicates is not None:
+            results = [
+                SimilarTicket(
+                    ticket_id=match.label,
+                    similarity_score=match.similarity,
+                    summary=self._summaries.get(match.label, ""),
+                    near_duplicate=True,
+                )
+                for match in self._near_duplicates.query(ticket.text, top_k, exclude=(ticket.ticket_id,))
+            ]
+            if len(results) >= top_k:
+                return results[:top_k]
+        # Fetching top_k + 1 leaves room for the query ticket and every duplicate already listed.
+        if self._lexical is None:
+            hits = self._vector_hits(ticket, top_k + 1)
+        else:
+            candidates = max(self._hybrid_candidates, top_k + 1)
+            vector_hits = self._vector_hits(ticket, candidates)
+            summaries = {ticket_id: summary for ticket_id, _, summary in vector_hits}
+            lexical_ids = [ticket_id for ticket_id, _ in self._lexical.search(ticket.text, candidates)]
+            hits = [
+                (ticket_id, score, summaries.get(ticket_id) or self._summaries.get(ticket_id, ""))
+                for ticket_id, score in reciprocal_rank_fusion(
+                    [[ticket_id for ticket_id, _, _ in vector_hits], lexical_ids], k=self._rrf_k
+                )
+            ]
+        listed = {item.ticket_id for item in results}
+        listed.add(ticket.ticket_id)
+        results.extend(
+            SimilarTicket(ticket_id=ticket_id, similarity_score=min(max(score, 0.0), 1.0), summary=summary)
+            for ticket_id, score, summary in hits
+            if ticket_id not in listed
+        )
+        return results[:top_k]
+
+    def _vector_hits(self, ticket: Ticket, limit: int) -> list[tuple[str, float, str]]:
+        query = self._embedder.embed([ticket.text])[0]
+        # Callers over-fetch by one so the ticket itself can be dropped when it is indexed.
+        hits = [
+            (ticket_id, score, self._summaries.get(ticket_id, ""))
+            for ticket_id, score in self._index.search(query, limit)
+        ]
+        for segment in self._segments:
+            hits.extend(
+                (hit.ticket_id, hit.similarity_score, hit.summary)
+                for hit in segment.search(
+                    query,
+                    limit,
+                    nprobe=self._segment_nprobe,
+                    rerank_candidates=self._segment_rerank_candidates,
+                    exclude=self._shadowed,
+                )
+            )
+        if self._segments:
+            hits.sort(key=lambda hit: hit[1], reverse=True)
+            del hits[limit:]
+        return hits
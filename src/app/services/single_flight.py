@@ -0,0 +1,147 @@
+"""Single-flight adapters that collapse concurrent identical service calls."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+from domain.models.context import ResolutionContext
+from domain.models.results import (
+    AutoResolutionOutcome,
+    AutoResolutionStream,
+    ClassificationOutcome,
+    ResolutionTimeOutcome,
+    SimilarTicket,
+)
+from domain.models.ticket import Ticket
+from domain.services.interfaces import (
+    AutoResolutionService,
+    ClassificationService,
+    ResolutionTimeService,
+    SimilarityService,
+)
+from ml.feature_engineering.ticket_features import ticket_created_hour
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    leaders: int = 0
+    joined: int = 0
+    # Shared calls cancelled because every caller waiting on them went away.
+    abandoned: int = 0
+
+
+@dataclass(slots=True)
+class _Flight(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and hand its result to every concurrent caller.
+
+    The call runs in its own task, so a caller that is cancelled (for example
+    because its client disconnected) only stops waiting; the shared call is
+    cancelled once no caller is left. Results are not kept: a call made after
+    the flight finished starts a new one.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.stats = SingleFlightStats()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._finish(key, flight))
+            self.stats.leaders += 1
+        else:
+            self.stats.joined += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Later callers must start a fresh call rather than join one being torn down.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+                self.stats.abandoned += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved; every waiter has already re-raised it.
+            flight.task.exception()
+
+
+def ticket_key(ticket: Ticket) -> Tuple[Hashable, ...]:
+    """Identity of a ticket's content and model inputs.
+
+    The id is included because services exclude the ticket itself, and the
+    UTC creation hour because the models take it as a feature.
+    """
+    return (ticket.ticket_id, ticket.customer_id, ticket.priority.value, ticket_created_hour(ticket), ticket.text)
+
+
+class SingleFlightClassificationService(ClassificationService):
+    def __init__(self, delegate: ClassificationService, flights: SingleFlight | None = None) -> None:
+        self._delegate = delegate
+        self.flights = flights or SingleFlight()
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return await self.flights.do(("classify", *ticket_key(ticket)), lambda: self._delegate.classify(ticket))
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return await self._delegate.classify_batch(tickets)
+
+
+class SingleFlightResolutionTimeService(ResolutionTimeService):
+    def __init__(self, delegate: ResolutionTimeService, flights: SingleFlight | None = None) -> None:
+        self._delegate = delegate
+        self.flights = flights or SingleFlight()
+
+    async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
+        return await self.flights.do(("estimate", *ticket_key(ticket)), lambda: self._delegate.estimate(ticket))
+
+
+class SingleFlightSimilarityService(SimilarityService):
+    def __init__(self, delegate: SimilarityService, flights: SingleFlight | None = None) -> None:
+        self._delegate = delegate
+        self.flights = flights or SingleFlight()
+
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        # Waiters share one list; copy it so no caller can mutate another's result.
+        results = await self.flights.do(
+            ("find_similar", top_k, *ticket_key(ticket)), lambda: self._delegate.find_similar(ticket, top_k=top_k)
+        )
+        return list(results)
+
+
+class SingleFlightAutoResolutionService(AutoResolutionService):
+    """Coalesce buffered generations; token streams are single-consumer and pass straight through."""
+
+    def __init__(self, delegate: AutoResolutionService, flights: SingleFlight | None = None) -> None:
+        self._delegate = delegate
+        self.flights = flights or SingleFlight()
+
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        key = ("generate", repr(context), *ticket_key(ticket))
+        return await self.flights.do(key, lambda: self._delegate.generate(ticket, context))
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        return await self._delegate.generate_stream(ticket, context)
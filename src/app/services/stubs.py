@@ -1,9 +1,11 @@
 """Placeholder service implementations until infrastructure wiring is provided."""
 from __future__ import annotations
 
+from domain.models.context import ResolutionContext
 from domain.models.conversation import ConversationTurn
 from domain.models.results import (
     AutoResolutionOutcome,
+    AutoResolutionStream,
     ClassificationOutcome,
     ResolutionTimeOutcome,
     SimilarTicket,
@@ -20,6 +22,9 @@ class NotConfiguredClassificationService(ClassificationService):
     async def classify(self, ticket: Ticket) -> ClassificationOutcome:
         raise NotImplementedError("Classification service is not yet configured.")
 
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        raise NotImplementedError("Classification service is not yet configured.")
+
 
 class NotConfiguredResolutionTimeService(ResolutionTimeService):
     async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
@@ -32,7 +37,12 @@ class NotConfiguredSimilarityService(SimilarityService):
 
 
 class NotConfiguredAutoResolutionService(AutoResolutionService):
-    async def generate(self, ticket: Ticket) -> AutoResolutionOutcome:
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
+        raise NotImplementedError("Auto-resolution service is not yet configured.")
+
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
         raise NotImplementedError("Auto-resolution service is not yet configured.")
 
 
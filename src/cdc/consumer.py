@@ -0,0 +1,169 @@
+"""Batched CDC consumer keeping the similarity index and feature store current."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+from cdc.events import TicketChangeEvent
+from cdc.sinks import ChangeSink
+from cdc.sources import ChangeEventSource, CheckpointStore, DeadLetterLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ConsumerStats:
+    events: int = 0
+    batches: int = 0
+    applied: int = 0
+    superseded: int = 0
+    retries: int = 0
+    dead_lettered: int = 0
+    committed_offset: int = 0
+    lag_seconds: Deque[float] = field(default_factory=lambda: deque(maxlen=10_000))
+
+
+class CDCConsumer:
+    """Read change events in batches, apply them to every sink, then checkpoint.
+
+    Each poll takes whatever the source has buffered up to ``batch_size``, so
+    batches grow on their own when the consumer falls behind and shrink back
+    to single events when it keeps up. Within a batch only the newest version
+    of each ticket is applied, and versions at or below the last one applied
+    are dropped, so replays after a failure or restart are no-ops. Applied
+    versions are remembered for the ``max_tracked_tickets`` most recently
+    changed tickets; older ones rely on the sinks being idempotent.
+
+    The offset is committed only after every sink succeeded; a failing batch
+    is retried with capped exponential backoff and nothing new is read
+    meanwhile, which in turn backs the source up to its producers. After
+    ``max_attempts`` failures the batch is written to ``dead_letter`` (or only
+    logged without one) and the offset moves past it, so one poisoned batch
+    cannot stall the stream.
+    """
+
+    def __init__(
+        self,
+        source: ChangeEventSource,
+        sinks: Sequence[ChangeSink],
+        checkpoint: CheckpointStore,
+        batch_size: int = 500,
+        max_wait_seconds: float = 0.2,
+        retry_backoff_seconds: float = 0.1,
+        max_backoff_seconds: float = 5.0,
+        max_attempts: int = 10,
+        dead_letter: Optional[DeadLetterLog] = None,
+        max_tracked_tickets: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self._source = source
+        self._sinks = list(sinks)
+        self._checkpoint = checkpoint
+        self._batch_size = batch_size
+        self._max_wait = max_wait_seconds
+        self._retry_backoff = retry_backoff_seconds
+        self._max_backoff = max_backoff_seconds
+        self._max_attempts = max_attempts
+        self._dead_letter = dead_letter
+        self._max_tracked_tickets = max_tracked_tickets
+        self._clock = clock
+        self._applied_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._stopping = asyncio.Event()
+        self.stats = ConsumerStats()
+
+    async def run(self) -> None:
+        """Consume from the last checkpoint until :meth:`stop` is called."""
+        offset = self._checkpoint.load()
+        self._source.seek(offset)
+        self.stats.committed_offset = offset
+        self._stopping.clear()
+        while not self._stopping.is_set():
+            await self.poll()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def poll(self) -> int:
+        """Apply and commit one batch; return the number of events read."""
+        events = await self._source.read(self._batch_size, self._max_wait)
+        if not events:
+            return 0
+        upserts, deletes = self._collapse(events)
+        deleted_ids = [event.ticket_id for event in deletes]
+        attempt = 0
+        applied = True
+        while True:
+            sink_name = ""
+            try:
+                for sink in self._sinks:
+                    sink_name = sink.name
+                    await sink.apply(upserts, deleted_ids)
+                break
+            except Exception as exc:  # noqa: BLE001 - retried up to max_attempts, then dead-lettered
+                attempt += 1
+                logger.exception(
+                    "cdc_batch_failed", extra={"extra": {"sink": sink_name, "attempt": attempt, "events": len(events)}}
+                )
+                if self._stopping.is_set():
+                    # Leave the offset uncommitted; the batch is replayed on the next start.
+                    return len(events)
+                if attempt >= self._max_attempts:
+                    await self._abandon(upserts + deletes, sink_name, exc)
+                    applied = False
+                    break
+                self.stats.retries += 1
+                await asyncio.sleep(min(self._retry_backoff * 2 ** (attempt - 1), self._max_backoff))
+
+        if applied:
+            for event in upserts + deletes:
+                self._remember(event)
+        offset = events[-1].offset
+        # The file store fsyncs; keep that off the event loop.
+        await asyncio.to_thread(self._checkpoint.save, offset)
+        self._source.commit(offset)
+
+        now = self._clock()
+        self.stats.events += len(events)
+        self.stats.batches += 1
+        self.stats.applied += (len(upserts) + len(deletes)) if applied else 0
+        self.stats.superseded += len(events) - len(upserts) - len(deletes)
+        self.stats.committed_offset = offset
+        self.stats.lag_seconds.extend(now - event.emitted_at for event in events)
+        return len(events)
+
+    async def _abandon(self, events: List[TicketChangeEvent], sink: str, error: Exception) -> None:
+        self.stats.dead_lettered += len(events)
+        logger.error(
+            "cdc_batch_dead_lettered",
+            extra={"extra": {"sink": sink, "events": len(events), "offset": events[-1].offset if events else None}},
+        )
+        if self._dead_letter is not None and events:
+            await asyncio.to_thread(self._dead_letter.write, events, sink, repr(error))
+
+    def _remember(self, event: TicketChangeEvent) -> None:
+        self._applied_versions[event.ticket_id] = event.version
+        self._applied_versions.move_to_end(event.ticket_id)
+        if len(self._applied_versions) > self._max_tracked_tickets:
+            self._applied_versions.popitem(last=False)
+
+    def _collapse(
+        self, events: Sequence[TicketChangeEvent]
+    ) -> tuple[List[TicketChangeEvent], List[TicketChangeEvent]]:
+        latest: Dict[str, TicketChangeEvent] = {}
+        for event in events:
+            current = latest.get(event.ticket_id)
+            if current is None or event.version > current.version:
+                latest[event.ticket_id] = event
+        upserts: List[TicketChangeEvent] = []
+        deletes: List[TicketChangeEvent] = []
+        for event in latest.values():
+            if event.version <= self._applied_versions.get(event.ticket_id, -1):
+                continue
+            (deletes if event.operation == "delete" else upserts).append(event)
+        return upserts, deletes
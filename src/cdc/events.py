@@ -0,0 +1,75 @@
+"""Ticket change events carried on the CDC stream."""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Literal, Optional
+
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_priority import TicketPriority
+
+Operation = Literal["upsert", "delete"]
+
+
+@dataclass(slots=True)
+class TicketChangeEvent:
+    """A row-level change of one ticket.
+
+    ``version`` increases with every change of the same ticket, so replays of
+    older events can be recognised and skipped. ``offset`` is the source
+    position to resume from once this event has been applied; sources fill it
+    in on read. ``emitted_at`` is the epoch time the change was committed
+    upstream and is what freshness lag is measured against.
+    """
+
+    ticket_id: str
+    operation: Operation
+    version: int
+    emitted_at: float
+    text: str = ""
+    customer_id: Optional[str] = None
+    priority: str = TicketPriority.MEDIUM.value
+    status: str = "open"
+    offset: int = 0
+
+    def to_ticket(self) -> Ticket:
+        try:
+            priority = TicketPriority(self.priority)
+        except ValueError:
+            priority = TicketPriority.MEDIUM
+        return Ticket(
+            ticket_id=self.ticket_id,
+            text=self.text,
+            customer_id=self.customer_id,
+            created_at=datetime.fromtimestamp(self.emitted_at, tz=timezone.utc),
+            priority=priority,
+        )
+
+    def to_json(self) -> str:
+        payload: Dict[str, Any] = {
+            "ticket_id": self.ticket_id,
+            "operation": self.operation,
+            "version": self.version,
+            "emitted_at": self.emitted_at,
+        }
+        if self.operation == "upsert":
+            payload.update(
+                text=self.text, customer_id=self.customer_id, priority=self.priority, status=self.status
+            )
+        return json.dumps(payload, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str | bytes, offset: int = 0) -> "TicketChangeEvent":
+        payload = json.loads(line)
+        return cls(
+            ticket_id=str(payload["ticket_id"]),
+            operation=payload["operation"],
+            version=int(payload["version"]),
+            emitted_at=float(payload["emitted_at"]),
+            text=payload.get("text", ""),
+            customer_id=payload.get("customer_id"),
+            priority=payload.get("priority", TicketPriority.MEDIUM.value),
+            status=payload.get("status", "open"),
+            offset=offset,
+        )
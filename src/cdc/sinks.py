@@ -0,0 +1,104 @@
+"""Targets the CDC consumer applies collapsed change batches to.
+
+Every sink must be idempotent: the consumer re-applies a whole batch after a
+failure or restart, so upserting the same ticket twice or deleting a missing
+one has to be harmless.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, Protocol, Sequence
+
+from cdc.events import TicketChangeEvent
+from domain.models.ticket import Ticket
+from feature_store.definitions.ticket import TicketFeatures
+from feature_store.online_store import OnlineFeatureStore
+
+
+class ChangeSink(Protocol):
+    name: str
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        """Upsert the latest state of ``upserts`` and remove the tickets in ``deletes``."""
+
+
+class TicketIndex(Protocol):
+    """Mutable similarity index, e.g. ``LocalSimilarityService``."""
+
+    def index_tickets(self, tickets: Sequence[Ticket]) -> None:
+        ...
+
+    def remove_tickets(self, ticket_ids: Iterable[str]) -> int:
+        ...
+
+
+class GroundingCache(Protocol):
+    """Cache of responses grounded in tickets, e.g. ``SemanticResponseCache``."""
+
+    def invalidate_grounding(self, ticket_ids: Iterable[str]) -> int:
+        ...
+
+
+class SimilarityIndexSink(ChangeSink):
+    """Re-embed changed tickets in one call per batch and update the local ANN index.
+
+    Embedding and index updates are CPU-bound, so they run on a worker thread
+    rather than stalling request handling on the event loop; the indexes
+    synchronise their own readers and writers.
+    """
+
+    name = "similarity"
+
+    def __init__(self, index: TicketIndex) -> None:
+        self._index = index
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        if deletes:
+            await asyncio.to_thread(self._index.remove_tickets, deletes)
+        if upserts:
+            await asyncio.to_thread(self._index.index_tickets, [event.to_ticket() for event in upserts])
+
+
+class ResolutionCacheSink(ChangeSink):
+    """Drop cached auto-resolutions grounded in tickets that changed or were deleted."""
+
+    name = "resolution_cache"
+
+    def __init__(self, cache: GroundingCache) -> None:
+        self._cache = cache
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        changed = [event.ticket_id for event in upserts]
+        changed.extend(deletes)
+        if changed:
+            self._cache.invalidate_grounding(changed)
+
+
+class TicketFeatureSink(ChangeSink):
+    """Write ticket feature records to the online store in store-sized batches."""
+
+    name = "features"
+
+    def __init__(self, store: OnlineFeatureStore, feature_group: str) -> None:
+        self._store = store
+        self._feature_group = feature_group
+        self._max_batch_size = getattr(store, "max_batch_size", 100)
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        records = [
+            TicketFeatures(
+                ticket_id=event.ticket_id,
+                customer_id=event.customer_id,
+                priority=event.priority,
+                status=event.status,
+                text_length=len(event.text),
+                event_time=datetime.fromtimestamp(event.emitted_at, tz=timezone.utc),
+            ).to_record()
+            for event in upserts
+        ]
+        for start in range(0, len(records), self._max_batch_size):
+            chunk = records[start : start + self._max_batch_size]
+            await self._store.batch_put(self._feature_group, {record["ticket_id"]: record for record in chunk})
+        for start in range(0, len(deletes), self._max_batch_size):
+            await self._store.batch_delete(self._feature_group, deletes[start : start + self._max_batch_size])
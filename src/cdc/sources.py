@@ -0,0 +1,213 @@
+"""Change event sources and consumer checkpoints.
+
+A source hands out events in stream order together with the offset to resume
+from after each one. The consumer commits that offset to a checkpoint store
+only after an event's batch has been applied, so a restart replays anything
+not yet applied (at-least-once delivery).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Protocol, Sequence
+
+from cdc.events import TicketChangeEvent
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeEventSource(Protocol):
+    """Ordered stream of ticket change events, e.g. one Kinesis shard."""
+
+    def seek(self, offset: int) -> None:
+        """Position the source so the next read starts after ``offset``."""
+
+    async def read(self, max_records: int, timeout: float) -> List[TicketChangeEvent]:
+        """Return up to ``max_records`` events, waiting at most ``timeout`` seconds for the first."""
+
+    def commit(self, offset: int) -> None:
+        """Signal that everything up to ``offset`` has been applied and may be released."""
+
+
+class CheckpointStore(Protocol):
+    def load(self) -> int:
+        """Return the last committed offset, or ``0`` when nothing was committed."""
+
+    def save(self, offset: int) -> None:
+        """Durably record ``offset`` as committed."""
+
+
+class DeadLetterLog(Protocol):
+    def write(self, events: Sequence[TicketChangeEvent], sink: str, error: str) -> None:
+        """Durably record ``events`` that ``sink`` could not apply, so they can be inspected and replayed."""
+
+
+class InMemoryEventSource(ChangeEventSource):
+    """Bounded in-process queue standing in for a stream shard.
+
+    ``publish`` waits while ``capacity`` uncommitted events are retained, which
+    pushes back on producers when the consumer falls behind. Uncommitted events
+    stay retained so ``seek`` can rewind to the last checkpoint, as a replaying
+    stream would.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self._capacity = capacity
+        self._retained: Deque[TicketChangeEvent] = deque()
+        self._first_offset = 1
+        self._next_read = 1
+        self._readable = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+
+    def __len__(self) -> int:
+        return len(self._retained)
+
+    @property
+    def lag(self) -> int:
+        """Events published but not yet read."""
+        return self._first_offset + len(self._retained) - self._next_read
+
+    async def publish(self, event: TicketChangeEvent) -> None:
+        while len(self._retained) >= self._capacity:
+            self._space.clear()
+            await self._space.wait()
+        event.offset = self._first_offset + len(self._retained)
+        self._retained.append(event)
+        self._readable.set()
+
+    def seek(self, offset: int) -> None:
+        self._next_read = max(offset + 1, self._first_offset)
+        if self.lag:
+            self._readable.set()
+
+    async def read(self, max_records: int, timeout: float) -> List[TicketChangeEvent]:
+        if not self.lag:
+            self._readable.clear()
+            try:
+                await asyncio.wait_for(self._readable.wait(), timeout)
+            except TimeoutError:
+                return []
+        start = self._next_read - self._first_offset
+        count = min(max_records, len(self._retained) - start)
+        events = [self._retained[start + index] for index in range(count)]
+        self._next_read += count
+        return events
+
+    def commit(self, offset: int) -> None:
+        while self._retained and self._first_offset <= offset:
+            self._retained.popleft()
+            self._first_offset += 1
+        self._next_read = max(self._next_read, self._first_offset)
+        if len(self._retained) < self._capacity:
+            self._space.set()
+
+
+class FileEventSource(ChangeEventSource):
+    """Tail a JSON-lines file of change events; offsets are byte positions.
+
+    A partially written final line is left unread until its newline arrives;
+    complete lines that do not parse are logged and skipped.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], poll_interval: float = 0.05) -> None:
+        self._path = Path(path)
+        self._poll_interval = poll_interval
+        self._position = 0
+
+    def seek(self, offset: int) -> None:
+        self._position = offset
+
+    async def read(self, max_records: int, timeout: float) -> List[TicketChangeEvent]:
+        deadline = time.monotonic() + timeout
+        while True:
+            events = await asyncio.to_thread(self._read_available, max_records)
+            if events or time.monotonic() >= deadline:
+                return events
+            await asyncio.sleep(min(self._poll_interval, max(deadline - time.monotonic(), 0.0)))
+
+    def commit(self, offset: int) -> None:
+        # The file is the durable log; retention is managed by whoever writes it.
+        return None
+
+    def _read_available(self, max_records: int) -> List[TicketChangeEvent]:
+        if not self._path.exists():
+            return []
+        events: List[TicketChangeEvent] = []
+        with open(self._path, "rb") as handle:
+            handle.seek(self._position)
+            while len(events) < max_records:
+                line = handle.readline()
+                if not line.endswith(b"\n"):
+                    break
+                self._position += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    events.append(TicketChangeEvent.from_json(line, offset=self._position))
+                except (ValueError, KeyError):
+                    # A malformed record can never be applied; retrying it would stall the stream.
+                    logger.warning("cdc_event_malformed", extra={"extra": {"offset": self._position}})
+        return events
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    def __init__(self, offset: int = 0) -> None:
+        self.offset = offset
+
+    def load(self) -> int:
+        return self.offset
+
+    def save(self, offset: int) -> None:
+        self.offset = offset
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoint kept in a small JSON file replaced atomically on every save."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> int:
+        if not self._path.exists():
+            return 0
+        return int(json.loads(self._path.read_text(encoding="utf-8"))["offset"])
+
+    def save(self, offset: int) -> None:
+        temporary = self._path.with_name(self._path.name + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"offset": offset}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._path)
+
+
+class FileDeadLetterLog(DeadLetterLog):
+    """Append abandoned events to a JSON-lines file, one record per event.
+
+    Each record is the event as it appeared on the stream plus the failing
+    sink and error, so the file can be fed back through a ``FileEventSource``
+    once the cause is fixed.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, events: Sequence[TicketChangeEvent], sink: str, error: str) -> None:
+        failed_at = time.time()
+        lines = []
+        for event in events:
+            payload = json.loads(event.to_json())
+            payload.update(dead_letter={"sink": sink, "error": error, "offset": event.offset, "failed_at": failed_at})
+            lines.append(json.dumps(payload, ensure_ascii=False) + "\n")
+        with open(self._path, "a", encoding="utf-8") as handle:
+            handle.writelines(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
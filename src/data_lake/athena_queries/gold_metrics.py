@@ -0,0 +1,138 @@
+"""Monthly SLA and resolution-time aggregates over resolved tickets, as the gold layer stores them.
+
+Both queries scan only the columns they need from the months overlapping the
+requested range and aggregate batch by batch, so their memory does not grow
+with the number of tickets. Resolution-time quantiles come from a
+log-spaced histogram (edges 10% apart) and are accurate to within about 5%;
+counts, breach ratios and means are exact.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data_lake.query import LakeQuery
+from data_lake.tables import RESOLVED_TICKETS, TIMESTAMP
+
+# Hours to resolve a ticket before it breaches its SLA, by priority.
+SLA_TARGET_HOURS: Dict[str, float] = {"critical": 4.0, "high": 8.0, "medium": 24.0, "low": 72.0}
+DEFAULT_SLA_TARGET_HOURS = SLA_TARGET_HOURS["medium"]
+# One minute to 180 days in steps of 10%.
+_HOUR_EDGES = np.geomspace(1 / 60, 24 * 180, num=int(np.ceil(np.log(24 * 180 * 60) / np.log(1.1))) + 1)
+
+
+def resolution_hours(batch: pa.RecordBatch | pa.Table) -> pa.Array:
+    elapsed = pc.subtract(batch.column("resolved_at"), batch.column("created_at"))
+    return pc.divide(pc.cast(elapsed, pa.int64()), 3.6e9)
+
+
+def _month_starts(years: pa.Array, months: pa.Array) -> pa.Array:
+    starts = [datetime(int(year), int(month), 1, tzinfo=timezone.utc) for year, month in zip(years, months)]
+    return pa.array(starts, TIMESTAMP)
+
+
+def _keys(batch: pa.RecordBatch, by: Sequence[str]) -> Dict[str, pa.Array]:
+    return {name: batch.column(name) for name in ("year", "month", *by)}
+
+
+def sla_summary(
+    query: LakeQuery,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    by: Sequence[str] = ("priority",),
+    targets: Mapping[str, float] = SLA_TARGET_HOURS,
+) -> pa.Table:
+    """Resolved tickets, SLA breaches and mean resolution hours per creation month and ``by`` columns.
+
+    A ticket breaches when it took longer than the target of its priority;
+    priorities without a target get :data:`DEFAULT_SLA_TARGET_HOURS`.
+    """
+    priorities = pa.array(list(targets))
+    target_hours = pa.array([float(hours) for hours in targets.values()])
+
+    def prepare(batch: pa.RecordBatch) -> pa.Table:
+        hours = resolution_hours(batch)
+        target = pc.fill_null(
+            pc.take(target_hours, pc.index_in(batch.column("priority"), value_set=priorities)),
+            DEFAULT_SLA_TARGET_HOURS,
+        )
+        breached = pc.cast(pc.greater(hours, target), pa.int64())
+        return pa.table({**_keys(batch, by), "hours": hours, "breached": breached})
+
+    columns = list(dict.fromkeys(["year", "month", "created_at", "resolved_at", "priority", *by]))
+    scanner = query.scan(RESOLVED_TICKETS, columns, start, end)
+    totals = query.aggregate(
+        scanner, ["year", "month", *by], [("hours", "count"), ("hours", "sum"), ("breached", "sum")], prepare
+    )
+    totals = totals.sort_by([("year", "ascending"), ("month", "ascending"), *((name, "ascending") for name in by)])
+    tickets = totals.column("hours_count")
+    return pa.table(
+        {
+            "month_start": _month_starts(totals.column("year"), totals.column("month")),
+            **{name: totals.column(name) for name in by},
+            "tickets": tickets,
+            "breached": totals.column("breached_sum"),
+            "breach_ratio": pc.divide(pc.cast(totals.column("breached_sum"), pa.float64()), tickets),
+            "mean_resolution_hours": pc.divide(totals.column("hours_sum"), tickets),
+        }
+    )
+
+
+def resolution_time_summary(
+    query: LakeQuery,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    by: Sequence[str] = ("category",),
+    quantiles: Sequence[float] = (0.5, 0.9),
+) -> pa.Table:
+    """Resolved tickets, mean and quantile resolution hours per creation month and ``by`` columns."""
+
+    def prepare(batch: pa.RecordBatch) -> pa.Table:
+        hours = resolution_hours(batch)
+        bucket = np.searchsorted(_HOUR_EDGES, hours.to_numpy(zero_copy_only=False)).astype(np.int16)
+        return pa.table({**_keys(batch, by), "bucket": bucket, "hours": hours})
+
+    keys = ["year", "month", *by]
+    columns = list(dict.fromkeys(["year", "month", "created_at", "resolved_at", *by]))
+    scanner = query.scan(RESOLVED_TICKETS, columns, start, end)
+    histogram = query.aggregate(scanner, [*keys, "bucket"], [("hours", "count"), ("hours", "sum")], prepare)
+    histogram = histogram.sort_by([(name, "ascending") for name in [*keys, "bucket"]])
+
+    groups = list(zip(*(histogram.column(name).to_pylist() for name in keys)))
+    counts = histogram.column("hours_count").to_numpy()
+    sums = histogram.column("hours_sum").to_numpy()
+    buckets = histogram.column("bucket").to_numpy()
+    # Representative value of each bucket: the geometric midpoint of its edges, clamped at both ends.
+    representative = np.concatenate([_HOUR_EDGES[:1], np.sqrt(_HOUR_EDGES[:-1] * _HOUR_EDGES[1:]), _HOUR_EDGES[-1:]])
+
+    rows: Dict[str, List[object]] = {name: [] for name in keys}
+    rows.update(tickets=[], mean_hours=[], **{_quantile_name(q): [] for q in quantiles})
+    boundaries = [index for index in range(1, len(groups)) if groups[index] != groups[index - 1]]
+    for begin, finish in zip([0, *boundaries], [*boundaries, len(groups)]) if groups else ():
+        total = int(counts[begin:finish].sum())
+        for name, value in zip(keys, groups[begin]):
+            rows[name].append(value)
+        rows["tickets"].append(total)
+        rows["mean_hours"].append(float(sums[begin:finish].sum()) / total)
+        cumulative = np.cumsum(counts[begin:finish])
+        for q in quantiles:
+            position = min(int(np.searchsorted(cumulative, q * total)), finish - begin - 1)
+            rows[_quantile_name(q)].append(float(representative[buckets[begin + position]]))
+    month_starts = _month_starts(pa.array(rows.pop("year"), pa.int64()), pa.array(rows.pop("month"), pa.int64()))
+    result = {name: pa.array(values, histogram.schema.field(name).type) for name, values in rows.items() if name in by}
+    return pa.table(
+        {
+            "month_start": month_starts,
+            **result,
+            "tickets": pa.array(rows["tickets"], pa.int64()),
+            **{name: pa.array(rows[name], pa.float64()) for name in ["mean_hours", *map(_quantile_name, quantiles)]},
+        }
+    )
+
+
+def _quantile_name(quantile: float) -> str:
+    return f"p{round(quantile * 100)}_hours"
@@ -0,0 +1,49 @@
+"""Merge the small files left behind by frequent writer commits into large ones.
+
+Meant to run on a schedule, like the Glue compaction job it stands in for:
+
+    PYTHONPATH=src python -m data_lake.glue_jobs.compact_tables --root .data/lake --table silver.resolved_tickets
+
+Only months before the current one (UTC) are compacted unless
+``--include-current`` is given, since compaction is not isolated from
+queries and writers of the same partition.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+from datetime import datetime, timezone
+
+from data_lake.tables import TABLES
+from data_lake.writer import DEFAULT_ROW_GROUP_ROWS, compact
+
+
+def run(args: argparse.Namespace) -> int:
+    now = datetime.now(timezone.utc)
+    reports = {}
+    for name in args.table:
+        report = compact(
+            args.root,
+            TABLES[name],
+            before=None if args.include_current else (now.year, now.month),
+            target_file_bytes=int(args.target_mb * 2**20),
+            row_group_rows=args.row_group_rows,
+        )
+        reports[name] = dataclasses.asdict(report)
+    print(json.dumps(reports, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", required=True, help="Lake root directory.")
+    parser.add_argument("--table", nargs="+", choices=sorted(TABLES), default=sorted(TABLES))
+    parser.add_argument("--target-mb", type=float, default=128.0, help="Size files are merged up to.")
+    parser.add_argument("--row-group-rows", type=int, default=DEFAULT_ROW_GROUP_ROWS)
+    parser.add_argument("--include-current", action="store_true", help="Also compact the current month.")
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
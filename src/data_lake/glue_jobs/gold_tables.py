@@ -0,0 +1,70 @@
+"""Recompute the monthly gold SLA and resolution-time tables from the silver resolved tickets.
+
+Each month in the range is aggregated with the queries in
+``data_lake.athena_queries.gold_metrics`` and written as the only file of its
+gold partition, replacing what a previous run wrote; a month left without rows
+gets an empty file, so no stale aggregate survives the rerun:
+
+    PYTHONPATH=src python -m data_lake.glue_jobs.gold_tables --root .data/lake --start 2026-01 --end 2026-03
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data_lake.athena_queries.gold_metrics import resolution_time_summary, sla_summary
+from data_lake.query import LakeQuery
+from data_lake.tables import RESOLUTION_TIME_MONTHLY, SLA_MONTHLY, TIMESTAMP, LakeTable
+from data_lake.writer import replace_partition
+
+
+def _month(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m").replace(tzinfo=timezone.utc)
+
+
+def _next_month(moment: datetime) -> datetime:
+    if moment.month == 12:
+        return moment.replace(year=moment.year + 1, month=1)
+    return moment.replace(month=moment.month + 1)
+
+
+def _publish(root: str, table: LakeTable, rows: pa.Table, start: datetime, end: datetime) -> List[str]:
+    written = []
+    month_start = start
+    while month_start < end:
+        # A month with no rows is still replaced, by an empty file, so an earlier run's aggregate cannot linger.
+        month_rows = rows.filter(pc.equal(rows.column("month_start"), pa.scalar(month_start, TIMESTAMP)))
+        replace_partition(root, table, (month_start.year, month_start.month), month_rows)
+        written.append(f"{month_start:%Y-%m}")
+        month_start = _next_month(month_start)
+    return written
+
+
+def run(args: argparse.Namespace) -> int:
+    query = LakeQuery(args.root)
+    start, end = _month(args.start), _next_month(_month(args.end))
+    written: Dict[str, List[str]] = {
+        SLA_MONTHLY.key: _publish(args.root, SLA_MONTHLY, sla_summary(query, start, end), start, end),
+        RESOLUTION_TIME_MONTHLY.key: _publish(
+            args.root, RESOLUTION_TIME_MONTHLY, resolution_time_summary(query, start, end), start, end
+        ),
+    }
+    print(json.dumps(written, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", required=True, help="Lake root directory.")
+    parser.add_argument("--start", required=True, help="First month to recompute, as YYYY-MM.")
+    parser.add_argument("--end", required=True, help="Last month to recompute, as YYYY-MM (inclusive).")
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Scan and aggregate lake tables with partition pruning, in bounded memory.
+
+Time ranges are turned into a predicate on the ``year``/``month`` partition
+keys as well as on the time column itself. Arrow evaluates the partition
+predicate against each directory's keys before opening any file, so a query
+over one month reads that month's files and nothing else; the row predicate
+then trims the partial months at either end using row-group statistics.
+
+:meth:`LakeQuery.aggregate` streams record batches and keeps only per-batch
+partial aggregates, merged as they pile up, so memory grows with the number
+of groups rather than with the rows scanned.
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from data_lake.tables import PARTITIONING, REPLACEMENT_GLOB, LakeTable, resolved_files
+
+Aggregation = Tuple[str, str]
+# How partial results of each aggregation are combined.
+_MERGE = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def partition_filter(start: Optional[datetime], end: Optional[datetime]) -> Optional[ds.Expression]:
+    """Predicate on ``year``/``month`` keeping the months that overlap ``[start, end)``."""
+    year, month = ds.field("year"), ds.field("month")
+    expression: Optional[ds.Expression] = None
+    if start is not None:
+        start = _utc(start)
+        expression = (year > start.year) | ((year == start.year) & (month >= start.month))
+    if end is not None:
+        # The month holding the last instant before ``end``.
+        last = _utc(end) - timedelta(microseconds=1)
+        upper = (year < last.year) | ((year == last.year) & (month <= last.month))
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def time_filter(column: str, start: Optional[datetime], end: Optional[datetime]) -> Optional[ds.Expression]:
+    expression: Optional[ds.Expression] = None
+    if start is not None:
+        expression = ds.field(column) >= pa.scalar(_utc(start), pa.timestamp("us", tz="UTC"))
+    if end is not None:
+        upper = ds.field(column) < pa.scalar(_utc(end), pa.timestamp("us", tz="UTC"))
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def _and(*expressions: Optional[ds.Expression]) -> Optional[ds.Expression]:
+    present = [expression for expression in expressions if expression is not None]
+    if not present:
+        return None
+    combined = present[0]
+    for expression in present[1:]:
+        combined = combined & expression
+    return combined
+
+
+class LakeQuery:
+    """Read-only access to the tables under ``root``.
+
+    Datasets are discovered on every call, so files published or compacted
+    since the last query are picked up without reopening anything. A table
+    with an unfinished file replacement is read as the replacement will
+    leave it, so a compaction interrupted mid-swap never shows rows twice.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], batch_rows: int = 1 << 20, use_threads: bool = True) -> None:
+        self.root = Path(root)
+        self._batch_rows = batch_rows
+        self._use_threads = use_threads
+
+    def dataset(self, table: LakeTable) -> ds.Dataset:
+        path = table.path(self.root)
+        schema = _with_partitions(table.schema)
+        if not path.exists():
+            return ds.dataset([], schema=schema)
+        if next(path.glob(f"year=*/month=*/{REPLACEMENT_GLOB}"), None) is not None:
+            files = [str(file) for _, directory in table.partitions(self.root) for file in resolved_files(directory)]
+            return ds.dataset(
+                files, format="parquet", partitioning=PARTITIONING, partition_base_dir=str(path), schema=schema
+            )
+        return ds.dataset(path, format="parquet", partitioning=PARTITIONING, schema=schema)
+
+    def files(self, table: LakeTable, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """Data files a query over ``[start, end)`` reads after partition pruning."""
+        fragments = self.dataset(table).get_fragments(filter=partition_filter(start, end))
+        return [fragment.path for fragment in fragments]
+
+    def scan(
+        self,
+        table: LakeTable,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filter: Optional[ds.Expression] = None,
+    ) -> ds.Scanner:
+        """Scanner over rows whose ``time_column`` lies in ``[start, end)`` and match ``filter``."""
+        expression = _and(partition_filter(start, end), time_filter(table.time_column, start, end), filter)
+        return self.dataset(table).scanner(
+            columns=list(columns) if columns is not None else None,
+            filter=expression,
+            batch_size=self._batch_rows,
+            use_threads=self._use_threads,
+        )
+
+    def read(
+        self,
+        table: LakeTable,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filter: Optional[ds.Expression] = None,
+    ) -> pa.Table:
+        return self.scan(table, columns, start, end, filter).to_table()
+
+    def aggregate(
+        self,
+        scanner: ds.Scanner,
+        keys: Sequence[str],
+        aggregations: Sequence[Aggregation],
+        prepare: Optional[Callable[[pa.RecordBatch], pa.Table]] = None,
+        merge_every: int = 64,
+    ) -> pa.Table:
+        """Group the scanned rows by ``keys`` with mergeable aggregations (sum, count, min, max).
+
+        ``prepare`` derives the key and measure columns from each scanned
+        batch. The result has the key columns followed by one
+        ``<column>_<aggregation>`` column per aggregation.
+        """
+        names = [f"{column}_{function}" for column, function in aggregations]
+        merge = [(name, _MERGE[function]) for name, (_, function) in zip(names, aggregations)]
+        partials: List[pa.Table] = []
+        for batch in scanner.to_batches():
+            if not batch.num_rows:
+                continue
+            table = prepare(batch) if prepare is not None else pa.Table.from_batches([batch])
+            partial = table.group_by(list(keys), use_threads=False).aggregate(list(aggregations))
+            partials.append(partial.select([*keys, *names]))
+            if len(partials) >= merge_every:
+                partials = [_merge(partials, keys, merge, names)]
+        if not partials:
+            # Aggregate an empty batch so the result still has the right column types.
+            empty = pa.RecordBatch.from_pylist([], schema=scanner.projected_schema)
+            table = prepare(empty) if prepare is not None else pa.Table.from_batches([empty])
+            return table.group_by(list(keys), use_threads=False).aggregate(list(aggregations)).select([*keys, *names])
+        return _merge(partials, keys, merge, names)
+
+
+def _merge(partials: List[pa.Table], keys: Sequence[str], merge: Sequence[Aggregation], names: List[str]) -> pa.Table:
+    combined = pa.concat_tables(partials, promote_options="permissive")
+    merged = combined.group_by(list(keys), use_threads=False).aggregate(list(merge))
+    # group_by names the merged columns "<name>_<merge>"; restore the original names.
+    return merged.select([*keys, *(f"{name}_{function}" for name, function in merge)]).rename_columns([*keys, *names])
+
+
+def _with_partitions(schema: pa.Schema) -> pa.Schema:
+    return schema.append(pa.field("year", pa.int16())).append(pa.field("month", pa.int8()))
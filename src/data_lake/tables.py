@@ -0,0 +1,180 @@
+"""Layout of the local ticket lake: layers, tables, schemas and year/month partitioning.
+
+Every table lives under ``<root>/<layer>/<name>/year=YYYY/month=MM/`` and is
+partitioned by the calendar month (UTC) of its ``time_column``, matching the
+``s3://ticket-data/bronze/year=2026/month=02/`` layout of the S3 lakehouse.
+Data files are named ``part-*.parquet``; files still being written start
+with a dot, which Arrow dataset discovery skips, so readers only ever see
+complete files.
+
+Replacing files of a partition (compaction, recomputed aggregates) first
+records a hidden ``.replace-*.json`` manifest naming the files going away
+and the staged files taking their place. Until the swap finishes the
+manifest is the source of truth: :func:`resolved_files` lists a partition
+as it will look afterwards, and an interrupted swap is completed by the
+next writer that replaces files there, so rows are never visible twice.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Literal, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+Layer = Literal["bronze", "silver", "gold"]
+Partition = Tuple[int, int]
+
+PARTITION_SCHEMA = pa.schema([pa.field("year", pa.int16()), pa.field("month", pa.int8())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+_PARTITION_PATTERN = re.compile(r"^year=(\d{4})/month=(\d{2})$")
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+REPLACEMENT_GLOB = ".replace-*.json"
+
+
+@dataclass(frozen=True, slots=True)
+class LakeTable:
+    layer: Layer
+    name: str
+    schema: pa.Schema
+    time_column: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.layer}.{self.name}"
+
+    def path(self, root: str | os.PathLike[str]) -> Path:
+        return Path(root) / self.layer / self.name
+
+    def partition_path(self, root: str | os.PathLike[str], partition: Partition) -> Path:
+        year, month = partition
+        return self.path(root) / f"year={year:04d}" / f"month={month:02d}"
+
+    def partitions(self, root: str | os.PathLike[str]) -> Iterator[Tuple[Partition, Path]]:
+        """Existing partition directories in chronological order."""
+        base = self.path(root)
+        found: List[Tuple[Partition, Path]] = []
+        for directory in base.glob("year=*/month=*"):
+            match = _PARTITION_PATTERN.match(directory.relative_to(base).as_posix())
+            if match and directory.is_dir():
+                found.append(((int(match.group(1)), int(match.group(2))), directory))
+        yield from sorted(found)
+
+
+def data_files(directory: Path) -> List[Path]:
+    """Complete data files of one partition, oldest name first."""
+    return sorted(path for path in directory.glob("part-*.parquet") if path.is_file())
+
+
+def staged_path(path: Path) -> Path:
+    """Hidden name a data file is written under before it is published."""
+    return path.with_name(f".{path.name}")
+
+
+@dataclass(frozen=True, slots=True)
+class Replacement:
+    """Recorded intent to swap ``inputs`` of a partition for the staged ``outputs``."""
+
+    manifest: Path
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+def pending_replacements(directory: Path) -> List[Replacement]:
+    """Replacements of one partition that were recorded but not finished, oldest first."""
+    found = []
+    for manifest in sorted(directory.glob(REPLACEMENT_GLOB)):
+        plan = json.loads(manifest.read_text())
+        found.append(Replacement(manifest, tuple(plan["inputs"]), tuple(plan["outputs"])))
+    return found
+
+
+def resolved_files(directory: Path) -> List[Path]:
+    """Data files of one partition with every pending replacement applied, oldest name first."""
+    files = {path.name: path for path in data_files(directory)}
+    for replacement in pending_replacements(directory):
+        for name in replacement.inputs:
+            files.pop(name, None)
+        for name in replacement.outputs:
+            path = directory / name
+            if not path.exists():
+                path = staged_path(path)
+            if path.exists():
+                files[name] = path
+    return [files[name] for name in sorted(files)]
+
+
+# One row per resolved ticket; the facts SLA and resolution-time analytics are computed from.
+RESOLVED_TICKETS = LakeTable(
+    "silver",
+    "resolved_tickets",
+    pa.schema(
+        [
+            pa.field("ticket_id", pa.string(), nullable=False),
+            pa.field("customer_id", pa.string()),
+            pa.field("created_at", TIMESTAMP, nullable=False),
+            pa.field("resolved_at", TIMESTAMP, nullable=False),
+            pa.field("priority", pa.string(), nullable=False),
+            pa.field("category", pa.string()),
+            pa.field("status", pa.string()),
+        ]
+    ),
+    time_column="created_at",
+)
+
+# Every prediction served, as logged by the inference path.
+PREDICTIONS = LakeTable(
+    "bronze",
+    "predictions",
+    pa.schema(
+        [
+            pa.field("ticket_id", pa.string(), nullable=False),
+            pa.field("predicted_at", TIMESTAMP, nullable=False),
+            pa.field("model_version", pa.string()),
+            pa.field("predicted_category", pa.string()),
+            pa.field("confidence", pa.float32()),
+            pa.field("predicted_resolution_hours", pa.float32()),
+        ]
+    ),
+    time_column="predicted_at",
+)
+
+SLA_MONTHLY = LakeTable(
+    "gold",
+    "sla_monthly",
+    pa.schema(
+        [
+            pa.field("month_start", TIMESTAMP, nullable=False),
+            pa.field("priority", pa.string()),
+            pa.field("tickets", pa.int64(), nullable=False),
+            pa.field("breached", pa.int64(), nullable=False),
+            pa.field("breach_ratio", pa.float64(), nullable=False),
+            pa.field("mean_resolution_hours", pa.float64(), nullable=False),
+        ]
+    ),
+    time_column="month_start",
+)
+
+RESOLUTION_TIME_MONTHLY = LakeTable(
+    "gold",
+    "resolution_time_monthly",
+    pa.schema(
+        [
+            pa.field("month_start", TIMESTAMP, nullable=False),
+            pa.field("category", pa.string()),
+            pa.field("tickets", pa.int64(), nullable=False),
+            pa.field("mean_hours", pa.float64(), nullable=False),
+            pa.field("p50_hours", pa.float64(), nullable=False),
+            pa.field("p90_hours", pa.float64(), nullable=False),
+        ]
+    ),
+    time_column="month_start",
+)
+
+TABLES: Dict[str, LakeTable] = {
+    table.key: table for table in (RESOLVED_TICKETS, PREDICTIONS, SLA_MONTHLY, RESOLUTION_TIME_MONTHLY)
+}
@@ -0,0 +1,341 @@
+"""Append rows to partitioned Parquet tables with size-based file rolling, and compact small files.
+
+:class:`PartitionedWriter` routes each appended row to its year/month
+partition and buffers rows per partition until a full row group is ready,
+so many small appends (one CDC flush, one batch of predictions) still
+produce large row groups. Each partition has at most one open file, written
+under a hidden name and renamed into place once it reaches
+``target_file_bytes`` or on :meth:`~PartitionedWriter.commit`.
+
+Frequent commits leave small files behind; :func:`compact` rewrites the small
+files of a partition into as few ``target_file_bytes`` files as possible.
+It and :func:`replace_partition` swap files through a replacement manifest
+(see :mod:`data_lake.tables`) so that a crash mid-swap never publishes the
+same rows twice; the next swap in that partition, or
+:func:`recover_partition`, finishes it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data_lake.tables import (
+    LakeTable,
+    Partition,
+    Replacement,
+    data_files,
+    pending_replacements,
+    staged_path,
+)
+
+DEFAULT_TARGET_FILE_BYTES = 128 * 2**20
+DEFAULT_ROW_GROUP_ROWS = 256 * 1024
+
+
+def conform(data: pa.Table | pa.RecordBatch, schema: pa.Schema) -> pa.Table:
+    """Select and cast ``data`` to ``schema``; missing nullable columns become nulls."""
+    rows = data.num_rows
+    columns = []
+    for field in schema:
+        if field.name in data.schema.names:
+            column = data.column(field.name).cast(field.type)
+            if not field.nullable and column.null_count:
+                raise ValueError(f"Column {field.name!r} must not contain nulls.")
+            columns.append(column)
+        elif field.nullable:
+            columns.append(pa.nulls(rows, field.type))
+        else:
+            raise ValueError(f"Missing required column {field.name!r}.")
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def partition_codes(table: pa.Table, time_column: str) -> np.ndarray:
+    """``year * 100 + month`` of every row, in UTC."""
+    times = table.column(time_column)
+    years = pc.year(times).to_numpy().astype(np.int32)
+    return years * 100 + pc.month(times).to_numpy().astype(np.int32)
+
+
+class _PartitionFile:
+    """One Parquet file being written under a hidden name, published by :meth:`close` or :meth:`publish`."""
+
+    def __init__(self, directory: Path, schema: pa.Schema, compression: str) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:12]}.parquet"
+        self.path = directory / name
+        self._staging = staged_path(self.path)
+        self._sink = pa.OSFile(str(self._staging), "wb")
+        self._writer = pq.ParquetWriter(self._sink, schema, compression=compression)
+        self.rows = 0
+
+    @property
+    def bytes_written(self) -> int:
+        return self._sink.tell()
+
+    def write(self, table: pa.Table, row_group_rows: int) -> None:
+        self._writer.write_table(table, row_group_size=row_group_rows)
+        self.rows += table.num_rows
+
+    def close(self) -> Path:
+        self._writer.close()
+        self._sink.close()
+        return self.publish()
+
+    def seal(self) -> None:
+        """Finish and fsync the file without publishing it."""
+        self._writer.close()
+        self._sink.close()
+        with open(self._staging, "rb") as handle:
+            os.fsync(handle.fileno())
+
+    def publish(self) -> Path:
+        os.replace(self._staging, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._writer.close()
+        self._sink.close()
+        self._staging.unlink(missing_ok=True)
+
+
+class PartitionedWriter:
+    """Append-only writer of one lake table; not thread-safe, use one per producer.
+
+    Rows become visible to readers when their file is published: when it
+    reaches ``target_file_bytes``, when more than ``max_open_files``
+    partitions are being written and it is the least recently used, or on
+    :meth:`commit`. Buffered rows across all partitions are capped at
+    ``max_open_files * row_group_rows``; beyond that the largest buffer is
+    written out early as a smaller row group.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        table: LakeTable,
+        target_file_bytes: int = DEFAULT_TARGET_FILE_BYTES,
+        row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+        max_open_files: int = 8,
+        compression: str = "zstd",
+    ) -> None:
+        self.root = Path(root)
+        self.table = table
+        self._target_file_bytes = target_file_bytes
+        self._row_group_rows = row_group_rows
+        self._max_open_files = max_open_files
+        self._compression = compression
+        self._buffers: Dict[Partition, List[pa.Table]] = {}
+        self._buffered_rows: Dict[Partition, int] = {}
+        self._files: "OrderedDict[Partition, _PartitionFile]" = OrderedDict()
+        self._published: List[Path] = []
+
+    def __enter__(self) -> "PartitionedWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if exc_info[0] is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def append(self, data: pa.Table | pa.RecordBatch) -> int:
+        """Buffer ``data`` in its partitions; return the number of rows appended."""
+        table = conform(data, self.table.schema)
+        if not table.num_rows:
+            return 0
+        codes = partition_codes(table, self.table.time_column)
+        if (codes == codes[0]).all():
+            self._buffer((int(codes[0]) // 100, int(codes[0]) % 100), table)
+        else:
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts, ends):
+                code = int(sorted_codes[start])
+                self._buffer((code // 100, code % 100), table.take(pa.array(order[start:end])))
+        return table.num_rows
+
+    def commit(self) -> List[Path]:
+        """Write every buffered row and publish all open files; return the files published since the last commit."""
+        for partition in list(self._buffers):
+            self._write(partition)
+        while self._files:
+            self._publish(next(iter(self._files)))
+        published, self._published = self._published, []
+        return published
+
+    def abort(self) -> None:
+        """Drop buffered rows and unpublished files."""
+        self._buffers.clear()
+        self._buffered_rows.clear()
+        for open_file in self._files.values():
+            open_file.abort()
+        self._files.clear()
+
+    def _buffer(self, partition: Partition, table: pa.Table) -> None:
+        self._buffers.setdefault(partition, []).append(table)
+        self._buffered_rows[partition] = self._buffered_rows.get(partition, 0) + table.num_rows
+        if self._buffered_rows[partition] >= self._row_group_rows:
+            self._write(partition, whole_row_groups=True)
+        if sum(self._buffered_rows.values()) > self._max_open_files * self._row_group_rows:
+            self._write(max(self._buffered_rows, key=self._buffered_rows.__getitem__))
+
+    def _write(self, partition: Partition, whole_row_groups: bool = False) -> None:
+        pending = pa.concat_tables(self._buffers.pop(partition))
+        del self._buffered_rows[partition]
+        if whole_row_groups:
+            # Keep the tail buffered so it becomes part of the next full row group.
+            full = pending.num_rows - pending.num_rows % self._row_group_rows
+            if full < pending.num_rows:
+                self._buffers[partition] = [pending.slice(full)]
+                self._buffered_rows[partition] = pending.num_rows - full
+                pending = pending.slice(0, full)
+        open_file = self._files.get(partition)
+        if open_file is None:
+            if len(self._files) >= self._max_open_files:
+                self._publish(next(iter(self._files)))
+            open_file = _PartitionFile(
+                self.table.partition_path(self.root, partition), self.table.schema, self._compression
+            )
+            self._files[partition] = open_file
+        self._files.move_to_end(partition)
+        open_file.write(pending, self._row_group_rows)
+        if open_file.bytes_written >= self._target_file_bytes:
+            self._publish(partition)
+
+    def _publish(self, partition: Partition) -> None:
+        self._published.append(self._files.pop(partition).close())
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    partitions: int
+    files_in: int
+    files_out: int
+    rows: int
+    seconds: float
+
+
+def compact(
+    root: str | os.PathLike[str],
+    table: LakeTable,
+    partitions: Optional[Iterable[Partition]] = None,
+    before: Optional[Partition] = None,
+    target_file_bytes: int = DEFAULT_TARGET_FILE_BYTES,
+    small_file_bytes: Optional[int] = None,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    compression: str = "zstd",
+) -> CompactionReport:
+    """Merge the files smaller than ``small_file_bytes`` (default half the target) in each partition.
+
+    Only ``partitions`` (default: all) strictly older than ``before`` are
+    touched, but replacements interrupted earlier are finished in every
+    partition first. The merged files are staged and recorded in a
+    replacement manifest before any input is removed, so a crash leaves
+    either the inputs or the merged files, never both. A scan running
+    concurrently can still fail on a removed file, which is why the
+    maintenance job only compacts closed months. Files published by writers
+    while compaction runs are left alone.
+    """
+    start = time.perf_counter()
+    small_file_bytes = target_file_bytes // 2 if small_file_bytes is None else small_file_bytes
+    wanted = None if partitions is None else set(partitions)
+    report = CompactionReport(partitions=0, files_in=0, files_out=0, rows=0, seconds=0.0)
+    for partition, directory in table.partitions(root):
+        recover_partition(directory)
+        if (wanted is not None and partition not in wanted) or (before is not None and partition >= before):
+            continue
+        small = [path for path in data_files(directory) if path.stat().st_size < small_file_bytes]
+        if len(small) < 2:
+            continue
+        outputs: List[_PartitionFile] = []
+        pending: List[pa.Table] = []
+
+        def write_pending() -> None:
+            if not outputs or outputs[-1].bytes_written >= target_file_bytes:
+                outputs.append(_PartitionFile(directory, table.schema, compression))
+            outputs[-1].write(pa.concat_tables(pending), row_group_rows)
+            pending.clear()
+
+        try:
+            for path in small:
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=row_group_rows):
+                    pending.append(conform(batch, table.schema))
+                    if sum(part.num_rows for part in pending) >= row_group_rows:
+                        write_pending()
+            if pending:
+                write_pending()
+        except BaseException:
+            for output in outputs:
+                output.abort()
+            raise
+        _replace_files(directory, small, outputs)
+        report.partitions += 1
+        report.files_in += len(small)
+        report.files_out += len(outputs)
+        report.rows += sum(output.rows for output in outputs)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def replace_partition(
+    root: str | os.PathLike[str], table: LakeTable, partition: Partition, data: pa.Table, compression: str = "zstd"
+) -> Path:
+    """Publish ``data`` as the only file of ``partition``; used for recomputed gold aggregates."""
+    directory = table.partition_path(root, partition)
+    recover_partition(directory)
+    previous = data_files(directory)
+    output = _PartitionFile(directory, table.schema, compression)
+    try:
+        output.write(conform(data, table.schema), DEFAULT_ROW_GROUP_ROWS)
+    except BaseException:
+        output.abort()
+        raise
+    _replace_files(directory, previous, [output])
+    return output.path
+
+
+def recover_partition(directory: Path) -> int:
+    """Finish the replacements a crash interrupted in one partition; return how many there were."""
+    pending = pending_replacements(directory)
+    for replacement in pending:
+        _finish_replacement(replacement)
+    return len(pending)
+
+
+def _replace_files(directory: Path, inputs: Sequence[Path], outputs: Sequence[_PartitionFile]) -> None:
+    for output in outputs:
+        output.seal()
+    manifest = directory / f".replace-{time.time_ns():020d}-{uuid.uuid4().hex[:12]}.json"
+    staging = manifest.with_name(f"{manifest.name}.tmp")
+    plan = {"inputs": [path.name for path in inputs], "outputs": [output.path.name for output in outputs]}
+    with open(staging, "w", encoding="utf-8") as handle:
+        json.dump(plan, handle)
+        handle.flush()
+        os.fsync(handle.fileno())
+    # From here on the swap is committed: readers resolve the manifest and recovery rolls it forward.
+    os.replace(staging, manifest)
+    _finish_replacement(Replacement(manifest, tuple(plan["inputs"]), tuple(plan["outputs"])))
+
+
+def _finish_replacement(replacement: Replacement) -> None:
+    directory = replacement.manifest.parent
+    for name in replacement.inputs:
+        (directory / name).unlink(missing_ok=True)
+    for name in replacement.outputs:
+        staged = staged_path(directory / name)
+        if staged.exists():
+            os.replace(staged, directory / name)
+    replacement.manifest.unlink()
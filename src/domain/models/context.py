@@ -0,0 +1,16 @@
+"""Domain representation of the context used to ground auto-resolutions."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+from domain.models.conversation import ConversationTurn
+from domain.models.results import SimilarTicket
+
+
+@dataclass(slots=True)
+class ResolutionContext:
+    """Pre-fetched grounding material supplied by the caller instead of being retrieved again."""
+
+    similar_tickets: List[SimilarTicket] = field(default_factory=list)
+    history: List[ConversationTurn] = field(default_factory=list)
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import AsyncIterator, List
 
-from src.app.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_category import TicketCategory
 
 
 @dataclass(slots=True)
@@ -23,9 +23,16 @@ class SimilarTicket:
     ticket_id: str
     similarity_score: float
     summary: str
+    near_duplicate: bool = False
 
 
 @dataclass(slots=True)
 class AutoResolutionOutcome:
     response: str
     grounding_ticket_ids: List[str]
+
+
+@dataclass(slots=True)
+class AutoResolutionStream:
+    grounding_ticket_ids: List[str]
+    tokens: AsyncIterator[str]
@@ -5,8 +5,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from src.app.value_objects.ticket_priority import TicketPriority
-from src.app.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_priority import TicketPriority
+from domain.value_objects.ticket_category import TicketCategory
 
 
 @dataclass(slots=True)
@@ -0,0 +1,258 @@
+"""Local conversation memory with bounded per-ticket history and a write-behind log.
+
+Every ticket keeps its most recent turns in an in-memory ring buffer, so reading
+the last ``N`` turns costs ``O(N)`` regardless of how long the thread is.
+Appends update memory and enqueue a record for a background writer thread,
+which batches records into an append-only JSON-lines log and fsyncs on an
+interval, so callers never wait on disk. The writer periodically compacts the
+retained state into a snapshot and starts a fresh log; recovery loads the
+snapshot and replays only log records newer than it.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from domain.models.conversation import ConversationTurn
+from domain.services.interfaces import ConversationService
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+LOG_FILE = "turns.log"
+
+_Record = Tuple[int, ConversationTurn]
+_STOP = object()
+_MAX_WRITE_BATCH = 4096
+
+
+def _encode(seq: int, turn: ConversationTurn) -> str:
+    return json.dumps(
+        {
+            "seq": seq,
+            "ticket_id": turn.ticket_id,
+            "user_message": turn.user_message,
+            "assistant_message": turn.assistant_message,
+            "created_at": turn.created_at.isoformat(),
+        },
+        ensure_ascii=False,
+    )
+
+
+def _decode(payload: Dict[str, Any]) -> _Record:
+    return payload["seq"], ConversationTurn(
+        ticket_id=payload["ticket_id"],
+        user_message=payload["user_message"],
+        assistant_message=payload["assistant_message"],
+        created_at=datetime.fromisoformat(payload["created_at"]),
+    )
+
+
+def _epoch_seconds(moment: datetime) -> float:
+    # The API layer stamps turns with naive UTC datetimes.
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a torn final line; everything before it is intact.
+                return
+
+
+class LocalConversationStore(ConversationService):
+    """Conversation memory bounded by turn count and age, persisted to local disk."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_turns_per_ticket: int = 200,
+        max_age: Optional[timedelta] = timedelta(days=30),
+        fsync_interval_seconds: float = 1.0,
+        compaction_interval_seconds: float = 300.0,
+        compaction_min_records: int = 10_000,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_turns = max_turns_per_ticket
+        self._max_age = max_age
+        self._fsync_interval = fsync_interval_seconds
+        self._compaction_interval = compaction_interval_seconds
+        self._compaction_min_records = compaction_min_records
+        self._threads: Dict[str, Deque[_Record]] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._seq = 0
+        self._records_since_snapshot = 0
+        self.recovery_seconds = self._recover()
+        self._log = open(self._directory / LOG_FILE, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._write_loop, name="conversation-log-writer", daemon=True)
+        self._writer.start()
+
+    async def append_turn(self, turn: ConversationTurn) -> None:
+        with self._lock:
+            self._seq += 1
+            record = (self._seq, turn)
+            self._buffer(turn.ticket_id).append(record)
+            # Enqueue under the lock so the log is written in sequence order.
+            self._queue.put(record)
+
+    async def get_history(self, ticket_id: str, limit: int = 10) -> list[ConversationTurn]:
+        with self._lock:
+            buffer = self._threads.get(ticket_id)
+            if not buffer:
+                return []
+            self._expire(buffer)
+            if not buffer:
+                del self._threads[ticket_id]
+                return []
+            newest = list(itertools.islice(reversed(buffer), limit))
+        return [turn for _, turn in reversed(newest)]
+
+    def flush(self) -> None:
+        """Block until every queued record has been written and fsynced."""
+        done = threading.Event()
+        self._queue.put(done)
+        self._wait(done)
+
+    def compact(self) -> None:
+        """Block until the retained state has been written to a fresh snapshot."""
+        done = threading.Event()
+        self._queue.put(("compact", done))
+        self._wait(done)
+
+    def close(self) -> None:
+        """Flush pending records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        if not self._log.closed:
+            self._log.close()
+
+    def _wait(self, done: threading.Event) -> None:
+        while not done.wait(timeout=0.1):
+            if not self._writer.is_alive():
+                raise RuntimeError("The conversation log writer thread has stopped; records are not persisted.")
+
+    def _buffer(self, ticket_id: str) -> Deque[_Record]:
+        buffer = self._threads.get(ticket_id)
+        if buffer is None:
+            buffer = self._threads[ticket_id] = deque(maxlen=self._max_turns)
+        return buffer
+
+    def _expire(self, buffer: Deque[_Record]) -> None:
+        if self._max_age is None:
+            return
+        cutoff = time.time() - self._max_age.total_seconds()
+        while buffer and _epoch_seconds(buffer[0][1].created_at) < cutoff:
+            buffer.popleft()
+
+    def _recover(self) -> float:
+        start = time.perf_counter()
+        last_snapshot_seq = 0
+        snapshot = _read_jsonl(self._directory / SNAPSHOT_FILE)
+        header = next(snapshot, None)
+        if header is not None:
+            last_snapshot_seq = header["last_seq"]
+            for payload in snapshot:
+                seq, turn = _decode(payload)
+                self._buffer(turn.ticket_id).append((seq, turn))
+        self._seq = last_snapshot_seq
+        for payload in _read_jsonl(self._directory / LOG_FILE):
+            if payload["seq"] <= last_snapshot_seq:
+                continue
+            seq, turn = _decode(payload)
+            self._buffer(turn.ticket_id).append((seq, turn))
+            self._seq = max(self._seq, seq)
+            self._records_since_snapshot += 1
+        for ticket_id, buffer in list(self._threads.items()):
+            self._expire(buffer)
+            if not buffer:
+                del self._threads[ticket_id]
+        return time.perf_counter() - start
+
+    def _write_loop(self) -> None:
+        last_fsync = last_compaction = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self._fsync_interval)
+            except queue.Empty:
+                item = None
+            items = [item] if item is not None else []
+            while len(items) < _MAX_WRITE_BATCH:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            waiters: List[threading.Event] = []
+            compact_waiters: List[threading.Event] = []
+            lines = []
+            for entry in items:
+                if entry is _STOP:
+                    stop = True
+                elif isinstance(entry, threading.Event):
+                    waiters.append(entry)
+                elif isinstance(entry, tuple) and entry[0] == "compact":
+                    compact_waiters.append(entry[1])
+                else:
+                    lines.append(_encode(*entry))  # type: ignore[misc]
+            if lines:
+                self._log.write("\n".join(lines) + "\n")
+                self._log.flush()
+                self._records_since_snapshot += len(lines)
+                dirty = True
+
+            now = time.monotonic()
+            if dirty and (waiters or stop or now - last_fsync >= self._fsync_interval):
+                os.fsync(self._log.fileno())
+                last_fsync, dirty = now, False
+            if compact_waiters or (
+                now - last_compaction >= self._compaction_interval
+                and self._records_since_snapshot >= self._compaction_min_records
+            ):
+                self._write_snapshot()
+                last_compaction, last_fsync, dirty = now, now, False
+            for event in waiters + compact_waiters:
+                event.set()
+            if stop:
+                return
+
+    def _write_snapshot(self) -> None:
+        # Records still queued are already in memory; the snapshot skips those
+        # newer than last_seq, they land in the fresh log instead.
+        with self._lock:
+            last_seq = self._seq
+            tickets = list(self._threads.items())
+        temporary = self._directory / (SNAPSHOT_FILE + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps({"last_seq": last_seq}) + "\n")
+            for ticket_id, buffer in tickets:
+                # Hold the lock for one ticket's bounded history at a time, never while encoding.
+                with self._lock:
+                    self._expire(buffer)
+                    if not buffer and self._threads.get(ticket_id) is buffer:
+                        del self._threads[ticket_id]
+                    records = list(buffer)
+                handle.writelines(_encode(seq, turn) + "\n" for seq, turn in records if seq <= last_seq)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._directory / SNAPSHOT_FILE)
+        self._log.close()
+        self._log = open(self._directory / LOG_FILE, "w", encoding="utf-8")
+        self._records_since_snapshot = 0
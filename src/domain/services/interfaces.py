@@ -3,20 +3,25 @@ from __future__ import annotations
 
 from typing import Protocol
 
-from src.app.models.conversation import ConversationTurn
-from src.app.models.results import (
+from domain.models.context import ResolutionContext
+from domain.models.conversation import ConversationTurn
+from domain.models.results import (
     AutoResolutionOutcome,
+    AutoResolutionStream,
     ClassificationOutcome,
     ResolutionTimeOutcome,
     SimilarTicket,
 )
-from src.app.models.ticket import Ticket
+from domain.models.ticket import Ticket
 
 
 class ClassificationService(Protocol):
     async def classify(self, ticket: Ticket) -> ClassificationOutcome:
         """Return the predicted ticket category."""
 
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        """Return predicted categories for a batch of tickets, preserving input order."""
+
 
 class ResolutionTimeService(Protocol):
     async def estimate(self, ticket: Ticket) -> ResolutionTimeOutcome:
@@ -29,9 +34,14 @@ class SimilarityService(Protocol):
 
 
 class AutoResolutionService(Protocol):
-    async def generate(self, ticket: Ticket) -> AutoResolutionOutcome:
+    async def generate(self, ticket: Ticket, context: ResolutionContext | None = None) -> AutoResolutionOutcome:
         """Return an auto-generated resolution grounded in historical knowledge."""
 
+    async def generate_stream(
+        self, ticket: Ticket, context: ResolutionContext | None = None
+    ) -> AutoResolutionStream:
+        """Return grounding ticket ids and an async iterator over response tokens as they are generated."""
+
 
 class ConversationService(Protocol):
     async def append_turn(self, turn: ConversationTurn) -> None:
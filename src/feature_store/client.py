@@ -0,0 +1,187 @@
+"""Read-through, coalescing feature store client for the inference path."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from .definitions.customer import CustomerFeatures
+from .online_store import FeatureRecord, OnlineFeatureStore
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class FeatureClientStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    store_calls: int = 0
+    refresh_failures: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+
+class FeatureStoreClient(Generic[T]):
+    """Batched multi-get over one feature group with a TTL cache and request coalescing.
+
+    Entries younger than ``ttl_seconds`` are served from memory. Entries between
+    the TTL and ``max_staleness_seconds`` are still served, but trigger one
+    background refresh; older entries are never served. Concurrent lookups of
+    an identifier that is already being fetched wait on the in-flight fetch
+    instead of issuing another store call. Absent records are cached as
+    ``None`` under the same rules.
+    """
+
+    def __init__(
+        self,
+        store: OnlineFeatureStore,
+        feature_group: str,
+        decode: Callable[[FeatureRecord], T],
+        ttl_seconds: float = 60.0,
+        max_staleness_seconds: float = 300.0,
+        max_entries: int = 100_000,
+        max_batch_size: int = 100,
+    ) -> None:
+        if max_staleness_seconds < ttl_seconds:
+            raise ValueError("max_staleness_seconds must be at least ttl_seconds.")
+        self._store = store
+        self._feature_group = feature_group
+        self._decode = decode
+        self._ttl = ttl_seconds
+        self._max_staleness = max_staleness_seconds
+        self._max_entries = max_entries
+        self._max_batch_size = max_batch_size
+        self._cache: "OrderedDict[str, Tuple[float, Optional[T]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future[Optional[T]]] = {}
+        self._refreshing: set[asyncio.Task[None]] = set()
+        self.stats = FeatureClientStats()
+
+    async def get(self, record_id: str) -> Optional[T]:
+        return (await self.get_many([record_id]))[record_id]
+
+    async def get_many(self, record_ids: Iterable[str]) -> Dict[str, Optional[T]]:
+        """Return features for every identifier, ``None`` where the store has no record."""
+        now = time.monotonic()
+        results: Dict[str, Optional[T]] = {}
+        waiting: Dict[str, asyncio.Future[Optional[T]]] = {}
+        to_fetch: List[str] = []
+        stale: List[str] = []
+        for record_id in dict.fromkeys(record_ids):
+            entry = self._cache.get(record_id)
+            if entry is not None:
+                age = now - entry[0]
+                if age <= self._ttl:
+                    self._cache.move_to_end(record_id)
+                    results[record_id] = entry[1]
+                    self.stats.hits += 1
+                    continue
+                if age <= self._max_staleness:
+                    results[record_id] = entry[1]
+                    self.stats.stale_hits += 1
+                    stale.append(record_id)
+                    continue
+            future = self._inflight.get(record_id)
+            if future is not None:
+                waiting[record_id] = future
+                self.stats.coalesced += 1
+            else:
+                to_fetch.append(record_id)
+                self.stats.misses += 1
+
+        # Stale identifiers ride along with the misses so a refresh never costs an extra round trip.
+        refresh = [record_id for record_id in stale if record_id not in self._inflight]
+        if to_fetch or refresh:
+            fetched = self._fetch(to_fetch + refresh)
+            for record_id in to_fetch:
+                waiting[record_id] = fetched[record_id]
+            for record_id in refresh:
+                # Stale values were already served; a failed refresh only means they age out.
+                fetched[record_id].add_done_callback(self._note_refresh_result)
+        for record_id, future in waiting.items():
+            results[record_id] = await asyncio.shield(future)
+        return results
+
+    def invalidate(self, record_ids: Iterable[str]) -> None:
+        """Drop cached entries so the next lookup reads through to the store."""
+        for record_id in record_ids:
+            self._cache.pop(record_id, None)
+
+    def _fetch(self, record_ids: List[str]) -> Dict[str, asyncio.Future[Optional[T]]]:
+        loop = asyncio.get_running_loop()
+        futures = {record_id: loop.create_future() for record_id in record_ids}
+        self._inflight.update(futures)
+        for start in range(0, len(record_ids), self._max_batch_size):
+            chunk = record_ids[start : start + self._max_batch_size]
+            task = loop.create_task(self._load(chunk, futures))
+            self._refreshing.add(task)
+            task.add_done_callback(self._refreshing.discard)
+        return futures
+
+    async def _load(self, record_ids: List[str], futures: Dict[str, asyncio.Future[Optional[T]]]) -> None:
+        try:
+            self.stats.store_calls += 1
+            records = await self._store.batch_get(self._feature_group, record_ids)
+            fetched_at = time.monotonic()
+            for record_id in record_ids:
+                record = records.get(record_id)
+                value = self._decode(record) if record is not None else None
+                self._remember(record_id, fetched_at, value)
+                self._settle(futures[record_id], result=value)
+        except BaseException as exc:
+            for record_id in record_ids:
+                self._settle(futures[record_id], error=exc)
+            if not isinstance(exc, Exception):
+                raise
+        finally:
+            for record_id in record_ids:
+                if self._inflight.get(record_id) is futures[record_id]:
+                    del self._inflight[record_id]
+
+    def _note_refresh_result(self, future: asyncio.Future[Optional[T]]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.stats.refresh_failures += 1
+
+    def _remember(self, record_id: str, fetched_at: float, value: Optional[T]) -> None:
+        self._cache[record_id] = (fetched_at, value)
+        self._cache.move_to_end(record_id)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _settle(
+        future: asyncio.Future[Optional[T]], result: Optional[T] = None, error: Optional[BaseException] = None
+    ) -> None:
+        if future.done():
+            return
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+
+
+def customer_feature_client(
+    store: OnlineFeatureStore,
+    feature_group: str,
+    ttl_seconds: float = 60.0,
+    max_staleness_seconds: float = 300.0,
+    max_entries: int = 100_000,
+) -> FeatureStoreClient[CustomerFeatures]:
+    """Return a client decoding records of the customer feature group."""
+    return FeatureStoreClient(
+        store,
+        feature_group,
+        CustomerFeatures.from_record,
+        ttl_seconds=ttl_seconds,
+        max_staleness_seconds=max_staleness_seconds,
+        max_entries=max_entries,
+        max_batch_size=getattr(store, "max_batch_size", 100),
+    )
@@ -0,0 +1,40 @@
+"""Customer feature group definition."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+CUSTOMER_RECORD_IDENTIFIER = "customer_id"
+CUSTOMER_FEATURE_NAMES = ("avg_resolution_time", "ticket_count_30d", "sla_breach_ratio")
+
+
+@dataclass(slots=True)
+class CustomerFeatures:
+    """Online features describing a customer's historical support load."""
+
+    customer_id: str
+    avg_resolution_time: float
+    ticket_count_30d: int
+    sla_breach_ratio: float
+    event_time: datetime
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "CustomerFeatures":
+        event_time = record.get("event_time")
+        return cls(
+            customer_id=str(record[CUSTOMER_RECORD_IDENTIFIER]),
+            avg_resolution_time=float(record["avg_resolution_time"]),
+            ticket_count_30d=int(record["ticket_count_30d"]),
+            sla_breach_ratio=float(record["sla_breach_ratio"]),
+            event_time=datetime.fromisoformat(event_time) if event_time else datetime.now(timezone.utc),
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            CUSTOMER_RECORD_IDENTIFIER: self.customer_id,
+            "avg_resolution_time": self.avg_resolution_time,
+            "ticket_count_30d": self.ticket_count_30d,
+            "sla_breach_ratio": self.sla_breach_ratio,
+            "event_time": self.event_time.isoformat(),
+        }
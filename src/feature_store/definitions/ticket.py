@@ -0,0 +1,42 @@
+"""Ticket feature group definition."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+TICKET_RECORD_IDENTIFIER = "ticket_id"
+
+
+@dataclass(slots=True)
+class TicketFeatures:
+    """Online features of a single ticket, kept current by the CDC consumer."""
+
+    ticket_id: str
+    customer_id: Optional[str]
+    priority: str
+    status: str
+    text_length: int
+    event_time: datetime
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "TicketFeatures":
+        event_time = record.get("event_time")
+        return cls(
+            ticket_id=str(record[TICKET_RECORD_IDENTIFIER]),
+            customer_id=record.get("customer_id"),
+            priority=str(record["priority"]),
+            status=str(record["status"]),
+            text_length=int(record["text_length"]),
+            event_time=datetime.fromisoformat(event_time) if event_time else datetime.now(timezone.utc),
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            TICKET_RECORD_IDENTIFIER: self.ticket_id,
+            "customer_id": self.customer_id,
+            "priority": self.priority,
+            "status": self.status,
+            "text_length": self.text_length,
+            "event_time": self.event_time.isoformat(),
+        }
@@ -0,0 +1,80 @@
+"""Online feature store backends addressed by feature group and record identifier."""
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Protocol, Sequence
+
+FeatureRecord = Dict[str, Any]
+
+
+class OnlineFeatureStore(Protocol):
+    """Remote online store, e.g. the SageMaker Feature Store runtime."""
+
+    async def batch_get(self, feature_group: str, record_ids: Sequence[str]) -> Dict[str, FeatureRecord]:
+        """Return records for the identifiers that exist; missing identifiers are omitted."""
+
+    async def batch_put(self, feature_group: str, records: Mapping[str, FeatureRecord]) -> None:
+        """Insert or replace records keyed by identifier."""
+
+    async def batch_delete(self, feature_group: str, record_ids: Sequence[str]) -> None:
+        """Delete records; identifiers without a record are ignored."""
+
+
+class SQLiteOnlineFeatureStore(OnlineFeatureStore):
+    """Local SQLite stand-in for the remote online store."""
+
+    max_batch_size = 100
+
+    def __init__(self, path: str | Path) -> None:
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS feature_records (feature_group TEXT NOT NULL, record_id TEXT NOT NULL, "
+            "payload TEXT NOT NULL, PRIMARY KEY (feature_group, record_id))"
+        )
+        self._lock = threading.Lock()
+
+    def _batch_get(self, feature_group: str, record_ids: Sequence[str]) -> Dict[str, FeatureRecord]:
+        placeholders = ",".join("?" * len(record_ids))
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT record_id, payload FROM feature_records "
+                f"WHERE feature_group = ? AND record_id IN ({placeholders})",
+                (feature_group, *record_ids),
+            ).fetchall()
+        return {record_id: json.loads(payload) for record_id, payload in rows}
+
+    def _batch_put(self, feature_group: str, records: Mapping[str, FeatureRecord]) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO feature_records (feature_group, record_id, payload) VALUES (?, ?, ?)",
+                [(feature_group, record_id, json.dumps(record)) for record_id, record in records.items()],
+            )
+            self._connection.execute("COMMIT")
+
+    def _batch_delete(self, feature_group: str, record_ids: Sequence[str]) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "DELETE FROM feature_records WHERE feature_group = ? AND record_id = ?",
+                [(feature_group, record_id) for record_id in record_ids],
+            )
+            self._connection.execute("COMMIT")
+
+    async def batch_get(self, feature_group: str, record_ids: Sequence[str]) -> Dict[str, FeatureRecord]:
+        if not record_ids:
+            return {}
+        return await asyncio.to_thread(self._batch_get, feature_group, list(record_ids))
+
+    async def batch_put(self, feature_group: str, records: Mapping[str, FeatureRecord]) -> None:
+        if records:
+            await asyncio.to_thread(self._batch_put, feature_group, dict(records))
+
+    async def batch_delete(self, feature_group: str, record_ids: Sequence[str]) -> None:
+        if record_ids:
+            await asyncio.to_thread(self._batch_delete, feature_group, list(record_ids))
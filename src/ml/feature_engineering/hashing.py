@@ -0,0 +1,99 @@
+"""Sparse feature hashing of engineered ticket features for linear models."""
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(slots=True)
+class SparseRows:
+    """Row-compressed sparse matrix; row ``r`` owns ``indices[indptr[r]:indptr[r + 1]]``."""
+
+    indices: np.ndarray
+    values: np.ndarray
+    indptr: np.ndarray
+    n_features: int
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+
+    def take(self, rows: np.ndarray) -> "SparseRows":
+        """Return the sub-matrix of the given rows, in the given order."""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.arange(indptr[-1], dtype=np.int64) + np.repeat(starts - indptr[:-1], lengths)
+        return SparseRows(
+            indices=self.indices[positions],
+            values=self.values[positions],
+            indptr=indptr,
+            n_features=self.n_features,
+        )
+
+
+class HashedFeatureVectorizer:
+    """Map batches following ``FEATURE_SCHEMA`` to signed, hashed sparse rows.
+
+    Text contributes word unigrams and bigrams scaled to unit L2 norm; priority,
+    hour of day and a log text-length bucket contribute one indicator each.
+    The indicators guarantee every row has at least one non-zero entry, which
+    segment sums over ``indptr`` rely on. CRC32 keeps hashing identical across
+    processes, so training workers and the online path agree.
+    """
+
+    def __init__(self, n_features: int = 2**18, use_bigrams: bool = True) -> None:
+        if n_features < 16:
+            raise ValueError("n_features must be at least 16.")
+        self.n_features = n_features
+        self.use_bigrams = use_bigrams
+
+    def _hash(self, feature: str) -> tuple[int, float]:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        return digest % self.n_features, 1.0 if digest & 0x80000000 else -1.0
+
+    def _row(self, text: str, text_length: int, created_hour: int, priority_code: int) -> dict[int, float]:
+        tokens = _TOKEN_PATTERN.findall(text)
+        if self.use_bigrams:
+            tokens.extend([f"{left} {right}" for left, right in zip(tokens, tokens[1:])])
+        row: dict[int, float] = {}
+        for token in tokens:
+            index, sign = self._hash(token)
+            row[index] = row.get(index, 0.0) + sign
+        norm = math.sqrt(sum(value * value for value in row.values())) or 1.0
+        for index in row:
+            row[index] /= norm
+        for indicator in (
+            f"__priority={priority_code}",
+            f"__hour={created_hour}",
+            f"__length={int(math.log2(text_length + 1))}",
+        ):
+            index, _ = self._hash(indicator)
+            row[index] = row.get(index, 0.0) + 1.0
+        return row
+
+    def transform(self, features: pa.RecordBatch) -> SparseRows:
+        rows = [
+            self._row(text, length, hour, priority)
+            for text, length, hour, priority in zip(
+                features.column("ticket_text").to_pylist(),
+                features.column("text_length").to_pylist(),
+                features.column("created_hour").to_pylist(),
+                features.column("priority_code").to_pylist(),
+            )
+        ]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        indices = np.fromiter((index for row in rows for index in row), dtype=np.int32, count=int(indptr[-1]))
+        values = np.fromiter((value for row in rows for value in row.values()), dtype=np.float32, count=int(indptr[-1]))
+        return SparseRows(indices=indices, values=values, indptr=indptr, n_features=self.n_features)
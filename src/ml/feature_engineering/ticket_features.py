@@ -0,0 +1,182 @@
+"""Ticket feature transformation shared by offline training and online inference.
+
+:func:`transform_batch` is the only implementation of the feature logic.
+Training streams Arrow batches of the raw dataset through it, and
+:func:`ticket_features` wraps a single request ticket in a one-row batch and
+calls the same function, so the two paths cannot drift apart. Encodings use
+fixed vocabularies taken from the domain enums, so nothing has to be fitted or
+shipped alongside the model.
+
+``created_hour`` is the hour of day in UTC on both paths: ISO strings are
+shifted by their offset, zoned timestamps converted, and values without a
+zone (naive datetimes, strings without an offset) are taken as UTC.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.preprocessing.text import join_text_columns, normalize_text
+
+PRIORITY_VOCABULARY: Tuple[str, ...] = tuple(priority.value for priority in TicketPriority)
+CATEGORY_VOCABULARY: Tuple[str, ...] = tuple(category.value for category in TicketCategory)
+DEFAULT_PRIORITY_CODE = PRIORITY_VOCABULARY.index(TicketPriority.MEDIUM.value)
+DEFAULT_CATEGORY_CODE = CATEGORY_VOCABULARY.index(TicketCategory.OTHER.value)
+UNKNOWN_HOUR = -1
+
+FEATURE_SCHEMA = pa.schema(
+    [
+        pa.field("ticket_text", pa.string(), nullable=False),
+        pa.field("text_length", pa.int32(), nullable=False),
+        pa.field("created_hour", pa.int8(), nullable=False),
+        pa.field("priority_code", pa.int8(), nullable=False),
+        pa.field("category_code", pa.int8(), nullable=False),
+    ]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RawColumns:
+    """Names of the raw input columns; text columns are concatenated in order.
+
+    The defaults match the customer-support-tickets training dataset.
+    Missing optional columns fall back to the default encodings.
+    """
+
+    text: Tuple[str, ...] = ("subject", "body")
+    created_at: Optional[str] = "created_at"
+    priority: Optional[str] = "priority"
+    category: Optional[str] = "category"
+    passthrough: Tuple[str, ...] = ()
+
+
+ONLINE_COLUMNS = RawColumns(text=("text",))
+
+
+@dataclass(slots=True)
+class TicketFeatureRow:
+    ticket_text: str
+    text_length: int
+    created_hour: int
+    priority_code: int
+    category_code: int
+
+
+def _column(batch: pa.RecordBatch, name: Optional[str]) -> Optional[pa.Array]:
+    if name is None or name not in batch.schema.names:
+        return None
+    return batch.column(name)
+
+
+def _encode(values: Optional[pa.Array], vocabulary: Sequence[str], default: int, rows: int) -> pa.Array:
+    if values is None:
+        return pa.array([default] * rows, type=pa.int8())
+    normalized = pc.utf8_lower(pc.utf8_trim_whitespace(values.cast(pa.string())))
+    codes = pc.index_in(normalized, value_set=pa.array(vocabulary))
+    return pc.fill_null(codes, default).cast(pa.int8())
+
+
+# ISO 8601 date-time: hour, minute and an optional UTC offset after any seconds.
+_ISO_DATETIME = (
+    r"^\d{4}-\d{2}-\d{2}[T ](?P<hour>\d{2}):(?P<minute>\d{2})(?::\d{2}(?:[.,]\d+)?)?"
+    r"\s*(?P<offset>Z|[+\-]\d{2}(?::?\d{2})?)?"
+)
+
+
+def _utc_hours_from_strings(values: pa.Array) -> pa.Array:
+    extracted = pc.extract_regex(values, pattern=_ISO_DATETIME)
+    matched = pc.is_valid(extracted).to_numpy(zero_copy_only=False)
+    filled = pc.fill_null(extracted, pa.scalar({"hour": "0", "minute": "0", "offset": ""}, extracted.type))
+    hour = pc.cast(pc.struct_field(filled, "hour"), pa.int32()).to_numpy()
+    minute = pc.cast(pc.struct_field(filled, "minute"), pa.int32()).to_numpy()
+    # "Z", "" and "+05" become "+0000", "+0000" and "+0500".
+    offset = pc.replace_substring(pc.struct_field(filled, "offset"), ":", "")
+    offset = pc.if_else(pc.starts_with(offset, "Z"), "+0000", offset)
+    offset = pc.utf8_rpad(pc.if_else(pc.equal(offset, ""), "+0000", offset), 5, "0")
+    sign = np.where(pc.starts_with(offset, "-").to_numpy(zero_copy_only=False), -1, 1)
+    offset_minutes = sign * (
+        pc.cast(pc.utf8_slice_codeunits(offset, 1, 3), pa.int32()).to_numpy() * 60
+        + pc.cast(pc.utf8_slice_codeunits(offset, 3, 5), pa.int32()).to_numpy()
+    )
+    utc_hour = ((hour * 60 + minute - offset_minutes) % (24 * 60)) // 60
+    return pa.array(utc_hour.astype(np.int8), mask=~matched)
+
+
+def _created_hour(values: Optional[pa.Array], rows: int) -> pa.Array:
+    if values is None:
+        return pa.array([UNKNOWN_HOUR] * rows, type=pa.int8())
+    if pa.types.is_timestamp(values.type):
+        if values.type.tz is not None:
+            # Arrow reads the fields of zoned timestamps in their own zone; the feature is the UTC hour.
+            values = values.cast(pa.timestamp(values.type.unit, tz="UTC"))
+        hours = pc.hour(values)
+    elif pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+        hours = _utc_hours_from_strings(values)
+    else:
+        return pa.array([UNKNOWN_HOUR] * rows, type=pa.int8())
+    return pc.fill_null(hours.cast(pa.int8()), UNKNOWN_HOUR)
+
+
+def transform_batch(batch: pa.RecordBatch, columns: RawColumns = RawColumns()) -> pa.RecordBatch:
+    """Turn a batch of raw tickets into model features following :data:`FEATURE_SCHEMA`.
+
+    Columns listed in ``columns.passthrough`` (labels, identifiers) are appended unchanged.
+    """
+    rows = batch.num_rows
+    text_columns = [column for column in (_column(batch, name) for name in columns.text) if column is not None]
+    if not text_columns:
+        raise ValueError(f"Batch has none of the text columns {columns.text!r}.")
+    text = normalize_text(join_text_columns(text_columns))
+    arrays = [
+        text,
+        pc.utf8_length(text).cast(pa.int32()),
+        _created_hour(_column(batch, columns.created_at), rows),
+        _encode(_column(batch, columns.priority), PRIORITY_VOCABULARY, DEFAULT_PRIORITY_CODE, rows),
+        _encode(_column(batch, columns.category), CATEGORY_VOCABULARY, DEFAULT_CATEGORY_CODE, rows),
+    ]
+    schema = FEATURE_SCHEMA
+    for name in columns.passthrough:
+        arrays.append(batch.column(name))
+        schema = schema.append(batch.schema.field(name))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def tickets_to_batch(tickets: Sequence[Ticket]) -> pa.RecordBatch:
+    """Lay out request tickets as a raw batch readable with :data:`ONLINE_COLUMNS`."""
+    return pa.RecordBatch.from_pydict(
+        {
+            "text": pa.array([ticket.text for ticket in tickets], type=pa.string()),
+            # Aware datetimes are converted to UTC; naive ones are taken as UTC already.
+            "created_at": pa.array([ticket.created_at for ticket in tickets], type=pa.timestamp("us", tz="UTC")),
+            "priority": pa.array([ticket.priority.value for ticket in tickets], type=pa.string()),
+            "category": pa.array(
+                [ticket.category.value if ticket.category else None for ticket in tickets], type=pa.string()
+            ),
+        }
+    )
+
+
+def ticket_created_hour(ticket: Ticket) -> int:
+    """The ``created_hour`` feature of a request ticket: the UTC hour, naive datetimes being UTC already."""
+    created_at = ticket.created_at
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.hour
+
+
+def transform_tickets(tickets: Sequence[Ticket]) -> pa.RecordBatch:
+    """Compute features for request tickets through the batch transformation."""
+    return transform_batch(tickets_to_batch(tickets), ONLINE_COLUMNS)
+
+
+def ticket_features(ticket: Ticket) -> TicketFeatureRow:
+    """Compute features for one request ticket through the batch transformation."""
+    return TicketFeatureRow(**transform_tickets([ticket]).to_pylist()[0])
@@ -0,0 +1 @@
+"""Compact model artifacts served in-process."""
@@ -0,0 +1,111 @@
+"""Linear models over hashed sparse features, stored as a single compressed ``.npz`` artifact."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Literal, Optional, Tuple
+
+import numpy as np
+
+from ml.feature_engineering.hashing import SparseRows
+
+ModelKind = Literal["classifier", "regressor"]
+TargetTransform = Literal["identity", "log1p"]
+ARTIFACT_FORMAT = 1
+
+
+@dataclass(slots=True)
+class LinearModel:
+    """``scores = X @ weights + bias`` with ``weights`` of shape ``(n_features, n_outputs)``.
+
+    Classifiers carry one output per entry in ``labels`` and expose softmax
+    probabilities; regressors have a single output, optionally trained on a
+    transformed target that :meth:`predict` inverts.
+    """
+
+    kind: ModelKind
+    weights: np.ndarray
+    bias: np.ndarray
+    labels: Tuple[str, ...] = ()
+    target_transform: TargetTransform = "identity"
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_features(self) -> int:
+        return int(self.weights.shape[0])
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of everything that determines predictions; changes whenever a new model is exported."""
+        digest = hashlib.blake2b(digest_size=8)
+        header = {
+            "kind": self.kind,
+            "labels": list(self.labels),
+            "target_transform": self.target_transform,
+            "vectorizer": self.metadata.get("vectorizer", {}),
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+        digest.update(np.ascontiguousarray(self.weights, dtype=np.float32).tobytes())
+        digest.update(np.ascontiguousarray(self.bias, dtype=np.float32).tobytes())
+        return digest.hexdigest()
+
+    def decision_function(self, rows: SparseRows) -> np.ndarray:
+        if rows.n_features != self.n_features:
+            raise ValueError(f"Model expects {self.n_features} hashed features, got {rows.n_features}.")
+        if len(rows) == 0:
+            return np.zeros((0, self.weights.shape[1]), dtype=np.float32)
+        contributions = self.weights[rows.indices] * rows.values[:, None]
+        # Segment sums per row; every row has at least one entry, see HashedFeatureVectorizer.
+        return np.add.reduceat(contributions, rows.indptr[:-1], axis=0) + self.bias
+
+    def predict_proba(self, rows: SparseRows) -> np.ndarray:
+        if self.kind != "classifier":
+            raise TypeError("predict_proba is only defined for classifiers.")
+        scores = self.decision_function(rows)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, rows: SparseRows) -> np.ndarray:
+        if self.kind == "classifier":
+            return self.predict_proba(rows).argmax(axis=1)
+        values = self.decision_function(rows)[:, 0]
+        if self.target_transform == "log1p":
+            return np.expm1(values)
+        return values
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        header = {
+            "format": ARTIFACT_FORMAT,
+            "kind": self.kind,
+            "labels": list(self.labels),
+            "target_transform": self.target_transform,
+            "metadata": self.metadata,
+        }
+        with open(path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+                weights=self.weights.astype(np.float32, copy=False),
+                bias=self.bias.astype(np.float32, copy=False),
+            )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], expected_kind: Optional[ModelKind] = None) -> "LinearModel":
+        with np.load(path, allow_pickle=False) as archive:
+            header = json.loads(archive["header"].tobytes().decode("utf-8"))
+            if header.get("format") != ARTIFACT_FORMAT:
+                raise ValueError(f"Unsupported model artifact format {header.get('format')!r} in {path}.")
+            if expected_kind is not None and header["kind"] != expected_kind:
+                raise ValueError(f"{path} holds a {header['kind']}, expected a {expected_kind}.")
+            return cls(
+                kind=header["kind"],
+                weights=np.ascontiguousarray(archive["weights"], dtype=np.float32),
+                bias=np.ascontiguousarray(archive["bias"], dtype=np.float32),
+                labels=tuple(header["labels"]),
+                target_transform=header["target_transform"],
+                metadata=header["metadata"],
+            )
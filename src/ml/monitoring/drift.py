@@ -0,0 +1,376 @@
+"""Streaming drift detection of live model inputs and outputs against a training baseline.
+
+A :class:`DriftBaseline` snapshot fixes, per monitored feature, the bins and
+their expected proportions: numeric features (text length, confidence,
+predicted hours) are cut at quantiles of the training data, categorical ones
+(priority, creation hour, predicted category) get one bin per code plus one
+for codes the training data never had. Because live values fall into the
+same bins, each feature's sketch is a fixed-size count vector, and PSI and a
+binned KS statistic are computed directly from it.
+
+:class:`DriftMonitor` keeps those counts over a sliding window made of
+``buckets`` time slices. The inference path only appends its feature batch
+and model outputs to a deque; a background thread folds the pending
+observations into the window in batches and recomputes the report, so
+recording a prediction costs one append and never takes a lock.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from ml.feature_engineering.ticket_features import PRIORITY_VOCABULARY, UNKNOWN_HOUR
+
+BASELINE_FORMAT = 1
+PSI_THRESHOLD = 0.2
+# Floor for empty bins so PSI stays finite; about one row in ten thousand.
+_EPSILON = 1e-4
+
+Observation = Tuple[pa.RecordBatch, np.ndarray]
+
+
+@dataclass(frozen=True, slots=True)
+class MonitoredFeature:
+    """A monitored value; ``categories`` lists the codes of categorical features and is empty for numeric ones."""
+
+    name: str
+    categories: Tuple[int, ...] = ()
+    labels: Tuple[str, ...] = ()
+
+
+def monitored_features(class_labels: Sequence[str] = ()) -> Tuple[MonitoredFeature, ...]:
+    """Features watched for a classifier over ``class_labels``, or for a regressor when it is empty.
+
+    The category input is left out: in training it is the label itself,
+    while requests rarely carry one, so it would always read as drifted.
+    """
+    hours = tuple(range(UNKNOWN_HOUR, 24))
+    features = [
+        MonitoredFeature("text_length"),
+        MonitoredFeature("created_hour", hours, tuple(str(hour) for hour in hours)),
+        MonitoredFeature("priority", tuple(range(len(PRIORITY_VOCABULARY))), PRIORITY_VOCABULARY),
+    ]
+    if class_labels:
+        features.append(
+            MonitoredFeature("predicted_category", tuple(range(len(class_labels))), tuple(class_labels))
+        )
+        features.append(MonitoredFeature("confidence"))
+    else:
+        features.append(MonitoredFeature("prediction"))
+    return tuple(features)
+
+
+def feature_values(features: pa.RecordBatch | pa.Table, outputs: np.ndarray) -> Dict[str, np.ndarray]:
+    """Monitored values of one inference call: its feature batch and the model's probabilities or predictions."""
+    values = {
+        "text_length": features.column("text_length").to_numpy(),
+        "created_hour": features.column("created_hour").to_numpy(),
+        "priority": features.column("priority_code").to_numpy(),
+    }
+    if outputs.ndim == 2:
+        values["predicted_category"] = outputs.argmax(axis=1)
+        values["confidence"] = outputs.max(axis=1)
+    else:
+        values["prediction"] = outputs
+    return values
+
+
+@dataclass(slots=True)
+class FeatureBaseline:
+    """Bins of one feature and the share of baseline rows in each.
+
+    Numeric features have ``len(edges) + 1`` bins split at ``edges``;
+    categorical features have one bin per code and a last one for unknown codes.
+    """
+
+    feature: MonitoredFeature
+    edges: np.ndarray
+    proportions: np.ndarray
+
+    @property
+    def bins(self) -> int:
+        return len(self.proportions)
+
+    def assign(self, values: np.ndarray) -> np.ndarray:
+        """Bin index of every value."""
+        if not self.feature.categories:
+            return np.searchsorted(self.edges, values, side="right")
+        return _category_bins(self.feature.categories, values)
+
+
+def _category_bins(categories: Sequence[int], values: np.ndarray) -> np.ndarray:
+    codes = np.asarray(categories)
+    positions = np.minimum(np.searchsorted(codes, values), len(codes) - 1)
+    return np.where(codes[positions] == values, positions, len(codes))
+
+
+@dataclass(slots=True)
+class DriftBaseline:
+    features: Dict[str, FeatureBaseline]
+    rows: int
+    metadata: Dict[str, object] = field(default_factory=dict)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        document = {
+            "format": BASELINE_FORMAT,
+            "rows": self.rows,
+            "metadata": self.metadata,
+            "features": [
+                {
+                    "name": baseline.feature.name,
+                    "categories": list(baseline.feature.categories),
+                    "labels": list(baseline.feature.labels),
+                    "edges": baseline.edges.tolist(),
+                    "proportions": baseline.proportions.tolist(),
+                }
+                for baseline in self.features.values()
+            ],
+        }
+        staging = Path(f"{path}.tmp")
+        staging.write_text(json.dumps(document, indent=1))
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "DriftBaseline":
+        document = json.loads(Path(path).read_text())
+        if document.get("format") != BASELINE_FORMAT:
+            raise ValueError(f"Unsupported drift baseline format {document.get('format')!r} in {path}.")
+        features = {}
+        for entry in document["features"]:
+            feature = MonitoredFeature(entry["name"], tuple(entry["categories"]), tuple(entry["labels"]))
+            features[feature.name] = FeatureBaseline(
+                feature, np.asarray(entry["edges"], dtype=np.float64), np.asarray(entry["proportions"])
+            )
+        return cls(features, int(document["rows"]), document.get("metadata", {}))
+
+
+class BaselineBuilder:
+    """Accumulate a baseline from batches of training features and model outputs in constant memory.
+
+    Categorical features are counted exactly. Numeric features keep a
+    uniform reservoir sample of ``sample_size`` values, whose quantiles
+    become the ``bins - 1`` edges; edges that coincide on heavily repeated
+    values are merged.
+    """
+
+    def __init__(
+        self,
+        features: Sequence[MonitoredFeature],
+        bins: int = 20,
+        sample_size: int = 100_000,
+        seed: int = 0,
+    ) -> None:
+        if bins < 2:
+            raise ValueError("bins must be at least 2.")
+        self._features = {feature.name: feature for feature in features}
+        self._bins = bins
+        self._sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._rows = 0
+        self._seen: Dict[str, int] = {}
+        self._samples: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, np.ndarray] = {}
+        for feature in features:
+            if feature.categories:
+                self._counts[feature.name] = np.zeros(len(feature.categories) + 1, dtype=np.int64)
+            else:
+                self._samples[feature.name] = np.empty(sample_size, dtype=np.float64)
+                self._seen[feature.name] = 0
+
+    def add(self, features: pa.RecordBatch, outputs: np.ndarray) -> None:
+        values = feature_values(features, outputs)
+        self._rows += features.num_rows
+        for name, feature in self._features.items():
+            column = values[name]
+            if feature.categories:
+                bins = _category_bins(feature.categories, column)
+                self._counts[name] += np.bincount(bins, minlength=len(feature.categories) + 1)
+            else:
+                self._sample(name, column.astype(np.float64, copy=False))
+
+    def _sample(self, name: str, column: np.ndarray) -> None:
+        sample, seen = self._samples[name], self._seen[name]
+        fill = max(min(self._sample_size - seen, len(column)), 0)
+        sample[seen : seen + fill] = column[:fill]
+        rest = column[fill:]
+        if len(rest):
+            # Algorithm R, vectorised: later duplicates overwrite earlier ones, as a sequential pass would.
+            slots = self._rng.integers(0, np.arange(seen + fill, seen + len(column)) + 1)
+            keep = slots < self._sample_size
+            sample[slots[keep]] = rest[keep]
+        self._seen[name] = seen + len(column)
+
+    def build(self, metadata: Optional[Dict[str, object]] = None) -> DriftBaseline:
+        if not self._rows:
+            raise ValueError("Cannot build a drift baseline from an empty dataset.")
+        baselines = {}
+        for name, feature in self._features.items():
+            if feature.categories:
+                counts = self._counts[name]
+                baselines[name] = FeatureBaseline(feature, np.empty(0), counts / counts.sum())
+                continue
+            sample = self._samples[name][: min(self._seen[name], self._sample_size)]
+            edges = np.unique(np.quantile(sample, np.arange(1, self._bins) / self._bins))
+            counts = np.bincount(np.searchsorted(edges, sample, side="right"), minlength=len(edges) + 1)
+            baselines[name] = FeatureBaseline(feature, edges, counts / counts.sum())
+        return DriftBaseline(baselines, self._rows, dict(metadata or {}))
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> float:
+    expected = np.maximum(expected, _EPSILON)
+    actual = np.maximum(actual, _EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Largest gap between the two CDFs at the bin edges, a lower bound on the exact KS statistic."""
+    return float(np.abs(np.cumsum(actual) - np.cumsum(expected)).max())
+
+
+@dataclass(slots=True)
+class FeatureDrift:
+    feature: str
+    rows: int
+    psi: float
+    ks: Optional[float]
+    drifted: bool
+
+
+@dataclass(slots=True)
+class DriftReport:
+    """Drift of every feature over the window; statistics are NaN until the window holds ``min_rows`` rows."""
+
+    rows: int
+    window_seconds: float
+    features: List[FeatureDrift]
+    pending: int
+    dropped: int
+
+    @property
+    def drifted(self) -> List[str]:
+        return [drift.feature for drift in self.features if drift.drifted]
+
+
+class DriftMonitor:
+    """Sliding-window PSI/KS drift of live traffic against a :class:`DriftBaseline`.
+
+    The window covers the last ``window_seconds`` in ``buckets`` slices;
+    each flush first clears the slices that have expired. Observations are
+    folded every ``flush_interval`` seconds by a daemon thread, or only on
+    :meth:`flush` when ``flush_interval`` is None. If the folding falls
+    behind by more than ``max_pending`` calls, further calls are dropped and
+    counted rather than queued without bound.
+    """
+
+    def __init__(
+        self,
+        baseline: DriftBaseline,
+        window_seconds: float = 3600.0,
+        buckets: int = 12,
+        flush_interval: Optional[float] = 1.0,
+        min_rows: int = 500,
+        psi_threshold: float = PSI_THRESHOLD,
+        max_pending: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if buckets < 1 or window_seconds <= 0:
+            raise ValueError("window_seconds and buckets must be positive.")
+        self.baseline = baseline
+        self.window_seconds = window_seconds
+        self._bucket_seconds = window_seconds / buckets
+        self._min_rows = min_rows
+        self._psi_threshold = psi_threshold
+        self._max_pending = max_pending
+        self._clock = clock
+        self._pending: Deque[Observation] = deque()
+        self._dropped = 0
+        self._counts = {
+            name: np.zeros((buckets, feature.bins), dtype=np.int64) for name, feature in baseline.features.items()
+        }
+        self._rows = np.zeros(buckets, dtype=np.int64)
+        self._slice = int(clock() // self._bucket_seconds)
+        self._lock = threading.Lock()
+        self._report = self._compute()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run, args=(flush_interval,), name="drift-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def observe(self, features: pa.RecordBatch, outputs: np.ndarray) -> None:
+        """Record one inference call; safe to call from any thread."""
+        if len(self._pending) >= self._max_pending:
+            self._dropped += 1
+            return
+        self._pending.append((features, outputs))
+
+    def flush(self) -> int:
+        """Fold pending observations into the window and refresh :meth:`report`; return the rows folded."""
+        with self._lock:
+            observations = []
+            while self._pending:
+                observations.append(self._pending.popleft())
+            self._advance()
+            rows = sum(features.num_rows for features, _ in observations)
+            if rows:
+                current = self._slice % len(self._rows)
+                # One conversion per column for everything pending, not per inference call.
+                values = feature_values(
+                    pa.Table.from_batches([features for features, _ in observations]),
+                    np.concatenate([outputs for _, outputs in observations]),
+                )
+                for name, baseline in self.baseline.features.items():
+                    bins = baseline.assign(values[name])
+                    self._counts[name][current] += np.bincount(bins, minlength=baseline.bins)
+                self._rows[current] += rows
+            self._report = self._compute()
+            return rows
+
+    def report(self) -> DriftReport:
+        """The report as of the last flush."""
+        return self._report
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self.flush()
+
+    def _advance(self) -> None:
+        """Clear the slices that left the window since the last flush."""
+        now = int(self._clock() // self._bucket_seconds)
+        for expired in range(self._slice + 1, min(now, self._slice + len(self._rows)) + 1):
+            index = expired % len(self._rows)
+            self._rows[index] = 0
+            for counts in self._counts.values():
+                counts[index] = 0
+        self._slice = max(now, self._slice)
+
+    def _compute(self) -> DriftReport:
+        rows = int(self._rows.sum())
+        features = []
+        for name, baseline in self.baseline.features.items():
+            if rows < self._min_rows:
+                psi, ks = math.nan, (None if baseline.feature.categories else math.nan)
+            else:
+                actual = self._counts[name].sum(axis=0) / rows
+                psi = population_stability_index(baseline.proportions, actual)
+                ks = None if baseline.feature.categories else binned_ks(baseline.proportions, actual)
+            features.append(FeatureDrift(name, rows, psi, ks, psi >= self._psi_threshold))
+        return DriftReport(rows, self.window_seconds, features, len(self._pending), self._dropped)
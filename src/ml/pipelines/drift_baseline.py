@@ -0,0 +1,70 @@
+"""Build the drift baseline a served model's live traffic is compared against.
+
+Streams a raw ticket dataset (ideally the model's training or validation
+data) through the feature transformation and the model, and writes the bins
+and proportions of every monitored feature:
+
+    PYTHONPATH=src python -m ml.pipelines.drift_baseline \\
+        --dataset data/tickets --model models/classifier.npz --output models/classifier.drift.json
+
+Point ``classification_drift_baseline_path`` (or
+``resolution_time_drift_baseline_path``) at the output. Rebuild it whenever
+the model is retrained, since predicted categories and confidences move with
+the model.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import RawColumns
+from ml.models.linear import LinearModel
+from ml.monitoring.drift import BaselineBuilder, monitored_features
+from ml.preprocessing.pipeline import iter_feature_batches, iter_raw_batches
+from ml.training.incremental import dataset_files
+
+
+def run(args: argparse.Namespace) -> int:
+    model = LinearModel.load(args.model)
+    vectorizer_config = model.metadata.get("vectorizer", {})
+    vectorizer = HashedFeatureVectorizer(
+        n_features=int(vectorizer_config.get("n_features", model.n_features)),
+        use_bigrams=bool(vectorizer_config.get("use_bigrams", True)),
+    )
+    columns = RawColumns(text=tuple(args.text_columns))
+    builder = BaselineBuilder(
+        monitored_features(model.labels if model.kind == "classifier" else ()),
+        bins=args.bins,
+        sample_size=args.sample_size,
+    )
+    dataset = Path(args.dataset)
+    files = list(dataset_files(dataset))
+    sources = [dataset] if dataset.is_file() else [dataset / name for name in files]
+    raw = (batch for source in sources for batch in iter_raw_batches(source, args.read_batch_size, columns))
+    for features in iter_feature_batches(raw, columns, workers=args.workers):
+        rows = vectorizer.transform(features)
+        builder.add(features, model.predict_proba(rows) if model.kind == "classifier" else model.predict(rows))
+    baseline = builder.build({"model": str(args.model), "dataset": str(args.dataset), "files": files})
+    baseline.save(args.output)
+    summary = {name: feature.bins for name, feature in baseline.features.items()}
+    print(json.dumps({"rows": baseline.rows, "bins": summary}, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", required=True, help="Directory of raw ticket Parquet files, or one file.")
+    parser.add_argument("--model", required=True, help="The served model.npz artifact.")
+    parser.add_argument("--output", required=True, help="Where to write the baseline JSON.")
+    parser.add_argument("--text-columns", nargs="+", default=list(RawColumns().text))
+    parser.add_argument("--bins", type=int, default=20, help="Quantile bins per numeric feature.")
+    parser.add_argument("--sample-size", type=int, default=100_000, help="Reservoir size for numeric quantiles.")
+    parser.add_argument("--read-batch-size", type=int, default=16_384)
+    parser.add_argument("--workers", type=int, default=1, help="Processes computing features.")
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
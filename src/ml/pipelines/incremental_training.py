@@ -0,0 +1,79 @@
+"""Retrain the ticket classifier or resolution-time regressor on dataset files changed since the last run.
+
+Meant to be run on a schedule or after a CDC flush lands new Parquet files:
+
+    PYTHONPATH=src python -m ml.pipelines.incremental_training \\
+        --dataset data/tickets --checkpoints models/classifier --target category
+
+The latest version's ``model.npz`` is what ``classification_model_path`` or
+``resolution_time_model_path`` should point at; ``--export`` copies it there.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import shutil
+
+from ml.feature_engineering.ticket_features import RawColumns
+from ml.training.incremental import (
+    CATEGORY_TARGET,
+    RESOLUTION_HOURS_TARGET,
+    CheckpointStore,
+    IncrementalTrainer,
+    TrainingTarget,
+)
+
+TARGETS = {"category": CATEGORY_TARGET, "resolution_hours": RESOLUTION_HOURS_TARGET}
+
+
+def run(args: argparse.Namespace) -> int:
+    target: TrainingTarget = TARGETS[args.target]
+    if args.target_column:
+        target = dataclasses.replace(target, column=args.target_column)
+    columns = RawColumns(text=tuple(args.text_columns))
+    store = CheckpointStore(args.checkpoints, keep_versions=args.keep_versions)
+    trainer = IncrementalTrainer(
+        store,
+        target,
+        columns=columns,
+        n_features=args.n_features,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        read_batch_size=args.read_batch_size,
+        learning_rate=args.learning_rate,
+        workers=args.workers,
+    )
+    report = trainer.train(args.dataset, full=args.full)
+    print(json.dumps(dataclasses.asdict(report), indent=2))
+    if args.export and report.version is not None:
+        source = store.model_path(report.version)
+        assert source is not None
+        staging = f"{args.export}.tmp"
+        shutil.copyfile(source, staging)
+        os.replace(staging, args.export)
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", required=True, help="Directory of raw ticket Parquet files, or one file.")
+    parser.add_argument("--checkpoints", required=True, help="Directory holding the model versions.")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="category")
+    parser.add_argument("--target-column", help="Dataset column holding the target, if not the target's name.")
+    parser.add_argument("--text-columns", nargs="+", default=list(RawColumns().text))
+    parser.add_argument("--full", action="store_true", help="Ignore the checkpoint and train on every file.")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--read-batch-size", type=int, default=16_384)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--n-features", type=int, default=2**18)
+    parser.add_argument("--workers", type=int, default=1, help="Processes computing features.")
+    parser.add_argument("--keep-versions", type=int, default=5)
+    parser.add_argument("--export", help="Copy the resulting model.npz to this path atomically.")
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
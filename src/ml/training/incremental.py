@@ -0,0 +1,287 @@
+"""Warm-started, out-of-core training of linear models on the dataset files that changed.
+
+The dataset is a directory of Parquet files (one per export, day or CDC
+flush). Each model version is saved with its optimizer state and a manifest
+of the files it has learned from, so the next run loads that version and
+streams only new or rewritten files through ``partial_fit``. Memory is
+bounded by the read batch size and the model, never by the dataset.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ml.feature_engineering.hashing import HashedFeatureVectorizer
+from ml.feature_engineering.ticket_features import CATEGORY_VOCABULARY, RawColumns
+from ml.models.linear import LinearModel, ModelKind, TargetTransform
+from ml.preprocessing.pipeline import iter_feature_batches, iter_raw_batches
+from ml.training.linear import LinearModelTrainer
+
+Manifest = Dict[str, Tuple[int, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class TrainingTarget:
+    """What to learn: ``column`` holds class labels for classifiers and numbers for regressors."""
+
+    kind: ModelKind
+    column: str
+    labels: Tuple[str, ...] = ()
+    target_transform: TargetTransform = "identity"
+
+
+CATEGORY_TARGET = TrainingTarget("classifier", "category", CATEGORY_VOCABULARY)
+RESOLUTION_HOURS_TARGET = TrainingTarget("regressor", "resolution_hours", target_transform="log1p")
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    version: int
+    trainer: LinearModelTrainer
+    manifest: Manifest = field(default_factory=dict)
+    metadata: Dict[str, object] = field(default_factory=dict)
+
+
+class CheckpointStore:
+    """Model versions under ``root/v000001/`` with a ``LATEST`` pointer.
+
+    A version holds the servable ``model.npz`` (loadable with
+    :meth:`LinearModel.load`), the AdaGrad accumulators in ``optimizer.npz``
+    and ``manifest.json`` mapping each trained file to its size and mtime.
+    Versions are written to a temporary directory and renamed into place, and
+    ``LATEST`` is replaced atomically, so a crashed run never leaves a
+    half-written checkpoint behind as the latest one.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], keep_versions: int = 5) -> None:
+        self.root = Path(root)
+        self._keep_versions = keep_versions
+
+    def _path(self, version: int) -> Path:
+        return self.root / f"v{version:06d}"
+
+    def latest_version(self) -> Optional[int]:
+        try:
+            return int((self.root / "LATEST").read_text().strip())
+        except FileNotFoundError:
+            return None
+
+    def model_path(self, version: Optional[int] = None) -> Optional[Path]:
+        version = self.latest_version() if version is None else version
+        return None if version is None else self._path(version) / "model.npz"
+
+    def load(self, learning_rate: float = 0.5, l2: float = 1e-6) -> Optional[Checkpoint]:
+        version = self.latest_version()
+        if version is None:
+            return None
+        path = self._path(version)
+        model = LinearModel.load(path / "model.npz")
+        with np.load(path / "optimizer.npz", allow_pickle=False) as archive:
+            state = {name: archive[name] for name in archive.files}
+        recorded = json.loads((path / "manifest.json").read_text())
+        manifest = {name: (size, mtime) for name, (size, mtime) in recorded.items()}
+        trainer = LinearModelTrainer.warm_start(model, state, learning_rate=learning_rate, l2=l2)
+        return Checkpoint(version, trainer, manifest, dict(model.metadata))
+
+    def save(self, trainer: LinearModelTrainer, manifest: Manifest, metadata: Dict[str, object]) -> int:
+        version = (self.latest_version() or 0) + 1
+        staging = self.root / f".v{version:06d}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        trainer.model({**metadata, "version": version}).save(staging / "model.npz")
+        with open(staging / "optimizer.npz", "wb") as handle:
+            np.savez(handle, **trainer.optimizer_state())
+        (staging / "manifest.json").write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        staging.rename(self._path(version))
+        pointer = self.root / ".LATEST.tmp"
+        pointer.write_text(str(version))
+        os.replace(pointer, self.root / "LATEST")
+        for old in range(version - self._keep_versions, 0, -1):
+            if not self._path(old).exists():
+                break
+            shutil.rmtree(self._path(old))
+        return version
+
+
+def dataset_files(dataset: str | os.PathLike[str]) -> Manifest:
+    """Size and mtime of every Parquet file under ``dataset`` (or of ``dataset`` itself), by relative path."""
+    root = Path(dataset)
+    paths = [root] if root.is_file() else sorted(root.rglob("*.parquet"))
+    manifest: Manifest = {}
+    for path in paths:
+        stat = path.stat()
+        manifest[path.name if path == root else path.relative_to(root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return manifest
+
+
+def changed_files(current: Manifest, trained: Manifest) -> List[str]:
+    """Files that are new or were rewritten since ``trained`` was recorded."""
+    return [name for name, fingerprint in current.items() if tuple(trained.get(name, ())) != fingerprint]
+
+
+def target_values(batch: pa.RecordBatch, target: TrainingTarget) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the positions of rows in ``batch`` with a usable target, and those targets."""
+    values = batch.column(target.column)
+    if target.kind == "classifier":
+        normalized = pc.utf8_lower(pc.utf8_trim_whitespace(values.cast(pa.string())))
+        codes = pc.index_in(normalized, value_set=pa.array(target.labels)).to_numpy(zero_copy_only=False)
+        # index_in yields nulls for unknown labels, which arrive here as NaN.
+        keep = np.flatnonzero(~np.isnan(codes))
+        return keep, codes[keep].astype(np.int64)
+    numbers = values.cast(pa.float64()).to_numpy(zero_copy_only=False)
+    keep = np.flatnonzero(np.isfinite(numbers))
+    return keep, numbers[keep]
+
+
+@dataclass(slots=True)
+class TrainingReport:
+    version: Optional[int]
+    parent_version: Optional[int]
+    warm_started: bool
+    files: List[str]
+    rows: int
+    skipped_rows: int
+    epochs: int
+    mean_loss: float
+    seconds: float
+
+
+class IncrementalTrainer:
+    """Fit a hashed-feature linear model over a Parquet dataset, resuming from the latest checkpoint.
+
+    A run streams the files changed since the checkpoint it resumes from
+    (every file with ``full=True`` or when there is none yet) ``epochs``
+    times in batches of ``read_batch_size`` rows, shuffles each batch and
+    takes AdaGrad steps of ``batch_size`` rows. A rewritten file is learned
+    from again as a whole; rows deleted from the dataset cannot be unlearned
+    and need a full retrain to disappear from the model.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        target: TrainingTarget,
+        columns: RawColumns = RawColumns(),
+        n_features: int = 2**18,
+        use_bigrams: bool = True,
+        epochs: int = 1,
+        batch_size: int = 256,
+        read_batch_size: int = 16_384,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        workers: int = 1,
+        seed: int = 0,
+    ) -> None:
+        self.store = store
+        self.target = target
+        self._columns = dataclasses.replace(columns, passthrough=(*columns.passthrough, target.column))
+        self._vectorizer = HashedFeatureVectorizer(n_features=n_features, use_bigrams=use_bigrams)
+        self._epochs = epochs
+        self._batch_size = batch_size
+        self._read_batch_size = read_batch_size
+        self._learning_rate = learning_rate
+        self._l2 = l2
+        self._workers = workers
+        self._rng = np.random.default_rng(seed)
+
+    def _fresh_trainer(self) -> LinearModelTrainer:
+        return LinearModelTrainer(
+            self.target.kind,
+            self._vectorizer.n_features,
+            self.target.labels,
+            target_transform=self.target.target_transform,
+            learning_rate=self._learning_rate,
+            l2=self._l2,
+        )
+
+    def _resume(self) -> Optional[Checkpoint]:
+        checkpoint = self.store.load(learning_rate=self._learning_rate, l2=self._l2)
+        if checkpoint is None:
+            return None
+        trainer = checkpoint.trainer
+        vectorizer = checkpoint.metadata.get("vectorizer")
+        use_bigrams = vectorizer.get("use_bigrams") if isinstance(vectorizer, dict) else None
+        if (
+            trainer.kind != self.target.kind
+            or trainer.labels != tuple(self.target.labels)
+            or trainer.target_transform != self.target.target_transform
+            or trainer.weights.shape[0] != self._vectorizer.n_features
+            or use_bigrams != self._vectorizer.use_bigrams
+        ):
+            raise ValueError(
+                f"Checkpoint v{checkpoint.version} was trained for a different target or feature space; "
+                "retrain with full=True."
+            )
+        return checkpoint
+
+    def _batches(self, dataset: Path, files: List[str]) -> Iterator[pa.RecordBatch]:
+        for name in files:
+            source = dataset if dataset.is_file() else dataset / name
+            yield from iter_raw_batches(source, self._read_batch_size, self._columns)
+
+    def train(self, dataset: str | os.PathLike[str], full: bool = False) -> TrainingReport:
+        start = time.perf_counter()
+        dataset = Path(dataset)
+        current = dataset_files(dataset)
+        checkpoint = None if full else self._resume()
+        trainer = checkpoint.trainer if checkpoint is not None else self._fresh_trainer()
+        trained = checkpoint.manifest if checkpoint is not None else {}
+        files = changed_files(current, trained)
+        parent = checkpoint.version if checkpoint is not None else None
+        if not files:
+            return TrainingReport(
+                version=parent,
+                parent_version=parent,
+                warm_started=checkpoint is not None,
+                files=[],
+                rows=0,
+                skipped_rows=0,
+                epochs=0,
+                mean_loss=0.0,
+                seconds=time.perf_counter() - start,
+            )
+
+        rows = skipped = 0
+        loss_sum = 0.0
+        for _ in range(self._epochs):
+            rows = skipped = 0
+            for features in iter_feature_batches(self._batches(dataset, files), self._columns, workers=self._workers):
+                keep, targets = target_values(features, self.target)
+                skipped += features.num_rows - len(keep)
+                if not len(keep):
+                    continue
+                order = self._rng.permutation(len(keep))
+                sparse = self._vectorizer.transform(features.take(pa.array(keep[order])))
+                targets = targets[order]
+                for offset in range(0, len(targets), self._batch_size):
+                    chunk = np.arange(offset, min(offset + self._batch_size, len(targets)))
+                    loss_sum += trainer.partial_fit(sparse.take(chunk), targets[chunk]) * len(chunk)
+                rows += len(keep)
+
+        metadata: Dict[str, object] = {
+            "vectorizer": {"n_features": self._vectorizer.n_features, "use_bigrams": self._vectorizer.use_bigrams},
+            "parent_version": parent,
+            "trained_files": files,
+        }
+        version = self.store.save(trainer, {**trained, **{name: current[name] for name in files}}, metadata)
+        return TrainingReport(
+            version=version,
+            parent_version=parent,
+            warm_started=checkpoint is not None,
+            files=files,
+            rows=rows,
+            skipped_rows=skipped,
+            epochs=self._epochs,
+            mean_loss=loss_sum / max(rows * self._epochs, 1),
+            seconds=time.perf_counter() - start,
+        )
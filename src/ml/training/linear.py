@@ -0,0 +1,151 @@
+"""Mini-batch AdaGrad training of hashed-feature linear models."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ml.feature_engineering.hashing import SparseRows
+from ml.models.linear import LinearModel, ModelKind, TargetTransform
+
+
+class LinearModelTrainer:
+    """Incrementally fit a :class:`LinearModel` with per-weight AdaGrad steps.
+
+    Only the weight rows touched by a mini-batch are updated, so a step costs
+    ``O(nnz * n_outputs)`` regardless of the hashed feature space.
+    Classifiers minimise softmax cross-entropy over integer class ids;
+    regressors minimise squared error on the transformed target.
+    """
+
+    def __init__(
+        self,
+        kind: ModelKind,
+        n_features: int,
+        labels: Sequence[str] = (),
+        target_transform: TargetTransform = "identity",
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+    ) -> None:
+        if kind == "classifier" and len(labels) < 2:
+            raise ValueError("A classifier needs at least two labels.")
+        outputs = len(labels) if kind == "classifier" else 1
+        self.kind: ModelKind = kind
+        self.labels = tuple(labels)
+        self.target_transform: TargetTransform = target_transform
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.weights = np.zeros((n_features, outputs), dtype=np.float32)
+        self.bias = np.zeros(outputs, dtype=np.float32)
+        self._weight_squares = np.zeros_like(self.weights)
+        self._bias_squares = np.zeros_like(self.bias)
+        self.samples_seen = 0
+
+    @classmethod
+    def warm_start(
+        cls,
+        model: LinearModel,
+        optimizer_state: Optional[Dict[str, np.ndarray]] = None,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+    ) -> "LinearModelTrainer":
+        """Continue training ``model``; without its :meth:`optimizer_state`, AdaGrad restarts with full steps."""
+        trainer = cls(
+            model.kind,
+            model.n_features,
+            model.labels,
+            target_transform=model.target_transform,
+            learning_rate=learning_rate,
+            l2=l2,
+        )
+        if trainer.weights.shape != model.weights.shape:
+            raise ValueError("Model weights do not match its labels.")
+        trainer.weights[...] = model.weights
+        trainer.bias[...] = model.bias
+        if optimizer_state is not None:
+            trainer._weight_squares[...] = optimizer_state["weight_squares"]
+            trainer._bias_squares[...] = optimizer_state["bias_squares"]
+        trainer.samples_seen = int(model.metadata.get("samples_seen", 0))
+        return trainer
+
+    def optimizer_state(self) -> Dict[str, np.ndarray]:
+        """Accumulated squared gradients, needed to resume with the step sizes training had reached."""
+        return {"weight_squares": self._weight_squares, "bias_squares": self._bias_squares}
+
+    def partial_fit(self, rows: SparseRows, targets: np.ndarray) -> float:
+        """Take one step on a mini-batch and return its mean loss before the update."""
+        size = len(rows)
+        if size == 0:
+            return 0.0
+        scores = self._model().decision_function(rows)
+        if self.kind == "classifier":
+            scores -= scores.max(axis=1, keepdims=True)
+            probabilities = np.exp(scores)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            classes = np.asarray(targets, dtype=np.int64)
+            loss = float(-np.log(probabilities[np.arange(size), classes] + 1e-12).mean())
+            gradient = probabilities
+            gradient[np.arange(size), classes] -= 1.0
+        else:
+            observed = np.asarray(targets, dtype=np.float32)
+            if self.target_transform == "log1p":
+                observed = np.log1p(np.maximum(observed, 0.0))
+            residual = scores[:, 0] - observed
+            loss = float(0.5 * np.mean(residual**2))
+            gradient = residual[:, None]
+        gradient /= size
+
+        # Sum per-entry gradients per feature by sorting, rather than a scattered np.add.at.
+        per_entry = gradient[rows.row_ids()] * rows.values[:, None]
+        order = np.argsort(rows.indices, kind="stable")
+        sorted_indices = rows.indices[order]
+        starts = np.flatnonzero(np.r_[True, sorted_indices[1:] != sorted_indices[:-1]])
+        touched = sorted_indices[starts]
+        weight_gradient = np.add.reduceat(per_entry[order], starts, axis=0)
+        weight_gradient += self.l2 * self.weights[touched]
+
+        self._weight_squares[touched] += weight_gradient**2
+        self.weights[touched] -= (
+            self.learning_rate * weight_gradient / (np.sqrt(self._weight_squares[touched]) + 1e-8)
+        )
+        bias_gradient = gradient.sum(axis=0)
+        self._bias_squares += bias_gradient**2
+        self.bias -= self.learning_rate * bias_gradient / (np.sqrt(self._bias_squares) + 1e-8)
+        self.samples_seen += size
+        return loss
+
+    def model(self, metadata: Optional[Dict[str, Any]] = None) -> LinearModel:
+        """Return a snapshot of the current weights as a servable model."""
+        model = self._model()
+        model.weights = model.weights.copy()
+        model.bias = model.bias.copy()
+        model.metadata = {"samples_seen": self.samples_seen, **(metadata or {})}
+        return model
+
+    def _model(self) -> LinearModel:
+        return LinearModel(
+            kind=self.kind,
+            weights=self.weights,
+            bias=self.bias,
+            labels=self.labels,
+            target_transform=self.target_transform,
+        )
+
+
+def fit_linear_model(
+    rows: SparseRows,
+    targets: np.ndarray,
+    trainer: LinearModelTrainer,
+    epochs: int = 5,
+    batch_size: int = 256,
+    seed: int = 0,
+) -> LinearModelTrainer:
+    """Run ``epochs`` shuffled passes of mini-batches over an in-memory training set."""
+    rng = np.random.default_rng(seed)
+    targets = np.asarray(targets)
+    for _ in range(epochs):
+        order = rng.permutation(len(rows))
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            trainer.partial_fit(rows.take(batch), targets[batch])
+    return trainer
@@ -0,0 +1,87 @@
+"""Prometheus metric registry and the collectors ``prometheus_client`` lacks.
+
+Instruments are ``prometheus_client`` counters, gauges and histograms
+registered in :data:`REGISTRY` rather than the library's global default, so
+benchmarks and tests can build registries of their own. Values that already
+live elsewhere, such as cache hit counts or queue depths, are read through
+callbacks at scrape time instead of being pushed on every change. Gauges
+support that through ``set_function``; counters do not, so
+:class:`CallbackCounter` yields a counter family from per-series callbacks.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily
+from prometheus_client.registry import Collector
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; roughly x2.5 steps from 100us to 30s.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+REGISTRY = CollectorRegistry()
+
+
+class CallbackSeries:
+    __slots__ = ("_family", "_values")
+
+    def __init__(self, family: "CallbackCounter", values: Tuple[str, ...]) -> None:
+        self._family = family
+        self._values = values
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read this series from ``function`` at scrape time."""
+        self._family._watch(self._values, function)
+
+
+class CallbackCounter(Collector):
+    """Counter family whose series are monotonic totals kept by another object."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: CollectorRegistry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, *values: str) -> CallbackSeries:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}.")
+        return CallbackSeries(self, tuple(str(value) for value in values))
+
+    def _watch(self, values: Tuple[str, ...], function: Callable[[], float]) -> None:
+        with self._lock:
+            self._functions[values] = function
+
+    def remove(self, *values: str) -> None:
+        with self._lock:
+            self._functions.pop(tuple(str(value) for value in values), None)
+
+    def describe(self) -> Iterable[CounterMetricFamily]:
+        return [CounterMetricFamily(self.name, self.documentation, labels=self.labelnames)]
+
+    def collect(self) -> Iterable[CounterMetricFamily]:
+        family = CounterMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        with self._lock:
+            functions = list(self._functions.items())
+        for values, function in functions:
+            family.add_metric(list(values), float(function()))
+        return [family]
+
+
+def render(registry: CollectorRegistry = REGISTRY) -> bytes:
+    """Return every registered metric in the Prometheus text format."""
+    return generate_latest(registry)
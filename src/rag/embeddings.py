@@ -0,0 +1,54 @@
+"""Local text embedders used for in-process vector search."""
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Protocol, Sequence
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class Embedder(Protocol):
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an L2-normalised ``(len(texts), dim)`` float32 matrix."""
+
+
+class HashingEmbedder:
+    """Signed feature-hashing embedder over word unigrams and bigrams.
+
+    Hashing uses CRC32 rather than the builtin ``hash`` so that every worker
+    process maps the same text to the same vector.
+    """
+
+    def __init__(self, dim: int = 256, use_bigrams: bool = True) -> None:
+        if dim < 1:
+            raise ValueError("dim must be positive.")
+        self.dim = dim
+        self._use_bigrams = use_bigrams
+
+    def _features(self, text: str) -> list[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if self._use_bigrams:
+            tokens.extend(f"{left} {right}" for left, right in zip(tokens, tokens[1:]))
+        return tokens
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self.dim] += sign
+        return normalize_rows(matrix)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return ``matrix`` scaled to unit L2 norm per row, leaving zero rows untouched."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return matrix / norms
@@ -0,0 +1,30 @@
+"""Rank fusion of lexical and vector retrieval results."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+FusedHit = Tuple[str, float]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    k: float = 60.0,
+    weights: Optional[Sequence[float]] = None,
+    normalize: bool = True,
+) -> List[FusedHit]:
+    """Fuse ranked label lists with reciprocal-rank fusion, best first.
+
+    Each list contributes ``weight / (k + rank)`` (1-based rank) to every label
+    it contains; only ranks are used, so BM25 scores and cosine similarities
+    need no calibration against each other. With ``normalize`` the scores are
+    divided by the best achievable total, which puts them in ``(0, 1]``.
+    """
+    weights = [1.0] * len(rankings) if weights is None else list(weights)
+    if len(weights) != len(rankings):
+        raise ValueError("One weight per ranking is required.")
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, label in enumerate(ranking, start=1):
+            fused[label] = fused.get(label, 0.0) + weight / (k + rank)
+    scale = sum(weights) / (k + 1.0) if normalize and fused else 1.0
+    return sorted(((label, score / scale) for label, score in fused.items()), key=lambda hit: hit[1], reverse=True)
@@ -0,0 +1,468 @@
+"""Resumable bulk embedding of ticket exports into memory-mapped vector segments.
+
+The backfill streams a directory of Parquet files in chunks. Worker
+processes normalise, hash, summarise and embed each chunk; this process
+drops tickets whose normalised text was already seen and writes every
+``segment_rows`` embedded tickets as one segment file (see
+:mod:`rag.vector_segment`) next to a Parquet file of per-ticket metadata.
+The output directory looks like::
+
+    manifest.json                  embedder, ingested files, resume position, segments
+    segment-000001.vseg            vectors, ticket ids and summaries
+    segment-000001.parquet         every input row of the shard: id, hash, status, metadata
+
+``manifest.json`` is replaced atomically after each segment lands, and it
+records the input file and row the committed segments end at. A killed run
+therefore resumes from the last segment, redoing at most one segment's worth
+of embedding; the content hashes of committed rows are read back from the
+metadata files so deduplication holds across restarts.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ml.preprocessing.text import join_text_columns, mask_pii, normalize_text
+from rag.embeddings import Embedder
+from rag.vector_segment import VectorSegment, write_segment
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SUMMARY_MAX_CHARS = 160
+
+EMBEDDED, DUPLICATE, EMPTY = "embedded", "duplicate", "empty"
+
+
+@dataclass(slots=True)
+class EmbedderSpec:
+    """Picklable recipe for an :class:`Embedder`, built once in every worker process.
+
+    ``factory`` is a ``module:attribute`` path to a class or function called
+    with ``options`` as keyword arguments, so any local model can be plugged
+    in without the pipeline importing it.
+    """
+
+    factory: str = "rag.embeddings:HashingEmbedder"
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def build(self) -> Embedder:
+        module, _, attribute = self.factory.partition(":")
+        if not module or not attribute:
+            raise ValueError(f"Embedder factory {self.factory!r} is not of the form 'module:attribute'.")
+        return getattr(importlib.import_module(module), attribute)(**self.options)
+
+
+@dataclass(frozen=True, slots=True)
+class TicketColumns:
+    """Input columns; text columns are joined in order, missing metadata columns are skipped.
+
+    The defaults match the customer-support-tickets dataset, which has no id
+    column: tickets without one are labelled ``<file>#<row>``.
+    """
+
+    text: Tuple[str, ...] = ("subject", "body")
+    ticket_id: Optional[str] = "ticket_id"
+    metadata: Tuple[str, ...] = ("queue", "type", "priority", "language", "category")
+
+
+@dataclass(slots=True)
+class IngestionReport:
+    rows_read: int
+    embedded: int
+    duplicates: int
+    empty: int
+    segments: int
+    seconds: float
+    workers: int
+    resumed: bool
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+@dataclass(slots=True)
+class _Chunk:
+    """One input chunk: every row's metadata, and vectors for the rows not seen in earlier chunks."""
+
+    file: str
+    end_row: int
+    metadata: pa.Table
+    candidates: np.ndarray
+    labels: List[str]
+    summaries: List[str]
+    vectors: Optional[np.ndarray]
+    completes_file: bool = False
+    embedded: int = 0
+    duplicates: int = 0
+    empty: int = 0
+
+
+def content_hash(text: str) -> int:
+    """64-bit BLAKE2b digest of already normalised ticket text."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def summaries(texts: pa.Array, max_chars: int = SUMMARY_MAX_CHARS) -> pa.Array:
+    """Single-line, PII-masked previews of ticket text, truncated with an ellipsis."""
+    collapsed = pc.utf8_trim_whitespace(pc.replace_substring_regex(mask_pii(texts), pattern=r"\s+", replacement=" "))
+    truncated = pc.binary_join_element_wise(
+        pc.utf8_rtrim_whitespace(pc.utf8_slice_codeunits(collapsed, 0, max_chars - 1)), "…", ""
+    )
+    return pc.if_else(pc.greater(pc.utf8_length(collapsed), max_chars), truncated, collapsed)
+
+
+def open_segments(path: str | os.PathLike[str]) -> List[VectorSegment]:
+    """Open a single segment file, or every committed segment of a backfill output directory."""
+    root = Path(path)
+    if root.is_file():
+        return [VectorSegment.open(root)]
+    manifest = json.loads((root / MANIFEST_NAME).read_text())
+    return [VectorSegment.open(root / segment["name"]) for segment in manifest["segments"] if segment["name"]]
+
+
+_worker_embedder: Optional[Embedder] = None
+
+
+def _init_worker(spec: EmbedderSpec) -> None:
+    global _worker_embedder
+    _worker_embedder = spec.build()
+
+
+def _embed_chunk(name: str, first_row: int, batch: pa.RecordBatch, columns: TicketColumns) -> _Chunk:
+    """Hash, summarise and embed one batch, skipping empty tickets and repeats within the batch."""
+    assert _worker_embedder is not None
+    schema_names = batch.schema.names
+    text_columns = [batch.column(column) for column in columns.text if column in schema_names]
+    if not text_columns:
+        raise ValueError(f"{name} has none of the text columns {columns.text!r}.")
+    raw = join_text_columns(text_columns)
+    rows = list(range(first_row, first_row + batch.num_rows))
+    given = (
+        batch.column(columns.ticket_id).to_pylist() if columns.ticket_id in schema_names else [None] * batch.num_rows
+    )
+    ids = [str(value) if value is not None else f"{name}#{row}" for value, row in zip(given, rows)]
+
+    hashes: List[Optional[int]] = []
+    statuses: List[str] = []
+    duplicate_of: List[Optional[str]] = []
+    first_seen: Dict[int, str] = {}
+    for position, text in enumerate(normalize_text(raw).to_pylist()):
+        digest = content_hash(text) if text else None
+        original = first_seen.get(digest) if digest is not None else None
+        hashes.append(digest)
+        statuses.append(EMPTY if digest is None else DUPLICATE if original is not None else EMBEDDED)
+        duplicate_of.append(original)
+        if digest is not None and original is None:
+            first_seen[digest] = ids[position]
+
+    candidates = np.flatnonzero(np.array(statuses, dtype=object) == EMBEDDED)
+    texts = raw.take(pa.array(candidates, type=pa.int64()))
+    metadata = {
+        "ticket_id": pa.array(ids, pa.string()),
+        "content_hash": pa.array(hashes, pa.uint64()),
+        "status": pa.array(statuses, pa.string()),
+        # Only duplicates within a chunk name their original; join on content_hash for the rest.
+        "duplicate_of": pa.array(duplicate_of, pa.string()),
+        "source_file": pa.array([name] * batch.num_rows, pa.string()),
+        "source_row": pa.array(rows, pa.int64()),
+    }
+    for column in columns.metadata:
+        if column in schema_names:
+            metadata[column] = batch.column(column)
+    return _Chunk(
+        file=name,
+        end_row=first_row + batch.num_rows,
+        metadata=pa.table(metadata),
+        candidates=candidates,
+        labels=[ids[position] for position in candidates],
+        summaries=summaries(texts).to_pylist(),
+        vectors=np.asarray(_worker_embedder.embed(texts.to_pylist()), dtype=np.float32) if len(texts) else None,
+    )
+
+
+def _iter_chunks(
+    path: Path, chunk_rows: int, columns: Sequence[str], start_row: int
+) -> Iterator[Tuple[int, pa.RecordBatch]]:
+    """Yield ``(first row, batch)`` from ``start_row`` on, skipping whole row groups before it."""
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    first_group, skip = 0, start_row
+    while first_group < metadata.num_row_groups and skip >= metadata.row_group(first_group).num_rows:
+        skip -= metadata.row_group(first_group).num_rows
+        first_group += 1
+    row = start_row - skip
+    present = [name for name in dict.fromkeys(columns) if name in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(
+        batch_size=chunk_rows, row_groups=range(first_group, metadata.num_row_groups), columns=present
+    ):
+        if skip >= batch.num_rows:
+            skip -= batch.num_rows
+            row += batch.num_rows
+            continue
+        if skip:
+            batch, row, skip = batch.slice(skip), row + skip, 0
+        yield row, batch
+        row += batch.num_rows
+
+
+class EmbeddingIngestion:
+    """Backfill ticket embeddings from Parquet exports into ``output`` in bulk.
+
+    Chunks of ``chunk_rows`` tickets are embedded by ``workers`` spawned
+    processes, at most ``max_inflight`` chunks at a time so memory stays
+    bounded, and consumed in input order. Only the lookup of content hashes
+    seen in earlier chunks runs here, so nearly all the work scales with
+    the pool. Segments are clustered and written on a background thread
+    while the pool keeps embedding; each one is committed to the manifest
+    once it is on disk. Peak memory is about two segments' vectors.
+    """
+
+    def __init__(
+        self,
+        output: str | os.PathLike[str],
+        embedder: EmbedderSpec = EmbedderSpec(),
+        columns: TicketColumns = TicketColumns(),
+        chunk_rows: int = 8_192,
+        segment_rows: int = 250_000,
+        nlist: int = 1024,
+        train_points_per_list: int = 64,
+        workers: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+    ) -> None:
+        if chunk_rows < 1 or segment_rows < 1:
+            raise ValueError("chunk_rows and segment_rows must be positive.")
+        self.output = Path(output)
+        self.embedder = embedder
+        self.columns = columns
+        self._chunk_rows = chunk_rows
+        self._segment_rows = segment_rows
+        self._nlist = nlist
+        self._train_points_per_list = train_points_per_list
+        self._workers = workers or os.cpu_count() or 1
+        self._max_inflight = max_inflight or self._workers * 2
+
+    def _settings(self, dim: int) -> Dict[str, Any]:
+        return {
+            "embedder": dataclasses.asdict(self.embedder),
+            "dim": dim,
+            "text_columns": list(self.columns.text),
+            "id_column": self.columns.ticket_id,
+        }
+
+    def _load_manifest(self, settings: Dict[str, Any], files: Dict[str, List[int]]) -> Optional[Dict[str, Any]]:
+        try:
+            manifest = json.loads((self.output / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            return None
+        if manifest.get("version") != MANIFEST_VERSION or manifest["settings"] != settings:
+            raise ValueError(f"{self.output} was written with different settings; rerun with restart=True.")
+        ingested = dict(manifest["files"])
+        if manifest["position"] is not None:
+            ingested[manifest["position"]["file"]] = manifest["position"]["fingerprint"]
+        if any(name in files and files[name] != fingerprint for name, fingerprint in ingested.items()):
+            raise ValueError(f"Input files already ingested into {self.output} changed; rerun with restart=True.")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        staging = self.output / f".{MANIFEST_NAME}.tmp"
+        staging.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        os.replace(staging, self.output / MANIFEST_NAME)
+
+    def _seen_hashes(self, manifest: Dict[str, Any]) -> Set[int]:
+        seen: Set[int] = set()
+        for segment in manifest["segments"]:
+            table = pq.read_table(
+                self.output / segment["metadata"], columns=["content_hash"], filters=[("status", "=", EMBEDDED)]
+            )
+            seen.update(table.column("content_hash").to_numpy().tolist())
+        return seen
+
+    @staticmethod
+    def _deduplicate(chunk: _Chunk, file_rows: int, seen: Set[int]) -> _Chunk:
+        """Mark rows whose text an earlier chunk already embedded as duplicates and drop their vectors."""
+        hashes = chunk.metadata.column("content_hash").to_pylist()
+        keep = []
+        for index, position in enumerate(chunk.candidates):
+            digest = hashes[position]
+            if digest not in seen:
+                seen.add(digest)
+                keep.append(index)
+        statuses = np.array(chunk.metadata.column("status").to_pylist(), dtype=object)
+        statuses[np.delete(chunk.candidates, keep)] = DUPLICATE
+        chunk.metadata = chunk.metadata.set_column(
+            chunk.metadata.schema.get_field_index("status"), "status", pa.array(statuses, pa.string())
+        )
+        if len(keep) < len(chunk.candidates):
+            chunk.labels = [chunk.labels[index] for index in keep]
+            chunk.summaries = [chunk.summaries[index] for index in keep]
+            chunk.vectors = chunk.vectors[keep] if keep and chunk.vectors is not None else None
+        chunk.completes_file = chunk.end_row == file_rows
+        chunk.embedded = len(keep)
+        chunk.empty = int((statuses == EMPTY).sum())
+        chunk.duplicates = chunk.metadata.num_rows - chunk.embedded - chunk.empty
+        return chunk
+
+    def _write_shard(self, index: int, chunks: List[_Chunk]) -> Dict[str, Any]:
+        name = f"segment-{index:06d}"
+        labels = [label for chunk in chunks for label in chunk.labels]
+        if labels:
+            nlist = max(1, min(self._nlist, len(labels) // self._train_points_per_list))
+            write_segment(
+                self.output / f"{name}.vseg",
+                labels,
+                np.concatenate([chunk.vectors for chunk in chunks if chunk.vectors is not None]),
+                [summary for chunk in chunks for summary in chunk.summaries],
+                nlist=nlist,
+                train_sample_size=nlist * self._train_points_per_list,
+            )
+        metadata = pa.concat_tables([chunk.metadata for chunk in chunks], promote_options="permissive")
+        staging = self.output / f".{name}.parquet.tmp"
+        pq.write_table(metadata, staging)
+        os.replace(staging, self.output / f"{name}.parquet")
+        # A shard of only duplicates and empty tickets has metadata but no segment file.
+        return {
+            "name": f"{name}.vseg" if labels else None,
+            "metadata": f"{name}.parquet",
+            "rows": len(labels),
+            "input_rows": metadata.num_rows,
+        }
+
+    def run(self, dataset: str | os.PathLike[str], restart: bool = False) -> IngestionReport:
+        """Ingest every Parquet file under ``dataset`` that is not in the output yet.
+
+        Files are taken in path order, resuming mid-file after the last
+        committed segment; files added since the previous run are picked up
+        and files that were fully ingested are skipped. Changing an ingested
+        file, the embedder or the columns requires ``restart=True``, which
+        discards the existing output.
+        """
+        start = time.perf_counter()
+        root = Path(dataset)
+        paths = [root] if root.is_file() else sorted(root.rglob("*.parquet"))
+        files: Dict[str, List[int]] = {}
+        for path in paths:
+            stat = path.stat()
+            files[path.name if path == root else path.relative_to(root).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+        settings = self._settings(self.embedder.build().dim)
+        self.output.mkdir(parents=True, exist_ok=True)
+        previous = None if restart else self._load_manifest(settings, files)
+        if previous is None:
+            for stale in (*self.output.glob("segment-*"), self.output / MANIFEST_NAME):
+                stale.unlink(missing_ok=True)
+        manifest: Dict[str, Any] = previous or {
+            "version": MANIFEST_VERSION,
+            "settings": settings,
+            "segments": [],
+            "files": {},
+            "position": None,
+            "counts": {"rows_read": 0, EMBEDDED: 0, DUPLICATE: 0, EMPTY: 0},
+        }
+        seen = self._seen_hashes(manifest)
+        resume_at = manifest["position"]
+        counts = {"rows_read": 0, EMBEDDED: 0, DUPLICATE: 0, EMPTY: 0}
+        segments_before = len(manifest["segments"])
+        file_rows: Dict[str, int] = {}
+        wanted = [*self.columns.text, *self.columns.metadata]
+        if self.columns.ticket_id:
+            wanted.append(self.columns.ticket_id)
+
+        def batches() -> Iterator[Tuple[str, int, pa.RecordBatch]]:
+            for name, path in zip(files, paths):
+                if name in manifest["files"]:
+                    continue
+                start_row = resume_at["row"] if resume_at is not None and resume_at["file"] == name else 0
+                file_rows[name] = pq.ParquetFile(path).metadata.num_rows
+                for first_row, batch in _iter_chunks(path, self._chunk_rows, wanted, start_row):
+                    yield name, first_row, batch
+
+        def commit(record: Dict[str, Any], shard: List[_Chunk]) -> None:
+            manifest["segments"].append(record)
+            for chunk in shard:
+                if chunk.completes_file:
+                    manifest["files"][chunk.file] = files[chunk.file]
+                for key, value in (
+                    ("rows_read", chunk.metadata.num_rows),
+                    (EMBEDDED, chunk.embedded),
+                    (DUPLICATE, chunk.duplicates),
+                    (EMPTY, chunk.empty),
+                ):
+                    manifest["counts"][key] += value
+                    counts[key] += value
+            last = shard[-1]
+            manifest["position"] = None
+            if not last.completes_file:
+                manifest["position"] = {"file": last.file, "row": last.end_row, "fingerprint": files[last.file]}
+            self._write_manifest(manifest)
+
+        buffered: List[_Chunk] = []
+        writing: Optional[Tuple[Future[Dict[str, Any]], List[_Chunk]]] = None
+        next_index = segments_before + 1
+
+        def finish_write() -> None:
+            nonlocal writing
+            if writing is not None:
+                future, shard = writing
+                commit(future.result(), shard)
+                writing = None
+
+        def flush(writer: ThreadPoolExecutor) -> None:
+            nonlocal buffered, writing, next_index
+            # One shard is written while the next is embedded; wait for it before queueing another.
+            finish_write()
+            writing = (writer.submit(self._write_shard, next_index, buffered), buffered)
+            next_index += 1
+            buffered = []
+
+        def collect(chunk: _Chunk, writer: ThreadPoolExecutor) -> None:
+            buffered.append(self._deduplicate(chunk, file_rows[chunk.file], seen))
+            if sum(item.embedded for item in buffered) >= self._segment_rows:
+                flush(writer)
+
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            if self._workers == 1:
+                _init_worker(self.embedder)
+                for name, first_row, batch in batches():
+                    collect(_embed_chunk(name, first_row, batch, self.columns), writer)
+            else:
+                # Spawned workers do not inherit Arrow's thread pools or open file handles from the parent.
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(
+                    max_workers=self._workers, mp_context=context, initializer=_init_worker, initargs=(self.embedder,)
+                ) as pool:
+                    pending: Deque[Future[_Chunk]] = deque()
+                    for name, first_row, batch in batches():
+                        pending.append(pool.submit(_embed_chunk, name, first_row, batch, self.columns))
+                        if len(pending) >= self._max_inflight:
+                            collect(pending.popleft().result(), writer)
+                    while pending:
+                        collect(pending.popleft().result(), writer)
+            if buffered:
+                flush(writer)
+            finish_write()
+
+        return IngestionReport(
+            rows_read=counts["rows_read"],
+            embedded=counts[EMBEDDED],
+            duplicates=counts[DUPLICATE],
+            empty=counts[EMPTY],
+            segments=sum(1 for record in manifest["segments"][segments_before:] if record["name"]),
+            seconds=time.perf_counter() - start,
+            workers=self._workers,
+            resumed=previous is not None,
+        )
@@ -0,0 +1,423 @@
+"""Incremental BM25 inverted index with block-max early termination."""
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SearchHit = Tuple[str, float]
+
+# Keeps error codes, versions and paths such as ``err-5012``, ``v2.3.1`` or ``api/v2`` whole.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[._\-/][a-z0-9]+)*")
+_SEPARATORS = re.compile(r"[._\-/]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound tokens are emitted whole and as their parts."""
+    tokens: List[str] = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if _SEPARATORS.search(token):
+            tokens.extend(part for part in _SEPARATORS.split(token) if part)
+    return tokens
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    if needed <= len(array):
+        return array
+    grown = np.empty(max(needed, 2 * len(array), 8), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class _Postings:
+    """Doc-ordered postings of one term plus per-range impact metadata.
+
+    Document ids are assigned in insertion order, so appends keep postings
+    sorted. The doc id space is cut into fixed ranges; for each range a term
+    occurs in we keep its offset in the postings, the largest term frequency
+    and the shortest document, which together bound the term's BM25
+    contribution anywhere in that range.
+    """
+
+    __slots__ = ("docs", "tfs", "size", "range_ids", "range_starts", "range_max_tf", "range_min_len", "ranges")
+
+    def __init__(self) -> None:
+        self.docs = np.empty(0, dtype=np.int32)
+        self.tfs = np.empty(0, dtype=np.uint16)
+        self.size = 0
+        self.range_ids = np.empty(0, dtype=np.int32)
+        self.range_starts = np.empty(0, dtype=np.int64)
+        self.range_max_tf = np.empty(0, dtype=np.float32)
+        self.range_min_len = np.empty(0, dtype=np.float32)
+        self.ranges = 0
+
+    def extend(self, docs: np.ndarray, tfs: np.ndarray, lengths: np.ndarray, range_size: int) -> None:
+        count = len(docs)
+        self.docs = _grow(self.docs, self.size + count)
+        self.tfs = _grow(self.tfs, self.size + count)
+        self.docs[self.size : self.size + count] = docs
+        self.tfs[self.size : self.size + count] = np.minimum(tfs, np.iinfo(np.uint16).max)
+
+        range_of_doc = docs // range_size
+        starts = np.flatnonzero(np.r_[True, range_of_doc[1:] != range_of_doc[:-1]])
+        new_ids = range_of_doc[starts].astype(np.int32)
+        new_max_tf = np.maximum.reduceat(tfs.astype(np.float32), starts)
+        new_min_len = np.minimum.reduceat(lengths, starts)
+        new_starts = starts.astype(np.int64) + self.size
+        if self.ranges and self.range_ids[self.ranges - 1] == new_ids[0]:
+            last = self.ranges - 1
+            self.range_max_tf[last] = max(self.range_max_tf[last], new_max_tf[0])
+            self.range_min_len[last] = min(self.range_min_len[last], new_min_len[0])
+            new_ids, new_starts = new_ids[1:], new_starts[1:]
+            new_max_tf, new_min_len = new_max_tf[1:], new_min_len[1:]
+        added = len(new_ids)
+        if added:
+            end = self.ranges + added
+            self.range_ids = _grow(self.range_ids, end)
+            self.range_starts = _grow(self.range_starts, end)
+            self.range_max_tf = _grow(self.range_max_tf, end)
+            self.range_min_len = _grow(self.range_min_len, end)
+            self.range_ids[self.ranges : end] = new_ids
+            self.range_starts[self.ranges : end] = new_starts
+            self.range_max_tf[self.ranges : end] = new_max_tf
+            self.range_min_len[self.ranges : end] = new_min_len
+            self.ranges = end
+        self.size += count
+
+    def range_bounds(self, ranges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return posting offsets ``[start, stop)`` for each range id in ``ranges`` (empty when absent)."""
+        ids = self.range_ids[: self.ranges]
+        slots = np.searchsorted(ids, ranges)
+        present = (slots < self.ranges) & (ids[np.minimum(slots, self.ranges - 1)] == ranges)
+        starts = np.where(present, self.range_starts[np.minimum(slots, self.ranges - 1)], 0)
+        next_starts = np.r_[self.range_starts[: self.ranges], self.size]
+        stops = np.where(present, next_starts[np.minimum(slots + 1, self.ranges)], 0)
+        return starts, stops
+
+
+# Query term: postings, idf times query term frequency, and its largest per-range bound.
+_RankedTerm = Tuple[_Postings, float, float]
+
+
+class BM25Index:
+    """Okapi BM25 over an append-only inverted index with tombstoned deletes.
+
+    Queries use docid-range block-max pruning. Documents of the rarest,
+    highest-impact terms are scored first to seed the k-th best score. Each
+    query term's per-range upper bounds are summed into a bound per range;
+    ranges are then scored in decreasing bound order in growing chunks, and
+    scoring stops once the next range's bound cannot beat the k-th best score.
+    Within a chunk, terms whose bounds together stay below that score only
+    refine candidates found through the other terms (MaxScore). When the
+    frequent terms are needed to reach the threshold, a plain vectorised scan
+    is cheaper and is used instead. Results are identical to scoring every
+    posting (:meth:`search_exhaustive`).
+
+    Postings take six bytes each (int32 doc id, uint16 term frequency).
+    Deleted and replaced documents are tombstoned and dropped by
+    :meth:`compact`, which runs automatically once they make up a quarter of
+    the index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, range_size: int = 2048, max_chunk_ranges: int = 64) -> None:
+        self.k1 = k1
+        self.b = b
+        self.range_size = range_size
+        self.max_chunk_ranges = max_chunk_ranges
+        self._terms: Dict[str, int] = {}
+        self._postings: List[_Postings] = []
+        self._labels: List[Optional[str]] = []
+        self._doc_of_label: Dict[str, int] = {}
+        self._lengths = np.empty(0, dtype=np.float32)
+        self._live = np.empty(0, dtype=bool)
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_of_label)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._doc_of_label
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._terms)
+
+    def add(self, labels: Sequence[str], texts: Sequence[str]) -> None:
+        """Insert or replace documents."""
+        if len(labels) != len(texts):
+            raise ValueError("labels and texts must have the same length.")
+        counted = [Counter(tokenize(text)) for text in texts]
+        with self._lock:
+            self._remove_labels(label for label in labels if label in self._doc_of_label)
+            first = len(self._labels)
+            end = first + len(labels)
+            self._lengths = _grow(self._lengths, end)
+            self._live = _grow(self._live, end)
+            per_term: Dict[int, Tuple[List[int], List[int]]] = {}
+            for offset, (label, counts) in enumerate(zip(labels, counted)):
+                doc = first + offset
+                self._labels.append(label)
+                self._doc_of_label[label] = doc
+                length = float(sum(counts.values()))
+                self._lengths[doc] = length
+                self._live[doc] = True
+                self._total_length += length
+                for term, tf in counts.items():
+                    term_id = self._terms.get(term)
+                    if term_id is None:
+                        term_id = self._terms[term] = len(self._postings)
+                        self._postings.append(_Postings())
+                    entry = per_term.get(term_id)
+                    if entry is None:
+                        entry = per_term[term_id] = ([], [])
+                    entry[0].append(doc)
+                    entry[1].append(tf)
+            for term_id, (docs, tfs) in per_term.items():
+                doc_array = np.asarray(docs, dtype=np.int32)
+                self._postings[term_id].extend(
+                    doc_array, np.asarray(tfs, dtype=np.int64), self._lengths[doc_array], self.range_size
+                )
+
+    def remove(self, labels: Iterable[str]) -> int:
+        """Delete documents; return the number actually removed."""
+        with self._lock:
+            removed = self._remove_labels(labels)
+            dead = len(self._labels) - len(self._doc_of_label)
+            if dead > max(1024, len(self._labels) // 4):
+                self.compact()
+            return removed
+
+    def search(self, query: str, k: int) -> List[SearchHit]:
+        """Return up to ``k`` ``(label, BM25 score)`` pairs, best first."""
+        with self._lock:
+            terms = self._query_terms(query)
+            if k <= 0 or not terms:
+                return []
+            average_length = self._total_length / max(len(self), 1)
+            range_parts, bound_parts, term_bounds = [], [], []
+            for postings, weight in terms:
+                bounds = weight * self._saturate(
+                    postings.range_max_tf[: postings.ranges], postings.range_min_len[: postings.ranges], average_length
+                )
+                range_parts.append(postings.range_ids[: postings.ranges])
+                bound_parts.append(bounds)
+                term_bounds.append(float(bounds.max()))
+            upper = np.bincount(np.concatenate(range_parts), weights=np.concatenate(bound_parts))
+            order = np.flatnonzero(upper)
+            order = order[np.argsort(-upper[order], kind="stable")]
+            by_bound = np.argsort(term_bounds, kind="stable")
+            ranked = [(*terms[i], term_bounds[i]) for i in by_bound]
+            cumulative_bounds = np.cumsum(np.asarray(term_bounds)[by_bound])
+
+            top_docs, top_scores = self._seed(ranked, k, average_length)
+            threshold = top_scores.min() if len(top_scores) == k else 0.0
+            essential = int(np.searchsorted(cumulative_bounds, threshold, side="right"))
+            sizes = [postings.size for postings, _, _ in ranked]
+            if sum(sizes[essential:]) * 8 >= sum(sizes):
+                # Low-impact terms are needed to reach the threshold; a single scan costs less than pruning.
+                return self._scan(terms, k, average_length)
+            position, chunk = 0, 1
+            while position < len(order):
+                threshold = top_scores.min() if len(top_scores) == k else 0.0
+                if upper[order[position]] <= threshold:
+                    break
+                ranges = np.sort(order[position : position + chunk])
+                position += len(ranges)
+                chunk = min(chunk * 8, self.max_chunk_ranges)
+                # MaxScore split: documents matching only the low-impact prefix cannot beat the threshold.
+                essential = int(np.searchsorted(cumulative_bounds, threshold, side="right"))
+                docs, scores = self._score_ranges(ranked, essential, ranges, average_length, threshold)
+                seen = np.isin(docs, top_docs)
+                docs, scores = docs[~seen], scores[~seen]
+                top_docs, top_scores = self._merge_top(top_docs, top_scores, docs, scores, k)
+            return self._hits(top_docs, top_scores)
+
+    def search_exhaustive(self, query: str, k: int) -> List[SearchHit]:
+        """Score every posting of every query term; the reference for :meth:`search`."""
+        with self._lock:
+            terms = self._query_terms(query)
+            if k <= 0 or not terms:
+                return []
+            return self._scan(terms, k, self._total_length / max(len(self), 1))
+
+    def compact(self) -> None:
+        """Drop tombstoned documents from every postings list and renumber doc ids densely."""
+        with self._lock:
+            total = len(self._labels)
+            live = self._live[:total]
+            new_ids = np.cumsum(live, dtype=np.int64) - 1
+            lengths = self._lengths[:total][live]
+            old_postings, self._postings = self._postings, []
+            old_terms, self._terms = self._terms, {}
+            for term, term_id in old_terms.items():
+                postings = old_postings[term_id]
+                docs = postings.docs[: postings.size]
+                keep = live[docs]
+                if not keep.any():
+                    continue
+                renumbered = new_ids[docs[keep]].astype(np.int32)
+                rebuilt = _Postings()
+                tfs = postings.tfs[: postings.size][keep].astype(np.int64)
+                rebuilt.extend(renumbered, tfs, lengths[renumbered], self.range_size)
+                self._terms[term] = len(self._postings)
+                self._postings.append(rebuilt)
+            self._labels = [label for label, alive in zip(self._labels, live) if alive]
+            self._doc_of_label = {label: doc for doc, label in enumerate(self._labels)}  # type: ignore[misc]
+            self._lengths = lengths.copy()
+            self._live = np.ones(len(self._labels), dtype=bool)
+
+    def _scan(self, terms: List[Tuple[_Postings, float]], k: int, average_length: float) -> List[SearchHit]:
+        doc_parts, score_parts = [], []
+        for postings, weight in terms:
+            docs = postings.docs[: postings.size]
+            tfs = postings.tfs[: postings.size].astype(np.float32)
+            doc_parts.append(docs)
+            score_parts.append(weight * self._saturate(tfs, self._lengths[docs], average_length))
+        totals = np.bincount(
+            np.concatenate(doc_parts), weights=np.concatenate(score_parts), minlength=len(self._labels)
+        )
+        candidates = np.flatnonzero((totals > 0) & self._live[: len(self._labels)])
+        top_docs, top_scores = self._merge_top(
+            np.empty(0, dtype=np.int64), np.empty(0), candidates, totals[candidates], k
+        )
+        return self._hits(top_docs, top_scores)
+
+    def _remove_labels(self, labels: Iterable[str]) -> int:
+        removed = 0
+        for label in labels:
+            doc = self._doc_of_label.pop(label, None)
+            if doc is None:
+                continue
+            self._live[doc] = False
+            self._labels[doc] = None
+            self._total_length -= float(self._lengths[doc])
+            removed += 1
+        return removed
+
+    def _query_terms(self, query: str) -> List[Tuple[_Postings, float]]:
+        documents = max(len(self), 1)
+        terms = []
+        for term, query_tf in Counter(tokenize(query)).items():
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            postings = self._postings[term_id]
+            # Document frequency counts tombstoned postings until the next compaction.
+            frequency = min(postings.size, documents)
+            idf = float(np.log1p((documents - frequency + 0.5) / (frequency + 0.5)))
+            terms.append((postings, idf * query_tf))
+        return terms
+
+    def _saturate(self, tfs: np.ndarray, lengths: np.ndarray, average_length: float) -> np.ndarray:
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / max(average_length, 1e-9))
+        return tfs * (self.k1 + 1.0) / (tfs + norm)
+
+    def _score_ranges(
+        self,
+        terms: List[_RankedTerm],
+        essential: int,
+        ranges: np.ndarray,
+        average_length: float,
+        threshold: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score documents in ``ranges`` that contain one of ``terms[essential:]``.
+
+        Essential postings are gathered range by range and define the
+        candidates. Each remaining term is either gathered too or, when its
+        postings in these ranges far outnumber the candidates, probed with a
+        binary search; candidates that cannot exceed ``threshold`` even with
+        the bounds of the unprobed terms are dropped before probing.
+        """
+        essential_slots, essential_scores = self._gather(terms[essential:], ranges, average_length)
+        if not essential_slots:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        width = len(ranges) * self.range_size
+        totals = np.bincount(
+            np.concatenate(essential_slots), weights=np.concatenate(essential_scores), minlength=width
+        )
+        slots = np.flatnonzero(totals)
+        probed, gathered = [], []
+        for term in terms[:essential]:
+            starts, stops = term[0].range_bounds(ranges)
+            (probed if int((stops - starts).sum()) > 16 * len(slots) else gathered).append(term)
+        if gathered:
+            extra_slots, extra_scores = self._gather(gathered, ranges, average_length)
+            if extra_slots:
+                totals += np.bincount(
+                    np.concatenate(extra_slots), weights=np.concatenate(extra_scores), minlength=width
+                )
+        docs = ranges[slots // self.range_size].astype(np.int64) * self.range_size + slots % self.range_size
+        scores = totals[slots]
+        slack = sum(bound for _, _, bound in probed)
+        keep = self._live[docs] & (scores + slack > threshold)
+        docs, scores = docs[keep], scores[keep]
+        self._probe(probed, docs, scores, average_length)
+        return docs, scores
+
+    def _gather(
+        self, terms: List[_RankedTerm], ranges: np.ndarray, average_length: float
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Return chunk-local slots and BM25 contributions of every posting of ``terms`` in ``ranges``."""
+        slot_parts, score_parts = [], []
+        for postings, weight, _ in terms:
+            starts, stops = postings.range_bounds(ranges)
+            lengths = stops - starts
+            total = int(lengths.sum())
+            if not total:
+                continue
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            positions = np.arange(total, dtype=np.int64) + np.repeat(starts - offsets[:-1], lengths)
+            docs = postings.docs[positions]
+            tfs = postings.tfs[positions].astype(np.float32)
+            # Slot = chunk-local range index * range_size + offset inside the range.
+            local = np.repeat(np.arange(len(ranges), dtype=np.int64), lengths)
+            slot_parts.append(local * self.range_size + (docs - ranges[local] * self.range_size))
+            score_parts.append(weight * self._saturate(tfs, self._lengths[docs], average_length))
+        return slot_parts, score_parts
+
+    def _seed(self, terms: List[_RankedTerm], k: int, average_length: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Fully score the documents of the highest-impact terms to start with a high threshold."""
+        parts, count = [], 0
+        for postings, _, _ in reversed(terms):
+            if count >= k or count + postings.size > max(16 * k, 4096):
+                break
+            parts.append(postings.docs[: postings.size])
+            count += postings.size
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        docs = np.unique(np.concatenate(parts)).astype(np.int64)
+        docs = docs[self._live[docs]]
+        scores = np.zeros(len(docs))
+        self._probe(terms, docs, scores, average_length)
+        return self._merge_top(np.empty(0, dtype=np.int64), np.empty(0), docs, scores, k)
+
+    def _probe(self, terms: List[_RankedTerm], docs: np.ndarray, scores: np.ndarray, average_length: float) -> None:
+        """Add the contribution of ``terms`` to ``scores`` of ``docs`` by binary search in their postings."""
+        for postings, weight, _ in terms:
+            posted = postings.docs[: postings.size]
+            found = np.minimum(np.searchsorted(posted, docs), postings.size - 1)
+            matched = posted[found] == docs
+            if matched.any():
+                tfs = postings.tfs[found[matched]].astype(np.float32)
+                scores[matched] += weight * self._saturate(tfs, self._lengths[docs[matched]], average_length)
+
+    @staticmethod
+    def _merge_top(
+        top_docs: np.ndarray, top_scores: np.ndarray, docs: np.ndarray, scores: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        merged_docs = np.concatenate([top_docs, docs])
+        merged_scores = np.concatenate([top_scores, scores])
+        if len(merged_scores) > k:
+            keep = np.argpartition(-merged_scores, k - 1)[:k]
+            merged_docs, merged_scores = merged_docs[keep], merged_scores[keep]
+        return merged_docs, merged_scores
+
+    def _hits(self, docs: np.ndarray, scores: np.ndarray) -> List[SearchHit]:
+        order = np.lexsort((docs, -scores))
+        return [(self._labels[int(docs[i])], float(scores[i])) for i in order]  # type: ignore[misc]
@@ -0,0 +1,69 @@
+"""LLM client abstractions used by the auto-resolution pipeline."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import AsyncIterator, Protocol
+
+from rag.prompt_templates.tokens import HeuristicTokenCounter
+
+_VOCABULARY = (
+    "Thanks for reaching out. ",
+    "We have reviewed similar tickets ",
+    "and the most common fix is ",
+    "to sign out of all sessions, ",
+    "clear the browser cache, ",
+    "and request a new link ",
+    "from the account settings page. ",
+    "If the issue persists, ",
+    "reply to this ticket ",
+    "and an agent will follow up. ",
+)
+
+
+class LLMClient(Protocol):
+    async def complete(self, prompt: str) -> str:
+        """Return the full completion for ``prompt``."""
+
+    def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield completion tokens for ``prompt`` as they are produced."""
+
+
+class FakeLLM(LLMClient):
+    """Deterministic offline LLM with configurable first-token and per-token latency.
+
+    The completion is chosen from a fixed vocabulary based on a hash of the
+    prompt, so identical prompts always yield identical text. A non-zero
+    ``prefill_ms_per_1k_tokens`` delays the first token in proportion to the
+    prompt length, the way prompt processing does on a hosted model.
+    """
+
+    def __init__(
+        self,
+        first_token_latency_ms: float = 200.0,
+        token_latency_ms: float = 20.0,
+        max_tokens: int = 40,
+        prefill_ms_per_1k_tokens: float = 0.0,
+    ) -> None:
+        self._first_token_latency = first_token_latency_ms / 1000
+        self._token_latency = token_latency_ms / 1000
+        self._max_tokens = max_tokens
+        self._prefill_per_token = prefill_ms_per_1k_tokens / 1_000_000
+        self._counter = HeuristicTokenCounter(cache_size=0)
+
+    def _tokens(self, prompt: str) -> list[str]:
+        seed = int.from_bytes(hashlib.blake2b(prompt.encode("utf-8"), digest_size=4).digest(), "big")
+        text = "".join(_VOCABULARY[(seed + i) % len(_VOCABULARY)] for i in range(len(_VOCABULARY)))
+        words = text.split(" ")
+        return [word + " " for word in words[: self._max_tokens] if word]
+
+    async def complete(self, prompt: str) -> str:
+        return "".join([token async for token in self.stream(prompt)]).strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        prefill = self._prefill_per_token * self._counter.count(prompt) if self._prefill_per_token else 0.0
+        await asyncio.sleep(self._first_token_latency + prefill)
+        for index, token in enumerate(self._tokens(prompt)):
+            if index:
+                await asyncio.sleep(self._token_latency)
+            yield token
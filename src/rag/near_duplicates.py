@@ -0,0 +1,303 @@
+"""MinHash/LSH index that flags exact and near-exact duplicate tickets before any embedding.
+
+A ticket is reduced to its word shingles (``shingle_size`` consecutive
+lowercase tokens) and summarised by a MinHash signature, whose share of
+agreeing positions estimates the Jaccard similarity of two shingle sets.
+Signatures are cut into ``bands`` bands; tickets sharing any band are
+candidates, and candidates are kept when the estimated similarity reaches
+``threshold``. Tickets with the same token sequence are exact duplicates
+and are matched through a digest without looking at signatures.
+
+Lookups cost a tokenisation, one small NumPy reduction and a few dict
+probes, i.e. tens of microseconds, so they can run in front of the vector
+path on every request.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+
+@dataclass(slots=True)
+class DuplicateMatch:
+    label: str
+    similarity: float
+    exact: bool
+
+
+@dataclass(slots=True)
+class Sketch:
+    """Exact-match digest and MinHash signature of one text; ``signature`` is None for texts without tokens.
+
+    Texts without tokens never match anything.
+    """
+
+    digest: int
+    signature: Optional[np.ndarray]
+
+
+@dataclass(slots=True)
+class NearDuplicateStats:
+    queries: int = 0
+    exact: int = 0
+    near: int = 0
+
+    @property
+    def misses(self) -> int:
+        return self.queries - self.exact - self.near
+
+
+class MinHasher:
+    """Shingle texts and compute MinHash signatures with multiply-shift hashing.
+
+    Shingle hashes are folded to 32 bits and permuted by
+    ``(a * x + b) >> 32`` over unsigned 64-bit arithmetic, a 2-universal
+    family that NumPy evaluates exactly. Token hashing uses CRC32 rather than
+    the builtin ``hash`` so every process computes the same signatures.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 2, seed: int = 0) -> None:
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError("num_perm and shingle_size must be positive.")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._position_multipliers = rng.integers(1, 2**63, size=shingle_size, dtype=np.uint64) | np.uint64(1)
+
+    def _shingles(self, tokens: List[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), np.uint64, len(tokens))
+        width = min(self.shingle_size, len(hashes))
+        count = len(hashes) - width + 1
+        combined = np.zeros(count, dtype=np.uint64)
+        for offset in range(width):
+            combined += hashes[offset : offset + count] * self._position_multipliers[offset]
+        return (combined >> _SHIFT32) ^ (combined & _MASK32)
+
+    def _digest(self, tokens: List[str]) -> int:
+        material = " ".join(tokens).encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "little")
+
+    def sketch(self, text: str) -> Sketch:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return Sketch(self._digest(tokens), None)
+        shingles = self._shingles(tokens)
+        permuted = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> _SHIFT32
+        return Sketch(self._digest(tokens), permuted.min(axis=1).astype(np.uint32))
+
+    def sketch_many(self, texts: Sequence[str], block_shingles: int = 65_536) -> List[Sketch]:
+        """Sketch a batch with one reduction per block of shingles; same results as :meth:`sketch`."""
+        tokenized = [_TOKEN_PATTERN.findall(text.lower()) for text in texts]
+        sketches = [Sketch(self._digest(tokens), None) for tokens in tokenized]
+        present = [row for row, tokens in enumerate(tokenized) if tokens]
+        start = 0
+        while start < len(present):
+            rows, parts, total = [], [], 0
+            while start < len(present) and (not parts or total < block_shingles):
+                shingles = self._shingles(tokenized[present[start]])
+                rows.append(present[start])
+                parts.append(shingles)
+                total += len(shingles)
+                start += 1
+            offsets = np.cumsum([0] + [len(part) for part in parts[:-1]])
+            permuted = (self._a[:, None] * np.concatenate(parts)[None, :] + self._b[:, None]) >> _SHIFT32
+            signatures = np.minimum.reduceat(permuted, offsets, axis=1).T.astype(np.uint32)
+            for row, signature in zip(rows, signatures):
+                sketches[row].signature = signature
+        return sketches
+
+
+class NearDuplicateIndex:
+    """Streaming MinHash/LSH index over labelled texts with an exact-duplicate fast path.
+
+    With the default 16 bands of 4 rows, a pair at Jaccard 0.8 shares a band
+    with probability above 0.999, one at 0.6 with 0.89 and one at 0.3 with
+    about 0.12; candidates are then checked against ``threshold`` on the full
+    signature. The index keeps the ``max_entries`` most recently added texts,
+    since resubmissions repeat recent tickets, and is safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        bands: int = 16,
+        hasher: Optional[MinHasher] = None,
+        max_entries: Optional[int] = 200_000,
+    ) -> None:
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("bands must divide the number of permutations.")
+        self.threshold = threshold
+        self.bands = bands
+        self.max_entries = max_entries
+        self.stats = NearDuplicateStats()
+        self._band_rows = self.hasher.num_perm // bands
+        rng = np.random.default_rng(1)
+        self._band_multipliers = rng.integers(1, 2**63, size=self._band_rows, dtype=np.uint64) | np.uint64(1)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._exact: Dict[int, List[int]] = {}
+        self._signatures = np.empty((0, self.hasher.num_perm), dtype=np.uint32)
+        self._band_keys = np.empty((0, bands), dtype=np.uint64)
+        self._digests: List[int] = []
+        self._has_signature: List[bool] = []
+        self._labels: List[Optional[str]] = []
+        self._slot_of_label: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slot_of_label)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._slot_of_label
+
+    def _keys(self, signature: np.ndarray) -> List[int]:
+        rows = signature.reshape(self.bands, self._band_rows).astype(np.uint64)
+        return (rows * self._band_multipliers).sum(axis=1, dtype=np.uint64).tolist()
+
+    def add(self, labels: Sequence[str], texts: Sequence[str]) -> None:
+        """Insert or replace texts, evicting the oldest beyond ``max_entries``."""
+        if len(labels) != len(texts):
+            raise ValueError("labels and texts must have the same length.")
+        self.add_sketches(labels, self.hasher.sketch_many(texts))
+
+    def add_sketches(self, labels: Sequence[str], sketches: Sequence[Sketch]) -> None:
+        with self._lock:
+            self._remove_labels(label for label in labels if label in self._slot_of_label)
+            for label, sketch in zip(labels, sketches):
+                slot = self._allocate()
+                self._labels[slot] = label
+                self._slot_of_label[label] = slot
+                self._has_signature[slot] = sketch.signature is not None
+                if sketch.signature is None:
+                    continue
+                self._digests[slot] = sketch.digest
+                self._exact.setdefault(sketch.digest, []).append(slot)
+                self._signatures[slot] = sketch.signature
+                keys = self._keys(sketch.signature)
+                self._band_keys[slot] = keys
+                for buckets, key in zip(self._buckets, keys):
+                    buckets.setdefault(key, []).append(slot)
+            if self.max_entries is not None and len(self._slot_of_label) > self.max_entries:
+                excess = len(self._slot_of_label) - self.max_entries
+                self._remove_labels([label for label, _ in zip(self._slot_of_label, range(excess))])
+
+    def remove(self, labels: Iterable[str]) -> int:
+        """Delete texts; return the number actually removed."""
+        with self._lock:
+            return self._remove_labels(labels)
+
+    def query(self, text: str, limit: int = 5, exclude: Iterable[str] = ()) -> List[DuplicateMatch]:
+        """Return up to ``limit`` indexed texts that duplicate ``text``, exact matches first."""
+        return self.query_sketch(self.hasher.sketch(text), limit, exclude)
+
+    def query_sketch(self, sketch: Sketch, limit: int = 5, exclude: Iterable[str] = ()) -> List[DuplicateMatch]:
+        excluded = set(exclude)
+        with self._lock:
+            self.stats.queries += 1
+            if sketch.signature is None:
+                return []
+            matches = [
+                DuplicateMatch(label, 1.0, True)
+                for label in (self._labels[slot] for slot in self._exact.get(sketch.digest, ()))
+                if label is not None and label not in excluded
+            ]
+            if len(matches) < limit:
+                candidates: Set[int] = set()
+                for buckets, key in zip(self._buckets, self._keys(sketch.signature)):
+                    candidates.update(buckets.get(key, ()))
+                candidates.difference_update(self._exact.get(sketch.digest, ()))
+                if candidates:
+                    slots = np.fromiter(candidates, np.int64, len(candidates))
+                    similarity = (self._signatures[slots] == sketch.signature).mean(axis=1)
+                    keep = np.flatnonzero(similarity >= self.threshold)
+                    near = [
+                        DuplicateMatch(self._labels[int(slots[i])] or "", float(similarity[i]), False)
+                        for i in keep[np.argsort(-similarity[keep], kind="stable")]
+                    ]
+                    matches.extend(match for match in near if match.label not in excluded)
+            matches = matches[:limit]
+            if matches and matches[0].exact:
+                self.stats.exact += 1
+            elif matches:
+                self.stats.near += 1
+            return matches
+
+    def deduplicate(self, labels: Sequence[str], texts: Sequence[str]) -> List[Optional[str]]:
+        """Batch mode for backfills: stream ``texts`` through the index in order.
+
+        Returns, per text, the label of the earliest indexed text it
+        duplicates (following chains back to that original), or None for
+        texts seen for the first time. Originals are added to the index;
+        duplicates are not, so a cluster keeps one representative.
+        """
+        if len(labels) != len(texts):
+            raise ValueError("labels and texts must have the same length.")
+        originals: List[Optional[str]] = []
+        canonical: Dict[str, str] = {}
+        for label, sketch in zip(labels, self.hasher.sketch_many(texts)):
+            matches = self.query_sketch(sketch, limit=1)
+            if matches:
+                original = canonical.get(matches[0].label, matches[0].label)
+                canonical[label] = original
+                originals.append(original)
+                continue
+            self.add_sketches([label], [sketch])
+            originals.append(None)
+        return originals
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._labels)
+        if slot == len(self._signatures):
+            capacity = max(1024, 2 * slot)
+            signatures = np.empty((capacity, self.hasher.num_perm), dtype=np.uint32)
+            signatures[:slot] = self._signatures
+            band_keys = np.empty((capacity, self.bands), dtype=np.uint64)
+            band_keys[:slot] = self._band_keys
+            self._signatures, self._band_keys = signatures, band_keys
+        self._labels.append(None)
+        self._digests.append(0)
+        self._has_signature.append(False)
+        return slot
+
+    def _remove_labels(self, labels: Iterable[str]) -> int:
+        removed = 0
+        for label in list(labels):
+            slot = self._slot_of_label.pop(label, None)
+            if slot is None:
+                continue
+            removed += 1
+            if self._has_signature[slot]:
+                self._discard(self._exact, self._digests[slot], slot)
+                for buckets, key in zip(self._buckets, self._band_keys[slot].tolist()):
+                    self._discard(buckets, key, slot)
+            self._labels[slot] = None
+            self._has_signature[slot] = False
+            self._free.append(slot)
+        return removed
+
+    @staticmethod
+    def _discard(table: Dict[int, List[int]], key: int, slot: int) -> None:
+        entries = table.get(key)
+        if entries is None:
+            return
+        entries.remove(slot)
+        if not entries:
+            del table[key]
+
@@ -0,0 +1 @@
+"""Batch jobs that build retrieval artifacts offline."""
@@ -0,0 +1,74 @@
+"""Embed a historical ticket corpus into vector segments for the local similarity backend.
+
+Restartable: rerunning with the same output directory continues after the
+last committed segment and picks up Parquet files added since.
+
+    PYTHONPATH=src python -m rag.pipelines.embedding_backfill \\
+        --dataset data/tickets --output data/embeddings --workers 8
+
+Point ``similarity_segment_path`` at the output directory to serve every
+segment it holds.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+
+from rag.ingestion import EmbedderSpec, EmbeddingIngestion, TicketColumns
+
+
+def _option(value: str) -> tuple[str, object]:
+    key, separator, raw = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"{value!r} is not of the form key=value.")
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def run(args: argparse.Namespace) -> int:
+    ingestion = EmbeddingIngestion(
+        args.output,
+        embedder=EmbedderSpec(args.embedder, dict(args.embedder_option)),
+        columns=TicketColumns(
+            text=tuple(args.text_columns), ticket_id=args.id_column or None, metadata=tuple(args.metadata_columns)
+        ),
+        chunk_rows=args.chunk_rows,
+        segment_rows=args.segment_rows,
+        nlist=args.nlist,
+        workers=args.workers,
+    )
+    report = ingestion.run(args.dataset, restart=args.restart)
+    print(json.dumps({**dataclasses.asdict(report), "rows_per_second": report.rows_per_second}, indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", required=True, help="Directory of ticket Parquet files, or one file.")
+    parser.add_argument("--output", required=True, help="Directory receiving segments, metadata and the manifest.")
+    parser.add_argument("--embedder", default=EmbedderSpec().factory, help="module:attribute building the embedder.")
+    parser.add_argument(
+        "--embedder-option",
+        type=_option,
+        action="append",
+        default=[],
+        help="key=value passed to the embedder factory; values are parsed as JSON when possible.",
+    )
+    parser.add_argument("--text-columns", nargs="+", default=list(TicketColumns().text))
+    parser.add_argument(
+        "--id-column", default=TicketColumns().ticket_id, help="Empty to label tickets by file and row."
+    )
+    parser.add_argument("--metadata-columns", nargs="*", default=list(TicketColumns().metadata))
+    parser.add_argument("--chunk-rows", type=int, default=8_192)
+    parser.add_argument("--segment-rows", type=int, default=250_000)
+    parser.add_argument("--nlist", type=int, default=1024, help="Inverted lists per segment.")
+    parser.add_argument("--workers", type=int, help="Embedding processes; defaults to the CPU count.")
+    parser.add_argument("--restart", action="store_true", help="Discard the existing output and start over.")
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
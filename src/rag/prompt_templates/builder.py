@@ -0,0 +1,225 @@
+"""Token-budgeted assembly of the auto-resolution prompt."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from domain.models.conversation import ConversationTurn
+from domain.models.results import SimilarTicket
+from domain.models.ticket import Ticket
+from rag.prompt_templates.template import compile_template
+from rag.prompt_templates.tokens import HeuristicTokenCounter, TokenCounter
+
+RESOLUTION_TEMPLATE = (
+    "You are a customer support assistant. Resolve the ticket using the similar tickets.\n"
+    "Similar tickets:\n{grounding}\n"
+    "{history}"
+    "Priority: {priority}\n"
+    "Ticket: {ticket}\n"
+    "Resolution:"
+)
+GROUNDING_LINE = "- [{ticket_id}] {summary}"
+NO_GROUNDING = "- none"
+HISTORY_SECTION = "Conversation so far:\n{lines}\n"
+USER_LINE = "User: {message}"
+ASSISTANT_LINE = "Assistant: {message}"
+
+
+@dataclass(slots=True)
+class BuiltPrompt:
+    text: str
+    # Sum of the per-part counts; BPE merges across part boundaries may shift the true count slightly.
+    tokens: int
+    grounding: List[SimilarTicket] = field(default_factory=list)
+    history: List[ConversationTurn] = field(default_factory=list)
+    dropped_grounding: int = 0
+    dropped_turns: int = 0
+    ticket_truncated: bool = False
+
+
+class PromptBuilder:
+    """Pack grounding tickets and conversation history into a fixed token budget.
+
+    The instructions, priority and ticket text are always kept; the ticket is
+    cut to ``max_ticket_fraction`` of the budget and each history message to
+    ``max_turn_tokens``. The remaining budget is split by an exact 0/1
+    knapsack: grounding tickets are worth their similarity score, history is
+    kept as a contiguous run of the most recent turns worth
+    ``history_weight * history_decay ** age`` each. The knapsack runs over at
+    most ``capacity_slots`` cost buckets with numpy, so packing stays well
+    under a millisecond; rounding item costs up to a bucket never overshoots.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        counter: Optional[TokenCounter] = None,
+        template: str = RESOLUTION_TEMPLATE,
+        grounding_weight: float = 1.0,
+        history_weight: float = 1.0,
+        history_decay: float = 0.8,
+        max_ticket_fraction: float = 0.5,
+        max_turn_tokens: int = 256,
+        capacity_slots: int = 512,
+    ) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive.")
+        self.max_tokens = max_tokens
+        self._counter = counter or HeuristicTokenCounter()
+        self._template = compile_template(template)
+        self._grounding_line = compile_template(GROUNDING_LINE)
+        self._history_section = compile_template(HISTORY_SECTION)
+        self._user_line = compile_template(USER_LINE)
+        self._assistant_line = compile_template(ASSISTANT_LINE)
+        self._grounding_weight = grounding_weight
+        self._history_weight = history_weight
+        self._history_decay = history_decay
+        self._max_ticket_tokens = max(1, int(max_tokens * max_ticket_fraction))
+        self._max_turn_tokens = max_turn_tokens
+        self._capacity_slots = capacity_slots
+        self._static_tokens = sum(self._counter.count(part) for part in self._template.literals)
+        self._history_header_tokens = sum(self._counter.count(part) for part in self._history_section.literals)
+
+    def build(
+        self, ticket: Ticket, grounding: Sequence[SimilarTicket] = (), history: Sequence[ConversationTurn] = ()
+    ) -> BuiltPrompt:
+        counter = self._counter
+        ticket_text = ticket.text
+        ticket_tokens = counter.count(ticket_text)
+        truncated = ticket_tokens > self._max_ticket_tokens
+        if truncated:
+            ticket_text = counter.truncate(ticket_text, self._max_ticket_tokens)
+            ticket_tokens = counter.count(ticket_text)
+        priority = ticket.priority.value
+        fixed = self._static_tokens + ticket_tokens + counter.count(priority) + counter.count(NO_GROUNDING)
+        available = max(self.max_tokens - fixed, 0)
+
+        grounding_lines = [
+            self._grounding_line.render(ticket_id=item.ticket_id, summary=item.summary) for item in grounding
+        ]
+        # One extra token per line for the newline separator.
+        grounding_costs = [counter.count(line) + 1 for line in grounding_lines]
+        # Newest turns first; older turns cannot be kept once a newer one no longer fits.
+        recent_lines: List[List[str]] = []
+        recent_costs: List[int] = []
+        spent = self._history_header_tokens
+        for turn in reversed(history):
+            lines = self._turn_lines(turn)
+            cost = sum(counter.count(line) + 1 for line in lines)
+            spent += cost
+            if spent > available:
+                break
+            recent_lines.append(lines)
+            recent_costs.append(cost)
+
+        chosen_grounding, kept_turns = self._pack(
+            [max(item.similarity_score, 1e-3) * self._grounding_weight for item in grounding],
+            grounding_costs,
+            recent_costs,
+            available,
+        )
+        selected = [item for index, item in enumerate(grounding) if index in chosen_grounding]
+        kept_history = list(history[len(history) - kept_turns :]) if kept_turns else []
+        history_text = ""
+        tokens = fixed
+        if kept_turns:
+            lines = [line for turn in reversed(recent_lines[:kept_turns]) for line in turn]
+            history_text = self._history_section.render(lines="\n".join(lines))
+            tokens += self._history_header_tokens + sum(recent_costs[:kept_turns])
+        if selected:
+            grounding_text = "\n".join(grounding_lines[index] for index in sorted(chosen_grounding))
+            tokens += sum(grounding_costs[index] for index in chosen_grounding) - counter.count(NO_GROUNDING)
+        else:
+            grounding_text = NO_GROUNDING
+        return BuiltPrompt(
+            text=self._template.render(
+                grounding=grounding_text, history=history_text, priority=priority, ticket=ticket_text
+            ),
+            tokens=tokens,
+            grounding=selected,
+            history=kept_history,
+            dropped_grounding=len(grounding) - len(selected),
+            dropped_turns=len(history) - kept_turns,
+            ticket_truncated=truncated,
+        )
+
+    def _turn_lines(self, turn: ConversationTurn) -> List[str]:
+        lines = [self._user_line.render(message=self._clip(turn.user_message))]
+        if turn.assistant_message:
+            lines.append(self._assistant_line.render(message=self._clip(turn.assistant_message)))
+        return lines
+
+    def _clip(self, message: str) -> str:
+        if self._counter.count(message) <= self._max_turn_tokens:
+            return message
+        return self._counter.truncate(message, self._max_turn_tokens)
+
+    def _pack(
+        self, values: List[float], costs: List[int], recent_costs: List[int], available: int
+    ) -> tuple[set[int], int]:
+        """Return the chosen grounding indices and how many of the most recent turns to keep."""
+        # Cumulative cost and value of keeping the newest n turns, n = 0..len(recent_costs).
+        history_costs = [0]
+        history_values = [0.0]
+        for age, cost in enumerate(recent_costs):
+            header = self._history_header_tokens if age == 0 else 0
+            history_costs.append(history_costs[-1] + cost + header)
+            history_values.append(history_values[-1] + self._history_weight * self._history_decay**age)
+
+        if sum(costs) + history_costs[-1] <= available:
+            return set(range(len(costs))), len(recent_costs)
+
+        bucket = max(1, math.ceil(available / self._capacity_slots))
+        capacity = available // bucket
+        best = np.zeros(capacity + 1)
+        taken = np.zeros((len(costs), capacity + 1), dtype=bool)
+        for index, (value, cost) in enumerate(zip(values, costs)):
+            weight = math.ceil(cost / bucket)
+            if weight > capacity:
+                continue
+            candidate = best[: capacity + 1 - weight] + value
+            improved = candidate > best[weight:]
+            taken[index, weight:] = improved
+            best[weight:] = np.where(improved, candidate, best[weight:])
+
+        best_total, best_turns, best_room = -1.0, 0, 0
+        for turns, (cost, value) in enumerate(zip(history_costs, history_values)):
+            if cost > available:
+                break
+            room = (available - cost) // bucket
+            total = value + best[room]
+            if total > best_total:
+                best_total, best_turns, best_room = total, turns, room
+
+        chosen: set[int] = set()
+        room = best_room
+        for index in range(len(costs) - 1, -1, -1):
+            if taken[index, room]:
+                chosen.add(index)
+                room -= math.ceil(costs[index] / bucket)
+        return chosen, best_turns
+
+
+def render_resolution_prompt(
+    ticket: Ticket, grounding: Sequence[SimilarTicket] = (), history: Sequence[ConversationTurn] = ()
+) -> str:
+    """Render the full prompt with every grounding ticket and turn, without a budget."""
+    grounding_line = compile_template(GROUNDING_LINE)
+    lines = [grounding_line.render(ticket_id=item.ticket_id, summary=item.summary) for item in grounding]
+    history_text = ""
+    if history:
+        turn_lines = []
+        for turn in history:
+            turn_lines.append(compile_template(USER_LINE).render(message=turn.user_message))
+            if turn.assistant_message:
+                turn_lines.append(compile_template(ASSISTANT_LINE).render(message=turn.assistant_message))
+        history_text = compile_template(HISTORY_SECTION).render(lines="\n".join(turn_lines))
+    return compile_template(RESOLUTION_TEMPLATE).render(
+        grounding="\n".join(lines) or NO_GROUNDING,
+        history=history_text,
+        priority=ticket.priority.value,
+        ticket=ticket.text,
+    )
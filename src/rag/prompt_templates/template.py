@@ -0,0 +1,40 @@
+"""Prompt templates parsed once and rendered by concatenation."""
+from __future__ import annotations
+
+from functools import lru_cache
+from string import Formatter
+from typing import List, Tuple
+
+
+class PromptTemplate:
+    """A ``str.format``-style template split into literal and field segments at construction.
+
+    Rendering joins pre-split segments instead of re-parsing the format string.
+    Format specs and conversions are rejected; fields are plain identifiers.
+    """
+
+    __slots__ = ("source", "fields", "literals", "_segments")
+
+    def __init__(self, source: str) -> None:
+        segments: List[Tuple[bool, str]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                segments.append((True, literal))
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                raise ValueError(f"Unsupported template field {field!r}.")
+            segments.append((False, field))
+        self.source = source
+        self.fields = tuple(dict.fromkeys(part for literal, part in segments if not literal))
+        self.literals = tuple(part for literal, part in segments if literal)
+        self._segments = tuple(segments)
+
+    def render(self, **values: str) -> str:
+        return "".join(part if literal else values[part] for literal, part in self._segments)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> PromptTemplate:
+    """Return the shared compiled template for ``source``."""
+    return PromptTemplate(source)
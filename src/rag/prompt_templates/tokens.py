@@ -0,0 +1,87 @@
+"""Local token counters used to size prompts before they reach the LLM."""
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import Literal, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Words split into pieces of at most eight characters, digits in runs of three, punctuation on its own.
+_PIECE_PATTERN = re.compile(r"[^\W\d_]{1,8}|\d{1,3}|[^\w\s]|_")
+
+TokenCounterName = Literal["auto", "tiktoken", "heuristic"]
+
+
+class TokenCounter(Protocol):
+    def count(self, text: str) -> int:
+        """Return the number of tokens ``text`` encodes to."""
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of ``text`` that fits in ``max_tokens``."""
+
+
+class HeuristicTokenCounter:
+    """Dependency-free approximation of a BPE tokenizer.
+
+    Counts word pieces of up to eight letters, digit runs of up to three and
+    single punctuation marks, which tracks byte-pair encodings of English
+    support text closely enough for budgeting. Counts are memoised because
+    the same grounding summaries and history turns recur across requests.
+    """
+
+    def __init__(self, cache_size: int = 16_384) -> None:
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    @staticmethod
+    def _count(text: str) -> int:
+        return sum(1 for _ in _PIECE_PATTERN.finditer(text))
+
+    def count(self, text: str) -> int:
+        return self._cached_count(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        for index, match in enumerate(_PIECE_PATTERN.finditer(text)):
+            if index == max_tokens:
+                return text[: match.start()].rstrip()
+        return text
+
+
+class TiktokenCounter:
+    """Exact counts from a ``tiktoken`` encoding, memoised per distinct text."""
+
+    def __init__(self, encoding: str = "cl100k_base", cache_size: int = 16_384) -> None:
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(encoding)
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    def _count(self, text: str) -> int:
+        return len(self._encoding.encode_ordinary(text))
+
+    def count(self, text: str) -> int:
+        return self._cached_count(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        tokens = self._encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self._encoding.decode(tokens[:max_tokens]).rstrip()
+
+
+def token_counter(name: TokenCounterName = "auto", encoding: str = "cl100k_base") -> TokenCounter:
+    """Return the requested counter; ``auto`` prefers ``tiktoken`` when it is installed."""
+    if name == "heuristic":
+        return HeuristicTokenCounter()
+    try:
+        return TiktokenCounter(encoding)
+    except ImportError:
+        if name == "tiktoken":
+            raise
+        logger.info("token_counter_fallback", extra={"extra": {"requested": name, "using": "heuristic"}})
+        return HeuristicTokenCounter()
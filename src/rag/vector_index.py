@@ -0,0 +1,301 @@
+"""In-process approximate nearest-neighbour index over normalised embeddings."""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embeddings import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+SearchHit = Tuple[str, float]
+
+
+class _InvertedList:
+    """Growable, swap-remove storage for the vectors assigned to one centroid."""
+
+    __slots__ = ("vectors", "keys", "size")
+
+    def __init__(self, dim: int, capacity: int = 16) -> None:
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.keys = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def extend(self, keys: np.ndarray, vectors: np.ndarray) -> int:
+        """Append entries and return the position of the first one."""
+        start = self.size
+        end = start + len(keys)
+        if end > len(self.keys):
+            capacity = max(16, end, len(self.keys) * 2)
+            grown = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:start] = self.vectors[:start]
+            self.vectors = grown
+            self.keys = np.resize(self.keys, capacity)
+        self.vectors[start:end] = vectors
+        self.keys[start:end] = keys
+        self.size = end
+        return start
+
+    def remove(self, position: int) -> Optional[int]:
+        """Remove the entry at ``position``; return the key moved into its slot, if any."""
+        last = self.size - 1
+        moved: Optional[int] = None
+        if position != last:
+            self.vectors[position] = self.vectors[last]
+            self.keys[position] = self.keys[last]
+            moved = int(self.keys[position])
+        self.size = last
+        return moved
+
+
+def spherical_kmeans(data: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity and return ``k`` unit centroids."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        present, starts = np.unique(assignment[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(data[order], starts, axis=0)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index with incremental inserts and deletes.
+
+    Vectors are partitioned by their nearest k-means centroid; a query scores
+    the centroids and scans only the ``nprobe`` closest lists. Until enough
+    vectors have been added to train ``nlist`` centroids, the index keeps a
+    single list and answers queries exactly.
+
+    Training never holds the index lock while k-means runs: it clusters a
+    snapshot, builds the new lists aside, replays the inserts and deletes
+    made in the meantime and swaps the result in. With ``auto_train`` the
+    first :meth:`add` that crosses the threshold starts it on a background
+    thread; otherwise callers run :meth:`train` themselves, e.g. after a bulk load.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_min_points_per_list: int = 32,
+        train_sample_size: int = 262_144,
+        auto_train: bool = True,
+    ) -> None:
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._train_threshold = nlist * train_min_points_per_list
+        self._train_sample_size = train_sample_size
+        self._auto_train = auto_train
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[_InvertedList] = [_InvertedList(dim)]
+        self._labels: List[Optional[str]] = []
+        self._free_keys: List[int] = []
+        self._key_by_label: Dict[str, int] = {}
+        # Location of every key as parallel arrays rather than a dict of tuples,
+        # which keeps per-vector bookkeeping to eight bytes at millions of entries.
+        self._list_of_key = np.empty(0, dtype=np.int32)
+        self._position_of_key = np.empty(0, dtype=np.int32)
+        self._lock = threading.RLock()
+        # Serialises training runs; ``_changes`` logs writes made while one is clustering.
+        self._training = threading.Lock()
+        self._training_thread: Optional[threading.Thread] = None
+        self._changes: Optional[Dict[str, Optional[np.ndarray]]] = None
+
+    def __len__(self) -> int:
+        return len(self._key_by_label)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._key_by_label
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, labels: Sequence[str], vectors: np.ndarray) -> None:
+        """Insert or replace vectors for ``labels``; a rejected batch leaves the index unchanged."""
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        labels = list(labels)
+        if len(labels) != len(vectors):
+            raise ValueError("labels and vectors must have the same length.")
+        if len(set(labels)) != len(labels):
+            raise ValueError("Duplicate labels in a single insert.")
+        with self._lock:
+            self._remove_labels(label for label in labels if label in self._key_by_label)
+            self._insert_assigned(labels, vectors)
+            if self._changes is not None:
+                self._changes.update(zip(labels, vectors))
+            if (
+                self._auto_train
+                and self._training_thread is None
+                and not self.is_trained
+                and len(self) >= self._train_threshold
+            ):
+                self._training_thread = threading.Thread(
+                    target=self._train_in_background, name="ivf-train", daemon=True
+                )
+                self._training_thread.start()
+
+    def remove(self, labels: Iterable[str]) -> int:
+        """Delete vectors for ``labels``; return the number actually removed."""
+        labels = list(labels)
+        with self._lock:
+            if self._changes is not None:
+                self._changes.update((label, None) for label in labels)
+            return self._remove_labels(labels)
+
+    def train(self, sample: Optional[np.ndarray] = None) -> None:
+        """Fit ``nlist`` centroids and redistribute every stored vector.
+
+        Blocks the caller for the whole clustering but readers and writers
+        only for the final swap.
+        """
+        with self._training:
+            with self._lock:
+                labels = [self._labels[int(key)] for key in self._stored_keys()]
+                stored = self._stored_vectors()
+                self._changes = {}
+            try:
+                data = stored if sample is None else normalize_rows(np.asarray(sample, dtype=np.float32))
+                if len(data) == 0:
+                    return
+                if len(data) > self._train_sample_size:
+                    rng = np.random.default_rng(0)
+                    data = data[rng.choice(len(data), size=self._train_sample_size, replace=False)]
+                staged = IVFIndex(self.dim, self.nlist, self.nprobe, auto_train=False)
+                staged._centroids = spherical_kmeans(data, self.nlist)
+                staged._lists = [_InvertedList(self.dim) for _ in range(len(staged._centroids))]
+                if labels:
+                    staged._insert_assigned(labels, stored)  # type: ignore[arg-type]
+                with self._lock:
+                    changes = self._changes
+                    staged._remove_labels(changes)
+                    added = [(label, vector) for label, vector in changes.items() if vector is not None]
+                    if added:
+                        staged._insert_assigned([label for label, _ in added], np.stack([v for _, v in added]))
+                    self._adopt(staged)
+            finally:
+                with self._lock:
+                    self._changes = None
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background training run; return whether none is still running."""
+        thread = self._training_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _train_in_background(self) -> None:
+        try:
+            self.train()
+        except Exception:  # noqa: BLE001 - the index keeps serving untrained; retried on a later add
+            logger.exception("IVF training failed")
+            with self._lock:
+                self._training_thread = None
+
+    def _adopt(self, other: "IVFIndex") -> None:
+        self._centroids = other._centroids
+        self._lists = other._lists
+        self._labels = other._labels
+        self._free_keys = other._free_keys
+        self._key_by_label = other._key_by_label
+        self._list_of_key = other._list_of_key
+        self._position_of_key = other._position_of_key
+
+    def search(self, query: np.ndarray, k: int) -> List[SearchHit]:
+        """Return up to ``k`` ``(label, cosine similarity)`` pairs, best first."""
+        if k <= 0:
+            return []
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(self.dim))
+        with self._lock:
+            if self._centroids is None:
+                probes = [0]
+            else:
+                nprobe = min(self.nprobe, len(self._centroids))
+                centroid_scores = self._centroids @ query
+                probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            keys_parts, score_parts = [], []
+            for list_id in probes:
+                inverted = self._lists[int(list_id)]
+                if inverted.size:
+                    score_parts.append(inverted.vectors[: inverted.size] @ query)
+                    keys_parts.append(inverted.keys[: inverted.size])
+            if not score_parts:
+                return []
+            scores = np.concatenate(score_parts)
+            keys = np.concatenate(keys_parts)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._labels[int(keys[i])], float(scores[i])) for i in top]  # type: ignore[misc]
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self._centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.argmax(vectors @ self._centroids.T, axis=1)
+
+    def _insert_assigned(self, labels: Sequence[str], vectors: np.ndarray) -> None:
+        keys = np.fromiter((self._allocate_key(label) for label in labels), dtype=np.int64, count=len(labels))
+        if len(self._labels) > len(self._list_of_key):
+            capacity = max(len(self._labels), len(self._list_of_key) * 2)
+            self._list_of_key = np.resize(self._list_of_key, capacity)
+            self._position_of_key = np.resize(self._position_of_key, capacity)
+        assignment = self._assign(vectors)
+        order = np.argsort(assignment, kind="stable")
+        boundaries = np.flatnonzero(np.diff(assignment[order])) + 1
+        for group in np.split(order, boundaries):
+            if not len(group):
+                continue
+            list_id = int(assignment[group[0]])
+            start = self._lists[list_id].extend(keys[group], vectors[group])
+            self._list_of_key[keys[group]] = list_id
+            self._position_of_key[keys[group]] = np.arange(start, start + len(group))
+
+    def _allocate_key(self, label: str) -> int:
+        if label in self._key_by_label:
+            raise ValueError(f"Duplicate label '{label}' in a single insert.")
+        if self._free_keys:
+            key = self._free_keys.pop()
+            self._labels[key] = label
+        else:
+            key = len(self._labels)
+            self._labels.append(label)
+        self._key_by_label[label] = key
+        return key
+
+    def _remove_labels(self, labels: Iterable[str]) -> int:
+        removed = 0
+        for label in list(labels):
+            key = self._key_by_label.pop(label, None)
+            if key is None:
+                continue
+            list_id = int(self._list_of_key[key])
+            position = int(self._position_of_key[key])
+            moved = self._lists[list_id].remove(position)
+            if moved is not None:
+                self._position_of_key[moved] = position
+            self._labels[key] = None
+            self._free_keys.append(key)
+            removed += 1
+        return removed
+
+    def _stored_keys(self) -> np.ndarray:
+        parts = [inverted.keys[: inverted.size] for inverted in self._lists]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _stored_vectors(self) -> np.ndarray:
+        parts = [inverted.vectors[: inverted.size] for inverted in self._lists]
+        return np.concatenate(parts) if parts else np.empty((0, self.dim), dtype=np.float32)
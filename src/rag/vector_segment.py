@@ -0,0 +1,240 @@
+"""Read-only, memory-mapped vector segments with int8 quantisation.
+
+A segment is a single file laid out as a fixed header followed by 64-byte
+aligned sections::
+
+    centroids        float32[nlist, dim]   IVF coarse quantiser
+    list_offsets     uint64[nlist + 1]     row range of each inverted list
+    codes            int8[count, dim]      per-row symmetric int8 codes
+    scales           float32[count]        dequantisation scale per row
+    vectors          float32[count, dim]   exact vectors for re-ranking
+    label_offsets    uint64[count + 1]     ticket id string table
+    label_blob       bytes
+    summary_offsets  uint64[count + 1]     summary string table
+    summary_blob     bytes
+
+Rows are stored grouped by inverted list, so a query reads the int8 codes of
+the probed lists sequentially and touches the float32 section only for the
+handful of candidates it re-ranks. Because the file is opened with ``mmap``,
+every worker process maps the same page-cache pages instead of holding its
+own heap copy.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AbstractSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embeddings import normalize_rows
+from .vector_index import spherical_kmeans
+
+SEGMENT_MAGIC = b"TKTVSEG1"
+SEGMENT_VERSION = 1
+_SECTION_NAMES = (
+    "centroids",
+    "list_offsets",
+    "codes",
+    "scales",
+    "vectors",
+    "label_offsets",
+    "label_blob",
+    "summary_offsets",
+    "summary_blob",
+)
+_HEADER = struct.Struct("<8sIIQI4x" + "Q" * len(_SECTION_NAMES))
+_ALIGNMENT = 64
+
+
+@dataclass(slots=True)
+class SegmentHit:
+    ticket_id: str
+    similarity_score: float
+    summary: str
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return symmetric per-row int8 codes and their float32 scales."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def _string_table(values: Sequence[str]) -> Tuple[np.ndarray, bytes]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_segment(
+    path: str | os.PathLike[str],
+    labels: Sequence[str],
+    vectors: np.ndarray,
+    summaries: Optional[Sequence[str]] = None,
+    nlist: int = 1024,
+    train_sample_size: int = 262_144,
+) -> Path:
+    """Cluster, quantise and write ``vectors`` to a segment file at ``path``."""
+    vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+    if vectors.ndim != 2 or len(labels) != len(vectors):
+        raise ValueError("labels and vectors must describe the same number of rows.")
+    if not len(vectors):
+        raise ValueError("Cannot write an empty segment.")
+    summaries = summaries if summaries is not None else [""] * len(labels)
+    rng = np.random.default_rng(0)
+    sample = vectors
+    if len(vectors) > train_sample_size:
+        sample = vectors[rng.choice(len(vectors), size=train_sample_size, replace=False)]
+    centroids = spherical_kmeans(sample, nlist)
+    assignment = np.argmax(vectors @ centroids.T, axis=1)
+    order = np.argsort(assignment, kind="stable")
+    list_offsets = np.zeros(len(centroids) + 1, dtype=np.uint64)
+    np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=list_offsets[1:])
+
+    ordered = vectors[order]
+    codes, scales = quantize_int8(ordered)
+    label_offsets, label_blob = _string_table([labels[i] for i in order])
+    summary_offsets, summary_blob = _string_table([summaries[i] for i in order])
+    sections = (
+        centroids.astype(np.float32).tobytes(),
+        list_offsets.tobytes(),
+        codes.tobytes(),
+        scales.tobytes(),
+        ordered.tobytes(),
+        label_offsets.tobytes(),
+        label_blob,
+        summary_offsets.tobytes(),
+        summary_blob,
+    )
+
+    offsets, cursor = [], _align(_HEADER.size)
+    for payload in sections:
+        offsets.append(cursor)
+        cursor = _align(cursor + len(payload))
+    header = _HEADER.pack(
+        SEGMENT_MAGIC, SEGMENT_VERSION, vectors.shape[1], len(vectors), len(centroids), *offsets
+    )
+
+    target = Path(path)
+    temporary = target.with_name(target.name + ".tmp")
+    with open(temporary, "wb") as handle:
+        handle.write(header)
+        for offset, payload in zip(offsets, sections):
+            handle.seek(offset)
+            handle.write(payload)
+        handle.truncate(cursor)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, target)
+    return target
+
+
+class VectorSegment:
+    """Zero-copy reader for a segment file written by :func:`write_segment`."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, dim, count, nlist, *offsets = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {SEGMENT_VERSION} vector segment.")
+        self.dim = dim
+        self.count = count
+        self.nlist = nlist
+        section = dict(zip(_SECTION_NAMES, offsets))
+        buffer = self._mmap
+        self._centroids = np.frombuffer(buffer, np.float32, nlist * dim, section["centroids"]).reshape(nlist, dim)
+        self._list_offsets = np.frombuffer(buffer, np.uint64, nlist + 1, section["list_offsets"])
+        self._codes = np.frombuffer(buffer, np.int8, count * dim, section["codes"]).reshape(count, dim)
+        self._scales = np.frombuffer(buffer, np.float32, count, section["scales"])
+        self._vectors = np.frombuffer(buffer, np.float32, count * dim, section["vectors"]).reshape(count, dim)
+        self._label_offsets = np.frombuffer(buffer, np.uint64, count + 1, section["label_offsets"])
+        self._label_blob = section["label_blob"]
+        self._summary_offsets = np.frombuffer(buffer, np.uint64, count + 1, section["summary_offsets"])
+        self._summary_blob = section["summary_blob"]
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> "VectorSegment":
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Release the mapping; array views must not be used afterwards."""
+        for name in ("_centroids", "_list_offsets", "_codes", "_scales", "_vectors", "_label_offsets", "_summary_offsets"):
+            setattr(self, name, None)
+        self._mmap.close()
+
+    def label(self, row: int) -> str:
+        return self._string(self._label_offsets, self._label_blob, row)
+
+    def summary(self, row: int) -> str:
+        return self._string(self._summary_offsets, self._summary_blob, row)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int = 16,
+        rerank_candidates: int = 64,
+        exclude: AbstractSet[str] = frozenset(),
+    ) -> List[SegmentHit]:
+        """Return the ``k`` best rows by exact cosine among int8-shortlisted candidates.
+
+        ``rerank_candidates`` bounds how many rows are scored in float32; set it
+        to ``0`` to rank by the quantised scores alone.
+        """
+        if k <= 0:
+            return []
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(self.dim))
+        nprobe = min(nprobe, self.nlist)
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows_parts, score_parts = [], []
+        for list_id in probes:
+            start, end = int(self._list_offsets[list_id]), int(self._list_offsets[list_id + 1])
+            if start == end:
+                continue
+            approx = (self._codes[start:end].astype(np.float32) @ query) * self._scales[start:end]
+            score_parts.append(approx)
+            rows_parts.append(np.arange(start, end))
+        if not score_parts:
+            return []
+        scores = np.concatenate(score_parts)
+        rows = np.concatenate(rows_parts)
+
+        shortlist = max(k, rerank_candidates)
+        shortlist += min(len(exclude), shortlist)
+        if shortlist < len(scores):
+            keep = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            rows, scores = rows[keep], scores[keep]
+        labels = [self.label(int(row)) for row in rows]
+        if exclude:
+            kept = [i for i, label in enumerate(labels) if label not in exclude]
+            rows, scores = rows[kept], scores[kept]
+            labels = [labels[i] for i in kept]
+        if rerank_candidates:
+            order = np.argsort(rows)
+            rows, labels = rows[order], [labels[i] for i in order]
+            scores = self._vectors[rows] @ query
+        top = np.argsort(-scores)[:k]
+        return [
+            SegmentHit(ticket_id=labels[i], similarity_score=float(scores[i]), summary=self.summary(int(rows[i])))
+            for i in top
+        ]
+
+    def _string(self, offsets: np.ndarray, blob_offset: int, row: int) -> str:
+        start, end = int(offsets[row]), int(offsets[row + 1])
+        return self._mmap[blob_offset + start : blob_offset + end].decode("utf-8")
@@ -0,0 +1,10 @@
+"""Make the bare source packages (``domain``, ``rag``, ...) and ``src.app`` importable from the tests."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parents[1]
+for path in (_SRC, _SRC.parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from domain.models.results import ClassificationOutcome, SimilarTicket
+from domain.models.ticket import Ticket
+from domain.services.interfaces import ClassificationService, SimilarityService
+from domain.value_objects.ticket_category import TicketCategory
+
+from src.app.api import analysis, classification
+from src.app.core.dependencies import get_classification_service, get_ticket_analysis_pipeline
+from src.app.services.admission import (
+    AdmissionControlledClassificationService,
+    AdmissionControlledSimilarityService,
+    AdmissionController,
+    AIMDLimit,
+)
+from src.app.services.analysis import TicketAnalysisPipeline
+from src.app.services.stubs import (
+    NotConfiguredAutoResolutionService,
+    NotConfiguredConversationService,
+    NotConfiguredResolutionTimeService,
+    NotConfiguredSimilarityService,
+)
+
+TICKET = {"ticket_id": "T-1", "ticket_text": "Cannot log in to the portal"}
+ANALYSIS = {**TICKET, "include_auto_resolution": False}
+
+
+class _Classifier(ClassificationService):
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return ClassificationOutcome(category=TicketCategory.AUTHENTICATION, confidence=0.9)
+
+
+class _Similarity(SimilarityService):
+    async def find_similar(self, ticket: Ticket, top_k: int = 5) -> list[SimilarTicket]:
+        return []
+
+
+def _saturated(name: str, max_queue: int) -> AdmissionController:
+    """A controller whose single slot is taken, so further calls queue or are shed."""
+    controller = AdmissionController(
+        name, AIMDLimit(initial=1, min_limit=1, max_limit=1), max_queue=max_queue, max_wait_seconds=0.0
+    )
+    asyncio.run(controller.acquire())
+    return controller
+
+
+def _pipeline(classifier: ClassificationService, similarity: SimilarityService) -> TicketAnalysisPipeline:
+    return TicketAnalysisPipeline(
+        classification=classifier,
+        resolution_time=NotConfiguredResolutionTimeService(),
+        similarity=similarity,
+        conversation=NotConfiguredConversationService(),
+        auto_resolution=NotConfiguredAutoResolutionService(),
+    )
+
+
+def _client(overrides: dict) -> TestClient:  # type: ignore[type-arg]
+    app = FastAPI()
+    app.include_router(classification.router)
+    app.include_router(analysis.router)
+    app.dependency_overrides.update(overrides)
+    return TestClient(app)
+
+
+def _provide(value: object):  # type: ignore[no-untyped-def]
+    def provider() -> object:
+        return value
+
+    return provider
+
+
+def test_full_queue_rejects_route_with_429() -> None:
+    service = AdmissionControlledClassificationService(_Classifier(), _saturated("classification", max_queue=0))
+    response = _client({get_classification_service: _provide(service)}).post("/v1/classification", json=TICKET)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_analysis_rejected_with_503_when_every_stage_is_shed() -> None:
+    classifier = AdmissionControlledClassificationService(_Classifier(), _saturated("classification", max_queue=1))
+    pipeline = _pipeline(classifier, NotConfiguredSimilarityService())
+    response = _client({get_ticket_analysis_pipeline: _provide(pipeline)}).post("/v1/tickets/analyze", json=ANALYSIS)
+    assert response.status_code == 503
+    assert "classification overloaded" in response.json()["detail"]
+    assert "Retry-After" in response.headers
+
+
+def test_analysis_reports_a_shed_stage_and_keeps_the_rest() -> None:
+    similarity = AdmissionControlledSimilarityService(_Similarity(), _saturated("similarity", max_queue=0))
+    pipeline = _pipeline(_Classifier(), similarity)
+    response = _client({get_ticket_analysis_pipeline: _provide(pipeline)}).post("/v1/tickets/analyze", json=ANALYSIS)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["classification"]["category"] == TicketCategory.AUTHENTICATION.value
+    assert body["stages"]["similarity"]["status"] == "shed"
+    assert body["stages"]["classification"]["status"] == "ok"
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+
+from src.app.services.batching import MicroBatchingClassificationService
+
+
+class RecordingModel:
+    """Echoes each ticket's index back as its confidence, after an optional delay."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.batches: list[list[str]] = []
+        self._delay = delay
+        self._fail = fail
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        return (await self.classify_batch([ticket]))[0]
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        self.batches.append([ticket.ticket_id for ticket in tickets])
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError("model down")
+        return [ClassificationOutcome(TicketCategory.OTHER, float(ticket.ticket_id)) for ticket in tickets]
+
+
+def _ticket(index: int) -> Ticket:
+    return Ticket(ticket_id=str(index), text=f"ticket {index}")
+
+
+def test_concurrent_callers_get_their_own_outcome_in_batches() -> None:
+    model = RecordingModel(delay=0.001)
+    batcher = MicroBatchingClassificationService(model, max_batch_size=8, max_wait_ms=50)
+
+    async def run() -> list[ClassificationOutcome]:
+        return await asyncio.gather(*(batcher.classify(_ticket(i)) for i in range(20)))
+
+    outcomes = asyncio.run(run())
+    assert [outcome.confidence for outcome in outcomes] == [float(i) for i in range(20)]
+    assert [len(batch) for batch in model.batches] == [8, 8, 4]
+
+
+def test_partial_batch_is_dispatched_after_max_wait() -> None:
+    model = RecordingModel()
+    batcher = MicroBatchingClassificationService(model, max_batch_size=32, max_wait_ms=1)
+    outcome = asyncio.run(batcher.classify(_ticket(7)))
+    assert outcome.confidence == 7.0
+    assert model.batches == [["7"]]
+
+
+def test_classify_batch_preserves_order_across_chunks() -> None:
+    model = RecordingModel()
+    batcher = MicroBatchingClassificationService(model, max_batch_size=3)
+    outcomes = asyncio.run(batcher.classify_batch([_ticket(i) for i in range(7)]))
+    assert [outcome.confidence for outcome in outcomes] == [float(i) for i in range(7)]
+    assert model.batches == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+
+
+def test_model_error_reaches_every_waiter() -> None:
+    batcher = MicroBatchingClassificationService(RecordingModel(fail=True), max_batch_size=4, max_wait_ms=1)
+
+    async def run() -> list[object]:
+        return await asyncio.gather(*(batcher.classify(_ticket(i)) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_rejects_empty_batch_size() -> None:
+    with pytest.raises(ValueError):
+        MicroBatchingClassificationService(RecordingModel(), max_batch_size=0)
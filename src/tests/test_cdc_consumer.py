@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from cdc.consumer import CDCConsumer
+from cdc.events import TicketChangeEvent
+from cdc.sinks import SimilarityIndexSink
+from cdc.sources import FileDeadLetterLog, InMemoryCheckpointStore, InMemoryEventSource
+
+
+class RecordingSink:
+    name = "recording"
+
+    def __init__(self, failures: int = 0) -> None:
+        self.calls: List[Tuple[List[Tuple[str, int]], List[str]]] = []
+        self._failures = failures
+
+    async def apply(self, upserts: Sequence[TicketChangeEvent], deletes: Sequence[str]) -> None:
+        if self._failures:
+            self._failures -= 1
+            raise RuntimeError("sink unavailable")
+        self.calls.append(([(event.ticket_id, event.version) for event in upserts], list(deletes)))
+
+
+def _event(ticket_id: str, version: int, operation: str = "upsert") -> TicketChangeEvent:
+    return TicketChangeEvent(ticket_id=ticket_id, operation=operation, version=version, emitted_at=0.0, text="t")
+
+
+def _consume(consumer: CDCConsumer, source: InMemoryEventSource, *batches: Sequence[TicketChangeEvent]) -> None:
+    async def run() -> None:
+        for batch in batches:
+            for event in batch:
+                await source.publish(event)
+            await consumer.poll()
+
+    asyncio.run(run())
+
+
+def _consumer(source: InMemoryEventSource, sink: RecordingSink, **options: object) -> CDCConsumer:
+    options.setdefault("retry_backoff_seconds", 0.0)
+    return CDCConsumer(source, [sink], InMemoryCheckpointStore(), max_wait_seconds=0.01, **options)
+
+
+def test_batches_collapse_to_latest_version_and_replays_are_skipped() -> None:
+    source, sink = InMemoryEventSource(), RecordingSink()
+    consumer = _consumer(source, sink)
+    _consume(
+        consumer,
+        source,
+        [_event("a", 1), _event("a", 3), _event("b", 1), _event("a", 2)],
+        [_event("a", 3), _event("b", 2, "delete"), _event("a", 2)],
+    )
+    assert sink.calls == [([("a", 3), ("b", 1)], []), ([], ["b"])]
+    assert consumer.stats.committed_offset == 7
+    assert consumer.stats.superseded == 2 + 2
+
+
+def test_failed_batch_is_retried_before_commit() -> None:
+    source, sink = InMemoryEventSource(), RecordingSink(failures=2)
+    consumer = _consumer(source, sink)
+    _consume(consumer, source, [_event("a", 1)])
+    assert sink.calls == [([("a", 1)], [])]
+    assert consumer.stats.retries == 2
+    assert consumer.stats.committed_offset == 1
+
+
+def test_poisoned_batch_is_dead_lettered_and_skipped(tmp_path: Path) -> None:
+    source, sink = InMemoryEventSource(), RecordingSink(failures=3)
+    dead_letter = tmp_path / "dead.jsonl"
+    consumer = _consumer(source, sink, max_attempts=3, dead_letter=FileDeadLetterLog(dead_letter))
+    _consume(consumer, source, [_event("a", 1), _event("b", 1)], [_event("c", 1)])
+    records = [json.loads(line) for line in dead_letter.read_text(encoding="utf-8").splitlines()]
+    assert [record["ticket_id"] for record in records] == ["a", "b"]
+    assert records[0]["dead_letter"]["sink"] == "recording"
+    assert consumer.stats.dead_lettered == 2
+    assert sink.calls == [([("c", 1)], [])]
+    assert consumer.stats.committed_offset == 3
+    # A dead-lettered version was never applied, so a later replay of it still goes through.
+    _consume(consumer, source, [_event("a", 1)])
+    assert sink.calls[-1] == ([("a", 1)], [])
+
+
+def test_applied_versions_are_bounded() -> None:
+    source, sink = InMemoryEventSource(), RecordingSink()
+    consumer = _consumer(source, sink, max_tracked_tickets=2)
+    _consume(consumer, source, [_event("a", 1), _event("b", 1), _event("c", 1)])
+    assert list(consumer._applied_versions) == ["b", "c"]
+
+
+def test_similarity_sink_updates_the_index_off_the_event_loop() -> None:
+    threads: List[str] = []
+
+    class Index:
+        def index_tickets(self, tickets: Sequence[object]) -> None:
+            threads.append(threading.current_thread().name)
+
+        def remove_tickets(self, ticket_ids: Sequence[str]) -> int:
+            threads.append(threading.current_thread().name)
+            return len(ticket_ids)
+
+    asyncio.run(SimilarityIndexSink(Index()).apply([_event("a", 1)], ["b"]))
+    assert len(threads) == 2
+    assert threading.main_thread().name not in threads
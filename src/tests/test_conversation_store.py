@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from domain.models.conversation import ConversationTurn
+from domain.repositories.conversation_store import SNAPSHOT_FILE, LocalConversationStore
+
+
+def _turn(ticket_id: str, index: int, age: timedelta = timedelta()) -> ConversationTurn:
+    return ConversationTurn(
+        ticket_id=ticket_id,
+        user_message=f"question {index}",
+        assistant_message=f"answer {index}",
+        created_at=datetime.utcnow() - age,
+    )
+
+
+def _append(store: LocalConversationStore, *turns: ConversationTurn) -> None:
+    async def run() -> None:
+        for turn in turns:
+            await store.append_turn(turn)
+
+    asyncio.run(run())
+
+
+def test_history_survives_compaction_and_restart(tmp_path: Path) -> None:
+    store = LocalConversationStore(tmp_path, max_turns_per_ticket=3)
+    _append(store, *(_turn("T-1", index) for index in range(5)), _turn("T-2", 0))
+    store.compact()
+    _append(store, _turn("T-2", 1))
+    store.close()
+
+    reopened = LocalConversationStore(tmp_path, max_turns_per_ticket=3)
+    try:
+        history = asyncio.run(reopened.get_history("T-1"))
+        assert [turn.user_message for turn in history] == ["question 2", "question 3", "question 4"]
+        history = asyncio.run(reopened.get_history("T-2"))
+        assert [turn.user_message for turn in history] == ["question 0", "question 1"]
+    finally:
+        reopened.close()
+
+
+def test_snapshot_drops_expired_tickets(tmp_path: Path) -> None:
+    store = LocalConversationStore(tmp_path, max_age=timedelta(hours=1))
+    try:
+        _append(store, _turn("old", 0, age=timedelta(hours=2)), _turn("new", 0))
+        store.compact()
+        assert "old" not in store._threads
+        lines = (tmp_path / SNAPSHOT_FILE).read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["ticket_id"] for line in lines[1:]] == ["new"]
+    finally:
+        store.close()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_flush_raises_when_the_writer_died(tmp_path: Path) -> None:
+    store = LocalConversationStore(tmp_path, fsync_interval_seconds=0.01)
+
+    def broken_write(text: str) -> int:
+        raise OSError("disk full")
+
+    store._log.write = broken_write  # type: ignore[method-assign]
+    _append(store, _turn("T-1", 0))
+    with pytest.raises(RuntimeError):
+        store.flush()
+    store.close()
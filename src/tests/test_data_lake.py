@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from data_lake import writer as lake_writer
+from data_lake.glue_jobs import gold_tables
+from data_lake.query import LakeQuery
+from data_lake.tables import RESOLVED_TICKETS, SLA_MONTHLY, Replacement, data_files, pending_replacements
+from data_lake.writer import PartitionedWriter, compact, recover_partition, replace_partition
+
+START = datetime(2024, 1, 20, tzinfo=timezone.utc)
+
+
+def _tickets(first: int, count: int) -> pa.Table:
+    # Every batch spans the same three months, so each commit adds a small file to each of them.
+    created = [START + timedelta(days=5 * (index % 12)) for index in range(first, first + count)]
+    return pa.table(
+        {
+            "ticket_id": [f"T-{index}" for index in range(first, first + count)],
+            "created_at": created,
+            "resolved_at": [moment + timedelta(hours=4) for moment in created],
+            "priority": ["high"] * count,
+        }
+    )
+
+
+def _write_in_commits(root: Path, commits: int = 3, per_commit: int = 12) -> None:
+    with PartitionedWriter(root, RESOLVED_TICKETS) as writer:
+        for commit in range(commits):
+            writer.append(_tickets(commit * per_commit, per_commit))
+            writer.commit()
+
+
+def _ids(root: Path) -> list[str]:
+    return sorted(LakeQuery(root).read(RESOLVED_TICKETS, columns=["ticket_id"]).column("ticket_id").to_pylist())
+
+
+def test_month_query_reads_only_that_partition(tmp_path: Path) -> None:
+    _write_in_commits(tmp_path)
+    query = LakeQuery(tmp_path)
+    february = datetime(2024, 2, 1, tzinfo=timezone.utc), datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+    files = query.files(RESOLVED_TICKETS, *february)
+    assert files
+    assert all("/year=2024/month=02/" in path for path in files)
+    assert len(files) < len(query.files(RESOLVED_TICKETS))
+    rows = query.read(RESOLVED_TICKETS, columns=["created_at"], start=february[0], end=february[1])
+    assert rows.num_rows and all(moment.month == 2 for moment in rows.column("created_at").to_pylist())
+
+
+def test_compaction_merges_small_files_and_keeps_every_row(tmp_path: Path) -> None:
+    _write_in_commits(tmp_path)
+    before = _ids(tmp_path)
+    partitions = list(RESOLVED_TICKETS.partitions(tmp_path))
+
+    report = compact(tmp_path, RESOLVED_TICKETS)
+
+    assert report.files_out == report.partitions < report.files_in
+    assert report.rows == len(before)
+    assert _ids(tmp_path) == before
+    for _, directory in partitions:
+        assert len(data_files(directory)) == 1
+        assert not pending_replacements(directory)
+
+
+@pytest.mark.parametrize("inputs_removed", [False, True])
+def test_interrupted_compaction_never_shows_rows_twice(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, inputs_removed: bool
+) -> None:
+    _write_in_commits(tmp_path)
+    before = _ids(tmp_path)
+
+    def crash(replacement: Replacement) -> None:
+        if inputs_removed:
+            for name in replacement.inputs:
+                (replacement.manifest.parent / name).unlink()
+        raise RuntimeError("crashed mid-swap")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(lake_writer, "_finish_replacement", crash)
+        with pytest.raises(RuntimeError):
+            compact(tmp_path, RESOLVED_TICKETS)
+
+    (_, directory), *_ = RESOLVED_TICKETS.partitions(tmp_path)
+    assert len(pending_replacements(directory)) == 1
+    assert _ids(tmp_path) == before
+
+    assert recover_partition(directory) == 1
+    assert not pending_replacements(directory)
+    assert len(data_files(directory)) == 1
+    assert _ids(tmp_path) == before
+
+
+def test_replace_partition_leaves_only_the_new_file(tmp_path: Path) -> None:
+    month = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    def aggregate(tickets: int) -> pa.Table:
+        return pa.table(
+            {
+                "month_start": [month],
+                "priority": ["high"],
+                "tickets": [tickets],
+                "breached": [1],
+                "breach_ratio": [1 / tickets],
+                "mean_resolution_hours": [4.0],
+            }
+        )
+
+    replace_partition(tmp_path, SLA_MONTHLY, (2024, 2), aggregate(10))
+    path = replace_partition(tmp_path, SLA_MONTHLY, (2024, 2), aggregate(20))
+
+    assert data_files(path.parent) == [path]
+    assert LakeQuery(tmp_path).read(SLA_MONTHLY, columns=["tickets"]).column("tickets").to_pylist() == [20]
+
+
+def test_gold_rerun_empties_a_month_that_lost_its_rows(tmp_path: Path) -> None:
+    def sla_months() -> list[int]:
+        rows = LakeQuery(tmp_path).read(SLA_MONTHLY, columns=["month_start"]).column("month_start").to_pylist()
+        return sorted({moment.month for moment in rows})
+
+    _write_in_commits(tmp_path)
+    args = argparse.Namespace(root=str(tmp_path), start="2024-01", end="2024-03")
+    gold_tables.run(args)
+    assert sla_months() == [1, 2, 3]
+
+    shutil.rmtree(RESOLVED_TICKETS.partition_path(tmp_path, (2024, 3)))
+    gold_tables.run(args)
+
+    assert sla_months() == [1, 2]
+    for month in (1, 2, 3):
+        assert len(data_files(SLA_MONTHLY.partition_path(tmp_path, (2024, month)))) == 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ml.training.incremental import CATEGORY_TARGET, CheckpointStore, IncrementalTrainer
+
+N_FEATURES = 2**10
+
+
+def _dataset(directory: Path, name: str) -> None:
+    directory.mkdir(exist_ok=True)
+    pq.write_table(
+        pa.table(
+            {
+                "subject": ["Cannot log in", "Charged twice", "Page loads slowly", "Password reset fails"] * 4,
+                "body": ["after the update", "on my card", "every afternoon", "link expired"] * 4,
+                "priority": ["high", "medium", "low", "high"] * 4,
+                "category": ["authentication", "billing", "performance", "authentication"] * 4,
+            }
+        ),
+        directory / name,
+    )
+
+
+def _trainer(root: Path, use_bigrams: bool) -> IncrementalTrainer:
+    return IncrementalTrainer(
+        CheckpointStore(root / "checkpoints"), CATEGORY_TARGET, n_features=N_FEATURES, use_bigrams=use_bigrams
+    )
+
+
+def test_resume_warm_starts_only_on_new_files(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    _dataset(dataset, "day-1.parquet")
+    first = _trainer(tmp_path, use_bigrams=True).train(dataset)
+    _dataset(dataset, "day-2.parquet")
+
+    second = _trainer(tmp_path, use_bigrams=True).train(dataset)
+
+    assert second.warm_started and second.parent_version == first.version
+    assert second.files == ["day-2.parquet"]
+
+
+def test_resume_rejects_a_checkpoint_from_another_bigram_setting(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    _dataset(dataset, "day-1.parquet")
+    _trainer(tmp_path, use_bigrams=True).train(dataset)
+    _dataset(dataset, "day-2.parquet")
+
+    with pytest.raises(ValueError, match="full=True"):
+        _trainer(tmp_path, use_bigrams=False).train(dataset)
+    assert not _trainer(tmp_path, use_bigrams=False).train(dataset, full=True).warm_started
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+
+from src.app.core.logging import DeferredQueueHandler, JsonLogFormatter
+
+
+def test_queued_records_carry_formatted_traceback_only() -> None:
+    handler = DeferredQueueHandler(queue.Queue(maxsize=4))
+    logger = logging.getLogger("tests.deferred_queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed %s", "T-1")
+    finally:
+        logger.removeHandler(handler)
+
+    record = handler.queue.get_nowait()
+    assert record.exc_info is None
+    assert record.args is None
+    payload = json.loads(JsonLogFormatter().format(record))
+    assert payload["message"] == "failed T-1"
+    assert "RuntimeError: boom" in payload["exception"]
+
+
+def test_full_queue_drops_and_counts() -> None:
+    handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "message", None, None)
+    handler.handle(record)
+    handler.handle(record)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
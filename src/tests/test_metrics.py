@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+from observability.metrics import CallbackCounter, render
+from prometheus_client import CollectorRegistry
+
+
+def test_callback_counter_reads_values_at_scrape_time() -> None:
+    registry = CollectorRegistry()
+    counter = CallbackCounter("lookups_total", "Lookups by result.", ("cache", "result"), registry=registry)
+    hits = [0]
+    counter.labels("prediction", "hit").set_function(lambda: hits[0])
+    hits[0] = 3
+
+    assert registry.get_sample_value("lookups_total", {"cache": "prediction", "result": "hit"}) == 3.0
+    text = render(registry).decode()
+    assert "# TYPE lookups_total counter" in text
+    assert 'lookups_total{cache="prediction",result="hit"} 3.0' in text
+
+
+def test_callback_counter_checks_label_arity_and_name_clashes() -> None:
+    registry = CollectorRegistry()
+    counter = CallbackCounter("lookups_total", "Lookups by result.", ("cache",), registry=registry)
+    with pytest.raises(ValueError):
+        counter.labels("prediction", "hit")
+    with pytest.raises(ValueError):
+        CallbackCounter("lookups_total", "Again.", ("cache",), registry=registry)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.models.linear import LinearModel
+
+from src.app.services.cache import CachedClassificationService, classification_cache, prediction_cache_key
+
+CREATED = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+
+
+def _key(text: str = "Cannot log in", **changes: object) -> str:
+    ticket = Ticket(ticket_id="T-1", text=text, created_at=CREATED)
+    for name, value in changes.items():
+        setattr(ticket, name, value)
+    return prediction_cache_key("classification", ticket, "v1")
+
+
+def test_key_folds_what_the_features_fold() -> None:
+    assert _key("Cannot log in") == _key("  cannot   LOG in ")
+    assert _key() == _key(ticket_id="T-2", customer_id="C-9")
+    assert _key() == _key(created_at=CREATED + timedelta(minutes=20))
+    assert _key() == _key(created_at=CREATED.astimezone(timezone(timedelta(hours=5))))
+
+
+def test_key_covers_every_model_input() -> None:
+    assert _key("Cannot log in") != _key("Cannot log in!")
+    assert _key() != _key(priority=TicketPriority.CRITICAL)
+    assert _key() != _key(created_at=CREATED + timedelta(hours=1))
+    ticket = Ticket(ticket_id="T-1", text="Cannot log in", created_at=CREATED)
+    assert prediction_cache_key("classification", ticket, "v1") != prediction_cache_key("classification", ticket, "v2")
+
+
+def test_model_fingerprint_tracks_the_artifact() -> None:
+    weights, bias = np.ones((8, 2), dtype=np.float32), np.zeros(2, dtype=np.float32)
+    model = LinearModel("classifier", weights, bias, labels=("a", "b"))
+    same = LinearModel("classifier", weights.copy(), bias, labels=("a", "b"), metadata={"samples_seen": 10})
+    retrained = LinearModel("classifier", weights * 2, bias, labels=("a", "b"))
+    assert model.fingerprint == same.fingerprint
+    assert model.fingerprint != retrained.fingerprint
+
+
+class CountingClassifier:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        self.calls += 1
+        return ClassificationOutcome(TicketCategory.BILLING, 0.9)
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return [await self.classify(ticket) for ticket in tickets]
+
+
+def test_repeats_are_served_from_cache_and_batches_only_compute_misses() -> None:
+    model = CountingClassifier()
+    service = CachedClassificationService(model, classification_cache(100, 60.0), model_version="v1")
+
+    async def run() -> None:
+        await service.classify(Ticket(ticket_id="1", text="Refund please", created_at=CREATED))
+        await service.classify(Ticket(ticket_id="2", text="refund  PLEASE", created_at=CREATED))
+        outcomes = await service.classify_batch(
+            [
+                Ticket(ticket_id="3", text="Refund please", created_at=CREATED),
+                Ticket(ticket_id="4", text="Something else", created_at=CREATED),
+            ]
+        )
+        assert [outcome.category for outcome in outcomes] == [TicketCategory.BILLING] * 2
+
+    asyncio.run(run())
+    assert model.calls == 2
+    assert service.cache.stats.local_hits == 2
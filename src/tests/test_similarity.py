@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Sequence
+
+import numpy as np
+import pytest
+
+from domain.models.ticket import Ticket
+from rag.embeddings import HashingEmbedder
+from rag.near_duplicates import NearDuplicateIndex
+from rag.vector_index import IVFIndex
+
+from src.app.core.dependencies import _upstream
+from src.app.core.exceptions import UpstreamServiceException, UpstreamTimeoutException
+from src.app.services.resilience import ResilientSimilarityService, ResilientUpstream
+from src.app.services.similarity import LocalSimilarityService
+
+DIM = 64
+CREATED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _ticket(ticket_id: str, text: str) -> Ticket:
+    return Ticket(ticket_id=ticket_id, text=text, created_at=CREATED)
+
+
+class _SlowEmbedder(HashingEmbedder):
+    def __init__(self, release: threading.Event) -> None:
+        super().__init__(dim=DIM)
+        self.release = release
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.release.wait(5)
+        return super().embed(texts)
+
+
+def test_search_runs_off_the_event_loop_so_timeouts_fire() -> None:
+    release = threading.Event()
+    service = LocalSimilarityService(embedder=_SlowEmbedder(release), index=IVFIndex(dim=DIM, auto_train=False))
+    resilient = ResilientSimilarityService(
+        service, ResilientUpstream("vector", timeout_seconds=0.05, max_retries=0, hedge=False)
+    )
+
+    async def scenario() -> float:
+        start = time.perf_counter()
+        try:
+            with pytest.raises(UpstreamTimeoutException):
+                await resilient.find_similar(_ticket("T-9", "Cannot log in"))
+        finally:
+            release.set()
+        return time.perf_counter() - start
+
+    assert asyncio.run(scenario()) < 1.0
+
+
+def test_near_duplicates_come_first_and_the_rest_is_filled_by_vector_search() -> None:
+    service = LocalSimilarityService(
+        embedder=HashingEmbedder(dim=DIM),
+        index=IVFIndex(dim=DIM, auto_train=False),
+        near_duplicates=NearDuplicateIndex(threshold=0.8),
+    )
+    resubmitted = "Password reset email never arrives after clicking forgot password on the login page"
+    service.index_tickets(
+        [
+            _ticket("T-1", resubmitted),
+            _ticket("T-2", resubmitted + " again"),
+            _ticket("T-3", "Password reset link expired before I could use it"),
+            _ticket("T-4", "Invoice shows the wrong billing address"),
+            _ticket("T-5", "Dashboard charts load slowly in the afternoon"),
+        ]
+    )
+
+    results = asyncio.run(service.find_similar(_ticket("T-9", resubmitted), top_k=4))
+
+    assert len(results) == 4
+    assert len({item.ticket_id for item in results}) == 4
+    assert [item.ticket_id for item in results[:2]] == ["T-1", "T-2"]
+    assert all(item.near_duplicate for item in results[:2])
+    assert not any(item.near_duplicate for item in results[2:])
+    assert "T-9" not in {item.ticket_id for item in results}
+
+    only_duplicates = asyncio.run(service.find_similar(_ticket("T-9", resubmitted), top_k=1))
+    assert [(item.ticket_id, item.near_duplicate) for item in only_duplicates] == [("T-1", True)]
+
+
+def test_in_process_backends_are_neither_retried_nor_hedged() -> None:
+    upstream = _upstream("in-process-test", 1000.0, in_process=True)
+    attempts = 0
+
+    async def attempt() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise RuntimeError("inference failed")
+
+    with pytest.raises(UpstreamServiceException):
+        asyncio.run(upstream.call(attempt))
+    assert attempts == 1
+    assert upstream.stats.hedges == upstream.stats.retries == 0
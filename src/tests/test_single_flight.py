@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.models.results import ClassificationOutcome
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_category import TicketCategory
+
+from src.app.services.single_flight import SingleFlight, SingleFlightClassificationService
+
+CREATED = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+
+
+class GatedModel:
+    """Counts calls and holds each one until ``release`` is set."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+        self._fail = fail
+
+    async def classify(self, ticket: Ticket) -> ClassificationOutcome:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self._fail:
+            raise RuntimeError("model down")
+        return ClassificationOutcome(TicketCategory.OTHER, float(self.calls))
+
+    async def classify_batch(self, tickets: list[Ticket]) -> list[ClassificationOutcome]:
+        return [await self.classify(ticket) for ticket in tickets]
+
+
+def _ticket(created_at: datetime = CREATED) -> Ticket:
+    return Ticket(ticket_id="", text="Cannot log in", created_at=created_at)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_identical_calls_share_one_result() -> None:
+    async def run() -> tuple[GatedModel, SingleFlight, list[ClassificationOutcome]]:
+        model = GatedModel()
+        service = SingleFlightClassificationService(model)
+        callers = [asyncio.create_task(service.classify(_ticket())) for _ in range(5)]
+        await _settle()
+        model.release.set()
+        return model, service.flights, await asyncio.gather(*callers)
+
+    model, flights, outcomes = asyncio.run(run())
+    assert model.calls == 1
+    assert {outcome.confidence for outcome in outcomes} == {1.0}
+    assert (flights.stats.leaders, flights.stats.joined, flights.in_flight) == (1, 4, 0)
+
+
+def test_created_hour_is_part_of_the_key() -> None:
+    async def run() -> GatedModel:
+        model = GatedModel()
+        service = SingleFlightClassificationService(model)
+        callers = [
+            asyncio.create_task(service.classify(_ticket())),
+            asyncio.create_task(service.classify(_ticket(CREATED + timedelta(minutes=10)))),
+            asyncio.create_task(service.classify(_ticket(CREATED + timedelta(hours=1)))),
+        ]
+        await _settle()
+        model.release.set()
+        await asyncio.gather(*callers)
+        return model
+
+    assert asyncio.run(run()).calls == 2
+
+
+def test_exception_reaches_every_waiter() -> None:
+    async def run() -> tuple[GatedModel, list[BaseException]]:
+        model = GatedModel(fail=True)
+        service = SingleFlightClassificationService(model)
+        callers = [asyncio.create_task(service.classify(_ticket())) for _ in range(3)]
+        await _settle()
+        model.release.set()
+        return model, await asyncio.gather(*callers, return_exceptions=True)
+
+    model, results = asyncio.run(run())
+    assert model.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_leader_leaves_the_call_running_for_others() -> None:
+    async def run() -> tuple[GatedModel, ClassificationOutcome, asyncio.Task]:  # type: ignore[type-arg]
+        model = GatedModel()
+        service = SingleFlightClassificationService(model)
+        leader = asyncio.create_task(service.classify(_ticket()))
+        await _settle()
+        follower = asyncio.create_task(service.classify(_ticket()))
+        await _settle()
+        leader.cancel()  # The leader's client disconnected.
+        await _settle()
+        model.release.set()
+        return model, await follower, leader
+
+    model, outcome, leader = asyncio.run(run())
+    assert leader.cancelled()
+    assert model.calls == 1 and model.cancelled == 0
+    assert outcome.confidence == 1.0
+
+
+def test_shared_call_is_cancelled_once_the_last_waiter_leaves() -> None:
+    async def run() -> tuple[GatedModel, SingleFlight, ClassificationOutcome]:
+        model = GatedModel()
+        service = SingleFlightClassificationService(model)
+        callers = [asyncio.create_task(service.classify(_ticket())) for _ in range(2)]
+        await _settle()
+        for caller in callers:
+            caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.gather(*callers)
+        await _settle()
+        assert model.cancelled == 1
+        assert service.flights.in_flight == 0
+        # A later call starts afresh instead of joining the torn-down one.
+        model.release.set()
+        return model, service.flights, await service.classify(_ticket())
+
+    model, flights, outcome = asyncio.run(run())
+    assert model.calls == 2
+    assert flights.stats.abandoned == 1
+    assert outcome.confidence == 2.0
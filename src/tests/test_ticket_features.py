@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pytest
+
+from domain.models.ticket import Ticket
+from domain.value_objects.ticket_priority import TicketPriority
+from ml.feature_engineering.ticket_features import (
+    UNKNOWN_HOUR,
+    ticket_created_hour,
+    transform_batch,
+    transform_tickets,
+)
+from ml.preprocessing.text import mask_pii
+
+TEXT = "Login fails with error 0x80070005 since 2024-01-15 on Windows 10.0.19045"
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        datetime(2024, 1, 1, 10, 0, tzinfo=timezone(timedelta(hours=5))),
+        datetime(2024, 1, 1, 23, 30, tzinfo=timezone(timedelta(hours=-2, minutes=-30))),
+        datetime(2024, 1, 1, 10, 15, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 10, 0),
+    ],
+)
+def test_training_and_serving_compute_identical_features(created_at: datetime) -> None:
+    ticket = Ticket(ticket_id="T-1", text=TEXT, created_at=created_at, priority=TicketPriority.HIGH)
+    raw = pa.RecordBatch.from_pydict(
+        {
+            "subject": pa.array([None], pa.string()),
+            "body": [TEXT],
+            "created_at": [created_at.isoformat()],
+            "priority": ["High "],
+            "category": pa.array([None], pa.string()),
+        }
+    )
+    training = transform_batch(raw).to_pylist()[0]
+    serving = transform_tickets([ticket]).to_pylist()[0]
+    assert training == serving
+    assert serving["created_hour"] == ticket_created_hour(ticket) != UNKNOWN_HOUR
+
+
+def test_zoned_timestamps_use_the_utc_hour() -> None:
+    created = pa.array([datetime(2024, 1, 1, 5, tzinfo=timezone.utc)], pa.timestamp("us", tz="Asia/Kolkata"))
+    features = transform_batch(pa.RecordBatch.from_pydict({"subject": ["a"], "body": ["b"], "created_at": created}))
+    assert features.column("created_hour").to_pylist() == [5]
+
+
+def test_unparseable_times_get_the_unknown_hour() -> None:
+    raw = pa.RecordBatch.from_pydict({"subject": ["a", "b"], "body": ["c", "d"], "created_at": ["yesterday", None]})
+    assert transform_batch(raw).column("created_hour").to_pylist() == [UNKNOWN_HOUR, UNKNOWN_HOUR]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "call +1 (555) 123-4567 now",
+        "555-123-4567",
+        "555.123.4567",
+        "(020) 7946 0958",
+        "+44 20 7946 0958",
+        "+15551234567",
+    ],
+)
+def test_phone_numbers_are_masked(text: str) -> None:
+    assert "<phone>" in mask_pii(pa.array([text]))[0].as_py()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "fails since 2024-01-15",
+        "2024-01-15T10:00:00+05:00",
+        "windows 10.0.19045.3803",
+        "upgraded to v2.3.1",
+        "error 0x80070005",
+        "ERR-5021-3344",
+        "at 10:30:45",
+        "build 22621.2428",
+        "order 12345678",
+    ],
+)
+def test_dates_versions_and_codes_are_kept(text: str) -> None:
+    assert mask_pii(pa.array([text]))[0].as_py() == text
+
+
+def test_other_pii_is_still_masked() -> None:
+    masked = mask_pii(pa.array(["mail jo@example.com from 10.1.2.3 card 4111 1111 1111 1111"]))[0].as_py()
+    assert masked == "mail <email> from <ip> card <card>"
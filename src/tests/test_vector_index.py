@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from rag import vector_index
+from rag.embeddings import normalize_rows
+from rag.vector_index import IVFIndex
+
+
+def _vectors(count: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    return normalize_rows(np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32))
+
+
+def _labels(count: int, prefix: str = "T") -> list[str]:
+    return [f"{prefix}-{index}" for index in range(count)]
+
+
+def test_search_finds_exact_vector_before_and_after_training() -> None:
+    vectors = _vectors(400)
+    index = IVFIndex(dim=16, nlist=8, nprobe=8, auto_train=False)
+    index.add(_labels(400), vectors)
+    assert index.search(vectors[17], 1)[0][0] == "T-17"
+    index.train()
+    assert index.is_trained
+    label, score = index.search(vectors[17], 1)[0]
+    assert label == "T-17" and score == pytest.approx(1.0, abs=1e-5)
+    assert len(index.search(vectors[0], 5)) == 5
+
+
+def test_add_replaces_and_remove_deletes() -> None:
+    vectors = _vectors(3)
+    index = IVFIndex(dim=16, nlist=4, auto_train=False)
+    index.add(["a", "b"], vectors[:2])
+    index.add(["a"], vectors[2:3])
+    assert len(index) == 2
+    assert index.search(vectors[2], 1)[0][0] == "a"
+    assert index.remove(["a", "missing"]) == 1
+    assert "a" not in index and len(index) == 1
+    assert [label for label, _ in index.search(vectors[0], 5)] == ["b"]
+
+
+def test_duplicate_labels_leave_index_unchanged() -> None:
+    vectors = _vectors(4)
+    index = IVFIndex(dim=16, nlist=4, auto_train=False)
+    index.add(["a"], vectors[:1])
+    with pytest.raises(ValueError):
+        index.add(["b", "a", "b"], vectors[1:4])
+    assert len(index) == 1 and "b" not in index
+    assert index.search(vectors[0], 1)[0][0] == "a"
+
+
+def test_background_training_keeps_writes_made_meanwhile() -> None:
+    vectors = _vectors(600)
+    index = IVFIndex(dim=16, nlist=4, nprobe=4, train_min_points_per_list=100)
+    index.add(_labels(400), vectors[:400])
+    index.add(_labels(200, prefix="U"), vectors[400:])
+    index.remove(["T-0", "T-1"])
+    assert index.wait_for_training(timeout=10)
+    assert index.is_trained
+    assert len(index) == 598
+    assert "T-0" not in index and "U-199" in index
+    assert index.search(vectors[599], 1)[0][0] == "U-199"
+    assert all(label != "T-0" for label, _ in index.search(vectors[0], 10))
+
+
+def test_writes_during_clustering_are_replayed(monkeypatch: pytest.MonkeyPatch) -> None:
+    started, release = threading.Event(), threading.Event()
+    original = vector_index.spherical_kmeans
+
+    def slow_kmeans(data: np.ndarray, k: int) -> np.ndarray:
+        started.set()
+        release.wait(10)
+        return original(data, k)
+
+    monkeypatch.setattr(vector_index, "spherical_kmeans", slow_kmeans)
+    vectors = _vectors(300)
+    index = IVFIndex(dim=16, nlist=4, nprobe=4, train_min_points_per_list=50)
+    index.add(_labels(200), vectors[:200])
+    assert started.wait(10)
+    # The index keeps serving and accepting writes while k-means runs.
+    index.add(_labels(100, prefix="U"), vectors[200:])
+    index.remove(["T-5"])
+    assert index.search(vectors[250], 1)[0][0] == "U-50"
+    release.set()
+    assert index.wait_for_training(timeout=10)
+    assert index.is_trained and len(index) == 299
+    assert "T-5" not in index
+    assert index.search(vectors[250], 1)[0][0] == "U-50"